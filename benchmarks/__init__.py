@@ -0,0 +1,7 @@
+import os
+import sys
+
+# The generated protobuf modules import each other as `proto.*`, so the
+# familytree package directory has to be importable, as in family_tree_webapp.py.
+BASE_PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(BASE_PROJECT_DIR, "familytree"))
@@ -0,0 +1,100 @@
+"""Measures importing a branch in one batch against one request per member."""
+
+import argparse
+import random
+import time
+from typing import Any
+
+from fastapi.testclient import TestClient
+
+from familytree import app_state
+from familytree.family_tree_webapp import app
+from familytree.handlers.family_tree_handler import FamilyTreeHandler
+
+from benchmarks.synthetic_tree import build_synthetic_family_tree
+
+MANAGE_URL = "/api/v1/manage"
+
+
+def _branch_operations(
+    root_id: str, size: int, rng: random.Random
+) -> list[dict[str, Any]]:
+    """Builds add_family_member operations for a branch below `root_id`.
+
+    Every other member is the spouse of the member before it, the others are
+    children of a random earlier member of the branch.
+    """
+    operations: list[dict[str, Any]] = []
+    for number in range(size):
+        if number % 2:
+            source_ref, relationship_type = f"m{number - 1}", "SPOUSE"
+        else:
+            source_ref = f"m{rng.randrange(number)}" if number else root_id
+            relationship_type = "PARENT_TO_CHILD"
+        operations.append(
+            {
+                "op": "add_family_member",
+                "ref": f"m{number}",
+                "new_member_data": {"name": f"Branch member {number}"},
+                "source_family_member_id": source_ref,
+                "relationship_type": relationship_type,
+                "infer_relationships": True,
+            }
+        )
+    return operations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--members", type=int, default=100_000)
+    parser.add_argument("--branch", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    family_tree = build_synthetic_family_tree(args.members)
+    client = TestClient(app)
+
+    def load() -> FamilyTreeHandler:
+        handler = FamilyTreeHandler()
+        handler.graph_handler.create_from_proto(family_tree)
+        app_state.set_current_family_tree_handler(handler)
+        return handler
+
+    root_id = next(load().graph_handler.iter_member_ids())
+    operations = _branch_operations(root_id, args.branch, random.Random(args.seed))
+
+    timings: dict[str, float] = {}
+    for name, read_between in (("per call", False), ("per call + read", True)):
+        load()
+        member_ids = {root_id: root_id}
+        start = time.perf_counter()
+        for operation in operations:
+            payload = dict(operation)
+            del payload["op"], payload["ref"]
+            payload["source_family_member_id"] = member_ids[
+                operation["source_family_member_id"]
+            ]
+            response = client.post(f"{MANAGE_URL}/add_family_member", json=payload)
+            new_member_id = response.json()["new_member_id"]
+            member_ids[operation["ref"]] = new_member_id
+            if read_between:
+                client.get(f"/api/v1/graph/member_info/{new_member_id}")
+        timings[name] = time.perf_counter() - start
+
+    handler = load()
+    start = time.perf_counter()
+    response = client.post(f"{MANAGE_URL}/batch", json={"operations": operations})
+    handler.snapshot_graph()
+    timings["batch"] = time.perf_counter() - start
+    assert response.status_code == 200, response.text
+
+    for name, timing in timings.items():
+        print(
+            f"{name:16s} members={args.members:7d} branch={args.branch:5d} "
+            f"total={timing * 1e3:8.1f}ms "
+            f"per member={timing / args.branch * 1e6:7.1f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Compares saving and loading a FamilyTree in text and binary protobuf."""
+
+import argparse
+import gc
+import time
+
+from familytree.handlers.proto_handler import ProtoHandler
+
+from benchmarks.synthetic_tree import build_synthetic_family_tree
+
+
+def _timed(function, *args):
+    """Returns the result of a call and the seconds it took."""
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    # Parsing text format of a million members takes minutes and over 4 GB.
+    parser.add_argument("--members", type=int, nargs="+", default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    for num_members in args.members:
+        proto_handler = ProtoHandler()
+        proto_handler._family_tree = build_synthetic_family_tree(num_members)
+        # Keeps full collections of the tree itself out of the timings.
+        gc.freeze()
+
+        text, save_text = _timed(proto_handler.save_to_textproto)
+        binary, save_binary = _timed(proto_handler.save_to_binary)
+        _, load_text = _timed(ProtoHandler().load_from_textproto, text)
+        _, load_binary = _timed(ProtoHandler().load_from_binary, binary)
+        text_size = len(text.encode("utf-8"))
+        print(
+            f"members={num_members:8d} "
+            f"size txtpb={text_size / 1e6:7.1f}MB binpb={len(binary) / 1e6:6.1f}MB "
+            f"({text_size / len(binary):.1f}x)"
+        )
+        print(
+            f"    save txtpb={save_text:7.2f}s binpb={save_binary:6.2f}s "
+            f"({save_text / save_binary:5.1f}x)  "
+            f"load txtpb={load_text:7.2f}s binpb={load_binary:6.2f}s "
+            f"({load_text / load_binary:5.1f}x)"
+        )
+        del text, binary, proto_handler
+        gc.unfreeze()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Measures calendar queries with the calendar index against a full scan."""
+
+import argparse
+import datetime
+import gc
+import random
+import time
+
+from familytree.handlers.graph_handler import GraphHandler
+from familytree.indexes.calendar_index import CalendarIndex
+from familytree.proto import family_tree_pb2, utils_pb2
+
+from benchmarks.synthetic_tree import build_synthetic_family_tree
+
+
+def _scan_month(graph_handler: GraphHandler, month: int) -> list[str]:
+    """Finds a month's birthdays the way the agent had to, by reading every
+    member."""
+    birthdays = []
+    for member_id in graph_handler.iter_member_ids():
+        date_of_birth = graph_handler.get_member(member_id).date_of_birth
+        if date_of_birth.month == month:
+            birthdays.append((date_of_birth.date, member_id))
+    birthdays.sort()
+    return [member_id for _, member_id in birthdays]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--members", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    graph_handler = GraphHandler()
+    graph_handler.create_from_proto(build_synthetic_family_tree(args.members))
+    member_ids = list(graph_handler.iter_member_ids())
+    rng = random.Random(args.seed)
+
+    start = time.perf_counter()
+    graph_handler._get_index(CalendarIndex)
+    print(f"build    members={args.members:7d} {time.perf_counter() - start:6.2f}s")
+    # Keeps full collections of the tree itself out of the timings.
+    gc.freeze()
+
+    days = [
+        datetime.date(2025, 1, 1) + datetime.timedelta(days=rng.randrange(365))
+        for _ in range(args.queries)
+    ]
+    queries = {
+        f"next {args.limit}": lambda day: graph_handler.find_events(
+            day, limit=args.limit
+        ),
+        "a week": lambda day: graph_handler.find_events(
+            day, day + datetime.timedelta(days=6)
+        ),
+        "a month": lambda day: graph_handler.find_events(
+            day.replace(day=1), day.replace(day=28)
+        ),
+        "a Tamil month's star days": lambda day: graph_handler.find_star_days(
+            day.month, utils_pb2.ROHINI
+        ),
+    }
+    for name, query in queries.items():
+        times = []
+        for day in days:
+            start = time.perf_counter()
+            found = len(query(day))
+            times.append(time.perf_counter() - start)
+        times.sort()
+        print(
+            f"{name:26s} members={args.members:7d} found~{found:6d} "
+            f"p50={times[len(times) // 2] * 1e6:8.1f}us "
+            f"p99={times[len(times) * 99 // 100] * 1e6:8.1f}us"
+        )
+    start = time.perf_counter()
+    for day in days[:10]:
+        _scan_month(graph_handler, day.month)
+    scan = (time.perf_counter() - start) / 10
+    print(f"scan a month's birthdays   {scan * 1e3:.1f}ms")
+
+    # Updates keep the calendar current; the first one after a copy also copies.
+    start = time.perf_counter()
+    for _ in range(args.queries):
+        member = family_tree_pb2.FamilyMember()
+        member.date_of_birth.month = rng.randint(1, 12)
+        member.date_of_birth.date = rng.randint(1, 28)
+        graph_handler.update_family_member(rng.choice(member_ids), member)
+    update = (time.perf_counter() - start) / args.queries
+    copy = graph_handler.copy()
+    member = family_tree_pb2.FamilyMember()
+    member.wedding_date.month = 6
+    member.wedding_date.date = 1
+    start = time.perf_counter()
+    copy.update_family_member(rng.choice(member_ids), member)
+    first_update = time.perf_counter() - start
+    print(
+        f"update   members={args.members:7d} {update * 1e6:6.1f}us "
+        f"first after copy={first_update * 1e3:6.2f}ms"
+    )
+    gc.unfreeze()
+
+
+if __name__ == "__main__":
+    main()
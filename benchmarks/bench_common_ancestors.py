@@ -0,0 +1,90 @@
+"""Measures batch lowest-common-ancestor queries against per-pair ancestor walks."""
+
+import argparse
+import itertools
+import random
+import time
+
+from familytree.handlers.graph_handler import GraphHandler
+from familytree.indexes.ancestry_index import AncestryIndex
+
+from benchmarks.synthetic_tree import build_synthetic_family_tree
+
+
+def _ancestors_by_traversal(graph_handler: GraphHandler, member_id: str) -> dict:
+    """Walks every CHILD_TO_PARENT edge above the member."""
+    generations = {member_id: 0}
+    frontier = [member_id]
+    while frontier:
+        next_frontier = []
+        for current_id in frontier:
+            for parent_id in graph_handler.get_parents(current_id):
+                if parent_id not in generations:
+                    generations[parent_id] = generations[current_id] + 1
+                    next_frontier.append(parent_id)
+        frontier = next_frontier
+    return generations
+
+
+def _common_by_traversal(graph_handler: GraphHandler, source_id: str, target_id: str):
+    """The approach without an index: intersect two fresh ancestor walks."""
+    source = _ancestors_by_traversal(graph_handler, source_id)
+    target = _ancestors_by_traversal(graph_handler, target_id)
+    common = source.keys() & target.keys()
+    return [
+        member_id
+        for member_id in common
+        if not any(
+            child_id in common for child_id in graph_handler.get_children(member_id)
+        )
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--members", type=int, default=100_000)
+    parser.add_argument("--reunion", type=int, default=200)
+    args = parser.parse_args()
+
+    graph_handler = GraphHandler()
+    graph_handler.create_from_proto(build_synthetic_family_tree(args.members))
+    member_ids = list(graph_handler.iter_member_ids())
+    rng = random.Random(0)
+
+    start = time.perf_counter()
+    graph_handler.find_common_ancestors([(member_ids[0], member_ids[1])])
+    print(f"members={args.members} first query={time.perf_counter() - start:.2f}s")
+
+    # A reunion: the descendants of one great-grandparent, every pair.
+    founder = next(
+        member_id
+        for member_id in member_ids[len(member_ids) // 2 :]
+        if graph_handler.count_descendants(member_id) >= args.reunion
+    )
+    reunion = [founder]
+    for member_id in reunion:
+        reunion.extend(graph_handler.get_children(member_id))
+        if len(reunion) >= args.reunion:
+            break
+    reunion = reunion[: args.reunion]
+    random_members = rng.sample(member_ids, args.reunion)
+
+    for name, members in (("reunion", reunion), ("random", random_members)):
+        pairs = list(itertools.combinations(members, 2))
+        start = time.perf_counter()
+        for source_id, target_id in pairs[:2000]:
+            _common_by_traversal(graph_handler, source_id, target_id)
+        traversal = (time.perf_counter() - start) / min(len(pairs), 2000)
+        graph_handler._indexes.pop(AncestryIndex, None)
+        start = time.perf_counter()
+        results = graph_handler.find_common_ancestors(pairs)
+        batch = (time.perf_counter() - start) / len(pairs)
+        related = sum(1 for ancestors in results if ancestors)
+        print(
+            f"{name:8s} pairs={len(pairs)} related={related} "
+            f"traversal={traversal * 1e6:8.1f}us batch={batch * 1e6:6.2f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
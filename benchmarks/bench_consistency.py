@@ -0,0 +1,84 @@
+"""Measures the consistency audit and the incremental checks of changes."""
+
+import argparse
+import gc
+import random
+import time
+
+from familytree.handlers.graph_handler import GraphHandler
+from familytree.indexes.consistency_index import ConsistencyIndex
+from familytree.proto import family_tree_pb2
+
+from benchmarks.synthetic_tree import build_synthetic_family_tree
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--members", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--changes", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for num_members in args.members:
+        graph_handler = GraphHandler()
+        graph_handler.create_from_proto(build_synthetic_family_tree(num_members))
+        member_ids = list(graph_handler.iter_member_ids())
+        rng = random.Random(args.seed)
+        graph_handler.is_ancestor(member_ids[0], member_ids[-1])
+        # Keeps full collections of the tree itself out of the timings.
+        gc.freeze()
+
+        start = time.perf_counter()
+        violations = graph_handler.audit_consistency()
+        audit = time.perf_counter() - start
+        print(
+            f"audit    members={num_members:7d} violations={len(violations):6d} "
+            f"{audit * 1e3:8.1f}ms {audit / num_members * 1e6:5.2f}us/member"
+        )
+
+        start = time.perf_counter()
+        for _ in range(args.changes):
+            member = family_tree_pb2.FamilyMember()
+            member.date_of_birth.year = rng.randint(1500, 2000)
+            graph_handler.update_family_member(rng.choice(member_ids), member)
+        update = (time.perf_counter() - start) / args.changes
+        # A link from a member to one of its ancestors closes a cycle, which
+        # walks the members on it.
+        start = time.perf_counter()
+        for _ in range(args.changes):
+            parent_id, child_id = rng.sample(member_ids, 2)
+            graph_handler.add_child_relation(parent_id, child_id, False)
+            graph_handler.remove_relationship(parent_id, child_id, False)
+        link = (time.perf_counter() - start) / args.changes
+        print(
+            f"changes  members={num_members:7d} update={update * 1e6:6.1f}us "
+            f"link added and removed={link * 1e6:6.1f}us"
+        )
+
+        # The same changes with only the lineage index kept up to date.
+        without = GraphHandler()
+        without.create_from_proto(build_synthetic_family_tree(num_members))
+        without.is_ancestor(member_ids[0], member_ids[-1])
+        rng = random.Random(args.seed)
+        start = time.perf_counter()
+        for _ in range(args.changes):
+            member = family_tree_pb2.FamilyMember()
+            member.date_of_birth.year = rng.randint(1500, 2000)
+            without.update_family_member(rng.choice(member_ids), member)
+        update = (time.perf_counter() - start) / args.changes
+        start = time.perf_counter()
+        for _ in range(args.changes):
+            parent_id, child_id = rng.sample(member_ids, 2)
+            without.add_child_relation(parent_id, child_id, False)
+            without.remove_relationship(parent_id, child_id, False)
+        link = (time.perf_counter() - start) / args.changes
+        assert ConsistencyIndex not in without._indexes
+        print(
+            f"without  members={num_members:7d} update={update * 1e6:6.1f}us "
+            f"link added and removed={link * 1e6:6.1f}us"
+        )
+        gc.unfreeze()
+
+
+if __name__ == "__main__":
+    main()
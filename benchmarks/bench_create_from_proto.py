@@ -0,0 +1,61 @@
+"""Compares the bulk GraphHandler.create_from_proto against per-item additions."""
+
+import argparse
+import time
+
+from familytree.handlers.graph_handler import GraphHandler
+from familytree.proto import family_tree_pb2
+
+from benchmarks.synthetic_tree import build_synthetic_family_tree
+
+
+def _create_one_by_one(
+    graph_handler: GraphHandler, family_tree: family_tree_pb2.FamilyTree
+) -> None:
+    """The previous implementation: one add_* call per member and per edge."""
+    for member_id, member_data in family_tree.members.items():
+        graph_handler.add_member(member_id, member_data)
+    for source_id, relationships in family_tree.relationships.items():
+        for child_id in relationships.children_ids:
+            graph_handler.add_child_relation(source_id, child_id, False)
+        for spouse_id in relationships.spouse_ids:
+            graph_handler.add_spouse_relation(source_id, spouse_id, False)
+        for parent_id in relationships.parent_ids:
+            graph_handler.add_parent_relation(source_id, parent_id, False)
+    for family_unit_id, family_unit in family_tree.family_units.items():
+        graph_handler.get_family_unit_graph()[family_unit_id] = family_unit
+
+
+def _best_of(func, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--members", type=int, nargs="+", default=[10_000, 50_000, 100_000]
+    )
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    for num_members in args.members:
+        family_tree = build_synthetic_family_tree(num_members)
+        one_by_one = _best_of(
+            lambda: _create_one_by_one(GraphHandler(), family_tree), args.repeats
+        )
+        bulk = _best_of(
+            lambda: GraphHandler().create_from_proto(family_tree), args.repeats
+        )
+        print(
+            f"members={num_members:>8} one_by_one={one_by_one:7.3f}s "
+            f"bulk={bulk:7.3f}s speedup={one_by_one / bulk:5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
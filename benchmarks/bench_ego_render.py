@@ -0,0 +1,50 @@
+"""Measures POI-centred rendering against rendering the whole tree."""
+
+import argparse
+import time
+
+from familytree.handlers.graph_handler import GraphHandler
+
+from benchmarks.synthetic_tree import build_synthetic_family_tree
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--members", type=int, default=100_000)
+    parser.add_argument("--full-members", type=int, default=2_000)
+    args = parser.parse_args()
+
+    small_handler = GraphHandler()
+    small_handler.create_from_proto(build_synthetic_family_tree(args.full_members))
+    start = time.perf_counter()
+    html_content = small_handler.render_graph_to_html("light")
+    print(
+        f"full tree   members={args.full_members:6d} "
+        f"render={time.perf_counter() - start:7.3f}s "
+        f"html={len(html_content) / 1e3:8.0f}kB"
+    )
+
+    graph_handler = GraphHandler()
+    graph_handler.create_from_proto(build_synthetic_family_tree(args.members))
+    member_ids = list(graph_handler.iter_member_ids())
+    poi_id = next(
+        member_id
+        for member_id in member_ids[args.members // 2 :]
+        if graph_handler.get_parents(member_id) and graph_handler.get_children(member_id)
+    )
+    for degree in (1, 2, 3, 4):
+        start = time.perf_counter()
+        html_content = graph_handler.render_ego_graph_to_html(poi_id, degree, "light")
+        render = time.perf_counter() - start
+        start = time.perf_counter()
+        graph_handler.render_ego_graph_to_html(poi_id, degree, "light")
+        cached = time.perf_counter() - start
+        nodes = len(graph_handler.get_ego_graph(poi_id, degree))
+        print(
+            f"ego degree={degree} members={nodes:6d} render={render:7.3f}s "
+            f"html={len(html_content) / 1e3:8.0f}kB cached={cached * 1e6:6.1f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
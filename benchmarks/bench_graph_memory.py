@@ -0,0 +1,55 @@
+"""Compares the memory held by the DiGraph and the compact graph backends."""
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+from familytree.handlers.compact_graph_handler import CompactGraphHandler
+from familytree.handlers.graph_handler import GraphHandler
+
+from benchmarks.synthetic_tree import build_synthetic_family_tree
+
+
+def _measure(handler_cls, num_members: int) -> tuple[float, float, float]:
+    """Returns bytes per member, build time and get_children time per call."""
+    family_tree = build_synthetic_family_tree(num_members)
+    # Materialize the member wrappers first so both backends share them.
+    members = dict(family_tree.members.items())
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    start = time.perf_counter()
+    graph_handler = handler_cls()
+    graph_handler.create_from_proto(family_tree)
+    build_time = time.perf_counter() - start
+    gc.collect()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    member_ids = list(members)[:: max(1, num_members // 20_000)]
+    start = time.perf_counter()
+    for member_id in member_ids:
+        graph_handler.get_children(member_id)
+    lookup_time = (time.perf_counter() - start) / len(member_ids)
+    return (after - before) / num_members, build_time, lookup_time
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--members", type=int, default=100_000)
+    args = parser.parse_args()
+
+    for handler_cls in (GraphHandler, CompactGraphHandler):
+        bytes_per_member, build_time, lookup_time = _measure(
+            handler_cls, args.members
+        )
+        print(
+            f"{handler_cls.__name__:20s} members={args.members} "
+            f"bytes/member={bytes_per_member:8.0f} build={build_time:6.2f}s "
+            f"get_children={lookup_time * 1e6:6.2f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Compares syncing one edit into the protobuf in full and from the changes, and
+checks that saves stay the same size over add and delete cycles.
+"""
+
+import argparse
+import gc
+import time
+
+from familytree.handlers.graph_handler import GraphHandler
+from familytree.handlers.proto_handler import ProtoHandler
+from familytree.proto import family_tree_pb2
+
+from benchmarks.synthetic_tree import build_synthetic_family_tree
+
+
+def _timed(function, *args):
+    """Returns the result of a call and the seconds it took."""
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def _run_cycles(num_members: int, num_cycles: int) -> None:
+    """Adds and deletes a child repeatedly, syncing the changes after each."""
+    proto_handler = ProtoHandler()
+    proto_handler._family_tree = build_synthetic_family_tree(num_members)
+    graph_handler = GraphHandler()
+    graph_handler.create_from_proto(proto_handler.get_family_tree())
+    checkpoint = graph_handler.checkpoint_changes()
+    parent_id = next(iter(proto_handler.get_family_tree().members))
+    gc.freeze()
+
+    for cycle in range(1, num_cycles + 1):
+        child_id = f"CYCLE{cycle}"
+        graph_handler.add_member(
+            child_id, family_tree_pb2.FamilyMember(id=child_id, name="Child")
+        )
+        graph_handler.add_child_relation(parent_id, child_id)
+        graph_handler.add_parent_relation(child_id, parent_id)
+        graph_handler.remove_member(child_id, remove_orphaned_neighbors=False)
+        changes = graph_handler.changes_since(checkpoint)
+        checkpoint = graph_handler.checkpoint_changes()
+        _, sync = _timed(
+            proto_handler.update_from_graph_changes, graph_handler, changes
+        )
+        if cycle in (1, 10, 100, 1000, num_cycles):
+            size = len(proto_handler.save_to_binary())
+            print(
+                f"members={num_members:8d} cycle={cycle:5d} "
+                f"sync={sync * 1e3:6.3f}ms binpb={size / 1e6:7.3f}MB"
+            )
+    gc.unfreeze()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--members", type=int, nargs="+", default=[10, 100_000])
+    parser.add_argument("--cycles", type=int, default=1000)
+    args = parser.parse_args()
+
+    for num_members in args.members:
+        proto_handler = ProtoHandler()
+        proto_handler._family_tree = build_synthetic_family_tree(num_members)
+        graph_handler = GraphHandler()
+        graph_handler.create_from_proto(proto_handler.get_family_tree())
+        checkpoint = graph_handler.checkpoint_changes()
+        # Keeps full collections of the tree itself out of the timings.
+        gc.freeze()
+
+        # One edit: a new child of the first member.
+        parent_id = next(iter(proto_handler.get_family_tree().members))
+        graph_handler.add_member(
+            "NEWCHILD", family_tree_pb2.FamilyMember(id="NEWCHILD", name="New Child")
+        )
+        graph_handler.add_child_relation(parent_id, "NEWCHILD")
+        graph_handler.add_parent_relation("NEWCHILD", parent_id)
+
+        _, full = _timed(
+            proto_handler.update_from_nx_graph,
+            graph_handler.get_family_graph(),
+            graph_handler.get_family_unit_graph(),
+        )
+        changes = graph_handler.changes_since(checkpoint)
+        _, incremental = _timed(
+            proto_handler.update_from_graph_changes, graph_handler, changes
+        )
+        print(
+            f"members={num_members:8d} sync full={full * 1e3:9.2f}ms "
+            f"changes={incremental * 1e3:6.3f}ms ({full / incremental:7.0f}x)"
+        )
+        del proto_handler, graph_handler
+        gc.unfreeze()
+
+    _run_cycles(max(args.members), args.cycles)
+
+
+if __name__ == "__main__":
+    main()
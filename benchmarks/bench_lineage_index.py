@@ -0,0 +1,79 @@
+"""Compares lineage index lookups against graph traversals."""
+
+import argparse
+import random
+import time
+
+from familytree.handlers.graph_handler import GraphHandler
+from familytree.indexes.lineage_index import LineageIndex
+
+from benchmarks.synthetic_tree import build_synthetic_family_tree
+
+
+def _descendants_by_traversal(graph_handler: GraphHandler, member_id: str) -> set[str]:
+    """The previous approach: walk every PARENT_TO_CHILD edge below the member."""
+    seen = {member_id}
+    stack = [member_id]
+    while stack:
+        for child_id in graph_handler.get_children(stack.pop()):
+            if child_id not in seen:
+                seen.add(child_id)
+                stack.append(child_id)
+    seen.discard(member_id)
+    return seen
+
+
+def _per_call(func, args_list) -> float:
+    start = time.perf_counter()
+    for args in args_list:
+        func(*args)
+    return (time.perf_counter() - start) / len(args_list)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--members", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    graph_handler = GraphHandler()
+    graph_handler.create_from_proto(build_synthetic_family_tree(args.members))
+    member_ids = list(graph_handler.iter_member_ids())
+    rng = random.Random(0)
+    sample = rng.sample(member_ids, args.queries)
+
+    start = time.perf_counter()
+    graph_handler.count_descendants(member_ids[0])
+    build = time.perf_counter() - start
+
+    labels = graph_handler._get_index(LineageIndex)._labels.values()
+    print(
+        f"members={args.members} build={build:.2f}s "
+        f"intervals/label={sum(map(len, labels)) / len(labels):.2f}"
+    )
+    largest = sorted(member_ids, key=graph_handler.count_descendants)[-20:]
+    for name, members in (("random", sample), ("largest", largest)):
+        pairs = [(member_id, rng.choice(member_ids)) for member_id in members]
+        traversal_ancestor = _per_call(
+            lambda a, b: b in _descendants_by_traversal(graph_handler, a), pairs
+        )
+        index_ancestor = _per_call(graph_handler.is_ancestor, pairs)
+        traversal_count = _per_call(
+            lambda m: len(_descendants_by_traversal(graph_handler, m)),
+            [(m,) for m in members],
+        )
+        index_count = _per_call(
+            graph_handler.count_descendants, [(m,) for m in members]
+        )
+        print(
+            f"{name:7s} is_ancestor        traversal={traversal_ancestor * 1e6:10.1f}us "
+            f"index={index_ancestor * 1e6:6.2f}us"
+        )
+        print(
+            f"{name:7s} count_descendants  traversal={traversal_count * 1e6:10.1f}us "
+            f"index={index_count * 1e6:6.2f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
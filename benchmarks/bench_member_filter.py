@@ -0,0 +1,112 @@
+"""Measures attribute filters with the attribute index against a proto scan."""
+
+import argparse
+import gc
+import random
+import time
+from typing import Callable
+
+from familytree.handlers.graph_handler import GraphHandler
+from familytree.indexes.attribute_index import AttributeIndex, ColumnFilter, InfoFilter
+from familytree.proto import family_tree_pb2, utils_pb2
+
+from benchmarks.synthetic_tree import LAST_NAMES, build_synthetic_family_tree
+
+# name: (column filters, info filters, the same test on a FamilyMember)
+QUERIES: dict[
+    str,
+    tuple[
+        list[ColumnFilter],
+        list[InfoFilter],
+        Callable[[family_tree_pb2.FamilyMember], bool],
+    ],
+] = {
+    "living women born 1940-1960": (
+        [
+            ColumnFilter("gender", values=[utils_pb2.FEMALE]),
+            ColumnFilter("alive", values=[1]),
+            ColumnFilter("birth_year", minimum=1940, maximum=1960),
+        ],
+        [],
+        lambda member: member.gender == utils_pb2.FEMALE
+        and member.HasField("alive")
+        and member.alive
+        and 1940 <= member.date_of_birth.year <= 1960,
+    ),
+    "star ROHINI": (
+        [ColumnFilter("birth_star", values=[utils_pb2.ROHINI])],
+        [],
+        lambda member: member.traditional_date_of_birth.star == utils_pb2.ROHINI,
+    ),
+    "native_place + born in May": (
+        [ColumnFilter("birth_month", values=[5])],
+        [InfoFilter("native_place", [LAST_NAMES[0]])],
+        lambda member: member.date_of_birth.month == 5
+        and member.additional_info.get("native_place") == LAST_NAMES[0],
+    ),
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--members", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    graph_handler = GraphHandler()
+    graph_handler.create_from_proto(build_synthetic_family_tree(args.members))
+    member_ids = list(graph_handler.iter_member_ids())
+    rng = random.Random(args.seed)
+
+    start = time.perf_counter()
+    graph_handler._get_index(AttributeIndex)
+    print(f"build    members={args.members:7d} {time.perf_counter() - start:6.2f}s")
+    # Keeps full collections of the tree itself out of the timings.
+    gc.freeze()
+
+    for name, (column_filters, info_filters, matches) in QUERIES.items():
+        times = []
+        for _ in range(args.queries):
+            start = time.perf_counter()
+            count, _ = graph_handler.filter_members(
+                column_filters, info_filters, args.limit
+            )
+            times.append(time.perf_counter() - start)
+        times.sort()
+        start = time.perf_counter()
+        scanned = sum(
+            matches(graph_handler.get_member(member_id)) for member_id in member_ids
+        )
+        scan = time.perf_counter() - start
+        assert scanned == count, (name, scanned, count)
+        print(
+            f"{name:28s} members={args.members:7d} matches={count:6d} "
+            f"p50={times[len(times) // 2] * 1e3:6.2f}ms "
+            f"p99={times[len(times) * 99 // 100] * 1e3:6.2f}ms "
+            f"scan={scan * 1e3:7.1f}ms"
+        )
+
+    # Updates keep the columns current; the first one after a copy also copies.
+    start = time.perf_counter()
+    for _ in range(args.queries):
+        member = family_tree_pb2.FamilyMember(alive=False)
+        member.date_of_death.year = 2000
+        graph_handler.update_family_member(rng.choice(member_ids), member)
+    update = (time.perf_counter() - start) / args.queries
+    copy = graph_handler.copy()
+    start = time.perf_counter()
+    copy.update_family_member(
+        rng.choice(member_ids), family_tree_pb2.FamilyMember(alive=False)
+    )
+    first_update = time.perf_counter() - start
+    print(
+        f"update   members={args.members:7d} {update * 1e6:6.1f}us "
+        f"first after copy={first_update * 1e3:6.2f}ms"
+    )
+    gc.unfreeze()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Measures member name search with the name index against a full scan."""
+
+import argparse
+import gc
+import random
+import time
+
+from familytree.handlers.graph_handler import GraphHandler
+from familytree.indexes.name_index import NameIndex, tokenize_name
+from familytree.proto import family_tree_pb2
+
+from benchmarks.synthetic_tree import build_synthetic_family_tree
+
+
+def _scan(graph_handler: GraphHandler, prefix: str, limit: int) -> list[str]:
+    """Finds matches the way pickers did, by scanning every member's name."""
+    words = tokenize_name(prefix)
+    matches = []
+    for member_id in graph_handler.iter_member_ids():
+        member = graph_handler.get_member(member_id)
+        tokens = tokenize_name(" ".join([member.name, *member.nicknames]))
+        if all(any(token.startswith(word) for token in tokens) for word in words):
+            matches.append((member.name.casefold(), member_id))
+    matches.sort()
+    return [member_id for _, member_id in matches[:limit]]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--members", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    graph_handler = GraphHandler()
+    graph_handler.create_from_proto(build_synthetic_family_tree(args.members))
+    member_ids = list(graph_handler.iter_member_ids())
+    rng = random.Random(args.seed)
+
+    start = time.perf_counter()
+    graph_handler._get_index(NameIndex)
+    print(f"build    members={args.members:7d} {time.perf_counter() - start:6.2f}s")
+    # Keeps full collections of the tree itself out of the timings.
+    gc.freeze()
+
+    names = [graph_handler.get_member(member_id).name for member_id in member_ids]
+    for length, surname in ((1, False), (3, False), (1, True), (3, True)):
+        prefixes = []
+        for _ in range(args.queries):
+            first, *rest = rng.choice(names).split()
+            prefix = first[:length]
+            if surname and rest:
+                prefix += f" {rest[-1][:2]}"
+            prefixes.append(prefix)
+        times = []
+        for prefix in prefixes:
+            start = time.perf_counter()
+            graph_handler.search_members(prefix, args.limit)
+            times.append(time.perf_counter() - start)
+        times.sort()
+        start = time.perf_counter()
+        for prefix in prefixes[:10]:
+            _scan(graph_handler, prefix, args.limit)
+        scan = (time.perf_counter() - start) / 10
+        print(
+            f"prefix={length}{' +surname' if surname else '         '} "
+            f"members={args.members:7d} "
+            f"p50={times[len(times) // 2] * 1e6:6.1f}us "
+            f"p99={times[len(times) * 99 // 100] * 1e6:6.1f}us "
+            f"scan={scan * 1e3:6.1f}ms"
+        )
+
+    # Renames keep the index current; the first one after a copy also copies it.
+    start = time.perf_counter()
+    for number in range(args.queries):
+        renamed = family_tree_pb2.FamilyMember(name=f"Renamed {number}")
+        graph_handler.update_family_member(rng.choice(member_ids), renamed)
+    rename = (time.perf_counter() - start) / args.queries
+    copy = graph_handler.copy()
+    start = time.perf_counter()
+    copy.update_family_member(
+        rng.choice(member_ids), family_tree_pb2.FamilyMember(name="Renamed")
+    )
+    first_rename = time.perf_counter() - start
+    print(
+        f"rename   members={args.members:7d} {rename * 1e6:6.1f}us "
+        f"first after copy={first_rename * 1e3:6.2f}ms"
+    )
+    gc.unfreeze()
+
+
+if __name__ == "__main__":
+    main()
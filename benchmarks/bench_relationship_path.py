@@ -0,0 +1,93 @@
+"""Compares the bidirectional relationship search with a one-sided search."""
+
+import argparse
+import random
+import time
+
+from familytree.handlers.family_tree_handler import FamilyTreeHandler
+from familytree.handlers.graph_handler import GraphHandler
+from familytree.indexes.lineage_index import LineageIndex
+
+from benchmarks.synthetic_tree import build_synthetic_family_tree
+
+
+def _path_length_by_one_sided_search(
+    graph_handler: GraphHandler, source_id: str, target_id: str
+) -> int | None:
+    """A plain breadth-first search from the source over the same links."""
+    if source_id == target_id:
+        return 0
+    lineage = graph_handler._get_index(LineageIndex)
+    depths = {source_id: 0}
+    frontier = [source_id]
+    while frontier:
+        next_frontier = []
+        for member_id in frontier:
+            for _, neighbor_id in graph_handler._iter_kinship_links(member_id, lineage):
+                if neighbor_id not in depths:
+                    depths[neighbor_id] = depths[member_id] + 1
+                    if neighbor_id == target_id:
+                        return depths[neighbor_id]
+                    next_frontier.append(neighbor_id)
+        frontier = next_frontier
+    return None
+
+
+def _per_call(func, args_list) -> float:
+    start = time.perf_counter()
+    for args in args_list:
+        func(*args)
+    return (time.perf_counter() - start) / len(args_list)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--members", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=100)
+    args = parser.parse_args()
+
+    family_tree_handler = FamilyTreeHandler()
+    graph_handler = family_tree_handler.graph_handler
+    graph_handler.create_from_proto(build_synthetic_family_tree(args.members))
+    member_ids = list(graph_handler.iter_member_ids())
+    rng = random.Random(0)
+
+    start = time.perf_counter()
+    graph_handler.find_relationship_path(member_ids[0], member_ids[1])
+    print(f"members={args.members} first query={time.perf_counter() - start:.2f}s")
+
+    distant = [tuple(rng.sample(member_ids, 2)) for _ in range(args.queries)]
+    # Second cousins and the like: up to three generations up and down.
+    close = []
+    while len(close) < args.queries:
+        start_id = member_id = rng.choice(member_ids)
+        for step in ("parent", "parent", "parent", "child", "child", "child"):
+            links = (
+                graph_handler.get_parents(member_id)
+                if step == "parent"
+                else graph_handler.get_children(member_id)
+            )
+            if links:
+                member_id = rng.choice(links)
+        if len(graph_handler.find_relationship_path(start_id, member_id)) >= 4:
+            close.append((start_id, member_id))
+
+    for name, pairs in (("distant", distant), ("close", close)):
+        lengths = [
+            len(graph_handler.find_relationship_path(*pair) or []) for pair in pairs
+        ]
+        one_sided = _per_call(
+            lambda a, b: _path_length_by_one_sided_search(graph_handler, a, b), pairs
+        )
+        bidirectional = _per_call(graph_handler.find_relationship_path, pairs)
+        labelled = _per_call(family_tree_handler.get_relationship, pairs)
+        print(
+            f"{name:8s} mean length={sum(lengths) / len(lengths):5.1f} "
+            f"one-sided={one_sided * 1e3:8.2f}ms "
+            f"bidirectional={bidirectional * 1e3:6.2f}ms "
+            f"with label={labelled * 1e3:6.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
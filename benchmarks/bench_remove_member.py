@@ -0,0 +1,68 @@
+"""Times deleting a whole branch with and without the member-to-unit index."""
+
+import argparse
+import time
+from collections import deque
+
+from familytree.handlers.graph_handler import GraphHandler
+
+from benchmarks.synthetic_tree import build_synthetic_family_tree
+
+
+def _remove_by_scanning_every_unit(graph_handler: GraphHandler, member_id: str):
+    """The previous implementation: scan every family unit for the member."""
+    family_unit_map = graph_handler.get_family_unit_graph()
+    units_to_delete = []
+    for unit_id, unit in family_unit_map.items():
+        while member_id in unit.parent_ids:
+            unit.parent_ids.remove(member_id)
+        while member_id in unit.child_ids:
+            unit.child_ids.remove(member_id)
+        if not unit.parent_ids and not unit.child_ids:
+            units_to_delete.append(unit_id)
+    for unit_id in units_to_delete:
+        del family_unit_map[unit_id]
+
+
+def _branch(graph_handler: GraphHandler, root_id: str, size: int) -> list[str]:
+    """Returns up to `size` descendants of a member in breadth-first order."""
+    branch: list[str] = []
+    queue = deque([root_id])
+    while queue and len(branch) < size:
+        member_id = queue.popleft()
+        branch.append(member_id)
+        queue.extend(graph_handler.get_children(member_id))
+    return branch
+
+
+def _time_branch_delete(num_members: int, branch_size: int, legacy: bool) -> float:
+    graph_handler = GraphHandler()
+    graph_handler.create_from_proto(build_synthetic_family_tree(num_members))
+    if legacy:
+        graph_handler._remove_member_from_family_units = (  # type: ignore[method-assign]
+            lambda member_id: _remove_by_scanning_every_unit(graph_handler, member_id)
+        )
+    branch = _branch(graph_handler, "M0000000", branch_size)
+    start = time.perf_counter()
+    for member_id in branch:
+        graph_handler.remove_member(member_id, remove_orphaned_neighbors=True)
+    return (time.perf_counter() - start) / len(branch)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--members", type=int, default=100_000)
+    parser.add_argument("--branch", type=int, default=200)
+    args = parser.parse_args()
+
+    scan = _time_branch_delete(args.members, args.branch, legacy=True)
+    index = _time_branch_delete(args.members, args.branch, legacy=False)
+    print(
+        f"members={args.members} branch={args.branch} "
+        f"scan={scan * 1e3:8.3f}ms/member index={index * 1e3:8.3f}ms/member "
+        f"speedup={scan / index:7.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
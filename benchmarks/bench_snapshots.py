@@ -0,0 +1,86 @@
+"""Measures the cost of serving reads from copy-on-write graph snapshots."""
+
+import argparse
+import gc
+import random
+import threading
+import time
+
+from familytree.handlers.family_tree_handler import FamilyTreeHandler
+from familytree.models.manage_model import UpdateFamilyMemberRequest
+
+from benchmarks.synthetic_tree import build_synthetic_family_tree
+
+
+def _update(handler: FamilyTreeHandler, member_id: str, number: int) -> None:
+    handler.update_family_member(
+        UpdateFamilyMemberRequest(
+            member_id=member_id, updated_member_data={"name": f"Renamed {number}"}
+        )
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--members", type=int, default=100_000)
+    parser.add_argument("--writes", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    family_tree = build_synthetic_family_tree(args.members)
+    for compact_graph in (False, True):
+        handler = FamilyTreeHandler(compact_graph=compact_graph)
+        handler.graph_handler.create_from_proto(family_tree)
+        member_ids = list(handler.graph_handler.iter_member_ids())
+        rng = random.Random(args.seed)
+        writes = [rng.choice(member_ids) for _ in range(args.writes)]
+        # Builds the lineage index, which is copied with each snapshot.
+        handler.graph_handler.count_descendants(member_ids[0])
+        # Keeps full collections of the tree itself out of the timings.
+        gc.freeze()
+
+        # Every write follows a read, so every write copies the graph.
+        copying = 0.0
+        for number, member_id in enumerate(writes):
+            handler.snapshot_graph()
+            start = time.perf_counter()
+            _update(handler, member_id, number)
+            copying += time.perf_counter() - start
+        # Without reads in between, writes go to the same copy.
+        start = time.perf_counter()
+        for number, member_id in enumerate(writes):
+            _update(handler, member_id, number)
+        in_place = time.perf_counter() - start
+
+        # A reader thread runs while the writer copies and writes.
+        read_times: list[float] = []
+        stop = threading.Event()
+
+        def read() -> None:
+            while not stop.is_set():
+                start = time.perf_counter()
+                handler.get_member_info(rng.choice(member_ids))
+                read_times.append(time.perf_counter() - start)
+
+        reader = threading.Thread(target=read)
+        reader.start()
+        for number, member_id in enumerate(writes):
+            handler.snapshot_graph()
+            _update(handler, member_id, number)
+        stop.set()
+        reader.join()
+        gc.unfreeze()
+
+        read_times.sort()
+        name = "compact" if compact_graph else "digraph"
+        print(
+            f"{name:8s} members={args.members:7d} "
+            f"write+copy={copying / args.writes * 1e3:6.2f}ms "
+            f"write={in_place / args.writes * 1e6:6.1f}us "
+            f"read p50={read_times[len(read_times) // 2] * 1e6:6.1f}us "
+            f"p99={read_times[len(read_times) * 99 // 100] * 1e6:6.1f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
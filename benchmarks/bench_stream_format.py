@@ -0,0 +1,99 @@
+"""Compares loading a graph from a .binpb file and from a .pbstream file."""
+
+import argparse
+import gc
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from familytree.handlers.compact_graph_handler import CompactGraphHandler
+from familytree.handlers.graph_handler import GraphHandler
+from familytree.handlers.proto_handler import ProtoHandler
+from familytree.utils.tree_stream import read_tree_stream
+
+from benchmarks.synthetic_tree import build_synthetic_family_tree
+
+_HANDLERS = {"graph": GraphHandler, "compact": CompactGraphHandler}
+
+
+def _current_rss_mb() -> float:
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+
+
+def _load(file_format: str, handler_name: str, path: str) -> None:
+    """Loads one file in this process and prints the times and peak memory."""
+    graph_handler = _HANDLERS[handler_name]()
+    gc.collect()
+    baseline_mb = _current_rss_mb()
+    start = time.perf_counter()
+    first_member = None
+    if file_format == "binpb":
+        with open(path, "rb") as f:
+            proto_handler = ProtoHandler()
+            proto_handler.load_from_binary(f.read())
+        first_member = time.perf_counter() - start
+        # The loaded protobuf is kept, as FamilyTreeHandler keeps it.
+        graph_handler.create_from_proto(proto_handler.get_family_tree())
+    else:
+
+        def timed_records(records):
+            nonlocal first_member
+            for record in records:
+                if first_member is None:
+                    first_member = time.perf_counter() - start
+                yield record
+
+        with open(path, "rb") as f:
+            graph_handler.create_from_records(timed_records(read_tree_stream(f)))
+    total = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3 - baseline_mb
+    print(f"{first_member} {total} {peak_mb}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--members", type=int, nargs="+", default=[100_000])
+    parser.add_argument("--load", nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.load:
+        _load(*args.load)
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        for num_members in args.members:
+            proto_handler = ProtoHandler()
+            proto_handler._family_tree = build_synthetic_family_tree(num_members)
+            paths = {
+                "binpb": os.path.join(directory, "tree.binpb"),
+                "pbstream": os.path.join(directory, "tree.pbstream"),
+            }
+            with open(paths["binpb"], "wb") as f:
+                f.write(proto_handler.save_to_binary())
+            with open(paths["pbstream"], "wb") as f:
+                proto_handler.save_to_stream(f)
+            del proto_handler
+
+            # Each load runs in a fresh process so its peak memory is its own.
+            for handler_name in _HANDLERS:
+                for file_format, path in paths.items():
+                    output = subprocess.run(
+                        [sys.executable, "-m", __spec__.name, "--load"]
+                        + [file_format, handler_name, path],
+                        check=True,
+                        capture_output=True,
+                        text=True,
+                    ).stdout.split()[-3:]
+                    first_member, total, peak_mb = map(float, output)
+                    print(
+                        f"members={num_members:8d} {handler_name:8s} "
+                        f"{file_format:9s} first member={first_member:6.2f}s "
+                        f"load={total:6.2f}s peak={peak_mb:7.0f}MB"
+                    )
+
+
+if __name__ == "__main__":
+    main()
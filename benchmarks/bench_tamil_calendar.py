@@ -0,0 +1,80 @@
+"""Measures the Tamil calendar tables and filling the traditional dates of a
+tree."""
+
+import argparse
+import datetime
+import gc
+import random
+import time
+
+import numpy as np
+
+from familytree.handlers.family_tree_handler import FamilyTreeHandler
+from familytree.handlers.graph_handler import GraphHandler
+from familytree.utils.tamil_calendar import TamilCalendar
+
+from benchmarks.synthetic_tree import build_synthetic_family_tree
+
+
+def _clear_traditional_dates(graph_handler: GraphHandler) -> None:
+    """Clears the traditional dates the synthetic tree sets, so that every
+    member is filled."""
+    for member_id in graph_handler.iter_member_ids():
+        member = graph_handler._get_attributes_for_update(member_id)
+        member.ClearField("traditional_date_of_birth")
+        member.ClearField("traditional_date_of_death")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--members", type=int, default=100_000)
+    parser.add_argument("--dates", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    start = time.perf_counter()
+    tamil_calendar = TamilCalendar(1800, 2100)
+    print(f"tables   years=301      {time.perf_counter() - start:6.2f}s")
+
+    first_day = datetime.date(1900, 1, 1).toordinal()
+    dates = [
+        datetime.date.fromordinal(first_day + rng.randrange(200 * 365))
+        for _ in range(args.dates)
+    ]
+    start = time.perf_counter()
+    tamil_calendar.convert(dates)
+    print(f"convert  dates={args.dates:8d} {time.perf_counter() - start:6.2f}s")
+    days = np.array(dates, dtype="datetime64[D]")
+    start = time.perf_counter()
+    tamil_calendar.convert(days)
+    print(f"convert  datetime64[D]  {time.perf_counter() - start:6.2f}s")
+
+    handler = FamilyTreeHandler()
+    graph_handler = GraphHandler()
+    graph_handler.create_from_proto(build_synthetic_family_tree(args.members))
+    _clear_traditional_dates(graph_handler)
+    handler.graph_handler = graph_handler
+    # Keeps full collections of the tree itself out of the timings.
+    gc.freeze()
+
+    start = time.perf_counter()
+    filled = graph_handler.copy().fill_traditional_dates()
+    print(
+        f"fill     members={args.members:7d} filled={filled:7d} "
+        f"{time.perf_counter() - start:6.2f}s"
+    )
+    # Through the handler the fill also copies the published graph and
+    # records every change for undo.
+    handler.snapshot_graph()
+    start = time.perf_counter()
+    handler.fill_traditional_dates()
+    print(
+        f"undoable members={args.members:7d} "
+        f"{time.perf_counter() - start:6.2f}s"
+    )
+    gc.unfreeze()
+
+
+if __name__ == "__main__":
+    main()
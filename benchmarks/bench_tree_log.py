@@ -0,0 +1,93 @@
+"""
+Compares making one edit durable by appending it to a tree log and by writing
+the whole tree, and times replaying the log at startup.
+"""
+
+import argparse
+import gc
+import os
+import tempfile
+import time
+
+from familytree.handlers.graph_handler import GraphHandler
+from familytree.handlers.proto_handler import ProtoHandler
+from familytree.proto import family_tree_pb2
+from familytree.utils.tree_log import TreeLog
+
+from benchmarks.synthetic_tree import build_synthetic_family_tree
+
+
+def _timed(function, *args):
+    """Returns the result of a call and the seconds it took."""
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--members", type=int, nargs="+", default=[10, 100_000])
+    parser.add_argument("--edits", type=int, default=100)
+    parser.add_argument("--no-sync", action="store_true")
+    args = parser.parse_args()
+
+    for num_members in args.members:
+        with tempfile.TemporaryDirectory() as directory:
+            proto_handler = ProtoHandler()
+            proto_handler._family_tree = build_synthetic_family_tree(num_members)
+            graph_handler = GraphHandler()
+            graph_handler.create_from_proto(proto_handler.get_family_tree())
+            tree_log = TreeLog(directory, sync=not args.no_sync)
+            tree_log.compact(proto_handler.save_to_binary())
+            checkpoint = graph_handler.checkpoint_changes()
+            parent_id = next(iter(proto_handler.get_family_tree().members))
+            gc.freeze()
+
+            # Each edit adds a child, then is logged as FamilyTreeHandler does.
+            append_seconds = 0.0
+            log_bytes = 0
+            for edit_number in range(args.edits):
+                child_id = f"LOGGED{edit_number}"
+                graph_handler.add_member(
+                    child_id, family_tree_pb2.FamilyMember(id=child_id, name="Child")
+                )
+                graph_handler.add_child_relation(parent_id, child_id)
+                graph_handler.add_parent_relation(child_id, parent_id)
+                start = time.perf_counter()
+                changes = graph_handler.changes_since(checkpoint)
+                checkpoint = graph_handler.checkpoint_changes()
+                edit = graph_handler.get_tree_edit(changes)
+                log_bytes += tree_log.append(edit)
+                append_seconds += time.perf_counter() - start
+                proto_handler.apply_tree_edit(edit)
+            append = append_seconds / args.edits
+
+            # The alternative: serialize and write the whole tree per edit.
+            start = time.perf_counter()
+            snapshot = proto_handler.save_to_binary()
+            tree_log._write_file(os.path.join(directory, "full.binpb"), snapshot)
+            full = time.perf_counter() - start
+            tree_log.close()
+
+            def replay():
+                replayed = ProtoHandler()
+                snapshot, edits = TreeLog(directory).read()
+                replayed.load_from_binary(snapshot)
+                for edit in edits:
+                    replayed.apply_tree_edit(edit)
+                return replayed
+
+            replayed, replay_seconds = _timed(replay)
+            assert replayed.get_family_tree() == proto_handler.get_family_tree()
+            print(
+                f"members={num_members:8d} append={append * 1e3:7.3f}ms "
+                f"({log_bytes // args.edits:4d} B) full write={full * 1e3:8.2f}ms "
+                f"({len(snapshot) / 1e6:6.2f} MB) replay {args.edits} edits="
+                f"{replay_seconds * 1e3:8.2f}ms"
+            )
+            del proto_handler, graph_handler, replayed
+            gc.unfreeze()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Compares typed adjacency lookups against scanning every neighbor."""
+
+import argparse
+import time
+
+from familytree.handlers.graph_handler import GraphHandler
+from familytree.utils.graph_types import EdgeType
+
+from benchmarks.synthetic_tree import build_synthetic_family_tree
+
+
+def _scan_neighbors(graph, member_id: str, edge_type: EdgeType) -> list[str]:
+    """The previous implementation: walk every neighbor and check its edge type."""
+    return [
+        neighbor
+        for neighbor in graph.neighbors(member_id)
+        if graph.get_edge_data(member_id, neighbor)["data"].edge_type == edge_type
+    ]
+
+
+def _time_per_call(func, member_ids: list[str], repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for member_id in member_ids:
+            func(member_id)
+    return (time.perf_counter() - start) / (repeats * len(member_ids))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--members", type=int, default=100_000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    graph_handler = GraphHandler()
+    graph_handler.create_from_proto(build_synthetic_family_tree(args.members))
+    graph = graph_handler.get_family_graph()
+    member_ids = list(graph.nodes)
+    print(f"members={graph.number_of_nodes()} edges={graph.number_of_edges()}")
+
+    cases = [
+        ("get_children", EdgeType.PARENT_TO_CHILD, graph_handler.get_children),
+        ("get_parents", EdgeType.CHILD_TO_PARENT, graph_handler.get_parents),
+        ("get_spouses", EdgeType.SPOUSE, graph_handler.get_spouses),
+    ]
+    for name, edge_type, indexed in cases:
+        scan = _time_per_call(
+            lambda m: _scan_neighbors(graph, m, edge_type), member_ids, args.repeats
+        )
+        index = _time_per_call(indexed, member_ids, args.repeats)
+        print(
+            f"{name:<14} scan={scan * 1e6:7.2f}us index={index * 1e6:7.2f}us "
+            f"speedup={scan / index:5.1f}x"
+        )
+
+    hubs = sorted(member_ids, key=graph.degree, reverse=True)[:100]
+    scan = _time_per_call(
+        lambda m: _scan_neighbors(graph, m, EdgeType.SPOUSE), hubs, args.repeats * 10
+    )
+    index = _time_per_call(graph_handler.get_spouses, hubs, args.repeats * 10)
+    print(
+        f"{'hub spouses':<14} scan={scan * 1e6:7.2f}us index={index * 1e6:7.2f}us "
+        f"speedup={scan / index:5.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
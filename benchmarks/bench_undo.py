@@ -0,0 +1,65 @@
+"""Measures undo and redo of manage operations against reloading the tree."""
+
+import argparse
+import random
+import time
+
+from familytree.handlers.family_tree_handler import FamilyTreeHandler
+from familytree.models.manage_model import (
+    DeleteFamilyMemberRequest,
+    UpdateFamilyMemberRequest,
+)
+
+from benchmarks.synthetic_tree import build_synthetic_family_tree
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--members", type=int, default=100_000)
+    parser.add_argument("--operations", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    family_tree = build_synthetic_family_tree(args.members)
+    handler = FamilyTreeHandler()
+    start = time.perf_counter()
+    handler.graph_handler.create_from_proto(family_tree)
+    reload = time.perf_counter() - start
+    member_ids = list(handler.graph_handler.iter_member_ids())
+    rng = random.Random(args.seed)
+
+    def update(member_id: str, number: int) -> None:
+        handler.update_family_member(
+            UpdateFamilyMemberRequest(
+                member_id=member_id, updated_member_data={"name": f"Renamed {number}"}
+            )
+        )
+
+    def delete(member_id: str, number: int) -> None:
+        handler.delete_family_member(DeleteFamilyMemberRequest(member_id=member_id))
+
+    for name, operation in (("update", update), ("delete", delete)):
+        apply = undo = redo = 0.0
+        for number in range(args.operations):
+            member_id = rng.choice(member_ids)
+            start = time.perf_counter()
+            operation(member_id, number)
+            apply += time.perf_counter() - start
+            start = time.perf_counter()
+            handler.undo()
+            undo += time.perf_counter() - start
+            start = time.perf_counter()
+            handler.redo()
+            redo += time.perf_counter() - start
+            handler.undo()
+        print(
+            f"{name:7s} members={args.members:7d} "
+            f"apply={apply / args.operations * 1e6:7.1f}us "
+            f"undo={undo / args.operations * 1e6:7.1f}us "
+            f"redo={redo / args.operations * 1e6:7.1f}us "
+            f"reload={reload:5.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
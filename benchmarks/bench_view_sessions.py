@@ -0,0 +1,72 @@
+"""Measures the cost of many concurrent interactive view sessions."""
+
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+
+from familytree.handlers.graph_handler import GraphHandler
+from familytree.indexes.visibility_index import RelativeGroup
+
+from benchmarks.synthetic_tree import build_synthetic_family_tree
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--members", type=int, default=100_000)
+    parser.add_argument("--sessions", type=int, default=5_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    graph_handler = GraphHandler()
+    graph_handler.create_from_proto(build_synthetic_family_tree(args.members))
+    member_ids = list(graph_handler.iter_member_ids())
+    rng = random.Random(args.seed)
+    # Keeps full collections of the tree itself out of the timings.
+    gc.freeze()
+    # Builds the index and its default session outside the measurements.
+    graph_handler.expand_relatives(member_ids[0], RelativeGroup.PARENTS)
+
+    session_ids = [f"session-{number}" for number in range(args.sessions)]
+    views = [(session_id, rng.choice(member_ids)) for session_id in session_ids]
+    groups = (RelativeGroup.PARENTS, RelativeGroup.SIBLINGS, RelativeGroup.CHILDREN)
+
+    # Timed first, then repeated under tracemalloc, which slows allocations.
+    start = time.perf_counter()
+    for session_id in session_ids:
+        graph_handler.create_view_session(session_id)
+    create = (time.perf_counter() - start) / args.sessions
+    start = time.perf_counter()
+    for session_id, member_id in views:
+        graph_handler.show_member(member_id, session_id)
+        for group in groups:
+            graph_handler.expand_relatives(member_id, group, session_id)
+    expand = (time.perf_counter() - start) / (args.sessions * len(groups))
+    for session_id in session_ids:
+        graph_handler.close_view_session(session_id)
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    for session_id in session_ids:
+        graph_handler.create_view_session(session_id)
+    empty = (tracemalloc.get_traced_memory()[0] - baseline) / args.sessions
+    for session_id, member_id in views:
+        graph_handler.show_member(member_id, session_id)
+        for group in groups:
+            graph_handler.expand_relatives(member_id, group, session_id)
+    used = (tracemalloc.get_traced_memory()[0] - baseline) / args.sessions
+    tracemalloc.stop()
+
+    print(
+        f"create     sessions={args.sessions:6d} time={create * 1e6:6.2f}us "
+        f"memory={empty:6.0f}B/session"
+    )
+    print(
+        f"expand     sessions={args.sessions:6d} time={expand * 1e6:6.2f}us "
+        f"memory={used:6.0f}B/session"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+import itertools
+import random
+from collections import deque
+
+from familytree.proto import family_tree_pb2, utils_pb2
+
+FIRST_NAMES = [
+    "Arjun",
+    "Meena",
+    "Karthik",
+    "Lakshmi",
+    "Ravi",
+    "Priya",
+    "Suresh",
+    "Anitha",
+    "Vijay",
+    "Deepa",
+    "Ganesh",
+    "Kavya",
+    "Harish",
+    "Revathi",
+    "Mohan",
+    "Sundari",
+]
+LAST_NAMES = [
+    "Iyer",
+    "Rajan",
+    "Subramanian",
+    "Krishnan",
+    "Natarajan",
+    "Venkatesh",
+    "Raman",
+    "Sekar",
+]
+START_YEAR = 1500
+
+
+def build_synthetic_family_tree(
+    num_members: int, seed: int = 0
+) -> family_tree_pb2.FamilyTree:
+    """
+    Builds a deterministic synthetic FamilyTree with roughly `num_members` members.
+
+    Couples are expanded breadth-first: every couple gets a few children (and
+    occasionally a very large household), and most children marry someone from
+    outside the tree, forming the next couple. Relationships are written in both
+    directions and every couple gets a FamilyUnit, matching what the app saves.
+
+    Args:
+        num_members: The number of members to generate.
+        seed: Seed for the random generator so runs are reproducible.
+
+    Returns:
+        A populated FamilyTree protobuf message.
+    """
+    rng = random.Random(seed)
+    family_tree = family_tree_pb2.FamilyTree()
+    counter = itertools.count()
+    couples: deque[tuple[str, str, str, int]] = deque()
+
+    def new_member(gender: int, birth_year: int) -> str:
+        member_id = f"M{next(counter):07d}"
+        member = family_tree.members[member_id]
+        member.id = member_id
+        member.name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        member.gender = gender
+        member.date_of_birth.year = birth_year
+        member.date_of_birth.month = rng.randint(1, 12)
+        member.date_of_birth.date = rng.randint(1, 28)
+        member.traditional_date_of_birth.month = rng.randint(1, 12)
+        member.traditional_date_of_birth.star = rng.randint(1, 27)
+        member.alive = birth_year > 1930
+        if rng.random() < 0.2:
+            member.nicknames.append(rng.choice(FIRST_NAMES)[:4])
+        if rng.random() < 0.1:
+            member.additional_info["native_place"] = rng.choice(LAST_NAMES)
+        return member_id
+
+    def new_couple(partner_id: str, birth_year: int) -> None:
+        partner = family_tree.members[partner_id]
+        spouse_gender = (
+            utils_pb2.FEMALE if partner.gender == utils_pb2.MALE else utils_pb2.MALE
+        )
+        spouse_id = new_member(spouse_gender, birth_year + rng.randint(-3, 3))
+        unit_id = f"U{next(counter):07d}"
+        unit = family_tree.family_units[unit_id]
+        unit.id = unit_id
+        unit.parent_ids.extend([partner_id, spouse_id])
+        unit.name = f"{partner.name}'s and {family_tree.members[spouse_id].name}'s family"
+        partner.acquired_family_unit_id = unit_id
+        family_tree.members[spouse_id].acquired_family_unit_id = unit_id
+        family_tree.relationships[partner_id].spouse_ids.append(spouse_id)
+        family_tree.relationships[spouse_id].spouse_ids.append(partner_id)
+        couples.append((partner_id, spouse_id, unit_id, birth_year))
+
+    while len(family_tree.members) < num_members:
+        if not couples:
+            founder_id = new_member(utils_pb2.MALE, START_YEAR)
+            new_couple(founder_id, START_YEAR)
+        parent_1, parent_2, unit_id, parent_year = couples.popleft()
+        num_children = 25 if rng.random() < 0.01 else rng.randint(0, 5)
+        for _ in range(num_children):
+            if len(family_tree.members) >= num_members:
+                break
+            child_year = parent_year + rng.randint(20, 35)
+            child_id = new_member(rng.choice([utils_pb2.MALE, utils_pb2.FEMALE]), child_year)
+            family_tree.members[child_id].birth_family_unit_id = unit_id
+            family_tree.family_units[unit_id].child_ids.append(child_id)
+            for parent_id in (parent_1, parent_2):
+                family_tree.relationships[parent_id].children_ids.append(child_id)
+                family_tree.relationships[child_id].parent_ids.append(parent_id)
+            if rng.random() < 0.7 and len(family_tree.members) < num_members:
+                new_couple(child_id, child_year)
+
+    return family_tree
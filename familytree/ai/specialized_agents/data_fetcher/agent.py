@@ -1,9 +1,20 @@
 from google.adk.agents import LlmAgent
 
+from familytree.ai.specialized_agents.date_translator import (
+    family_tree_date_translator,
+)
+from familytree.ai.specialized_agents.event_finder import family_tree_event_finder
+from familytree.ai.specialized_agents.path_finder import family_tree_path_finder
+
 _name = "family_tree_oracle"
 _model = "gemini-2.0-flash"
 
 # The Family tree Expert
 family_tree_oracle = LlmAgent(
     name=_name,
+    sub_agents=[
+        family_tree_path_finder,
+        family_tree_event_finder,
+        family_tree_date_translator,
+    ],
 )
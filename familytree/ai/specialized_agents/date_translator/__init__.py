@@ -0,0 +1 @@
+from .agent import family_tree_date_translator  # noqa: F401
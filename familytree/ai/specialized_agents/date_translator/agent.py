@@ -0,0 +1,17 @@
+from google.adk.agents import LlmAgent
+
+from .prompt import PROMPT
+from .tools import gregorian_to_tamil, tamil_to_gregorian
+
+_name = "family_tree_date_translator"
+_model = "gemini-2.0-flash"
+_description = "Converts dates between the Gregorian and Tamil calendars"
+
+# The Date translator
+family_tree_date_translator = LlmAgent(
+    name=_name,
+    model=_model,
+    description=_description,
+    instruction=PROMPT,
+    tools=[gregorian_to_tamil, tamil_to_gregorian],
+)
@@ -0,0 +1,75 @@
+import datetime
+import logging
+
+import familytree.proto.utils_pb2 as utils_pb2
+from familytree.exceptions import FamilyTreeBaseError
+from familytree.utils.tamil_calendar import get_tamil_calendar
+
+logger = logging.getLogger(__name__)
+
+
+def gregorian_to_tamil(date: str) -> dict:
+    """
+    Converts a Gregorian date to the Tamil calendar.
+
+    Args:
+        date: The date as YYYY-MM-DD, between 1800 and 2100.
+
+    Returns:
+        A dict with a "status" key. On success, it holds the Tamil month,
+        the star (nakshatra), the paksham and the thithi of the day.
+    """
+    try:
+        traditional_date = get_tamil_calendar().traditional_date(
+            datetime.date.fromisoformat(date)
+        )
+    except ValueError as e:
+        return {"status": "ERROR", "message": f"Invalid date: {e}"}
+    except FamilyTreeBaseError as e:
+        logger.error(f"Date conversion failed: {e.detail}")
+        return {"status": "ERROR", "message": e.detail}
+    return {
+        "status": "OK",
+        "tamil_month": utils_pb2.TamilMonth.Name(traditional_date.month),
+        "star": utils_pb2.TamilStar.Name(traditional_date.star),
+        "paksham": utils_pb2.Paksham.Name(traditional_date.paksham),
+        "thithi": utils_pb2.Thithi.Name(traditional_date.thithi),
+    }
+
+
+def tamil_to_gregorian(
+    year: int, tamil_month: str, star: str, paksham: str, thithi: str
+) -> dict:
+    """
+    Finds the Gregorian dates in a year that have the given Tamil date, e.g.
+    the day of a birth star in a Tamil month, or the thithi of a death
+    anniversary.
+
+    Args:
+        year: The Gregorian year, between 1800 and 2100.
+        tamil_month: The Tamil month in capitals, e.g. "CHITHIRAI", or "".
+        star: The star in capitals, e.g. "ROHINI", or "".
+        paksham: "SHUKLA" or "KRISHNA", or "".
+        thithi: The thithi in capitals, e.g. "PRATHAMAI", or "".
+
+    Returns:
+        A dict with a "status" key. On success, "dates" lists the matching
+        days of the year as YYYY-MM-DD.
+    """
+    values = {}
+    for field, enum, name in (
+        ("tamil_month", utils_pb2.TamilMonth, tamil_month),
+        ("star", utils_pb2.TamilStar, star),
+        ("paksham", utils_pb2.Paksham, paksham),
+        ("thithi", utils_pb2.Thithi, thithi),
+    ):
+        try:
+            values[field] = enum.Value(name) if name else None
+        except ValueError:
+            return {"status": "ERROR", "message": f"Unknown {field} '{name}'."}
+    try:
+        dates = get_tamil_calendar().find_dates(year, **values)
+    except FamilyTreeBaseError as e:
+        logger.error(f"Date conversion failed: {e.detail}")
+        return {"status": "ERROR", "message": e.detail}
+    return {"status": "OK", "dates": [date.isoformat() for date in dates]}
@@ -0,0 +1 @@
+from .agent import family_tree_event_finder  # noqa: F401
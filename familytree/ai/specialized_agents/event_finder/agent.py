@@ -0,0 +1,17 @@
+from google.adk.agents import LlmAgent
+
+from .prompt import PROMPT
+from .tools import find_events, find_star_days
+
+_name = "family_tree_event_finder"
+_model = "gemini-2.0-flash"
+_description = "Finds birthdays, wedding anniversaries and star days of members"
+
+# The Event finder
+family_tree_event_finder = LlmAgent(
+    name=_name,
+    model=_model,
+    description=_description,
+    instruction=PROMPT,
+    tools=[find_events, find_star_days],
+)
@@ -0,0 +1,70 @@
+import datetime
+import logging
+
+from familytree.exceptions import FamilyTreeBaseError
+
+logger = logging.getLogger(__name__)
+
+
+def find_events(start_date: str, end_date: str, limit: int, kinds: list[str]) -> dict:
+    """
+    Finds the birthdays and wedding anniversaries of family members on the
+    calendar, in date order.
+
+    Use this tool for questions like "whose birthday is this month?" or "what
+    are the next five anniversaries?".
+
+    Args:
+        start_date: The first day to look at, as YYYY-MM-DD, or "" for today.
+        end_date: The last day to look at, as YYYY-MM-DD, less than a year
+            after the start, or "" for the whole year from the start.
+        limit: The largest number of events to return, or 0 for no limit.
+        kinds: "birthday" and/or "wedding_anniversary", or [] for both.
+
+    Returns:
+        A dict with a "status" key. On success, "events" lists each event's
+        kind, member ID and name, its date, and the year of the birth or
+        wedding if known.
+    """
+    # Imported here because the app state imports the handlers, which import
+    # the agents.
+    from familytree import app_state
+
+    family_tree_handler = app_state.get_current_family_tree_handler()
+    try:
+        start = datetime.date.fromisoformat(start_date) if start_date else None
+        end = datetime.date.fromisoformat(end_date) if end_date else None
+    except ValueError as e:
+        return {"status": "ERROR", "message": f"Invalid date: {e}"}
+    try:
+        response = family_tree_handler.find_events(start, end, limit or None, kinds)
+    except FamilyTreeBaseError as e:
+        logger.error(f"Event lookup failed: {e.detail}")
+        return {"status": "ERROR", "message": e.detail}
+    return response.model_dump(mode="json", exclude_none=True)
+
+
+def find_star_days(tamil_month: str, star: str) -> dict:
+    """
+    Finds the family members whose birth star day falls in a Tamil month.
+
+    A member's star day is the day of their birth star (nakshatra) in their
+    Tamil birth month.
+
+    Args:
+        tamil_month: The Tamil month in capitals, e.g. "CHITHIRAI" or "AADI".
+        star: The star in capitals, e.g. "ROHINI", or "" for every star.
+
+    Returns:
+        A dict with a "status" key. On success, "star_days" lists each
+        member's ID, name, Tamil month and star.
+    """
+    from familytree import app_state
+
+    family_tree_handler = app_state.get_current_family_tree_handler()
+    try:
+        response = family_tree_handler.find_star_days(tamil_month, star or None)
+    except FamilyTreeBaseError as e:
+        logger.error(f"Star day lookup failed: {e.detail}")
+        return {"status": "ERROR", "message": e.detail}
+    return response.model_dump(exclude_none=True)
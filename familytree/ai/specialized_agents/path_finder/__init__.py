@@ -0,0 +1 @@
+from .agent import family_tree_path_finder  # noqa: F401
@@ -0,0 +1,17 @@
+from google.adk.agents import LlmAgent
+
+from .prompt import PROMPT
+from .tools import find_relationship
+
+_name = "family_tree_path_finder"
+_model = "gemini-2.0-flash"
+_description = "Finds how two members of the family tree are related"
+
+# The Relationship finder
+family_tree_path_finder = LlmAgent(
+    name=_name,
+    model=_model,
+    description=_description,
+    instruction=PROMPT,
+    tools=[find_relationship],
+)
@@ -0,0 +1,57 @@
+import logging
+
+from familytree.exceptions import FamilyTreeBaseError
+
+logger = logging.getLogger(__name__)
+
+
+def _resolve_member_id(graph_handler, member: str) -> list[str]:
+    """Returns the IDs of the members matching an ID or a full name."""
+    if graph_handler.has_member(member):
+        return [member]
+    name = member.strip().casefold()
+    return [
+        member_id
+        for member_id in graph_handler.iter_member_ids()
+        if graph_handler.get_member(member_id).name.casefold() == name
+    ]
+
+
+def find_relationship(source_member: str, target_member: str) -> dict:
+    """
+    Finds how one family member is related to another.
+
+    Use this tool for any question of the form "how is A related to B". The
+    answer names what the target member is to the source member, e.g. the
+    target is the source's "maternal grandfather's brother".
+
+    Args:
+        source_member: The member ID or full name of the member the
+            relationship is relative to.
+        target_member: The member ID or full name of the member whose
+            relationship is described.
+
+    Returns:
+        A dict with a "status" key. On success, "relationship" holds the label
+        (absent if the members are not related) and "path" lists every member
+        on the way with how it is related to the previous one.
+    """
+    # Imported here because the app state imports the handlers, which import
+    # the agents.
+    from familytree import app_state
+
+    family_tree_handler = app_state.get_current_family_tree_handler()
+    graph_handler = family_tree_handler.snapshot_graph()
+    member_ids = []
+    for member in (source_member, target_member):
+        matches = _resolve_member_id(graph_handler, member)
+        if len(matches) != 1:
+            problem = "No member" if not matches else "More than one member"
+            return {"status": "ERROR", "message": f"{problem} matches '{member}'."}
+        member_ids.append(matches[0])
+    try:
+        response = family_tree_handler.get_relationship(*member_ids)
+    except FamilyTreeBaseError as e:
+        logger.error(f"Relationship lookup failed: {e.detail}")
+        return {"status": "ERROR", "message": e.detail}
+    return response.model_dump(exclude_none=True)
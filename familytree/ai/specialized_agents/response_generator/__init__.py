@@ -0,0 +1 @@
+from .agent import family_tree_narrator  # noqa: F401
@@ -0,0 +1,9 @@
+from google.adk.agents import LlmAgent
+
+_name = "family_tree_narrator"
+_model = "gemini-2.0-flash"
+
+# The Narrator of the family tree facts
+family_tree_narrator = LlmAgent(
+    name=_name,
+)
@@ -1,14 +1,20 @@
 import logging
+import os
 from typing import Optional
 
 from familytree.handlers.family_tree_handler import FamilyTreeHandler
 
 logger = logging.getLogger(__name__)
 
+# If set, every edit is appended to a tree log in this directory, and the tree
+# kept there is replayed when the handler is created.
+TREE_LOG_DIR_ENV = "FAMILYTREE_TREE_LOG_DIR"
+
 
 class GlobalAppState:
     def __init__(self):
         self.family_tree_handler: Optional[FamilyTreeHandler] = None
+        self.tree_log_directory: Optional[str] = os.environ.get(TREE_LOG_DIR_ENV)
         logger.info("GlobalAppState initialized, FamilyTreeHandler is None.")
 
     def set_handler(self, handler: FamilyTreeHandler):
@@ -21,8 +27,24 @@ class GlobalAppState:
                 "FamilyTreeHandler accessed before explicit initialization. Creating a default one."
             )
             self.family_tree_handler = FamilyTreeHandler()
+            if self.tree_log_directory:
+                self.family_tree_handler.open_tree_log(self.tree_log_directory)
         return self.family_tree_handler
 
+    def reset_handler(self):
+        """
+        Replaces the handler with a new, empty one.
+
+        If a tree log is kept, it is moved to the new handler and starts over
+        from the empty tree.
+        """
+        new_handler = FamilyTreeHandler()
+        if self.tree_log_directory:
+            if self.family_tree_handler is not None:
+                self.family_tree_handler.close_tree_log()
+            new_handler.open_tree_log(self.tree_log_directory, replay=False)
+        self.set_handler(new_handler)
+
 
 # Single instance of our state
 global_app_state = GlobalAppState()
@@ -39,5 +61,4 @@ def set_current_family_tree_handler(handler: FamilyTreeHandler):
 
 def reset_current_family_tree_handler():
     logger.info("Resetting global FamilyTreeHandler.")
-    new_handler = FamilyTreeHandler()
-    global_app_state.set_handler(new_handler)
+    global_app_state.reset_handler()
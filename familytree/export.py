@@ -22,9 +22,10 @@ class ExportWidget(QWidget):
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 10, 0, 0)  # Add top margin
 
-        export_data_button = QPushButton("💾 Export Data (.txtpb)")
+        export_data_button = QPushButton("💾 Export Data (.txtpb/.binpb)")
         export_data_button.setToolTip(
-            "Save the raw family tree data in Protobuf Text Format."
+            "Save the raw family tree data in Protobuf Text Format (.txtpb), or "
+            "in the smaller and faster binary format (.binpb)."
         )
         export_data_button.clicked.connect(self.export_data_to_file)
         layout.addWidget(export_data_button)
@@ -52,7 +53,8 @@ class ExportWidget(QWidget):
             self,
             "Save Family Tree Data",
             os.path.join(default_dir, suggested_name),  # Suggest path and name
-            "Protobuf Text Files (*.txtpb);;All Files (*)",
+            "Protobuf Text Files (*.txtpb);;Protobuf Binary Files (*.binpb);;"
+            "Protobuf Stream Files (*.pbstream);;All Files (*)",
         )
         if file_name:
             try:
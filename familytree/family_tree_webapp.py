@@ -1,6 +1,7 @@
 import logging
 import os
 import sys
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.responses import FileResponse, JSONResponse
@@ -14,6 +15,7 @@ INDEX_HTML_FILE = os.path.join(FRONTEND_DIST_DIR, "index.html")
 sys.path.append(BASE_PROJECT_DIR)
 sys.path.append(PYTHON_DIR)
 
+from familytree.app_state import get_current_family_tree_handler  # noqa: E402
 from familytree.exceptions import FamilyTreeBaseError  # noqa: E402
 from familytree.models.base_model import (  # noqa: E402
     ERROR_STATUS,
@@ -28,10 +30,23 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Creates the family tree handler at startup, so that a tree log is
+    replayed before the first request, and closes the log at shutdown.
+    """
+    get_current_family_tree_handler()
+    yield
+    get_current_family_tree_handler().close_tree_log()
+
+
 app = FastAPI(
     title="FamilyTree API",
     version="1.0.0",
     description="API for the FamilyTree application, also serving the Vue.js frontend.",
+    lifespan=lifespan,
 )
 
 
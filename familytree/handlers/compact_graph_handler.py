@@ -0,0 +1,736 @@
+import gc
+import logging
+from array import array
+from typing import Iterable, Iterator, Optional
+
+from networkx import DiGraph
+from networkx.exception import NetworkXError
+
+from familytree.exceptions import MemberNotFoundError
+from familytree.handlers.graph_handler import GraphHandler
+from familytree.proto import family_tree_pb2
+from familytree.utils.graph_types import NODE_FLAGS, EdgeType, GraphEdge
+from familytree.utils.operation_journal import GraphChanges
+from familytree.utils.tree_stream import RecordKind, TreeRecord
+
+logger = logging.getLogger(__name__)
+
+# Encoding of the tri-state `has_visible_*` flags in the node flag arrays.
+_TRISTATE_CODES: dict[Optional[bool], int] = {None: 0, False: 1, True: 2}
+_TRISTATE_VALUES: tuple[Optional[bool], ...] = (None, False, True)
+
+# Edges added or removed since the last build are kept in overflow structures.
+# Once they outgrow this many entries, or a quarter of the CSR edges, the CSR
+# arrays are rebuilt.
+_MIN_PENDING_EDGES_BEFORE_COMPACTION = 1024
+
+
+def _boolean_flag(name: str) -> property:
+    """Builds a CompactNode property backed by a 0/1 flag array."""
+
+    def getter(node: "CompactNode") -> bool:
+        return bool(node._handler._node_flags[name][node._index])
+
+    def setter(node: "CompactNode", value: bool) -> None:
+        node._handler._node_flags[name][node._index] = 1 if value else 0
+
+    return property(getter, setter)
+
+
+def _tristate_flag(name: str) -> property:
+    """Builds a CompactNode property backed by a None/False/True flag array."""
+
+    def getter(node: "CompactNode") -> Optional[bool]:
+        return _TRISTATE_VALUES[node._handler._node_flags[name][node._index]]
+
+    def setter(node: "CompactNode", value: Optional[bool]) -> None:
+        node._handler._node_flags[name][node._index] = _TRISTATE_CODES[value]
+
+    return property(getter, setter)
+
+
+class CompactNode:
+    """
+    GraphNode compatible view of a member stored in a CompactGraphHandler.
+
+    The view holds no state of its own. Attributes are read from the handler's
+    member list and flags are read from and written to its flag arrays.
+    """
+
+    __slots__ = ("_handler", "_index")
+
+    is_poi = _boolean_flag("is_poi")
+    is_visible = _boolean_flag("is_visible")
+    has_visible_spouse = _tristate_flag("has_visible_spouse")
+    has_visible_parents = _tristate_flag("has_visible_parents")
+    has_visible_children = _tristate_flag("has_visible_children")
+    has_visible_siblings = _tristate_flag("has_visible_siblings")
+    has_visible_inlaws = _tristate_flag("has_visible_inlaws")
+
+    def __init__(self, handler: "CompactGraphHandler", index: int):
+        self._handler = handler
+        self._index = index
+
+    @property
+    def attributes(self) -> family_tree_pb2.FamilyMember:
+        return self._handler._attributes[self._index]
+
+    @attributes.setter
+    def attributes(self, value: family_tree_pb2.FamilyMember) -> None:
+        self._handler._attributes[self._index] = value
+
+
+class _CsrTable:
+    """
+    Outgoing edges in compressed sparse row form.
+
+    The targets of the member with index `i` are `indices[indptr[i]:indptr[i + 1]]`.
+    When `rendered` is set it holds the `is_rendered` flag of each edge.
+    """
+
+    __slots__ = ("indptr", "indices", "rendered")
+
+    def __init__(
+        self,
+        num_members: int,
+        edges: list[tuple[int, int, bool]],
+        with_rendered_flags: bool = True,
+    ):
+        """
+        Builds the table with a stable counting sort on the source index.
+
+        Args:
+            num_members: The number of interned members.
+            edges: (source index, target index, is_rendered) tuples.
+            with_rendered_flags: Whether to keep the `is_rendered` flags.
+        """
+        counts = array("q", bytes(8 * (num_members + 1)))
+        for source, _, _ in edges:
+            counts[source + 1] += 1
+        for index in range(num_members):
+            counts[index + 1] += counts[index]
+        self.indptr = counts
+        self.indices = array("i", bytes(4 * len(edges)))
+        self.rendered: Optional[bytearray] = (
+            bytearray(len(edges)) if with_rendered_flags else None
+        )
+        cursor = array("q", counts)
+        for source, target, is_rendered in edges:
+            position = cursor[source]
+            self.indices[position] = target
+            if self.rendered is not None:
+                self.rendered[position] = is_rendered
+            cursor[source] = position + 1
+
+    def positions(self, source: int) -> range:
+        """Returns the positions of a member's outgoing edges."""
+        if source + 1 >= len(self.indptr):
+            return range(0)
+        return range(self.indptr[source], self.indptr[source + 1])
+
+
+class CompactGraphHandler(GraphHandler):
+    """
+    GraphHandler backed by compact arrays instead of a NetworkX DiGraph.
+
+    Member IDs are interned to integer indices. Edges are stored per EdgeType in
+    CSR arrays, and the GraphNode flags are stored in one byte array per flag.
+    Edits made after a build go to small overflow maps and tombstones, which are
+    folded back into the CSR arrays once they grow.
+
+    The public API is the same as GraphHandler's. `get_family_graph()`
+    materializes a NetworkX DiGraph for code that still needs one. Its nodes
+    are CompactNode views, so flag changes made through it are kept. Edge
+    attributes are changed with `set_edge_attributes`.
+    """
+
+    def __init__(self):
+        """
+        Initializes the CompactGraphHandler with an empty store.
+        """
+        super().__init__()
+        self._reset_store()
+
+    def _reset_store(self) -> None:
+        """
+        Clears all members, edges and family units.
+        """
+        self._member_ids: list[str] = []
+        self._member_index: dict[str, int] = {}
+        # Attributes of each interned member, or None once the member is removed.
+        self._attributes: list[Optional[family_tree_pb2.FamilyMember]] = []
+        self._node_flags: dict[str, bytearray] = {
+            flag: bytearray() for flag in NODE_FLAGS
+        }
+        self._edge_tables: dict[EdgeType, _CsrTable] = {
+            edge_type: _CsrTable(0, []) for edge_type in EdgeType
+        }
+        self._predecessor_table = _CsrTable(0, [], with_rendered_flags=False)
+        self._csr_edge_count = 0
+        # CSR edges that were removed or replaced since the last build.
+        self._removed_edges: set[tuple[int, int]] = set()
+        # Edges added since the last build: type -> source -> target -> is_rendered.
+        self._added_edges: dict[EdgeType, dict[int, dict[int, bool]]] = {
+            edge_type: {} for edge_type in EdgeType
+        }
+        self._added_predecessors: dict[int, dict[int, None]] = {}
+        self._added_edge_count = 0
+        # Per-edge attributes are rare, so only non-empty ones are stored.
+        self._edge_attributes: dict[tuple[int, int], dict] = {}
+        self._graph_view: Optional[DiGraph] = None
+        self._indexes = {}
+        self._owned_member_ids = None
+        self._owned_family_unit_ids = None
+        self._version += 1
+        self._family_unit_map = {}
+        self._member_family_units = {}
+        self._stale_family_unit_names = set()
+        self._changes = GraphChanges()
+
+    def _copy_store_to(self, clone: "CompactGraphHandler") -> None:  # type: ignore[override]
+        """
+        Copies the members and edges into a new, empty handler.
+
+        CSR tables are replaced rather than changed when they are rebuilt, and
+        so are per-edge attribute dicts, so the copy shares them. Only the
+        member arrays and the overflow structures are copied.
+
+        Args:
+            clone: The CompactGraphHandler to copy into.
+        """
+        clone._member_ids = self._member_ids.copy()
+        clone._member_index = self._member_index.copy()
+        clone._attributes = self._attributes.copy()
+        clone._node_flags = {
+            flag: flag_array.copy() for flag, flag_array in self._node_flags.items()
+        }
+        clone._edge_tables = self._edge_tables.copy()
+        clone._predecessor_table = self._predecessor_table
+        clone._csr_edge_count = self._csr_edge_count
+        clone._removed_edges = self._removed_edges.copy()
+        clone._added_edges = {
+            edge_type: {source: targets.copy() for source, targets in added.items()}
+            for edge_type, added in self._added_edges.items()
+        }
+        clone._added_predecessors = {
+            target: sources.copy()
+            for target, sources in self._added_predecessors.items()
+        }
+        clone._added_edge_count = self._added_edge_count
+        clone._edge_attributes = self._edge_attributes.copy()
+
+    def _copy_member_store(self, member_id: str) -> None:
+        """
+        Replaces the attributes message of a member with a copy.
+
+        Flags live in arrays that are copied with the store.
+
+        Args:
+            member_id: The ID of the member, which may not be part of the graph.
+        """
+        index = self._member_index.get(member_id)
+        if index is None or self._attributes[index] is None:
+            return
+        attributes = family_tree_pb2.FamilyMember()
+        attributes.CopyFrom(self._attributes[index])
+        self._attributes[index] = attributes
+
+    def _intern_member(
+        self, member_id: str, member_data: family_tree_pb2.FamilyMember
+    ) -> int:
+        """
+        Stores a new member and returns its index. All flags start cleared.
+
+        Args:
+            member_id: The unique identifier for the family member.
+            member_data: The FamilyMember protobuf message containing member details.
+
+        Returns:
+            The index of the member in the compact arrays.
+        """
+        index = len(self._member_ids)
+        self._member_ids.append(member_id)
+        self._member_index[member_id] = index
+        self._attributes.append(member_data)
+        for flag_array in self._node_flags.values():
+            flag_array.append(0)
+        return index
+
+    def _is_live(self, index: int) -> bool:
+        return self._attributes[index] is not None
+
+    def _iter_targets(
+        self, source: int, edge_type: EdgeType
+    ) -> Iterator[tuple[int, bool]]:
+        """
+        Yields the live targets of a member's outgoing edges of one type.
+
+        Args:
+            source: The index of the source member.
+            edge_type: The type of the outgoing edges to follow.
+
+        Yields:
+            (target index, is_rendered) tuples in insertion order.
+        """
+        table = self._edge_tables[edge_type]
+        for position in table.positions(source):
+            target = table.indices[position]
+            if self._is_live(target) and (source, target) not in self._removed_edges:
+                yield target, bool(table.rendered[position])  # type: ignore[index]
+        for target, is_rendered in self._added_edges[edge_type].get(source, {}).items():
+            if self._is_live(target):
+                yield target, is_rendered
+
+    def _iter_predecessors(self, target: int) -> Iterator[int]:
+        """
+        Yields the live members with an edge of any type to a member.
+
+        Args:
+            target: The index of the target member.
+
+        Yields:
+            The indices of the source members.
+        """
+        table = self._predecessor_table
+        candidates = dict.fromkeys(
+            table.indices[position] for position in table.positions(target)
+        )
+        candidates.update(self._added_predecessors.get(target, {}))
+        for source in candidates:
+            if self._is_live(source) and self._find_edge(source, target) is not None:
+                yield source
+
+    def _find_edge(self, source: int, target: int) -> Optional[tuple[EdgeType, bool]]:
+        """
+        Looks up the edge from one member to another.
+
+        Args:
+            source: The index of the source member.
+            target: The index of the target member.
+
+        Returns:
+            The (edge type, is_rendered) of the edge, or None if there is none.
+        """
+        for edge_type, added_edges in self._added_edges.items():
+            is_rendered = added_edges.get(source, {}).get(target)
+            if is_rendered is not None:
+                return edge_type, is_rendered
+        if (source, target) in self._removed_edges:
+            return None
+        for edge_type, table in self._edge_tables.items():
+            for position in table.positions(source):
+                if table.indices[position] == target:
+                    return edge_type, bool(table.rendered[position])  # type: ignore[index]
+        return None
+
+    def _discard_edge(self, source: int, target: int) -> bool:
+        """
+        Removes the edge from one member to another if it exists.
+
+        Args:
+            source: The index of the source member.
+            target: The index of the target member.
+
+        Returns:
+            True if an edge was removed, False otherwise.
+        """
+        self._edge_attributes.pop((source, target), None)
+        for added_edges in self._added_edges.values():
+            targets = added_edges.get(source)
+            if targets is not None and target in targets:
+                del targets[target]
+                self._added_edge_count -= 1
+                return True
+        if self._find_edge(source, target) is None:
+            return False
+        self._removed_edges.add((source, target))
+        return True
+
+    def _iter_edges(self) -> Iterator[tuple[EdgeType, int, int, bool]]:
+        """
+        Yields every live edge as (edge type, source, target, is_rendered).
+        """
+        for edge_type in EdgeType:
+            for source in range(len(self._member_ids)):
+                if not self._is_live(source):
+                    continue
+                for target, is_rendered in self._iter_targets(source, edge_type):
+                    yield edge_type, source, target, is_rendered
+
+    def _build_tables(
+        self, edges_by_type: dict[EdgeType, list[tuple[int, int, bool]]]
+    ) -> None:
+        """
+        Replaces the CSR arrays and clears the overflow structures.
+
+        Args:
+            edges_by_type: (source, target, is_rendered) tuples grouped by type.
+        """
+        num_members = len(self._member_ids)
+        self._edge_tables = {
+            edge_type: _CsrTable(num_members, edges_by_type.get(edge_type, []))
+            for edge_type in EdgeType
+        }
+        self._predecessor_table = _CsrTable(
+            num_members,
+            [
+                (target, source, False)
+                for edges in edges_by_type.values()
+                for source, target, _ in edges
+            ],
+            with_rendered_flags=False,
+        )
+        self._csr_edge_count = sum(len(edges) for edges in edges_by_type.values())
+        self._removed_edges = set()
+        self._added_edges = {edge_type: {} for edge_type in EdgeType}
+        self._added_predecessors = {}
+        self._added_edge_count = 0
+
+    def compact(self) -> None:
+        """
+        Folds the edges edited since the last build back into the CSR arrays.
+
+        Member indices do not change, so existing CompactNode views stay valid.
+        """
+        edges_by_type: dict[EdgeType, list[tuple[int, int, bool]]] = {
+            edge_type: [] for edge_type in EdgeType
+        }
+        for edge_type, source, target, is_rendered in self._iter_edges():
+            edges_by_type[edge_type].append((source, target, is_rendered))
+        self._build_tables(edges_by_type)
+        logger.debug(f"Compacted graph store to {self._csr_edge_count} edges.")
+
+    def _compact_if_needed(self) -> None:
+        threshold = max(
+            _MIN_PENDING_EDGES_BEFORE_COMPACTION, self._csr_edge_count // 4
+        )
+        if self._added_edge_count + len(self._removed_edges) > threshold:
+            self.compact()
+
+    def _get_node(self, member_id: str) -> CompactNode:  # type: ignore[override]
+        return CompactNode(self, self._member_index[member_id])
+
+    def _get_edge_type(self, source_id: str, target_id: str) -> Optional[EdgeType]:
+        source = self._member_index.get(source_id)
+        target = self._member_index.get(target_id)
+        if source is None or target is None:
+            return None
+        edge = self._find_edge(source, target)
+        return edge[0] if edge is not None else None
+
+    def _get_edge(self, source_id: str, target_id: str) -> GraphEdge:
+        source = self._member_index[source_id]
+        target = self._member_index[target_id]
+        edge = self._find_edge(source, target)
+        if edge is None:
+            raise KeyError((source_id, target_id))
+        return self._view_edge(edge[0], source, target, edge[1])
+
+    def _get_predecessor_ids(self, member_id: str) -> list[str]:
+        target = self._member_index[member_id]
+        if not self._is_live(target):
+            raise KeyError(member_id)
+        return [self._member_ids[source] for source in self._iter_predecessors(target)]
+
+    def _put_edge(self, source_id: str, target_id: str, edge: GraphEdge) -> None:
+        source = self._member_index[source_id]
+        target = self._member_index[target_id]
+        self._discard_edge(source, target)
+        self._added_edges[edge.edge_type].setdefault(source, {})[target] = (
+            edge.is_rendered
+        )
+        self._added_predecessors.setdefault(target, {})[source] = None
+        self._added_edge_count += 1
+        if edge.attributes:
+            self._edge_attributes[source, target] = dict(edge.attributes)
+        self._graph_view = None
+        self._compact_if_needed()
+
+    def _delete_edge(self, source_id: str, target_id: str) -> None:
+        self._discard_edge(self._member_index[source_id], self._member_index[target_id])
+        self._graph_view = None
+        self._compact_if_needed()
+
+    def _get_typed_neighbors(self, member_id: str, edge_type: EdgeType) -> dict:
+        try:
+            source = self._member_index[member_id]
+        except KeyError as e:
+            raise NetworkXError(f"The node {member_id} is not in the digraph.") from e
+        return {
+            self._member_ids[target]: None
+            for target, _ in self._iter_targets(source, edge_type)
+        }
+
+    def has_member(self, member_id: str) -> bool:
+        return member_id in self._member_index
+
+    def iter_member_ids(self) -> Iterator[str]:
+        for index, member_id in enumerate(self._member_ids):
+            if self._is_live(index):
+                yield member_id
+
+    def get_family_graph(self) -> DiGraph:
+        """
+        Returns a NetworkX DiGraph view of the compact store.
+
+        The view is built on first use and reused until the next structural
+        change. Node data are CompactNode views; edge data are GraphEdge copies.
+
+        Returns:
+            nx.DiGraph: The family graph.
+        """
+        if self._graph_view is None:
+            graph_view = DiGraph()
+            graph_view.add_nodes_from(
+                (member_id, {"data": CompactNode(self, index)})
+                for index, member_id in enumerate(self._member_ids)
+                if self._is_live(index)
+            )
+            graph_view.add_edges_from(
+                (
+                    self._member_ids[source],
+                    self._member_ids[target],
+                    {"data": self._view_edge(edge_type, source, target, is_rendered)},
+                )
+                for edge_type, source, target, is_rendered in self._iter_edges()
+            )
+            self._graph_view = graph_view
+        return self._graph_view
+
+    def _view_edge(
+        self, edge_type: EdgeType, source: int, target: int, is_rendered: bool
+    ) -> GraphEdge:
+        """Returns the GraphEdge shown for an edge in the NetworkX view."""
+        edge_obj = GraphEdge.shared(edge_type, is_rendered)
+        attributes = self._edge_attributes.get((source, target))
+        return edge_obj.with_attributes(attributes) if attributes else edge_obj
+
+    def set_edge_attributes(
+        self,
+        source_member_id: str,
+        target_member_id: str,
+        attributes: dict,
+    ) -> None:
+        source = self._member_index.get(source_member_id)
+        target = self._member_index.get(target_member_id)
+        if source is None or target is None or self._find_edge(source, target) is None:
+            raise self._relationship_not_found_error(
+                "set_edge_attributes", source_member_id, target_member_id
+            )
+        self._journal_edge(source_member_id, target_member_id)
+        self._edge_attributes[source, target] = {
+            **self._edge_attributes.get((source, target), {}),
+            **attributes,
+        }
+        self._graph_view = None
+        self._version += 1
+
+    def create_from_proto(self, family_tree: family_tree_pb2.FamilyTree) -> None:
+        """
+        Builds the compact store from a FamilyTree protobuf message.
+
+        Relationships are validated and deduplicated exactly like
+        GraphHandler.create_from_proto, then written to the CSR arrays.
+
+        Args:
+            family_tree: A family_tree_pb2.FamilyTree message instance.
+
+        Raises:
+            InvalidInputError: If any relationship refers to a member that is not
+                part of the tree. All dangling references are reported together.
+        """
+        logger.info("Creating compact graph from FamilyTree proto...")
+        self._reset_store()
+
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            nodes, edges = self._collect_nodes_and_edges(family_tree)
+
+            for member_id, node_obj in nodes.items():
+                index = self._intern_member(member_id, node_obj.attributes)
+                for flag in NODE_FLAGS[2:]:
+                    self._node_flags[flag][index] = _TRISTATE_CODES[
+                        getattr(node_obj, flag)
+                    ]
+            del nodes
+
+            self._build_tables_from_edges(edges)
+            del edges
+            self._load_family_units(family_tree)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        self._share_loaded_messages()
+
+        logger.info(
+            f"Finished creating compact graph from FamilyTree proto with "
+            f"{len(self._member_ids)} members and {self._csr_edge_count} relationships."
+        )
+
+    def create_from_records(self, records: Iterable[TreeRecord]) -> None:
+        """
+        Builds the compact store from the records of a stream file as they are
+        read.
+
+        Members are interned as their records arrive. Relationships are
+        validated and deduplicated exactly like GraphHandler.create_from_records,
+        then written to the CSR arrays.
+
+        Args:
+            records: The records of a stream, usually from
+                `tree_stream.read_tree_stream`.
+
+        Raises:
+            InvalidInputError: If any relationship refers to a member that is not
+                part of the tree or comes after the relationship. All dangling
+                references are reported together.
+        """
+        logger.info("Creating compact graph from a stream of records...")
+        self._reset_store()
+
+        # Views of the interned members, whose flags the relationships set.
+        nodes: dict[str, CompactNode] = {}
+        edges: dict[tuple[str, str], GraphEdge] = {}
+        dangling_references: list[str] = []
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for kind, key, message in records:
+                if kind == RecordKind.MEMBER:
+                    index = self._member_index.get(key)
+                    if index is None:
+                        index = self._intern_member(key, message)
+                    else:
+                        # A later record of a member replaces the earlier one.
+                        self._attributes[index] = message
+                    nodes[key] = CompactNode(self, index)
+                elif kind == RecordKind.RELATIONSHIPS:
+                    self._collect_relationship_edges(
+                        key, message, nodes, edges, dangling_references
+                    )
+                else:
+                    self._family_unit_map[key] = message
+                    self._index_family_unit_members(key, message)
+            del nodes
+            self._raise_for_dangling_references(dangling_references)
+
+            self._build_tables_from_edges(edges)
+            del edges
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+        logger.info(
+            f"Finished creating compact graph from a stream with "
+            f"{len(self._member_ids)} members and {self._csr_edge_count} relationships."
+        )
+
+    def _build_tables_from_edges(
+        self, edges: dict[tuple[str, str], GraphEdge]
+    ) -> None:
+        """
+        Writes the edges of a bulk build to the CSR arrays.
+
+        Args:
+            edges: The GraphEdge objects keyed by (source ID, target ID).
+        """
+        edges_by_type: dict[EdgeType, list[tuple[int, int, bool]]] = {
+            edge_type: [] for edge_type in EdgeType
+        }
+        for (source_id, target_id), edge_obj in edges.items():
+            edges_by_type[edge_obj.edge_type].append(
+                (
+                    self._member_index[source_id],
+                    self._member_index[target_id],
+                    edge_obj.is_rendered,
+                )
+            )
+        self._build_tables(edges_by_type)
+
+    def add_member(
+        self, member_id: str, member_data: family_tree_pb2.FamilyMember
+    ) -> None:
+        """
+        Adds a family member to the compact store.
+
+        Adding an existing member replaces its attributes and clears its flags,
+        and keeps its relationships, like re-adding a node to a DiGraph.
+
+        Args:
+            member_id: The unique identifier for the family member.
+            member_data: The FamilyMember protobuf message containing member details.
+        """
+        self._journal_member(member_id)
+        index = self._member_index.get(member_id)
+        if index is None:
+            self._intern_member(member_id, member_data)
+            self._graph_view = None
+        else:
+            self._attributes[index] = member_data
+            for flag_array in self._node_flags.values():
+                flag_array[index] = 0
+        self._notify_member_added(member_id)
+        logger.debug(f"Added node: {member_id}")
+
+    def _drop_member(self, index: int) -> None:
+        """
+        Tombstones a member. Its edges are hidden because the member is not live.
+
+        Args:
+            index: The index of the member to remove.
+        """
+        del self._member_index[self._member_ids[index]]
+        self._attributes[index] = None
+        for flag_array in self._node_flags.values():
+            flag_array[index] = 0
+        for added_edges in self._added_edges.values():
+            self._added_edge_count -= len(added_edges.pop(index, {}))
+        self._added_predecessors.pop(index, None)
+
+    def _has_any_edge(self, index: int) -> bool:
+        """Checks if a member has an incoming or outgoing edge of any type."""
+        for edge_type in EdgeType:
+            for _ in self._iter_targets(index, edge_type):
+                return True
+        for _ in self._iter_predecessors(index):
+            return True
+        return False
+
+    def remove_member(self, member_id: str, remove_orphaned_neighbors: bool):
+        """
+        Removes a family member from the compact store.
+
+        Optionally removes neighboring members if they become orphaned (i.e., have no
+        other connections) after the primary member's removal.
+
+        Args:
+            member_id: The ID of the member to remove.
+            remove_orphaned_neighbors: If True, remove neighbors who become disconnected.
+
+        Raises:
+            MemberNotFoundError: If the member with the given ID is not found.
+        """
+        index = self._member_index.get(member_id)
+        if index is None:
+            error_message = f"Member ID '{member_id}' is not part of the family graph"
+            logger.error(error_message)
+            raise MemberNotFoundError(member_id=member_id, operation="remove_member")
+
+        self._journal_member_removal(member_id)
+        neighbors = dict.fromkeys(
+            target
+            for edge_type in EdgeType
+            for target, _ in self._iter_targets(index, edge_type)
+        )
+        self._drop_member(index)
+        self._forget_member(member_id)
+        if remove_orphaned_neighbors:
+            for neighbor in neighbors:
+                if not self._has_any_edge(neighbor):
+                    neighbor_id = self._member_ids[neighbor]
+                    self._journal_member(neighbor_id)
+                    self._drop_member(neighbor)
+                    self._forget_member(neighbor_id)
+        self._graph_view = None
+        logger.debug(f"Removed member: {member_id}")
@@ -1,18 +1,63 @@
+import datetime
+import gc
 import logging
-from typing import Any, Optional
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterable, Iterator, Optional, TypeVar
 
 from google.protobuf.json_format import MessageToDict
 from networkx import DiGraph
 from networkx.exception import NetworkXError
 
-from familytree.exceptions import InvalidInputError, MemberNotFoundError
-from familytree.proto import family_tree_pb2
+from familytree.exceptions import (
+    InvalidInputError,
+    MemberNotFoundError,
+    OperationError,
+)
+from familytree.indexes.ancestry_index import AncestryIndex, CommonAncestor
+from familytree.indexes.attribute_index import (
+    AttributeIndex,
+    ColumnFilter,
+    InfoFilter,
+)
+from familytree.indexes.calendar_index import (
+    CalendarEvent,
+    CalendarIndex,
+    EventKind,
+    StarDay,
+)
+from familytree.indexes.consistency_index import ConsistencyIndex, Violation
+from familytree.indexes.graph_index import GraphIndex
+from familytree.indexes.lineage_index import LineageIndex
+from familytree.indexes.name_index import NameIndex, NameMatch
+from familytree.indexes.visibility_index import (
+    DEFAULT_VIEW_SESSION_ID,
+    RelativeGroup,
+    VisibilityDelta,
+    VisibilityIndex,
+)
+from familytree.proto import family_tree_pb2, utils_pb2
 from familytree.rendering.pyvis_renderer import PyvisRenderer
 from familytree.utils import id_utils, proto_utils
-from familytree.utils.graph_types import EdgeType, GraphEdge, GraphNode
+from familytree.utils.graph_types import NODE_FLAGS, EdgeType, GraphEdge, GraphNode
+from familytree.utils.kinship_utils import KinshipStep
+from familytree.utils.operation_journal import (
+    FamilyUnitState,
+    GraphChanges,
+    GraphOperation,
+    MemberState,
+)
+from familytree.utils.tamil_calendar import LAST_SUPPORTED_YEAR, get_tamil_calendar
+from familytree.utils.tree_log import TreeEdit
+from familytree.utils.tree_stream import RecordKind, TreeRecord
 
 logger = logging.getLogger(__name__)
 
+# Rendered ego graphs kept at once. Each one embeds the vis.js library.
+_MAX_CACHED_EGO_GRAPHS = 32
+
+IndexT = TypeVar("IndexT", bound=GraphIndex)
+
 
 class GraphHandler:
     """
@@ -25,6 +70,39 @@ class GraphHandler:
         """
         self._graph: DiGraph = DiGraph()
         self._family_unit_map: dict[str, family_tree_pb2.FamilyUnit] = {}
+        # Outgoing neighbors of every member grouped by edge type. The inner
+        # dicts are used as insertion-ordered sets so typed lookups cost the
+        # size of the answer instead of the degree of the member.
+        self._typed_adjacency: dict[str, dict[EdgeType, dict[str, None]]] = {}
+        # Reverse index from a member ID to the IDs of the family units that
+        # list the member as a parent or a child.
+        self._member_family_units: dict[str, set[str]] = {}
+        # Family units whose name has to be rebuilt from their parents' names.
+        # Names are refreshed lazily when the family unit map is read.
+        self._stale_family_unit_names: set[str] = set()
+        # Secondary indexes keyed by their class. They are built on first use
+        # and kept in sync through the _notify_* methods.
+        self._indexes: dict[type[GraphIndex], GraphIndex] = {}
+        # Incremented on every change to members, edges or their attributes,
+        # so derived results can be cached against it.
+        self._version = 0
+        # Rendered ego graphs keyed by (POI, degree, theme), with the graph
+        # version they were rendered at.
+        self._ego_graph_html_cache: dict[tuple[str, int, str], tuple[int, str]] = {}
+        # Readers of a published handler share it, so the indexes and the
+        # render cache, which reads fill in, are changed under this lock.
+        self._cache_lock = threading.RLock()
+        # Once the handler has been copied, the containers stored per member and
+        # the family unit messages are shared with the copy. These hold the IDs
+        # of the members and family units this handler has copied since, which
+        # it may change in place; None means all.
+        self._owned_member_ids: Optional[set[str]] = None
+        self._owned_family_unit_ids: Optional[set[str]] = None
+        # The operation being recorded by `record_operation`, if any.
+        self._operation: Optional[GraphOperation] = None
+        # What changed since the last copy or checkpoint, with the earlier
+        # change sets chained behind it.
+        self._changes = GraphChanges()
 
     def _check_if_node_exists(self, node_id: str, type: str) -> bool:
         """
@@ -40,7 +118,7 @@ class GraphHandler:
         Raises:
             InvalidInputError: If the node with the given ID is not found.
         """
-        if not self._graph.has_node(node_id):
+        if not self.has_member(node_id):
             error_message = f"{type} ID '{node_id}' not found in graph nodes."
             logger.error(error_message)
             raise InvalidInputError(
@@ -50,6 +128,639 @@ class GraphHandler:
             )
         return True
 
+    def _get_node(self, member_id: str) -> GraphNode:
+        """
+        Returns the GraphNode stored for a member.
+
+        Args:
+            member_id: The ID of the member.
+
+        Returns:
+            The GraphNode holding the member's attributes and visibility flags.
+
+        Raises:
+            KeyError: If the member is not part of the graph.
+        """
+        return self._graph.nodes[member_id]["data"]
+
+    def _own_member(self, member_id: str) -> None:
+        """
+        Copies the containers stored for a member if they may be shared with a
+        copy of this handler, so that they can be changed in place.
+
+        Members that are not part of the graph yet are marked as owned, since
+        the containers created for them are new.
+
+        Args:
+            member_id: The ID of the member.
+        """
+        owned_member_ids = self._owned_member_ids
+        if owned_member_ids is None or member_id in owned_member_ids:
+            return
+        owned_member_ids.add(member_id)
+        self._copy_member_store(member_id)
+        unit_ids = self._member_family_units.get(member_id)
+        if unit_ids is not None:
+            self._member_family_units[member_id] = unit_ids.copy()
+
+    def _copy_member_store(self, member_id: str) -> None:
+        """
+        Replaces the node, attributes message and adjacency dicts of a member
+        with copies.
+
+        Args:
+            member_id: The ID of the member, which may not be part of the graph.
+        """
+        graph = self._graph
+        node_attributes = graph._node.get(member_id)
+        if node_attributes is None:
+            return
+        node_obj = node_attributes["data"].copy()
+        attributes = family_tree_pb2.FamilyMember()
+        attributes.CopyFrom(node_obj.attributes)
+        node_obj.attributes = attributes
+        graph._node[member_id] = {"data": node_obj}
+        graph._succ[member_id] = graph._succ[member_id].copy()
+        graph._pred[member_id] = graph._pred[member_id].copy()
+        typed = self._typed_adjacency.get(member_id)
+        if typed is not None:
+            self._typed_adjacency[member_id] = {
+                edge_type: neighbors.copy() for edge_type, neighbors in typed.items()
+            }
+
+    def _own_edge(self, source_id: str, target_id: str) -> None:
+        """
+        Owns both ends of an edge and copies the edge's attribute dict, which
+        `add_edge` and `set_edge_attributes` change in place.
+
+        Args:
+            source_id: The ID of the source member of the edge.
+            target_id: The ID of the target member of the edge.
+        """
+        if self._owned_member_ids is None:
+            return
+        self._own_member(source_id)
+        self._own_member(target_id)
+        graph = self._graph
+        edge_attributes = graph._succ[source_id].get(target_id)
+        if edge_attributes is not None:
+            edge_attributes = edge_attributes.copy()
+            graph._succ[source_id][target_id] = edge_attributes
+            graph._pred[target_id][source_id] = edge_attributes
+
+    def _get_node_for_update(self, member_id: str) -> GraphNode:
+        """
+        Returns the GraphNode stored for a member for changing it in place.
+
+        Args:
+            member_id: The ID of the member.
+
+        Returns:
+            The GraphNode owned by this handler.
+
+        Raises:
+            KeyError: If the member is not part of the graph.
+        """
+        self._journal_member(member_id)
+        self._own_member(member_id)
+        return self._get_node(member_id)
+
+    def _get_attributes_for_update(
+        self, member_id: str
+    ) -> family_tree_pb2.FamilyMember:
+        """
+        Returns a member's attributes message for changing it in place.
+
+        Args:
+            member_id: The ID of the member.
+
+        Returns:
+            The FamilyMember message owned by this handler.
+
+        Raises:
+            KeyError: If the member is not part of the graph.
+        """
+        return self._get_node_for_update(member_id).attributes
+
+    def _get_family_unit_for_update(
+        self, family_unit_id: str
+    ) -> Optional[family_tree_pb2.FamilyUnit]:
+        """
+        Returns a family unit message for changing it in place.
+
+        The message is copied first if it may be shared with a copy of this
+        handler.
+
+        Args:
+            family_unit_id: The ID of the family unit.
+
+        Returns:
+            The FamilyUnit message owned by this handler, or None if there is
+            no such family unit.
+        """
+        self._journal_family_unit(family_unit_id)
+        family_unit = self._family_unit_map.get(family_unit_id)
+        owned_unit_ids = self._owned_family_unit_ids
+        if (
+            family_unit is not None
+            and owned_unit_ids is not None
+            and family_unit_id not in owned_unit_ids
+        ):
+            family_unit_copy = family_tree_pb2.FamilyUnit()
+            family_unit_copy.CopyFrom(family_unit)
+            family_unit = self._family_unit_map[family_unit_id] = family_unit_copy
+            owned_unit_ids.add(family_unit_id)
+        return family_unit
+
+    def _journal_member(self, member_id: str) -> None:
+        """
+        Marks a member changed, and records its state before the operation
+        being recorded changes it for the first time.
+
+        Args:
+            member_id: The ID of the member, which may not be part of the graph.
+        """
+        self._changes.member_ids.add(member_id)
+        operation = self._operation
+        if operation is None or member_id in operation.members:
+            return
+        state: Optional[MemberState] = None
+        if self.has_member(member_id):
+            node_obj = self._get_node(member_id)
+            attributes = family_tree_pb2.FamilyMember()
+            attributes.CopyFrom(node_obj.attributes)
+            state = (attributes, tuple(getattr(node_obj, flag) for flag in NODE_FLAGS))
+        operation.members[member_id] = state
+
+    def _journal_edge(self, source_id: str, target_id: str) -> None:
+        """
+        Marks the relationships of an edge's source changed, and records the
+        edge before the operation being recorded changes it for the first time.
+
+        Args:
+            source_id: The ID of the source member of the edge.
+            target_id: The ID of the target member of the edge.
+        """
+        self._changes.relationship_ids.add(source_id)
+        operation = self._operation
+        if operation is None or (source_id, target_id) in operation.edges:
+            return
+        edge_type = self._get_edge_type(source_id, target_id)
+        if edge_type is None:
+            operation.edges[source_id, target_id] = None
+            return
+        operation.edges[source_id, target_id] = self._get_edge(source_id, target_id)
+        if (source_id, edge_type) not in operation.target_orders:
+            operation.target_orders[source_id, edge_type] = tuple(
+                self._get_typed_neighbors(source_id, edge_type)
+            )
+
+    def _journal_member_removal(self, member_id: str) -> None:
+        """
+        Records a member and all its edges before the member is removed.
+
+        Args:
+            member_id: The ID of the member.
+        """
+        if self._operation is None:
+            changes = self._changes
+            changes.member_ids.add(member_id)
+            changes.relationship_ids.add(member_id)
+            changes.relationship_ids.update(self._get_predecessor_ids(member_id))
+            return
+        self._journal_member(member_id)
+        for edge_type in EdgeType:
+            for target_id in list(self._get_typed_neighbors(member_id, edge_type)):
+                self._journal_edge(member_id, target_id)
+        for source_id in self._get_predecessor_ids(member_id):
+            self._journal_edge(source_id, member_id)
+
+    def _journal_family_unit(self, family_unit_id: str) -> None:
+        """
+        Marks a family unit changed, and records it before the operation being
+        recorded changes it or marks its name stale for the first time.
+
+        Args:
+            family_unit_id: The ID of the family unit, which may not exist.
+        """
+        self._changes.family_unit_ids.add(family_unit_id)
+        operation = self._operation
+        if operation is None or family_unit_id in operation.family_units:
+            return
+        state: Optional[FamilyUnitState] = None
+        family_unit = self._family_unit_map.get(family_unit_id)
+        if family_unit is not None:
+            family_unit_copy = family_tree_pb2.FamilyUnit()
+            family_unit_copy.CopyFrom(family_unit)
+            state = (
+                family_unit_copy,
+                family_unit_id in self._stale_family_unit_names,
+            )
+        operation.family_units[family_unit_id] = state
+
+    @contextmanager
+    def record_operation(self, description: str) -> Iterator[GraphOperation]:
+        """
+        Records the changes made to the graph inside the block as one operation.
+
+        If the block raises, its changes are rolled back before the exception
+        propagates.
+
+        Args:
+            description: A short description of the operation, e.g. for an
+                undo button.
+
+        Yields:
+            The GraphOperation, which is complete once the block exits. Pass it
+            to `restore_operation` to undo the changes.
+
+        Raises:
+            OperationError: If an operation is already being recorded.
+        """
+        if self._operation is not None:
+            raise OperationError(
+                operation="record_operation",
+                reason="Another operation is already being recorded.",
+            )
+        operation = GraphOperation(description)
+        self._operation = operation
+        try:
+            yield operation
+        except BaseException:
+            self._operation = None
+            self.restore_operation(operation)
+            raise
+        finally:
+            self._operation = None
+
+    def restore_operation(self, operation: GraphOperation) -> GraphOperation:
+        """
+        Puts back the state recorded in an operation, undoing it.
+
+        Members and edges are restored through the same methods that change
+        them, so the secondary indexes stay in sync. The state they replace is
+        recorded in turn, so the result can be restored to redo the operation.
+        The cost is proportional to the size of the operation.
+
+        Args:
+            operation: The operation to undo.
+
+        Returns:
+            The operation that restores the state from before this call.
+        """
+        inverse = GraphOperation(operation.description)
+        self._operation = inverse
+        try:
+            for member_id, state in operation.members.items():
+                if state is not None:
+                    self._restore_member(member_id, state)
+            for (source_id, target_id), edge in operation.edges.items():
+                if edge is not None:
+                    self._add_typed_edge(source_id, target_id, edge)
+                elif self._has_edge(source_id, target_id):
+                    self._remove_edge(source_id, target_id)
+            for (source_id, edge_type), target_ids in operation.target_orders.items():
+                if self.has_member(source_id):
+                    self._restore_target_order(source_id, edge_type, target_ids)
+            for member_id, state in operation.members.items():
+                if state is None and self.has_member(member_id):
+                    self.remove_member(member_id, remove_orphaned_neighbors=False)
+            for family_unit_id, state in operation.family_units.items():
+                self._restore_family_unit(family_unit_id, state)
+        finally:
+            self._operation = None
+        self._version += 1
+        return inverse
+
+    def _restore_target_order(
+        self, source_id: str, edge_type: EdgeType, target_ids: tuple[str, ...]
+    ) -> None:
+        """
+        Puts a member's targets of one type back in a recorded order.
+
+        Restored edges are added after the existing ones, so the edges from the
+        first one out of place onwards are removed and added again in order.
+        Targets that are not in the recorded order keep their order after the
+        others.
+
+        Args:
+            source_id: The ID of the source member.
+            edge_type: The type of the edges.
+            target_ids: The recorded order of the targets.
+        """
+        current_ids = list(self._get_typed_neighbors(source_id, edge_type))
+        current_set = set(current_ids)
+        ordered_ids = [i for i in target_ids if i in current_set]
+        ordered_set = set(ordered_ids)
+        ordered_ids += [i for i in current_ids if i not in ordered_set]
+        for position, (current_id, target_id) in enumerate(
+            zip(current_ids, ordered_ids)
+        ):
+            if current_id != target_id:
+                break
+        else:
+            return
+        for target_id in ordered_ids[position:]:
+            edge = self._get_edge(source_id, target_id)
+            self._remove_edge(source_id, target_id)
+            self._add_typed_edge(source_id, target_id, edge)
+
+    def _restore_member(self, member_id: str, state: MemberState) -> None:
+        """
+        Restores the attributes and flags of a member, adding it if needed.
+
+        Args:
+            member_id: The ID of the member.
+            state: The recorded attributes and flags.
+        """
+        attributes = family_tree_pb2.FamilyMember()
+        attributes.CopyFrom(state[0])
+        if self.has_member(member_id):
+            self._get_node_for_update(member_id).attributes = attributes
+            self._mark_family_unit_names_stale(member_id)
+            self._notify_member_updated(member_id)
+        else:
+            self.add_member(member_id, attributes)
+        node_obj = self._get_node_for_update(member_id)
+        for flag, value in zip(NODE_FLAGS, state[1]):
+            setattr(node_obj, flag, value)
+
+    def _restore_family_unit(
+        self, family_unit_id: str, state: Optional[FamilyUnitState]
+    ) -> None:
+        """
+        Replaces or deletes a family unit and updates the member reverse index.
+
+        Args:
+            family_unit_id: The ID of the family unit.
+            state: The recorded FamilyUnit and whether its name was stale, or
+                None if it did not exist.
+        """
+        self._journal_family_unit(family_unit_id)
+        current = self._family_unit_map.pop(family_unit_id, None)
+        if current is not None:
+            for member_id in (*current.parent_ids, *current.child_ids):
+                unit_ids = self._member_family_units.get(member_id)
+                if unit_ids is not None:
+                    self._own_member(member_id)
+                    self._member_family_units[member_id].discard(family_unit_id)
+        self._stale_family_unit_names.discard(family_unit_id)
+        if state is None:
+            return
+        family_unit, is_stale = state
+        if is_stale:
+            self._stale_family_unit_names.add(family_unit_id)
+        family_unit_copy = family_tree_pb2.FamilyUnit()
+        family_unit_copy.CopyFrom(family_unit)
+        self._family_unit_map[family_unit_id] = family_unit_copy
+        if self._owned_family_unit_ids is not None:
+            self._owned_family_unit_ids.add(family_unit_id)
+        self._index_family_unit_members(family_unit_id, family_unit_copy)
+
+    def _get_edge_type(self, source_id: str, target_id: str) -> Optional[EdgeType]:
+        """
+        Returns the type of the edge from one member to another.
+
+        Args:
+            source_id: The ID of the source member of the edge.
+            target_id: The ID of the target member of the edge.
+
+        Returns:
+            The EdgeType of the edge, or None if there is no such edge.
+        """
+        edge_data = self._graph.get_edge_data(source_id, target_id)
+        return edge_data["data"].edge_type if edge_data else None
+
+    def _get_edge(self, source_id: str, target_id: str) -> GraphEdge:
+        """
+        Returns the GraphEdge stored for the edge from one member to another.
+
+        Args:
+            source_id: The ID of the source member of the edge.
+            target_id: The ID of the target member of the edge.
+
+        Returns:
+            The GraphEdge of the edge.
+
+        Raises:
+            KeyError: If there is no such edge.
+        """
+        return self._graph.edges[source_id, target_id]["data"]
+
+    def _get_predecessor_ids(self, member_id: str) -> list[str]:
+        """
+        Returns the members with an edge of any type to a member.
+
+        Args:
+            member_id: The ID of the target member.
+
+        Returns:
+            The IDs of the source members.
+
+        Raises:
+            KeyError: If the member is not part of the graph.
+        """
+        return list(self._graph.pred[member_id])
+
+    def get_member_edges(self, member_id: str) -> list[tuple[str, str]]:
+        """
+        Returns the edges from and to a member.
+
+        Args:
+            member_id: The ID of the member.
+
+        Returns:
+            The edges as (source ID, target ID) pairs, those from the member
+            first.
+
+        Raises:
+            KeyError: If the member is not part of the graph.
+        """
+        edges = [
+            (member_id, target_id)
+            for edge_type in EdgeType
+            for target_id in self._get_typed_neighbors(member_id, edge_type)
+        ]
+        edges.extend(
+            (source_id, member_id)
+            for source_id in self._get_predecessor_ids(member_id)
+        )
+        return edges
+
+    def _has_edge(self, source_id: str, target_id: str) -> bool:
+        """
+        Checks if an edge of any type exists from one member to another.
+
+        Args:
+            source_id: The ID of the source member of the edge.
+            target_id: The ID of the target member of the edge.
+
+        Returns:
+            True if the edge exists, False otherwise.
+        """
+        return self._get_edge_type(source_id, target_id) is not None
+
+    def _add_typed_edge(self, source_id: str, target_id: str, edge: GraphEdge) -> None:
+        """
+        Adds an edge to the graph, replacing any existing edge between the two
+        members, and notifies the secondary indexes.
+
+        Args:
+            source_id: The ID of the source member of the edge.
+            target_id: The ID of the target member of the edge.
+            edge: The GraphEdge object to store on the edge.
+        """
+        self._journal_edge(source_id, target_id)
+        previous_type = self._get_edge_type(source_id, target_id)
+        self._put_edge(source_id, target_id, edge)
+        self._notify_edge_changed(source_id, target_id, previous_type, edge.edge_type)
+
+    def _remove_edge(self, source_id: str, target_id: str) -> None:
+        """
+        Removes an edge from the graph and notifies the secondary indexes.
+
+        Args:
+            source_id: The ID of the source member of the edge.
+            target_id: The ID of the target member of the edge.
+
+        Raises:
+            KeyError: If the edge does not exist.
+        """
+        previous_type = self._get_edge_type(source_id, target_id)
+        if previous_type is None:
+            raise KeyError((source_id, target_id))
+        self._journal_edge(source_id, target_id)
+        self._delete_edge(source_id, target_id)
+        self._notify_edge_changed(source_id, target_id, previous_type, None)
+
+    def _put_edge(self, source_id: str, target_id: str, edge: GraphEdge) -> None:
+        """
+        Stores an edge in the graph and records it in the typed adjacency index.
+
+        If an edge already exists between the two members it is replaced, and
+        the index entry for its previous type is dropped.
+
+        Args:
+            source_id: The ID of the source member of the edge.
+            target_id: The ID of the target member of the edge.
+            edge: The GraphEdge object to store on the edge.
+        """
+        self._own_edge(source_id, target_id)
+        if self._graph.has_edge(source_id, target_id):
+            self._unindex_edge(source_id, target_id)
+        self._graph.add_edge(source_id, target_id, data=edge)
+        self._typed_adjacency[source_id].setdefault(edge.edge_type, {})[target_id] = (
+            None
+        )
+
+    def _unindex_edge(self, source_id: str, target_id: str) -> None:
+        """
+        Removes an existing graph edge from the typed adjacency index.
+
+        The edge itself is left untouched in the graph.
+
+        Args:
+            source_id: The ID of the source member of the edge.
+            target_id: The ID of the target member of the edge.
+        """
+        edge_obj: GraphEdge = self._graph.edges[source_id, target_id]["data"]
+        self._typed_adjacency[source_id].get(edge_obj.edge_type, {}).pop(
+            target_id, None
+        )
+
+    def _delete_edge(self, source_id: str, target_id: str) -> None:
+        """
+        Deletes an existing edge from the graph and from the typed adjacency index.
+
+        Args:
+            source_id: The ID of the source member of the edge.
+            target_id: The ID of the target member of the edge.
+        """
+        self._own_edge(source_id, target_id)
+        self._unindex_edge(source_id, target_id)
+        self._graph.remove_edge(source_id, target_id)
+
+    def _get_index(self, index_cls: type[IndexT]) -> IndexT:
+        """
+        Returns a secondary index, building it from the current graph on first use.
+
+        Args:
+            index_cls: The GraphIndex subclass to return.
+
+        Returns:
+            The index instance, kept in sync with later graph changes.
+        """
+        with self._cache_lock:
+            index = self._indexes.get(index_cls)
+            if index is None:
+                index = index_cls.from_graph_handler(self)
+                self._indexes[index_cls] = index
+            return index
+
+    def _notify_edge_changed(
+        self,
+        source_id: str,
+        target_id: str,
+        previous_type: Optional[EdgeType],
+        edge_type: Optional[EdgeType],
+    ) -> None:
+        """
+        Tells the secondary indexes that an edge was added, replaced or removed.
+
+        Args:
+            source_id: The ID of the source member of the edge.
+            target_id: The ID of the target member of the edge.
+            previous_type: The type of the edge before the change, if any.
+            edge_type: The type of the edge after the change, if any.
+        """
+        self._version += 1
+        for index in self._indexes.values():
+            index.edge_changed(source_id, target_id, previous_type, edge_type)
+
+    def _notify_member_added(self, member_id: str) -> None:
+        """Tells the secondary indexes that a member was added or replaced."""
+        self._version += 1
+        for index in self._indexes.values():
+            index.member_added(member_id)
+
+    def _notify_member_updated(self, member_id: str) -> None:
+        """Tells the secondary indexes that a member's attributes changed."""
+        self._version += 1
+        for index in self._indexes.values():
+            index.member_updated(member_id)
+
+    def _forget_member(self, member_id: str) -> None:
+        """
+        Drops a member that was removed from the graph from the family units and
+        the secondary indexes.
+
+        Args:
+            member_id: The ID of the removed member.
+        """
+        self._version += 1
+        self._remove_member_from_family_units(member_id)
+        for index in self._indexes.values():
+            index.member_removed(member_id)
+
+    def _get_typed_neighbors(self, member_id: str, edge_type: EdgeType) -> dict:
+        """
+        Returns the ordered set of members reached from a member by one edge type.
+
+        Args:
+            member_id: The ID of the member.
+            edge_type: The type of the outgoing edges to follow.
+
+        Returns:
+            A dict used as an ordered set of neighbor member IDs.
+
+        Raises:
+            NetworkXError: If the member is not part of the graph.
+        """
+        try:
+            return self._typed_adjacency[member_id].get(edge_type, {})
+        except KeyError as e:
+            raise NetworkXError(f"The node {member_id} is not in the digraph.") from e
+
     def _update_family_units_map(
         self, family_unit_id: str, data_to_update: dict[str, Any]
     ) -> None:
@@ -57,35 +768,56 @@ class GraphHandler:
         Updates the family unit map with new parent or child information.
 
         If the family unit does not exist, it creates a new one.
-        It also updates the name of the family unit based on the parents.
+        When the unit is new or gains a parent, its name is marked stale and
+        rebuilt from the parents' names the next time the map is read.
 
         Args:
             family_unit_id: The ID of the family unit to update.
             data_to_update: A dictionary containing 'parents' or 'children' keys with lists of member IDs.
         """
         logger.debug("Updating family units map...")
-        family_unit_to_update = self._family_unit_map.get(
-            family_unit_id, family_tree_pb2.FamilyUnit()
-        )
+        family_unit_to_update = self._get_family_unit_for_update(family_unit_id)
+        if family_unit_to_update is None:
+            family_unit_to_update = family_tree_pb2.FamilyUnit()
         if not family_unit_to_update.id:
             family_unit_to_update.id = family_unit_id
+            self._stale_family_unit_names.add(family_unit_id)
         if "parents" in data_to_update:
             for parent_id in data_to_update["parents"]:
                 if parent_id not in family_unit_to_update.parent_ids:
                     family_unit_to_update.parent_ids.append(parent_id)
+                    self._stale_family_unit_names.add(family_unit_id)
+                self._own_member(parent_id)
+                self._member_family_units.setdefault(parent_id, set()).add(
+                    family_unit_id
+                )
         if "children" in data_to_update:
             for child_id in data_to_update["children"]:
                 if child_id not in family_unit_to_update.child_ids:
                     family_unit_to_update.child_ids.append(child_id)
-
-        parent_names = [
-            self.get_member_info(id)["name"] for id in family_unit_to_update.parent_ids
-        ]
-        family_unit_to_update.name = (
-            " and ".join(f"{name}'s" for name in parent_names) + " family"
-        )
+                self._own_member(child_id)
+                self._member_family_units.setdefault(child_id, set()).add(
+                    family_unit_id
+                )
         self._family_unit_map[family_unit_id] = family_unit_to_update
 
+    def _refresh_family_unit_names(self) -> None:
+        """
+        Rebuilds the names of family units marked stale from their parents' names.
+        """
+        for family_unit_id in self._stale_family_unit_names:
+            family_unit = self._get_family_unit_for_update(family_unit_id)
+            if family_unit is None:
+                continue
+            parent_names = [
+                self._get_node(parent_id).attributes.name
+                for parent_id in family_unit.parent_ids
+            ]
+            family_unit.name = (
+                " and ".join(f"{name}'s" for name in parent_names) + " family"
+            )
+        self._stale_family_unit_names.clear()
+
     def _get_birth_family_id(self, member_id: str) -> str:
         """
         Retrieves the birth family unit ID for a member.
@@ -96,7 +828,7 @@ class GraphHandler:
         Returns:
             The birth family unit ID string.
         """
-        node_data: GraphNode = self._graph.nodes[member_id]["data"]
+        node_data: GraphNode = self._get_node(member_id)
         return node_data.attributes.birth_family_unit_id
 
     def _get_acquired_family_id(self, member_id: str) -> str:
@@ -109,7 +841,7 @@ class GraphHandler:
         Returns:
             The acquired family unit ID string.
         """
-        node_data: GraphNode = self._graph.nodes[member_id]["data"]
+        node_data: GraphNode = self._get_node(member_id)
         return node_data.attributes.acquired_family_unit_id
 
     def _set_birth_family_id(self, member_id: str, family_unit_id: str):
@@ -120,9 +852,8 @@ class GraphHandler:
             member_id: The ID of the member.
             family_unit_id: The birth family unit ID to set.
         """
-        self._graph.nodes[member_id][
-            "data"
-        ].attributes.birth_family_unit_id = family_unit_id
+        attributes = self._get_attributes_for_update(member_id)
+        attributes.birth_family_unit_id = family_unit_id
 
     def _set_acquired_family_id(self, member_id: str, family_unit_id: str):
         """
@@ -132,213 +863,978 @@ class GraphHandler:
             member_id: The ID of the member.
             family_unit_id: The acquired family unit ID to set.
         """
-        self._graph.nodes[member_id][
-            "data"
-        ].attributes.acquired_family_unit_id = family_unit_id
+        attributes = self._get_attributes_for_update(member_id)
+        attributes.acquired_family_unit_id = family_unit_id
+
+    def _index_family_unit_members(
+        self, family_unit_id: str, family_unit: family_tree_pb2.FamilyUnit
+    ) -> None:
+        """
+        Records every parent and child of a family unit in the member reverse index.
+
+        Args:
+            family_unit_id: The ID of the family unit.
+            family_unit: The FamilyUnit protobuf message.
+        """
+        for member_id in (*family_unit.parent_ids, *family_unit.child_ids):
+            self._own_member(member_id)
+            self._member_family_units.setdefault(member_id, set()).add(family_unit_id)
 
     def _remove_member_from_family_units(self, member_id: str):
-        """Removes a member ID from all family units and deletes empty units."""
-        units_to_delete = []
-        for unit_id, unit in self._family_unit_map.items():
+        """
+        Removes a member ID from its family units and deletes units that become empty.
+
+        Only the units recorded for the member in the reverse index are touched.
+        """
+        for unit_id in self._member_family_units.pop(member_id, set()):
+            unit = self._get_family_unit_for_update(unit_id)
+            if unit is None:
+                continue
             # Use a while loop to remove all occurrences if any duplicates exist
             while member_id in unit.parent_ids:
                 unit.parent_ids.remove(member_id)
+                self._stale_family_unit_names.add(unit_id)
             while member_id in unit.child_ids:
                 unit.child_ids.remove(member_id)
 
-            # If a family unit becomes empty, mark it for deletion
+            # If a family unit becomes empty, delete it
             if not unit.parent_ids and not unit.child_ids:
-                units_to_delete.append(unit_id)
+                del self._family_unit_map[unit_id]
+                logger.debug(
+                    f"Removed empty family unit '{unit_id}' after member deletion."
+                )
 
-        for unit_id in units_to_delete:
-            del self._family_unit_map[unit_id]
-            logger.debug(
-                f"Removed empty family unit '{unit_id}' after member deletion."
-            )
+    def _load_family_units(self, family_tree: family_tree_pb2.FamilyTree) -> None:
+        """
+        Loads the family units of a FamilyTree and indexes their members.
+
+        Args:
+            family_tree: A family_tree_pb2.FamilyTree message instance.
+        """
+        for family_unit_id, family_unit in family_tree.family_units.items():
+            self._family_unit_map[family_unit_id] = family_unit
+            self._index_family_unit_members(family_unit_id, family_unit)
+
+    def get_member_family_unit_ids(self, member_id: str) -> list[str]:
+        """
+        Retrieves the IDs of the family units a member belongs to.
+
+        Args:
+            member_id: The ID of the member.
+
+        Returns:
+            A sorted list of family unit IDs that list the member as a parent
+            or a child.
+        """
+        return sorted(self._member_family_units.get(member_id, set()))
+
+    def get_family_graph(self) -> DiGraph:
+        """
+        Returns the internal NetworkX DiGraph instance.
+
+        Returns:
+            nx.DiGraph: The family graph.
+        """
+        return self._graph
+
+    def has_member(self, member_id: str) -> bool:
+        """
+        Checks if a member is part of the graph.
+
+        Args:
+            member_id: The ID of the member.
+
+        Returns:
+            True if the member exists, False otherwise.
+        """
+        return self._graph.has_node(member_id)
+
+    def iter_member_ids(self) -> Iterator[str]:
+        """
+        Yields the IDs of all members in the graph.
+
+        Yields:
+            Member IDs in insertion order.
+        """
+        yield from self._graph.nodes
+
+    def get_family_unit_graph(self) -> dict[str, family_tree_pb2.FamilyUnit]:
+        """
+        Returns the map of family units.
+
+        Names of units whose parents changed are refreshed before returning.
+
+        Returns:
+            A dictionary mapping family unit IDs to FamilyUnit protobuf messages.
+        """
+        self._refresh_family_unit_names()
+        return self._family_unit_map
+
+    def get_member_info(self, member_id: str) -> dict[str, Any]:
+        """
+        Retrieves all stored information for a given family member.
+
+        Args:
+            member_id: The ID of the member.
+
+        Returns:
+            A dictionary containing the member's attributes.
+        """
+        node_data: GraphNode = self._get_node(member_id)
+        return MessageToDict(node_data.attributes, preserving_proto_field_name=True)
+
+    def get_member(self, member_id: str) -> family_tree_pb2.FamilyMember:
+        """
+        Retrieves the stored FamilyMember message of a member.
+
+        The message belongs to the graph and must not be modified; use
+        `update_family_member` instead.
+
+        Args:
+            member_id: The ID of the member.
+
+        Returns:
+            The member's FamilyMember message.
+
+        Raises:
+            KeyError: If the member is not part of the graph.
+        """
+        return self._get_node(member_id).attributes
+
+    def has_parent(self, member_id: str) -> bool:
+        """
+        Checks if a member has a recorded parent relationship.
+
+        Note: This checks for the existence of a parent link, not whether
+        the parent node is currently visible in a rendered graph.
+
+        Args:
+            member_id: The ID of the member.
+
+        Returns:
+            True if the member has a parent relationship, False otherwise.
+        """
+        node_data: GraphNode = self._get_node(member_id)
+        return node_data.has_visible_parents is not None
+
+    def has_child(self, member_id: str) -> bool:
+        """
+        Checks if a member has a recorded child relationship.
+
+        Note: This checks for the existence of a child link, not whether
+        the child node is currently visible in a rendered graph.
+
+        Args:
+            member_id: The ID of the member.
+
+        Returns:
+            True if the member has a child relationship, False otherwise.
+        """
+        node_data: GraphNode = self._get_node(member_id)
+        return node_data.has_visible_children is not None
+
+    def has_spouse(self, member_id: str) -> bool:
+        """
+        Checks if a member has a recorded spouse relationship.
+
+        Note: This checks for the existence of a spouse link, not whether
+        the spouse node is currently visible in a rendered graph.
+
+        Args:
+            member_id: The ID of the member.
+
+        Returns:
+            True if the member has a spouse relationship, False otherwise.
+        """
+        node_data: GraphNode = self._get_node(member_id)
+        return node_data.has_visible_spouse is not None
+
+    def get_spouse(self, member_id: str) -> Optional[str]:
+        """
+        Retrieves the ID of the first found spouse of a member.
+
+        It looks up the first member connected by a SPOUSE edge in the typed
+        adjacency index.
+
+        Args:
+            member_id: The ID of the member.
+
+        Returns:
+            The ID of the spouse, or None if no spouse is found.
+        """
+        return next(iter(self._get_typed_neighbors(member_id, EdgeType.SPOUSE)), None)
+
+    def get_spouses(self, member_id: str) -> list[str]:
+        """
+        Retrieves the IDs of all spouses of a member.
+
+        Args:
+            member_id: The ID of the member.
+
+        Returns:
+            A list of spouse member IDs.
+        """
+        return list(self._get_typed_neighbors(member_id, EdgeType.SPOUSE))
+
+    def get_children(self, member_id: str) -> list[str]:
+        """
+        Retrieves a list of children IDs for a member.
+
+        It collects all members connected by a PARENT_TO_CHILD edge from the
+        typed adjacency index.
+
+        Args:
+            member_id: The ID of the member (parent).
+
+        Returns:
+            A list of children member IDs.
+        """
+        return list(self._get_typed_neighbors(member_id, EdgeType.PARENT_TO_CHILD))
+
+    def get_parent(self, member_id: str) -> Optional[str]:
+        """
+        Retrieves the ID of the first found parent of a member.
+
+        It looks up the first member connected by a CHILD_TO_PARENT edge in the
+        typed adjacency index.
+
+        Args:
+            member_id: The ID of the member (child).
+
+        Returns:
+            The ID of the parent, or None if no parent is found.
+        """
+        return next(
+            iter(self._get_typed_neighbors(member_id, EdgeType.CHILD_TO_PARENT)), None
+        )
+
+    def get_parents(self, member_id: str) -> list[str]:
+        """
+        Retrieves the IDs of all parents of a member.
+
+        Args:
+            member_id: The ID of the member (child).
+
+        Returns:
+            A list of parent member IDs.
+        """
+        return list(self._get_typed_neighbors(member_id, EdgeType.CHILD_TO_PARENT))
+
+    def is_ancestor(self, ancestor_id: str, descendant_id: str) -> bool:
+        """
+        Checks if a member is an ancestor of another member.
+
+        A member is a parent of another if either a PARENT_TO_CHILD or a
+        CHILD_TO_PARENT edge links them. The check is answered by the lineage
+        index without walking the graph.
+
+        Args:
+            ancestor_id: The ID of the possible ancestor.
+            descendant_id: The ID of the possible descendant.
+
+        Returns:
+            True if `ancestor_id` is a parent, grandparent, etc. of `descendant_id`.
+
+        Raises:
+            MemberNotFoundError: If either member is not part of the graph.
+        """
+        return self._get_index(LineageIndex).is_ancestor(ancestor_id, descendant_id)
+
+    def count_descendants(self, member_id: str) -> int:
+        """
+        Counts the children, grandchildren, etc. of a member.
+
+        Args:
+            member_id: The ID of the member.
+
+        Returns:
+            The number of distinct descendants of the member.
+
+        Raises:
+            MemberNotFoundError: If the member is not part of the graph.
+        """
+        return self._get_index(LineageIndex).count_descendants(member_id)
+
+    def find_common_ancestors(
+        self, member_pairs: Iterable[tuple[str, str]]
+    ) -> list[list[CommonAncestor]]:
+        """
+        Finds the lowest common ancestors of many pairs of members at once.
+
+        The ancestors of each member are collected once and reused for every
+        pair the member is part of, so a table over a group of members costs
+        about as much as one query per member. The generation distances give
+        the cousin degree, min(source, target) - 1, and the number of times
+        removed, |source - target|.
+
+        Args:
+            member_pairs: The (source member ID, target member ID) pairs.
+
+        Returns:
+            For every pair, in order, its lowest common ancestors with the
+            generations from each member, nearest first. A member counts as
+            its own ancestor.
+
+        Raises:
+            MemberNotFoundError: If a member of any pair is not part of the graph.
+        """
+        ancestry = self._get_index(AncestryIndex)
+        return [
+            ancestry.lowest_common_ancestors(source_member_id, target_member_id)
+            for source_member_id, target_member_id in member_pairs
+        ]
+
+    def search_members(self, prefix: str, limit: int) -> list[NameMatch]:
+        """
+        Finds members whose name or nicknames start with the given words.
+
+        The search is answered by the name index, which is built on first use
+        and kept up to date as members are added, renamed and removed.
+
+        Args:
+            prefix: The start of one or more words of the name, e.g. "ron w".
+            limit: The largest number of matches to return.
+
+        Returns:
+            Up to `limit` matches, those on the name before those on a
+            nickname, each ordered by the matching word and then by name.
+        """
+        return self._get_index(NameIndex).search(prefix, limit)
+
+    def filter_members(
+        self,
+        column_filters: Iterable[ColumnFilter] = (),
+        info_filters: Iterable[InfoFilter] = (),
+        limit: Optional[int] = None,
+    ) -> tuple[int, list[str]]:
+        """
+        Finds the members whose attributes meet every condition.
+
+        The filter is answered by the attribute index, which keeps dates,
+        gender, whether members are alive, Tamil calendar fields and
+        additional_info values in columns. It is built on first use and kept
+        up to date as members are added, updated and removed.
+
+        Args:
+            column_filters: Conditions on attributes, e.g.
+                `ColumnFilter("birth_year", minimum=1940, maximum=1960)`.
+            info_filters: Conditions on additional_info keys.
+            limit: The largest number of member IDs to return, if any.
+
+        Returns:
+            The number of matching members and the IDs of up to `limit` of
+            them, in no particular order.
+
+        Raises:
+            InvalidInputError: If a filter names an unknown attribute.
+        """
+        return self._get_index(AttributeIndex).filter(
+            list(column_filters), list(info_filters), limit
+        )
+
+    def find_events(
+        self,
+        start: datetime.date,
+        end: Optional[datetime.date] = None,
+        limit: Optional[int] = None,
+        kinds: Optional[Iterable[EventKind]] = None,
+    ) -> list[CalendarEvent]:
+        """
+        Finds the birthdays and wedding anniversaries from a date on.
+
+        The events are read from the calendar index, which is built on first
+        use and kept up to date as members are added, updated and removed.
+
+        Args:
+            start: The first day to look at.
+            end: The last day to look at, less than a year after `start`. If
+                not given, the year from `start` on is looked at.
+            limit: The largest number of events to return, if any.
+            kinds: The kinds of events to find, all if not given.
+
+        Returns:
+            The first `limit` events from `start` to `end`, in date order.
+
+        Raises:
+            InvalidInputError: If `end` is before `start` or a year or more
+                after it, or `limit` is negative.
+        """
+        return self._get_index(CalendarIndex).find_events(
+            start, end, limit, None if kinds is None else list(kinds)
+        )
+
+    def find_star_days(
+        self, tamil_month: int, star: Optional[int] = None
+    ) -> list[StarDay]:
+        """
+        Finds the members whose birth star day falls in a Tamil month.
+
+        Args:
+            tamil_month: The TamilMonth value.
+            star: The TamilStar value, if only that star's members are wanted.
+
+        Returns:
+            The star days, ordered by star and then by member ID.
+        """
+        return self._get_index(CalendarIndex).star_days(tamil_month, star)
+
+    def find_violations(
+        self, member_ids: Optional[Iterable[str]] = None
+    ) -> list[Violation]:
+        """
+        Returns the genealogical invariants the tree breaks, e.g. a member who
+        is their own ancestor or a child born before a parent.
+
+        The violations are kept by the consistency index, which audits the
+        whole tree on first use and then re-checks only what each change
+        touches.
+
+        Args:
+            member_ids: The members whose violations to return. All violations
+                if not given.
+
+        Returns:
+            The violations, ordered by member ID.
+        """
+        return self._get_index(ConsistencyIndex).violations(member_ids)
+
+    def audit_consistency(self) -> list[Violation]:
+        """
+        Checks every member and parent-child link of the tree from scratch.
+
+        The audit takes time linear in the size of the tree. Its result
+        replaces the consistency index kept up to date by the changes.
+
+        Returns:
+            All violations, ordered by member ID.
+        """
+        with self._cache_lock:
+            self._get_index(LineageIndex)
+            self._indexes.pop(ConsistencyIndex, None)
+            return self.find_violations()
+
+    def _iter_kinship_links(
+        self, member_id: str, lineage: LineageIndex
+    ) -> Iterator[tuple[KinshipStep, str]]:
+        """
+        Yields the parents, children and spouses of a member with their step.
+
+        Parents and children come from the lineage index, so a link recorded
+        by an edge in either direction is found.
+        """
+        for parent_id in lineage.get_parent_ids(member_id):
+            yield KinshipStep.PARENT, parent_id
+        for child_id in lineage.get_child_ids(member_id):
+            yield KinshipStep.CHILD, child_id
+        for spouse_id in self._get_typed_neighbors(member_id, EdgeType.SPOUSE):
+            yield KinshipStep.SPOUSE, spouse_id
+
+    def find_relationship_path(
+        self, source_member_id: str, target_member_id: str
+    ) -> Optional[list[tuple[KinshipStep, str]]]:
+        """
+        Finds the shortest chain of parent, child and spouse links between two members.
+
+        The search runs breadth-first from both members at once, always
+        growing the smaller frontier, so it only visits the members within
+        about half the distance of either end. Links are treated as symmetric:
+        a member is a parent of its children and a spouse of its spouses.
+        Parent and child links are followed before spouse links, and among
+        the paths found when the searches meet, the one with the fewest
+        spouse links wins, so blood relationships are preferred.
+
+        Args:
+            source_member_id: The ID of the member the path starts from.
+            target_member_id: The ID of the member the path leads to.
+
+        Returns:
+            The path as (step, member ID) pairs, where each step says how the
+            member is related to the previous one, e.g. KinshipStep.PARENT for
+            "the previous member's parent". Empty if both IDs are the same,
+            None if the members are not connected.
+
+        Raises:
+            MemberNotFoundError: If either member is not part of the graph.
+        """
+        for member_id in (source_member_id, target_member_id):
+            if not self.has_member(member_id):
+                raise MemberNotFoundError(
+                    member_id=member_id, operation="find_relationship_path"
+                )
+        if source_member_id == target_member_id:
+            return []
+
+        lineage = self._get_index(LineageIndex)
+        # Each member reached maps to its neighbor on the path towards the
+        # start of its search and the step linking the two, read in the
+        # source-to-target direction.
+        forward: dict[str, Optional[tuple[str, KinshipStep]]] = {
+            source_member_id: None
+        }
+        backward: dict[str, Optional[tuple[str, KinshipStep]]] = {
+            target_member_id: None
+        }
+        forward_frontier = [source_member_id]
+        backward_frontier = [target_member_id]
+        while forward_frontier and backward_frontier:
+            is_forward = len(forward_frontier) <= len(backward_frontier)
+            frontier = forward_frontier if is_forward else backward_frontier
+            reached, other = (forward, backward) if is_forward else (backward, forward)
+            next_frontier = []
+            meetings = []
+            for member_id in frontier:
+                for step, neighbor_id in self._iter_kinship_links(member_id, lineage):
+                    if neighbor_id in reached:
+                        continue
+                    reached[neighbor_id] = (
+                        member_id,
+                        step if is_forward else step.inverse(),
+                    )
+                    next_frontier.append(neighbor_id)
+                    if neighbor_id in other:
+                        meetings.append(neighbor_id)
+            if meetings:
+                return min(
+                    (
+                        self._join_relationship_path(forward, backward, meeting_id)
+                        for meeting_id in meetings
+                    ),
+                    key=lambda path: (
+                        len(path),
+                        sum(step is KinshipStep.SPOUSE for step, _ in path),
+                    ),
+                )
+            if is_forward:
+                forward_frontier = next_frontier
+            else:
+                backward_frontier = next_frontier
+        return None
 
-    def get_family_graph(self) -> DiGraph:
+    @staticmethod
+    def _join_relationship_path(
+        forward: dict[str, Optional[tuple[str, KinshipStep]]],
+        backward: dict[str, Optional[tuple[str, KinshipStep]]],
+        meeting_id: str,
+    ) -> list[tuple[KinshipStep, str]]:
+        """Builds the path through a member reached by both searches."""
+        path = []
+        member_id = meeting_id
+        while forward[member_id] is not None:
+            previous_id, step = forward[member_id]
+            path.append((step, member_id))
+            member_id = previous_id
+        path.reverse()
+        member_id = meeting_id
+        while backward[member_id] is not None:
+            next_id, step = backward[member_id]
+            path.append((step, next_id))
+            member_id = next_id
+        return path
+
+    def copy(self) -> "GraphHandler":
         """
-        Returns the internal NetworkX DiGraph instance.
+        Returns an independent copy of the graph, e.g. for a writer to change
+        while readers keep using this one.
+
+        Only the top-level dicts are copied, which takes time linear in the
+        number of members but little per member. The containers stored per
+        member, the family unit messages and the GraphEdge objects are shared,
+        and each handler copies a member's containers or a family unit the
+        first time it changes them. Secondary indexes are copied or rebuilt as
+        each index decides.
 
         Returns:
-            nx.DiGraph: The family graph.
+            A new handler of the same class with the same members, edges and
+            family units.
         """
-        return self._graph
-
-    def get_family_unit_graph(self) -> dict[str, family_tree_pb2.FamilyUnit]:
+        clone = type(self)()
+        self._owned_member_ids = set()
+        self._owned_family_unit_ids = set()
+        clone._owned_member_ids = set()
+        clone._owned_family_unit_ids = set()
+        # Both handlers' changes from here on follow the ones so far.
+        ended_changes = self._changes
+        self._changes = GraphChanges(ended_changes)
+        clone._changes = GraphChanges(ended_changes)
+        self._copy_store_to(clone)
+        clone._family_unit_map = self._family_unit_map.copy()
+        clone._member_family_units = self._member_family_units.copy()
+        clone._stale_family_unit_names = self._stale_family_unit_names.copy()
+        clone._version = self._version
+        # Readers may build indexes on this handler while it is being copied.
+        with self._cache_lock:
+            # View sessions outlive copies, so the copy shares them even if no
+            # view has been opened yet.
+            self._get_index(VisibilityIndex)
+            indexes = list(self._indexes.items())
+        for index_cls, index in indexes:
+            index_copy = index.copy_for(clone)
+            if index_copy is not None:
+                clone._indexes[index_cls] = index_copy
+        return clone
+
+    def checkpoint_changes(self) -> GraphChanges:
         """
-        Returns the map of family units.
+        Ends the current change set, to mark this point in the history, e.g.
+        when the tree is saved.
 
         Returns:
-            A dictionary mapping family unit IDs to FamilyUnit protobuf messages.
+            The latest change set that is not empty, or the first one of the
+            history. Pass it to `changes_since` to get what changed after it.
         """
-        return self._family_unit_map
-
-    def get_member_info(self, member_id: str) -> dict[str, Any]:
+        checkpoint = self._changes
+        self._changes = GraphChanges(checkpoint)
+        while checkpoint.is_empty() and checkpoint.previous is not None:
+            checkpoint = checkpoint.previous
+        return checkpoint
+
+    def changes_since(
+        self, checkpoint: Optional[GraphChanges]
+    ) -> Optional[GraphChanges]:
         """
-        Retrieves all stored information for a given family member.
+        Returns the IDs of the members, relationships and family units changed
+        since a checkpoint.
 
         Args:
-            member_id: The ID of the member.
+            checkpoint: A change set returned by `checkpoint_changes` of this
+                handler or of a handler it was copied from.
 
         Returns:
-            A dictionary containing the member's attributes.
+            The changes, or None if the checkpoint is None or from another
+            history, e.g. from before the tree was loaded.
         """
-        node_data: GraphNode = self._graph.nodes[member_id]["data"]
-        return MessageToDict(node_data.attributes, preserving_proto_field_name=True)
+        return self._changes.collect_since(checkpoint)
 
-    def has_parent(self, member_id: str) -> bool:
+    def get_tree_edit(self, changes: GraphChanges) -> TreeEdit:
         """
-        Checks if a member has a recorded parent relationship.
+        Returns the current state of what changed in the graph, as an edit of
+        a FamilyTree message.
 
-        Note: This checks for the existence of a parent link, not whether
-        the parent node is currently visible in a rendered graph.
+        A member's relationships are listed in the graph's order. A member
+        without relationships has its Relationships entry deleted. The cost is
+        proportional to the number of changes and the degrees of the changed
+        members.
 
         Args:
-            member_id: The ID of the member.
+            changes: The changed member, relationships and family unit IDs,
+                from `changes_since`.
 
         Returns:
-            True if the member has a parent relationship, False otherwise.
+            The changed members, relationships and family units, copied, and
+            those the graph no longer has.
         """
-        node_data: GraphNode = self._graph.nodes[member_id]["data"]
-        return node_data.has_visible_parents is not None
-
-    def has_child(self, member_id: str) -> bool:
+        edit = TreeEdit(family_tree_pb2.FamilyTree(), family_tree_pb2.FamilyTree())
+        for member_id in changes.member_ids:
+            if self.has_member(member_id):
+                edit.changed.members[member_id].CopyFrom(self.get_member(member_id))
+            else:
+                edit.deleted.members[member_id].SetInParent()
+        for source_id in changes.relationship_ids:
+            if not self.has_member(source_id):
+                edit.deleted.relationships[source_id].SetInParent()
+                continue
+            relationships = family_tree_pb2.Relationships(
+                children_ids=self.get_children(source_id),
+                parent_ids=self.get_parents(source_id),
+                spouse_ids=self.get_spouses(source_id),
+            )
+            if relationships.ByteSize():
+                edit.changed.relationships[source_id].CopyFrom(relationships)
+            else:
+                edit.deleted.relationships[source_id].SetInParent()
+        family_unit_map = self.get_family_unit_graph()
+        for family_unit_id in changes.family_unit_ids:
+            family_unit = family_unit_map.get(family_unit_id)
+            if family_unit is not None:
+                edit.changed.family_units[family_unit_id].CopyFrom(family_unit)
+            else:
+                edit.deleted.family_units[family_unit_id].SetInParent()
+        return edit
+
+    def _copy_store_to(self, clone: "GraphHandler") -> None:
         """
-        Checks if a member has a recorded child relationship.
-
-        Note: This checks for the existence of a child link, not whether
-        the child node is currently visible in a rendered graph.
+        Copies the members and edges into a new, empty handler.
 
         Args:
-            member_id: The ID of the member.
-
-        Returns:
-            True if the member has a child relationship, False otherwise.
+            clone: The handler to copy into.
         """
-        node_data: GraphNode = self._graph.nodes[member_id]["data"]
-        return node_data.has_visible_children is not None
+        graph = clone._graph
+        graph.graph.update(self._graph.graph)
+        # Assigning `_adj` also sets `_succ` and resets the cached views.
+        graph._node = self._graph._node.copy()
+        graph._adj = self._graph._succ.copy()
+        graph._pred = self._graph._pred.copy()
+        clone._typed_adjacency = self._typed_adjacency.copy()
 
-    def has_spouse(self, member_id: str) -> bool:
+    def create_from_proto(self, family_tree: family_tree_pb2.FamilyTree) -> None:
         """
-        Checks if a member has a recorded spouse relationship.
+        Creates a NetworkX directed graph from a FamilyTree protobuf message.
 
-        Note: This checks for the existence of a spouse link, not whether
-        the spouse node is currently visible in a rendered graph.
+        The graph nodes represent family members, and edges represent relationships
+        like parent-child and spouse.
+
+        This is a bulk build: every relationship is read once, member references
+        are checked against a set of the tree's member IDs, and nodes and edges
+        are added with batched `add_nodes_from` and `add_edges_from` calls instead
+        of going through `add_member` and the `add_*_relation` methods one item
+        at a time. The resulting graph is the same as adding every member and
+        relationship individually without updating family units.
 
         Args:
-            member_id: The ID of the member.
+            family_tree: A family_tree_pb2.FamilyTree message instance.
 
-        Returns:
-            True if the member has a spouse relationship, False otherwise.
+        Raises:
+            InvalidInputError: If any relationship refers to a member that is not
+                part of the tree. All dangling references are reported together.
         """
-        node_data: GraphNode = self._graph.nodes[member_id]["data"]
-        return node_data.has_visible_spouse is not None
+        logger.info("Creating NetworkX graph from FamilyTree proto...")
+        self._reset_graph()
 
-    def get_spouse(self, member_id: str) -> Optional[str]:
+        # The build allocates a few objects per member and per edge; pausing the
+        # cyclic garbage collector avoids repeated full-heap scans while loading.
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            nodes, edges = self._collect_nodes_and_edges(family_tree)
+
+            self._graph.add_nodes_from(
+                (member_id, {"data": node_obj}) for member_id, node_obj in nodes.items()
+            )
+            self._add_collected_edges(nodes, edges)
+            self._load_family_units(family_tree)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        self._share_loaded_messages()
+
+        logger.info(
+            f"Finished creating NetworkX graph from FamilyTree proto with "
+            f"{len(nodes)} members and {len(edges)} relationships."
+        )
+
+    def create_from_records(self, records: Iterable[TreeRecord]) -> None:
         """
-        Retrieves the ID of the first found spouse of a member.
+        Creates the graph from the records of a stream file as they are read.
 
-        It iterates through the neighbors and returns the first one connected
-        by a SPOUSE edge.
+        Each member becomes a node as soon as its record arrives, so the
+        stream's messages are only held once, by the graph, and no FamilyTree
+        message of the whole tree is built. Relationships are checked and
+        collected as they arrive and added as edges at the end, like
+        `create_from_proto` does. Stream files list every member before any
+        relationships.
 
         Args:
-            member_id: The ID of the member.
+            records: The records of a stream, usually from
+                `tree_stream.read_tree_stream`.
 
-        Returns:
-            The ID of the spouse, or None if no spouse is found.
+        Raises:
+            InvalidInputError: If any relationship refers to a member that is not
+                part of the tree or comes after the relationship. All dangling
+                references are reported together.
         """
-        for neighbor in self._graph.neighbors(member_id):
-            edge_obj: GraphEdge = self._graph.get_edge_data(member_id, neighbor)["data"]
-            if edge_obj.edge_type == EdgeType.SPOUSE:
-                return neighbor
-        return None
+        logger.info("Creating NetworkX graph from a stream of records...")
+        self._reset_graph()
+
+        nodes: dict[str, GraphNode] = {}
+        edges: dict[tuple[str, str], GraphEdge] = {}
+        dangling_references: list[str] = []
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for kind, key, message in records:
+                if kind == RecordKind.MEMBER:
+                    node_obj = GraphNode(attributes=message)
+                    nodes[key] = node_obj
+                    self._graph.add_node(key, data=node_obj)
+                elif kind == RecordKind.RELATIONSHIPS:
+                    self._collect_relationship_edges(
+                        key, message, nodes, edges, dangling_references
+                    )
+                else:
+                    self._family_unit_map[key] = message
+                    self._index_family_unit_members(key, message)
+            self._raise_for_dangling_references(dangling_references)
+            self._add_collected_edges(nodes, edges)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+        logger.info(
+            f"Finished creating NetworkX graph from a stream with "
+            f"{len(nodes)} members and {len(edges)} relationships."
+        )
 
-    def get_children(self, member_id: str) -> list[str]:
+    def _share_loaded_messages(self) -> None:
         """
-        Retrieves a list of children IDs for a member.
-
-        It iterates through the neighbors and collects all those connected
-        by a PARENT_TO_CHILD edge.
+        Marks the member and family unit messages of a FamilyTree the graph was
+        built from as shared, so that they are copied before they are changed.
 
-        Args:
-            member_id: The ID of the member (parent).
+        The FamilyTree's owner, e.g. a ProtoHandler, keeps using them.
+        """
+        self._owned_member_ids = set()
+        self._owned_family_unit_ids = set()
 
-        Returns:
-            A list of children member IDs.
+    def _reset_graph(self) -> None:
+        """Replaces the graph, the family units and every index with empty ones."""
+        self._graph = DiGraph()  # Initialize the private graph
+        self._family_unit_map = {}  # Initialize the family unit map
+        self._typed_adjacency = {}  # Initialize the typed adjacency index
+        self._member_family_units = {}  # Initialize the family unit reverse index
+        self._stale_family_unit_names = set()
+        self._indexes = {}  # Secondary indexes are rebuilt on first use
+        self._owned_member_ids = None
+        self._owned_family_unit_ids = None
+        self._version += 1
+        self._changes = GraphChanges()
+
+    def _add_collected_edges(
+        self,
+        nodes: dict[str, GraphNode],
+        edges: dict[tuple[str, str], GraphEdge],
+    ) -> None:
         """
-        children: list[str] = []
-        for neighbor in self._graph.neighbors(member_id):
-            edge_obj: GraphEdge = self._graph.get_edge_data(member_id, neighbor)["data"]
-            if edge_obj.edge_type == EdgeType.PARENT_TO_CHILD:
-                children.append(neighbor)
-        return children
+        Adds the edges of a bulk build to the graph and the typed adjacency.
 
-    def get_parent(self, member_id: str) -> Optional[str]:
+        Args:
+            nodes: The GraphNode objects keyed by member ID.
+            edges: The GraphEdge objects keyed by (source ID, target ID).
         """
-        Retrieves the ID of the first found parent of a member.
+        self._graph.add_edges_from(
+            (source_id, target_id, {"data": edge_obj})
+            for (source_id, target_id), edge_obj in edges.items()
+        )
+        self._typed_adjacency = {member_id: {} for member_id in nodes}
+        for (source_id, target_id), edge_obj in edges.items():
+            self._typed_adjacency[source_id].setdefault(edge_obj.edge_type, {})[
+                target_id
+            ] = None
+
+    def _collect_nodes_and_edges(
+        self, family_tree: family_tree_pb2.FamilyTree
+    ) -> tuple[dict[str, GraphNode], dict[tuple[str, str], GraphEdge]]:
+        """
+        Builds the node and edge objects for a FamilyTree in a single pass.
 
-        It iterates through the neighbors and returns the first one connected
-        by a CHILD_TO_PARENT edge.
+        Later duplicate relationships replace earlier ones, exactly like repeated
+        `add_edge` calls would. Spouse edges are only rendered in one direction.
 
         Args:
-            member_id: The ID of the member (child).
+            family_tree: A family_tree_pb2.FamilyTree message instance.
 
         Returns:
-            The ID of the parent, or None if no parent is found.
+            A tuple of the GraphNode objects keyed by member ID and the GraphEdge
+            objects keyed by (source ID, target ID).
+
+        Raises:
+            InvalidInputError: If any relationship refers to a member that is not
+                part of the tree. All dangling references are reported together.
         """
-        for neighbor in self._graph.neighbors(member_id):
-            edge_obj: GraphEdge = self._graph.get_edge_data(member_id, neighbor)["data"]
-            if edge_obj.edge_type == EdgeType.CHILD_TO_PARENT:
-                return neighbor
-        return None
+        nodes: dict[str, GraphNode] = {
+            member_id: GraphNode(attributes=member_data)
+            for member_id, member_data in family_tree.members.items()
+        }
+        edges: dict[tuple[str, str], GraphEdge] = {}
+        dangling_references: list[str] = []
+
+        for source_member_id, relationships_data in family_tree.relationships.items():
+            self._collect_relationship_edges(
+                source_member_id, relationships_data, nodes, edges, dangling_references
+            )
+        self._raise_for_dangling_references(dangling_references)
+        return nodes, edges
 
-    def create_from_proto(self, family_tree: family_tree_pb2.FamilyTree) -> None:
+    @staticmethod
+    def _collect_relationship_edges(
+        source_member_id: str,
+        relationships_data: family_tree_pb2.Relationships,
+        nodes: dict[str, GraphNode],
+        edges: dict[tuple[str, str], GraphEdge],
+        dangling_references: list[str],
+    ) -> None:
         """
-        Creates a NetworkX directed graph from a FamilyTree protobuf message.
+        Builds the edge objects of one member's relationships.
 
-        The graph nodes represent family members, and edges represent relationships
-        like parent-child and spouse.
+        Later duplicate relationships replace earlier ones, exactly like repeated
+        `add_edge` calls would. Spouse edges are only rendered in one direction.
 
         Args:
-            family_tree: A family_tree_pb2.FamilyTree message instance.
+            source_member_id: The ID of the member the relationships are of.
+            relationships_data: The member's Relationships message.
+            nodes: The GraphNode objects keyed by member ID. The flags of the
+                member's node are updated.
+            edges: The GraphEdge objects keyed by (source ID, target ID), which
+                the new edges are added to.
+            dangling_references: Descriptions of references to members that are
+                not in `nodes`, which new ones are appended to.
         """
-        logger.info("Creating NetworkX graph from FamilyTree proto...")
-        self._graph = DiGraph()  # Initialize the private graph
-        self._family_unit_map = {}  # Initialize the family unit map
-
-        # 1. Add all members as nodes
-        for (
-            member_id,
-            member_data,
-        ) in family_tree.members.items():  # Use the passed parameter
-            self.add_member(member_id, member_data)
-
-        # 2. Add relationships as edges
-        for (
-            source_member_id,
-            relationships_data,
-        ) in family_tree.relationships.items():  # Use the passed parameter
-            # Children relationships: source_member_id is PARENT of child_id
-            for child_id in relationships_data.children_ids:
-                self.add_child_relation(
-                    source_member_id, child_id, add_to_family_unit=False
-                )
-            # Spouse relationships: source_member_id is SPOUSE of spouse_id
-            for spouse_id in relationships_data.spouse_ids:
-                self.add_spouse_relation(
-                    source_member_id, spouse_id, add_to_family_unit=False
-                )
-            # Parent relationships: source_member_id is CHILD of parent_id
-            for parent_id in relationships_data.parent_ids:
-                self.add_parent_relation(
-                    source_member_id, parent_id, add_to_family_unit=False
+        children_ids = list(relationships_data.children_ids)
+        spouse_ids = list(relationships_data.spouse_ids)
+        parent_ids = list(relationships_data.parent_ids)
+        source_node = nodes.get(source_member_id)
+        if source_node is None:
+            if children_ids or spouse_ids or parent_ids:
+                dangling_references.append(
+                    f"Source ID '{source_member_id}' not found in graph nodes."
                 )
+            return
 
-        for family_unit_id, family_unit in family_tree.family_units.items():
-            self._family_unit_map[family_unit_id] = family_unit
+        # Children relationships: source_member_id is PARENT of child_id
+        for child_id in children_ids:
+            edges[source_member_id, child_id] = GraphEdge.shared(
+                EdgeType.PARENT_TO_CHILD, is_rendered=True
+            )
+        # Spouse relationships: source_member_id is SPOUSE of spouse_id
+        for spouse_id in spouse_ids:
+            edges[source_member_id, spouse_id] = GraphEdge.shared(
+                EdgeType.SPOUSE,
+                is_rendered=(spouse_id, source_member_id) not in edges,
+            )
+        # Parent relationships: source_member_id is CHILD of parent_id
+        for parent_id in parent_ids:
+            edges[source_member_id, parent_id] = GraphEdge.shared(
+                EdgeType.CHILD_TO_PARENT, is_rendered=False
+            )
+
+        if children_ids:
+            source_node.has_visible_children = False
+        if spouse_ids:
+            source_node.has_visible_spouse = False
+        if parent_ids:
+            source_node.has_visible_parents = False
+
+        for type, target_ids in (
+            ("Child", children_ids),
+            ("Spouse", spouse_ids),
+            ("Parent", parent_ids),
+        ):
+            for target_id in target_ids:
+                if target_id not in nodes:
+                    dangling_references.append(
+                        f"{type} ID '{target_id}' not found in graph nodes."
+                    )
+
+    @staticmethod
+    def _raise_for_dangling_references(dangling_references: list[str]) -> None:
+        """
+        Reports the dangling member references found by a bulk build.
+
+        Args:
+            dangling_references: Descriptions of the dangling references.
 
-        logger.info("Finished creating NetworkX graph from FamilyTree proto.")
+        Raises:
+            InvalidInputError: If there are any dangling references.
+        """
+        if dangling_references:
+            error_message = (
+                f"Found {len(dangling_references)} dangling member reference(s) "
+                f"in relationships: {' '.join(dangling_references)}"
+            )
+            logger.error(error_message)
+            raise InvalidInputError(
+                operation="Adding edges",
+                field="relationships",
+                description=error_message,
+            )
 
     def add_member(
         self, member_id: str, member_data: family_tree_pb2.FamilyMember
@@ -358,7 +1854,12 @@ class GraphHandler:
         """
         node_obj = GraphNode(attributes=member_data)
 
+        self._journal_member(member_id)
+        # Re-adding a member updates its node attribute dict in place.
+        self._own_member(member_id)
         self._graph.add_node(member_id, data=node_obj)
+        self._typed_adjacency.setdefault(member_id, {})
+        self._notify_member_added(member_id)
         logger.debug(f"Added node: {member_id}")
 
     def add_child_relation(
@@ -385,11 +1886,9 @@ class GraphHandler:
         self._check_if_node_exists(child_id, "Child")
 
         # Edge: source_member_id -> child_id (CHILD)
-        edge_data_child = GraphEdge(
-            edge_type=EdgeType.PARENT_TO_CHILD, is_rendered=True
-        )
-        self._graph.add_edge(source_member_id, child_id, data=edge_data_child)
-        self._graph.nodes[source_member_id]["data"].has_visible_children = False
+        edge_data_child = GraphEdge.shared(EdgeType.PARENT_TO_CHILD, is_rendered=True)
+        self._add_typed_edge(source_member_id, child_id, edge_data_child)
+        self._get_node_for_update(source_member_id).has_visible_children = False
         logger.debug(f"Added CHILD edge: {source_member_id} -> {child_id}")
 
         # Update family_units
@@ -433,12 +1932,10 @@ class GraphHandler:
         self._check_if_node_exists(spouse_id, "Spouse")
 
         # Edge: source_member_id -> spouse_id (SPOUSE)
-        is_edge_rendered = (
-            False if self._graph.has_edge(spouse_id, source_member_id) else True
-        )
-        edge_data = GraphEdge(edge_type=EdgeType.SPOUSE, is_rendered=is_edge_rendered)
-        self._graph.add_edge(source_member_id, spouse_id, data=edge_data)
-        self._graph.nodes[source_member_id]["data"].has_visible_spouse = False
+        is_edge_rendered = not self._has_edge(spouse_id, source_member_id)
+        edge_data = GraphEdge.shared(EdgeType.SPOUSE, is_rendered=is_edge_rendered)
+        self._add_typed_edge(source_member_id, spouse_id, edge_data)
+        self._get_node_for_update(source_member_id).has_visible_spouse = False
         logger.debug(f"Added SPOUSE edge: {source_member_id} -> {spouse_id}")
 
         # Update family_units
@@ -481,11 +1978,11 @@ class GraphHandler:
         self._check_if_node_exists(parent_id, "Parent")
 
         # Edge: source_member_id -> parent_id (PARENT)
-        edge_data_parent = GraphEdge(
-            edge_type=EdgeType.CHILD_TO_PARENT, is_rendered=False
+        edge_data_parent = GraphEdge.shared(
+            EdgeType.CHILD_TO_PARENT, is_rendered=False
         )
-        self._graph.add_edge(source_member_id, parent_id, data=edge_data_parent)
-        self._graph.nodes[source_member_id]["data"].has_visible_parents = False
+        self._add_typed_edge(source_member_id, parent_id, edge_data_parent)
+        self._get_node_for_update(source_member_id).has_visible_parents = False
         logger.debug(f"Added PARENT edge: {source_member_id} -> {parent_id}")
 
         # Update family_units
@@ -509,15 +2006,103 @@ class GraphHandler:
         """
         Updates the attributes of a family member in the graph.
 
+        If the member's name changes, the names of the family units where the
+        member is a parent are marked stale.
+
         Args:
             member_id: The ID of the member to update.
             updated_family_member: The updated FamilyMember protobuf message.
         """
-        member_info: GraphNode = self._graph.nodes[member_id]["data"]
-        proto_utils.apply_changes(member_info.attributes, updated_family_member)
-        self._graph.nodes[member_id]["data"] = member_info
+        attributes = self._get_attributes_for_update(member_id)
+        previous_name = attributes.name
+        proto_utils.apply_changes(attributes, updated_family_member)
+        if attributes.name != previous_name:
+            self._mark_family_unit_names_stale(member_id)
+        self._notify_member_updated(member_id)
         logger.debug(f"Updated member: {member_id}")
 
+    def fill_traditional_dates(self, overwrite: bool = False) -> int:
+        """
+        Sets the traditional dates of birth and death from the Gregorian ones.
+
+        All dates are converted at once with the precomputed Tamil calendar.
+        Only complete, valid Gregorian dates up to the last year the calendar
+        supports are converted.
+
+        Args:
+            overwrite: Whether to replace traditional dates that are already
+                set. If False, only empty ones are filled.
+
+        Returns:
+            The number of traditional dates set.
+        """
+        fields = (
+            ("date_of_birth", "traditional_date_of_birth"),
+            ("date_of_death", "traditional_date_of_death"),
+        )
+        targets: list[tuple[str, str]] = []
+        dates: list[datetime.date] = []
+        # Every member is read and most are copied and journaled, which
+        # allocates a few objects each; pausing the cyclic garbage collector
+        # avoids repeated full-heap scans.
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for member_id in self.iter_member_ids():
+                member = self.get_member(member_id)
+                for date_field, traditional_field in fields:
+                    if not overwrite and getattr(member, traditional_field).ByteSize():
+                        continue
+                    date = getattr(member, date_field)
+                    if date.year > LAST_SUPPORTED_YEAR:
+                        continue
+                    try:
+                        dates.append(datetime.date(date.year, date.month, date.date))
+                    except ValueError:
+                        continue
+                    targets.append((member_id, traditional_field))
+            if not dates:
+                return 0
+            tamil_calendar = get_tamil_calendar(
+                min(min(dates).year, 1800), max(max(dates).year, 2100)
+            )
+            # Members share a few thousand distinct traditional dates, so each
+            # is built once and copied into the members.
+            traditional_dates: dict[tuple, utils_pb2.TraditionalDate] = {}
+            for (member_id, traditional_field), *values in zip(
+                targets, *(values.tolist() for values in tamil_calendar.convert(dates))
+            ):
+                key = tuple(values)
+                traditional_date = traditional_dates.get(key)
+                if traditional_date is None:
+                    month, star, paksham, thithi = key
+                    traditional_date = traditional_dates[key] = (
+                        utils_pb2.TraditionalDate(
+                            month=month, star=star, paksham=paksham, thithi=thithi
+                        )
+                    )
+                attributes = self._get_attributes_for_update(member_id)
+                getattr(attributes, traditional_field).CopyFrom(traditional_date)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        for member_id in dict.fromkeys(member_id for member_id, _ in targets):
+            self._notify_member_updated(member_id)
+        return len(targets)
+
+    def _mark_family_unit_names_stale(self, member_id: str) -> None:
+        """
+        Marks the names of the family units where a member is a parent stale.
+
+        Args:
+            member_id: The ID of the member whose name changed.
+        """
+        for unit_id in self._member_family_units.get(member_id, set()):
+            family_unit = self._family_unit_map.get(unit_id)
+            if family_unit is not None and member_id in family_unit.parent_ids:
+                self._journal_family_unit(unit_id)
+                self._stale_family_unit_names.add(unit_id)
+
     def remove_member(self, member_id: str, remove_orphaned_neighbors: bool):
         """
         Removes a family member from the graph.
@@ -533,15 +2118,25 @@ class GraphHandler:
             MemberNotFoundError: If the member with the given ID is not found.
         """
         if self._graph.has_node(member_id):
+            self._journal_member_removal(member_id)
             neighbors = list(self._graph.neighbors(member_id))
-            # Remove the primary member from graph and family units
+            predecessors = list(self._graph.predecessors(member_id))
+            # Removing the node changes the adjacency dicts of its neighbors.
+            for neighbor in (*neighbors, *predecessors):
+                self._own_member(neighbor)
+            # Remove the primary member from graph, adjacency index and family units
+            for predecessor in predecessors:
+                self._unindex_edge(predecessor, member_id)
             self._graph.remove_node(member_id)
-            self._remove_member_from_family_units(member_id)
+            del self._typed_adjacency[member_id]
+            self._forget_member(member_id)
             if remove_orphaned_neighbors:
                 for neighbor in neighbors:
                     if self._graph.degree(neighbor) == 0:
+                        self._journal_member(neighbor)
                         self._graph.remove_node(neighbor)
-                        self._remove_member_from_family_units(neighbor)
+                        del self._typed_adjacency[neighbor]
+                        self._forget_member(neighbor)
             logger.debug(f"Removed member: {member_id}")
         else:
             error_message = f"Member ID '{member_id}' is not part of the family graph"
@@ -569,20 +2164,323 @@ class GraphHandler:
             InvalidInputError: If the relationship from source to target does not exist.
         """
         try:
-            self._graph.remove_edge(source_member_id, target_member_id)
+            self._remove_edge(source_member_id, target_member_id)
             if remove_inverse_relationship:
-                self._graph.remove_edge(target_member_id, source_member_id)
+                self._remove_edge(target_member_id, source_member_id)
             logger.debug(
                 f"Removed relationship: {source_member_id} -> {target_member_id}"
             )
-        except NetworkXError:
-            error_message = f"Relationship between {source_member_id} and {target_member_id} not found"
-            logger.error(error_message)
+        except (KeyError, NetworkXError):
+            raise self._relationship_not_found_error(
+                "remove_relationship", source_member_id, target_member_id
+            )
+
+    def set_edge_attributes(
+        self,
+        source_member_id: str,
+        target_member_id: str,
+        attributes: dict[str, Any],
+    ) -> None:
+        """
+        Sets per-edge attributes, such as PyVis edge options, on a relationship.
+
+        Edges without attributes share one immutable GraphEdge per type and
+        render flag, so the edge is replaced by a copy that carries the merged
+        attributes. Other edges are not affected.
+
+        Args:
+            source_member_id: The ID of the source member of the relationship.
+            target_member_id: The ID of the target member of the relationship.
+            attributes: The attributes to set on the edge.
+
+        Raises:
+            InvalidInputError: If the relationship from source to target does not exist.
+        """
+        try:
+            edge_data = self._graph.edges[source_member_id, target_member_id]
+        except KeyError:
+            raise self._relationship_not_found_error(
+                "set_edge_attributes", source_member_id, target_member_id
+            )
+        self._journal_edge(source_member_id, target_member_id)
+        self._own_edge(source_member_id, target_member_id)
+        edge_data = self._graph.edges[source_member_id, target_member_id]
+        edge_data["data"] = edge_data["data"].with_attributes(attributes)
+        self._version += 1
+
+    def _relationship_not_found_error(
+        self, operation: str, source_member_id: str, target_member_id: str
+    ) -> InvalidInputError:
+        """
+        Logs and builds the error for a relationship that does not exist.
+
+        Args:
+            operation: The name of the operation that failed.
+            source_member_id: The ID of the source member of the relationship.
+            target_member_id: The ID of the target member of the relationship.
+
+        Returns:
+            The InvalidInputError to raise.
+        """
+        error_message = f"Relationship between {source_member_id} and {target_member_id} not found"
+        logger.error(error_message)
+        return InvalidInputError(
+            operation=operation,
+            field="relationship",
+            description=error_message,
+        )
+
+    def get_ego_graph(self, poi_id: str, degree: int) -> DiGraph:
+        """
+        Builds the graph of the members within a number of hops of a member.
+
+        A breadth-first search follows the parent, child and spouse edges of
+        each member out to `degree` hops from the POI, in both directions, so
+        a link recorded by an edge one way only is followed too. The returned
+        graph holds those members and every edge between them, so its size
+        depends on the neighborhood and not on the whole tree. Its nodes are
+        new GraphNode objects with only `is_poi` set on the POI; edges are
+        shared with the family graph.
+
+        Args:
+            poi_id: The ID of the member at the center of the graph.
+            degree: The number of hops to include. 0 gives the POI alone.
+
+        Returns:
+            A new DiGraph in the format of `get_family_graph`.
+
+        Raises:
+            MemberNotFoundError: If the POI is not part of the graph.
+            InvalidInputError: If the degree is negative.
+        """
+        if degree < 0:
             raise InvalidInputError(
-                operation="remove_relationship",
-                field="relationship",
-                description=error_message,
+                operation="get_ego_graph",
+                field="degree",
+                description=f"Degree must not be negative, got {degree}.",
             )
+        if not self.has_member(poi_id):
+            raise MemberNotFoundError(member_id=poi_id, operation="get_ego_graph")
+
+        members = {poi_id: None}
+        frontier = [poi_id]
+        for _ in range(degree):
+            next_frontier = []
+            for member_id in frontier:
+                neighbor_ids = [
+                    neighbor_id
+                    for edge_type in EdgeType
+                    for neighbor_id in self._get_typed_neighbors(member_id, edge_type)
+                ]
+                neighbor_ids.extend(self._get_predecessor_ids(member_id))
+                for neighbor_id in neighbor_ids:
+                    if neighbor_id not in members:
+                        members[neighbor_id] = None
+                        next_frontier.append(neighbor_id)
+            if not next_frontier:
+                break
+            frontier = next_frontier
+
+        ego_graph = DiGraph()
+        for member_id in members:
+            node_obj = GraphNode(self._get_node(member_id).attributes)
+            node_obj.is_poi = member_id == poi_id
+            ego_graph.add_node(member_id, data=node_obj)
+        for member_id in members:
+            for edge_type in EdgeType:
+                for neighbor_id in self._get_typed_neighbors(member_id, edge_type):
+                    if neighbor_id in members:
+                        ego_graph.add_edge(
+                            member_id,
+                            neighbor_id,
+                            data=self._get_edge(member_id, neighbor_id),
+                        )
+        return ego_graph
+
+    def render_ego_graph_to_html(self, poi_id: str, degree: int, theme: str) -> str:
+        """
+        Renders the members within a number of hops of a member to an HTML string.
+
+        Renders are cached per POI, degree and theme until the graph changes.
+
+        Args:
+            poi_id: The ID of the member at the center of the graph.
+            degree: The number of hops to include.
+            theme: The color theme to use for rendering (e.g., 'light', 'dark').
+
+        Returns:
+            str: The HTML content of the rendered graph.
+
+        Raises:
+            MemberNotFoundError: If the POI is not part of the graph.
+            InvalidInputError: If the degree is negative.
+        """
+        cache_key = (poi_id, degree, theme)
+        with self._cache_lock:
+            cached = self._ego_graph_html_cache.get(cache_key)
+        if cached is None or cached[0] != self._version:
+            # Rendered outside the lock, so other readers are not held up.
+            html_content = PyvisRenderer().render_graph_to_html(
+                self.get_ego_graph(poi_id, degree), theme
+            )
+            cached = (self._version, html_content)
+        with self._cache_lock:
+            cache = self._ego_graph_html_cache
+            # Reinserted to keep the dict ordered from least to most recently
+            # used.
+            cache.pop(cache_key, None)
+            if len(cache) >= _MAX_CACHED_EGO_GRAPHS:
+                del cache[next(iter(cache))]
+            cache[cache_key] = cached
+        return cached[1]
+
+    def create_view_session(self, session_id: str) -> None:
+        """
+        Starts an interactive view of the graph with every member hidden.
+
+        Sessions share the graph and keep only their own view state, so each
+        one is cheap to create.
+
+        Args:
+            session_id: The ID of the new session.
+
+        Raises:
+            OperationError: If a session with this ID already exists.
+        """
+        self._get_index(VisibilityIndex).create_session(session_id)
+
+    def close_view_session(self, session_id: str) -> None:
+        """
+        Ends an interactive view of the graph.
+
+        Args:
+            session_id: The ID of the session.
+
+        Raises:
+            OperationError: If there is no session with this ID.
+        """
+        self._get_index(VisibilityIndex).close_session(session_id)
+
+    def show_member(
+        self, member_id: str, session_id: str = DEFAULT_VIEW_SESSION_ID
+    ) -> VisibilityDelta:
+        """
+        Shows a member as the point of interest of an interactive view.
+
+        Args:
+            member_id: The ID of the member.
+            session_id: The ID of the view session.
+
+        Returns:
+            The members and edges that became visible.
+
+        Raises:
+            MemberNotFoundError: If the member is not part of the graph.
+            OperationError: If there is no session with this ID.
+        """
+        return self._get_index(VisibilityIndex).show(member_id, session_id)
+
+    def expand_relatives(
+        self,
+        member_id: str,
+        group: RelativeGroup,
+        session_id: str = DEFAULT_VIEW_SESSION_ID,
+    ) -> VisibilityDelta:
+        """
+        Shows a group of relatives of a member in an interactive view.
+
+        The member is shown too if it is hidden. Visibility is reference
+        counted, so a relative shown by several expansions stays visible until
+        all of them are collapsed.
+
+        Args:
+            member_id: The ID of the member.
+            group: The group of relatives to show.
+            session_id: The ID of the view session.
+
+        Returns:
+            The members and edges that became visible.
+
+        Raises:
+            MemberNotFoundError: If the member is not part of the graph.
+            OperationError: If there is no session with this ID.
+        """
+        return self._get_index(VisibilityIndex).expand(member_id, group, session_id)
+
+    def collapse_relatives(
+        self,
+        member_id: str,
+        group: RelativeGroup,
+        session_id: str = DEFAULT_VIEW_SESSION_ID,
+    ) -> VisibilityDelta:
+        """
+        Hides a group of relatives of a member in an interactive view.
+
+        Relatives still shown by another expansion stay visible. Relatives that
+        are hidden take the groups they expanded with them.
+
+        Args:
+            member_id: The ID of the member.
+            group: The group of relatives to hide.
+            session_id: The ID of the view session.
+
+        Returns:
+            The members and edges that were hidden.
+
+        Raises:
+            MemberNotFoundError: If the member is not part of the graph.
+            OperationError: If there is no session with this ID.
+        """
+        return self._get_index(VisibilityIndex).collapse(member_id, group, session_id)
+
+    def get_view_node(
+        self, member_id: str, session_id: str = DEFAULT_VIEW_SESSION_ID
+    ) -> dict[str, Any]:
+        """
+        Returns a member as a vis-network node, drawn as in the rendered HTML.
+
+        The node is highlighted if the member is the point of interest of the
+        view session. The shared graph node is left untouched.
+
+        Args:
+            member_id: The ID of the member.
+            session_id: The ID of the view session.
+
+        Returns:
+            The node options with the member ID under "id".
+
+        Raises:
+            KeyError: If the member is not part of the graph.
+        """
+        node_obj = self._get_node(member_id)
+        if self._get_index(VisibilityIndex).is_poi(member_id, session_id):
+            node_obj = GraphNode(attributes=node_obj.attributes)
+            node_obj.is_poi = True
+        node_options = PyvisRenderer().build_node_options(member_id, node_obj)
+        return {"id": member_id, **node_options}
+
+    def get_view_edge(
+        self, source_member_id: str, target_member_id: str
+    ) -> Optional[dict[str, Any]]:
+        """
+        Returns an edge as a vis-network edge, drawn as in the rendered HTML.
+
+        Args:
+            source_member_id: The ID of the source member of the edge.
+            target_member_id: The ID of the target member of the edge.
+
+        Returns:
+            The edge options with the member IDs under "from" and "to", or None
+            if the edge is not rendered.
+
+        Raises:
+            KeyError: If there is no such edge.
+        """
+        edge_obj = self._get_edge(source_member_id, target_member_id)
+        if not edge_obj.is_rendered:
+            return None
+        edge_options = PyvisRenderer().build_edge_options(edge_obj)
+        return {"from": source_member_id, "to": target_member_id, **edge_options}
 
     def render_graph_to_html(
         self, theme: str, output_html_file_path: Optional[str] = None
@@ -592,7 +2490,7 @@ class GraphHandler:
         and optionally saves it to a file.
 
         The visibility of nodes and edges is determined by the 'is_rendered'
-        attribute on GraphNode and GraphEdge objects within self._graph.
+        attribute on GraphNode and GraphEdge objects of the family graph.
         The 'is_poi' attribute on GraphNode objects can be used to highlight
         a person of interest.
 
@@ -604,4 +2502,6 @@ class GraphHandler:
             str: The HTML content of the rendered graph.
         """
         renderer = PyvisRenderer()
-        return renderer.render_graph_to_html(self._graph, theme, output_html_file_path)
+        return renderer.render_graph_to_html(
+            self.get_family_graph(), theme, output_html_file_path
+        )
@@ -1,12 +1,18 @@
 import logging
+from typing import TYPE_CHECKING, BinaryIO, Iterable
 
 from google.protobuf import text_format
 from networkx import DiGraph
 from thefuzz import fuzz
 
 from familytree.proto import family_tree_pb2
-from familytree.utils import id_utils, proto_utils
+from familytree.utils import id_utils, proto_utils, tree_stream
 from familytree.utils.graph_types import EdgeType
+from familytree.utils.operation_journal import GraphChanges
+from familytree.utils.tree_log import TreeEdit
+
+if TYPE_CHECKING:
+    from familytree.handlers.graph_handler import GraphHandler
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +41,9 @@ class ProtoHandler:
         """
         Loads family tree data from a text-formatted protobuf string.
 
+        The data is merged into a copy of the current FamilyTree message,
+        which then replaces it.
+
         Args:
             family_tree_textproto: A string containing the family tree data
                                    in text protobuf format.
@@ -44,26 +53,149 @@ class ProtoHandler:
             Exception: For other unexpected errors during loading.
         """
         logger.info("Loading FamilyTree from text proto")
-        text_format.Merge(family_tree_textproto, self._family_tree)
+        family_tree = self._copy_family_tree()
+        text_format.Merge(family_tree_textproto, family_tree)
+        self._family_tree = family_tree
         logger.info("Successfully loaded FamilyTree from text proto")
 
+    def load_from_binary(self, family_tree_binary: bytes) -> None:
+        """
+        Loads family tree data from the binary protobuf wire format.
+
+        The data is merged into a copy of the current FamilyTree message,
+        which then replaces it.
+
+        Args:
+            family_tree_binary: The serialized FamilyTree message.
+
+        Raises:
+            google.protobuf.message.DecodeError: If the bytes are not a valid
+                FamilyTree message.
+        """
+        logger.info("Loading FamilyTree from binary proto")
+        family_tree = self._copy_family_tree()
+        family_tree.MergeFromString(family_tree_binary)
+        self._family_tree = family_tree
+        logger.info("Successfully loaded FamilyTree from binary proto")
+
+    def _copy_family_tree(self) -> family_tree_pb2.FamilyTree:
+        """
+        Returns a copy of the FamilyTree message for a load to merge into.
+
+        Graphs built from the current message share its member and family
+        unit messages, so a load replaces the message instead of changing it.
+        """
+        family_tree = family_tree_pb2.FamilyTree()
+        family_tree.CopyFrom(self._family_tree)
+        return family_tree
+
+    def clear(self) -> None:
+        """Replaces the FamilyTree protobuf message with an empty one."""
+        self._family_tree = family_tree_pb2.FamilyTree()
+
     def update_from_nx_graph(
-        self, nx_graph: DiGraph, family_unit_map: dict[str, family_tree_pb2.FamilyUnit]
+        self,
+        nx_graph: DiGraph,
+        family_unit_map: dict[str, family_tree_pb2.FamilyUnit],
+        reconcile: bool = False,
     ) -> None:
         """
         Updates the internal FamilyTree protobuf message from a NetworkX DiGraph.
 
-        Note: This method is not yet implemented.
+        Members and family units are added or merged, and relationships are
+        added. With `reconcile`, the message is made to mirror the graph:
+        members, relationships and family units are replaced by the graph's,
+        and those the graph does not have are deleted.
 
         Args:
            nx_graph: A NetworkX directed graph representing the family tree.
+           family_unit_map: The family units of the graph, by ID.
+           reconcile: Whether to delete what is not in the graph.
         """
         nodes_from_graph = nx_graph.nodes(data=True)
         edges_from_graph = nx_graph.edges(data=True)
 
-        self._update_missing_family_members(nodes_from_graph)
-        self._update_missing_relationships(edges_from_graph)
-        self._update_family_units(family_unit_map)
+        if not reconcile:
+            self._update_missing_family_members(nodes_from_graph)
+            self._update_missing_relationships(edges_from_graph)
+            self._update_family_units(family_unit_map)
+            return
+
+        family_tree = self._family_tree
+        for member_id, node_data in nodes_from_graph:
+            self._replace_entry(
+                family_tree.members, member_id, node_data["data"].attributes
+            )
+        relationships_by_source: dict[str, family_tree_pb2.Relationships] = {}
+        for source_id, target_id, edge_data in edges_from_graph:
+            relationships = relationships_by_source.get(source_id)
+            if relationships is None:
+                relationships = family_tree_pb2.Relationships()
+                relationships_by_source[source_id] = relationships
+            self._listed_relationship_ids(
+                relationships, edge_data["data"].edge_type
+            ).append(target_id)
+        for source_id, relationships in relationships_by_source.items():
+            self._replace_entry(family_tree.relationships, source_id, relationships)
+        for family_unit_id, family_unit in family_unit_map.items():
+            self._replace_entry(family_tree.family_units, family_unit_id, family_unit)
+        for messages, keys in (
+            (family_tree.members, nx_graph),
+            (family_tree.relationships, relationships_by_source),
+            (family_tree.family_units, family_unit_map),
+        ):
+            for key in [key for key in messages if key not in keys]:
+                del messages[key]
+
+    def update_from_graph_changes(
+        self, graph_handler: "GraphHandler", changes: GraphChanges
+    ) -> None:
+        """
+        Makes the internal FamilyTree protobuf message mirror what changed in a
+        graph, e.g. since the last save.
+
+        Like `update_from_nx_graph` with `reconcile`, but only the members,
+        relationships and family units in `changes` are read and written. The
+        cost is proportional to the number of changes and the degrees of the
+        changed members, not to the size of the tree.
+
+        Args:
+            graph_handler: The graph the changes were made to.
+            changes: The changed member, relationships and family unit IDs,
+                from `GraphHandler.changes_since`.
+        """
+        self.apply_tree_edit(graph_handler.get_tree_edit(changes))
+
+    def apply_tree_edit(self, edit: TreeEdit) -> None:
+        """
+        Applies an edit to the internal FamilyTree protobuf message.
+
+        Changed members, relationships and family units replace the stored
+        ones, and deleted ones are removed.
+
+        Args:
+            edit: The edit, e.g. from `GraphHandler.get_tree_edit` or a tree
+                log.
+        """
+        family_tree = self._family_tree
+        for messages, changed, deleted in (
+            (family_tree.members, edit.changed.members, edit.deleted.members),
+            (
+                family_tree.relationships,
+                edit.changed.relationships,
+                edit.deleted.relationships,
+            ),
+            (
+                family_tree.family_units,
+                edit.changed.family_units,
+                edit.deleted.family_units,
+            ),
+        ):
+            for key, message in changed.items():
+                self._replace_entry(messages, key, message)
+            for key in deleted:
+                if key in messages:
+                    del messages[key]
 
     def merge_family_trees(
         self,
@@ -106,6 +238,32 @@ class ProtoHandler:
         """
         return text_format.MessageToString(self._family_tree, indent=2)
 
+    def save_to_binary(self) -> bytes:
+        """
+        Saves the current FamilyTree protobuf message in the binary wire format.
+
+        Map entries are written in key order, so the same tree is always
+        saved as the same bytes.
+
+        Returns:
+            bytes: The serialized FamilyTree message.
+        """
+        return self._family_tree.SerializeToString(deterministic=True)
+
+    def save_to_stream(self, stream: BinaryIO) -> int:
+        """
+        Writes the current FamilyTree protobuf message as a stream file.
+
+        Args:
+            stream: A file or buffer opened for writing bytes.
+
+        Returns:
+            int: The number of bytes written.
+        """
+        return tree_stream.write_tree_stream(
+            tree_stream.tree_records(self._family_tree), stream
+        )
+
     def _update_missing_family_members(self, nodes_from_graph):
         """
         Updates or adds family members in the internal FamilyTree message from a list of graph nodes.
@@ -116,14 +274,23 @@ class ProtoHandler:
                               field, which is a FamilyMember message.
         """
         for node_id, node_data in nodes_from_graph:
-            if node_id not in self._family_tree.members:
-                self._family_tree.members[node_id].CopyFrom(
-                    node_data["data"].attributes
-                )
-            else:
-                proto_utils.apply_changes(
-                    self._family_tree.members[node_id], node_data["data"].attributes
-                )
+            self._update_family_member(node_id, node_data["data"].attributes)
+
+    def _update_family_member(
+        self, member_id: str, attributes: family_tree_pb2.FamilyMember
+    ) -> None:
+        """
+        Adds a family member to the internal FamilyTree message, or merges its
+        attributes into the stored member.
+
+        Args:
+            member_id: The ID of the member.
+            attributes: The member's FamilyMember message from the graph.
+        """
+        if member_id not in self._family_tree.members:
+            self._family_tree.members[member_id].CopyFrom(attributes)
+        else:
+            proto_utils.apply_changes(self._family_tree.members[member_id], attributes)
 
     def _update_missing_relationships(self, edges_from_graph):
         """
@@ -134,27 +301,82 @@ class ProtoHandler:
                               has data containing a 'data' object with an 'edge_type'
                               field.
         """
+        targets_by_source: dict[tuple[str, EdgeType], list[str]] = {}
         for source_id, target_id, edge_data in edges_from_graph:
-            if (
-                edge_data["data"].edge_type == EdgeType.PARENT_TO_CHILD
-                and target_id
-                not in self._family_tree.relationships[source_id].children_ids
-            ):
-                self._family_tree.relationships[source_id].children_ids.append(
-                    target_id
-                )
-            elif (
-                edge_data["data"].edge_type == EdgeType.CHILD_TO_PARENT
-                and target_id
-                not in self._family_tree.relationships[source_id].parent_ids
-            ):
-                self._family_tree.relationships[source_id].parent_ids.append(target_id)
-            elif (
-                edge_data["data"].edge_type == EdgeType.SPOUSE
-                and target_id
-                not in self._family_tree.relationships[source_id].spouse_ids
-            ):
-                self._family_tree.relationships[source_id].spouse_ids.append(target_id)
+            targets_by_source.setdefault(
+                (source_id, edge_data["data"].edge_type), []
+            ).append(target_id)
+        for (source_id, edge_type), target_ids in targets_by_source.items():
+            self._add_relationships(source_id, edge_type, target_ids)
+
+    def _add_relationships(
+        self, source_id: str, edge_type: EdgeType, target_ids: Iterable[str]
+    ) -> None:
+        """
+        Adds the relationships of one type from a member that the internal
+        FamilyTree message does not list yet.
+
+        Membership is checked against a set of the listed IDs, so adding costs
+        the number of relationships of that type, not its square.
+
+        Args:
+            source_id: The ID of the member the relationships are from.
+            edge_type: The type of the relationships.
+            target_ids: The IDs of the members the relationships are to.
+        """
+        target_ids = list(target_ids)
+        if not target_ids:
+            return
+        listed_ids = self._listed_relationship_ids(
+            self._family_tree.relationships[source_id], edge_type
+        )
+        known_ids = set(listed_ids)
+        for target_id in target_ids:
+            if target_id not in known_ids:
+                listed_ids.append(target_id)
+                known_ids.add(target_id)
+
+    @staticmethod
+    def _replace_entry(messages, key: str, message) -> None:
+        """
+        Sets an entry of a map of the internal FamilyTree message to a copy of
+        a message.
+
+        An existing entry is replaced rather than changed in place, because
+        graphs built from the FamilyTree may still share its message.
+
+        Args:
+            messages: The members, relationships or family units map.
+            key: The ID of the entry.
+            message: The message to copy.
+        """
+        if key in messages:
+            existing = messages[key]
+            if existing is message or existing == message:
+                return
+            del messages[key]
+        messages[key].CopyFrom(message)
+
+    @staticmethod
+    def _listed_relationship_ids(
+        relationships: family_tree_pb2.Relationships, edge_type: EdgeType
+    ):
+        """
+        Returns the repeated field of a Relationships message that lists the
+        relationships of a type.
+
+        Args:
+            relationships: The Relationships message of a member.
+            edge_type: The type of the relationships.
+
+        Returns:
+            The children, parent or spouse IDs field.
+        """
+        if edge_type == EdgeType.PARENT_TO_CHILD:
+            return relationships.children_ids
+        if edge_type == EdgeType.CHILD_TO_PARENT:
+            return relationships.parent_ids
+        return relationships.spouse_ids
 
     def _update_family_units(self, family_units_map):
         """
@@ -165,12 +387,25 @@ class ProtoHandler:
                               are FamilyUnit protobuf messages.
         """
         for family_unit_id, family_unit in family_units_map.items():
-            if family_unit_id not in self._family_tree.family_units:
-                self._family_tree.family_units[family_unit_id].CopyFrom(family_unit)
-            else:
-                proto_utils.apply_changes(
-                    self._family_tree.family_units[family_unit_id], family_unit
-                )
+            self._update_family_unit(family_unit_id, family_unit)
+
+    def _update_family_unit(
+        self, family_unit_id: str, family_unit: family_tree_pb2.FamilyUnit
+    ) -> None:
+        """
+        Adds a family unit to the internal FamilyTree message, or merges it
+        into the stored family unit.
+
+        Args:
+            family_unit_id: The ID of the family unit.
+            family_unit: The FamilyUnit message from the graph.
+        """
+        if family_unit_id not in self._family_tree.family_units:
+            self._family_tree.family_units[family_unit_id].CopyFrom(family_unit)
+        else:
+            proto_utils.apply_changes(
+                self._family_tree.family_units[family_unit_id], family_unit
+            )
 
     def _calculate_similarity(self, member1, member2):
         """
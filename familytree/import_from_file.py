@@ -25,7 +25,9 @@ class ImportFromFileForm(QWidget):
         layout.setContentsMargins(0, 0, 0, 10)  # Add bottom margin
 
         self.file_path_input = QLineEdit()
-        self.file_path_input.setPlaceholderText("Click Browse to select a .txtpb file")
+        self.file_path_input.setPlaceholderText(
+            "Click Browse to select a .txtpb, .binpb or .pbstream file"
+        )
         self.file_path_input.setReadOnly(True)
 
         browse_button = QPushButton("📂 Browse...")
@@ -55,7 +57,9 @@ class ImportFromFileForm(QWidget):
             self,
             "Open Family Tree Data File",
             start_dir,
-            "Protobuf Text Files (*.txtpb);;All Files (*)",
+            "Family Tree Files (*.txtpb *.binpb *.pbstream);;"
+            "Protobuf Text Files (*.txtpb);;Protobuf Binary Files (*.binpb);;"
+            "Protobuf Stream Files (*.pbstream);;All Files (*)",
         )
         if file_name:
             self.file_path_input.setText(file_name)
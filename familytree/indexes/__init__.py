@@ -0,0 +1 @@
+# This file makes the 'indexes' directory a Python package.
@@ -0,0 +1,173 @@
+import logging
+from collections import deque
+from typing import TYPE_CHECKING, NamedTuple, Optional
+
+from familytree.exceptions import MemberNotFoundError
+from familytree.indexes.graph_index import GraphIndex
+from familytree.indexes.lineage_index import LineageIndex
+from familytree.utils.graph_types import EdgeType
+
+if TYPE_CHECKING:
+    from familytree.handlers.graph_handler import GraphHandler
+
+logger = logging.getLogger(__name__)
+
+# Ancestor maps kept at once. A reunion table of this many members needs no
+# map to be rebuilt.
+_MAX_CACHED_MEMBERS = 4096
+
+
+class CommonAncestor(NamedTuple):
+    """A lowest common ancestor of two members and its distance from each."""
+
+    member_id: str
+    # Generations between the first member of the pair and the ancestor.
+    source_generations: int
+    # Generations between the second member of the pair and the ancestor.
+    target_generations: int
+
+
+class AncestryIndex(GraphIndex):
+    """
+    Lowest common ancestors of member pairs in the parent-child graph.
+
+    A member can have two parents, so the parent-child graph is a DAG and a
+    pair can have several lowest common ancestors, e.g. both parents of two
+    siblings. The index keeps, for recently queried members, a map from every
+    ancestor (and the member itself) to the fewest generations between them.
+    The common ancestors of a pair are the intersection of the two maps, and
+    the lowest ones are those without a child in the intersection.
+
+    Parents are read from the LineageIndex. A change to a parent link drops
+    the maps that contain the child, since only the child and its descendants
+    gain or lose ancestors.
+    """
+
+    def __init__(self, lineage: LineageIndex):
+        self._lineage = lineage
+        self._generations: dict[str, dict[str, int]] = {}
+
+    @classmethod
+    def from_graph_handler(cls, graph_handler: "GraphHandler") -> "AncestryIndex":
+        """
+        Creates the ancestry index on top of a GraphHandler's lineage index.
+
+        Args:
+            graph_handler: The GraphHandler to index.
+
+        Returns:
+            The new AncestryIndex.
+        """
+        return cls(graph_handler._get_index(LineageIndex))
+
+    def _ancestor_generations(self, member_id: str) -> dict[str, int]:
+        """
+        Returns the fewest generations from a member to each of its ancestors.
+
+        Args:
+            member_id: The ID of the member.
+
+        Returns:
+            A map from the member and every ancestor to the generation distance.
+        """
+        generations = self._generations.pop(member_id, None)
+        if generations is None:
+            generations = {member_id: 0}
+            queue = deque([member_id])
+            while queue:
+                current_id = queue.popleft()
+                distance = generations[current_id] + 1
+                for parent_id in self._lineage.get_parent_ids(current_id):
+                    if parent_id not in generations:
+                        generations[parent_id] = distance
+                        queue.append(parent_id)
+            if len(self._generations) >= _MAX_CACHED_MEMBERS:
+                del self._generations[next(iter(self._generations))]
+        # Reinserted to keep the dict ordered from least to most recently used.
+        self._generations[member_id] = generations
+        return generations
+
+    def lowest_common_ancestors(
+        self, source_member_id: str, target_member_id: str
+    ) -> list[CommonAncestor]:
+        """
+        Finds the lowest common ancestors of two members.
+
+        A member counts as its own ancestor here, so if one member descends
+        from the other, the other is the only lowest common ancestor.
+
+        Args:
+            source_member_id: The ID of the first member.
+            target_member_id: The ID of the second member.
+
+        Returns:
+            The lowest common ancestors, nearest (fewest generations in total)
+            first. Empty if the members share no ancestor.
+
+        Raises:
+            MemberNotFoundError: If either member is not indexed.
+        """
+        for member_id in (source_member_id, target_member_id):
+            if not self._lineage.has_member(member_id):
+                raise MemberNotFoundError(
+                    member_id=member_id, operation="lowest_common_ancestors"
+                )
+        source_generations = self._ancestor_generations(source_member_id)
+        target_generations = self._ancestor_generations(target_member_id)
+        common = source_generations.keys() & target_generations.keys()
+        lowest = [
+            member_id
+            for member_id in common
+            if not any(
+                child_id in common
+                for child_id in self._lineage.get_child_ids(member_id)
+            )
+        ]
+        # In a parent-child cycle every common ancestor has a common child;
+        # fall back to the nearest ones.
+        ancestors = [
+            CommonAncestor(
+                member_id, source_generations[member_id], target_generations[member_id]
+            )
+            for member_id in (lowest or common)
+        ]
+        ancestors.sort(
+            key=lambda ancestor: (
+                ancestor.source_generations + ancestor.target_generations,
+                ancestor.member_id,
+            )
+        )
+        if not lowest and ancestors:
+            nearest = ancestors[0].source_generations + ancestors[0].target_generations
+            ancestors = [
+                ancestor
+                for ancestor in ancestors
+                if ancestor.source_generations + ancestor.target_generations == nearest
+            ]
+        return ancestors
+
+    def _drop_maps_containing(self, member_id: str) -> None:
+        """Drops the cached maps of a member and of its cached descendants."""
+        stale = [
+            cached_id
+            for cached_id, generations in self._generations.items()
+            if member_id in generations
+        ]
+        for cached_id in stale:
+            del self._generations[cached_id]
+
+    def member_removed(self, member_id: str) -> None:
+        self._drop_maps_containing(member_id)
+
+    def edge_changed(
+        self,
+        source_id: str,
+        target_id: str,
+        previous_type: Optional[EdgeType],
+        edge_type: Optional[EdgeType],
+    ) -> None:
+        for changed_type in (previous_type, edge_type):
+            if changed_type == EdgeType.PARENT_TO_CHILD:
+                self._drop_maps_containing(target_id)
+            elif changed_type == EdgeType.CHILD_TO_PARENT:
+                self._drop_maps_containing(source_id)
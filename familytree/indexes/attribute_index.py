@@ -0,0 +1,318 @@
+import gc
+from operator import attrgetter
+from typing import TYPE_CHECKING, Callable, Collection, NamedTuple, Optional
+
+import numpy as np
+
+from familytree.exceptions import InvalidInputError
+from familytree.indexes.graph_index import GraphIndex
+from familytree.proto import family_tree_pb2
+
+if TYPE_CHECKING:
+    from familytree.handlers.graph_handler import GraphHandler
+
+
+def _read_alive(member: family_tree_pb2.FamilyMember) -> int:
+    """Returns 1 if a member is alive, 0 if not and -1 if it is not known."""
+    return int(member.alive) if member.HasField("alive") else -1
+
+
+class AttributeColumn(NamedTuple):
+    """A member attribute stored as a column of small integers."""
+
+    name: str
+    dtype: type
+    read: Callable[[family_tree_pb2.FamilyMember], int]
+
+
+# Unset dates and enums are 0, as in the protos.
+COLUMNS = (
+    AttributeColumn("birth_year", np.int32, attrgetter("date_of_birth.year")),
+    AttributeColumn("birth_month", np.int8, attrgetter("date_of_birth.month")),
+    AttributeColumn("birth_day", np.int8, attrgetter("date_of_birth.date")),
+    AttributeColumn("death_year", np.int32, attrgetter("date_of_death.year")),
+    AttributeColumn("gender", np.int8, attrgetter("gender")),
+    AttributeColumn("alive", np.int8, _read_alive),
+    AttributeColumn(
+        "birth_tamil_month", np.int8, attrgetter("traditional_date_of_birth.month")
+    ),
+    AttributeColumn(
+        "birth_star", np.int8, attrgetter("traditional_date_of_birth.star")
+    ),
+    AttributeColumn(
+        "birth_paksham", np.int8, attrgetter("traditional_date_of_birth.paksham")
+    ),
+    AttributeColumn(
+        "birth_thithi", np.int8, attrgetter("traditional_date_of_birth.thithi")
+    ),
+    AttributeColumn(
+        "death_tamil_month", np.int8, attrgetter("traditional_date_of_death.month")
+    ),
+    AttributeColumn(
+        "death_star", np.int8, attrgetter("traditional_date_of_death.star")
+    ),
+    AttributeColumn(
+        "death_paksham", np.int8, attrgetter("traditional_date_of_death.paksham")
+    ),
+    AttributeColumn(
+        "death_thithi", np.int8, attrgetter("traditional_date_of_death.thithi")
+    ),
+)
+_COLUMNS_BY_NAME = {column.name: column for column in COLUMNS}
+
+_MIN_CAPACITY = 1024
+
+
+def _is_any_of(values: np.ndarray, allowed: Collection[int]) -> np.ndarray:
+    """
+    Returns where `values` is one of `allowed`.
+
+    Comparing once per allowed value is much faster than np.isin for the few
+    values a filter lists.
+    """
+    matches = np.zeros(len(values), dtype=bool)
+    for value in allowed:
+        matches |= values == value
+    return matches
+
+
+class ColumnFilter(NamedTuple):
+    """A condition on one attribute column."""
+
+    column: str
+    # The values the attribute may have, if restricted.
+    values: Optional[Collection[int]] = None
+    # Inclusive bounds on the attribute, if any.
+    minimum: Optional[int] = None
+    maximum: Optional[int] = None
+
+
+class InfoFilter(NamedTuple):
+    """A condition on one `additional_info` key."""
+
+    key: str
+    # The values the key may have, or None for any value as long as it is set.
+    values: Optional[Collection[str]] = None
+
+
+class AttributeIndex(GraphIndex):
+    """
+    Member attributes stored column by column for filtered queries.
+
+    Every member is a row. Dates, gender, whether the member is alive and the
+    Tamil calendar fields of the birth and death dates are kept in one NumPy
+    array per attribute. Each `additional_info` key is a column of value codes,
+    0 where the member does not have the key, with one dictionary per key from
+    values to codes. A filter compares whole columns at once and combines the
+    results into one mask, so it never decodes a FamilyMember.
+
+    Rows are kept dense: a removed member's row is filled with the last row.
+    The arrays grow by doubling. They are shared with copies of the index made
+    for graph snapshots, and copied by whichever index changes them first.
+    """
+
+    def __init__(self):
+        self._member_ids: list[str] = []
+        self._rows: dict[str, int] = {}
+        self._columns: dict[str, np.ndarray] = {
+            column.name: np.zeros(_MIN_CAPACITY, dtype=column.dtype)
+            for column in COLUMNS
+        }
+        self._info_columns: dict[str, np.ndarray] = {}
+        # For every additional_info key, the codes of its values, from 1.
+        self._info_codes: dict[str, dict[str, int]] = {}
+        self._graph_handler: "GraphHandler | None" = None
+        self._is_shared = False
+
+    @classmethod
+    def from_graph_handler(cls, graph_handler: "GraphHandler") -> "AttributeIndex":
+        """
+        Builds the attribute columns from the members of a GraphHandler.
+
+        Args:
+            graph_handler: The GraphHandler to index.
+
+        Returns:
+            The new AttributeIndex.
+        """
+        index = cls()
+        index._graph_handler = graph_handler
+        values: dict[str, list[int]] = {column.name: [] for column in COLUMNS}
+        info_rows: dict[str, tuple[list[int], list[int]]] = {}
+        # The build allocates a few objects per member; pausing the cyclic
+        # garbage collector avoids repeated full-heap scans.
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for row, member_id in enumerate(graph_handler.iter_member_ids()):
+                member = graph_handler.get_member(member_id)
+                index._member_ids.append(member_id)
+                index._rows[member_id] = row
+                for column in COLUMNS:
+                    values[column.name].append(column.read(member))
+                for key, value in member.additional_info.items():
+                    rows, codes = info_rows.setdefault(key, ([], []))
+                    rows.append(row)
+                    codes.append(index._info_code(key, value))
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        capacity = max(_MIN_CAPACITY, len(index._member_ids))
+        for column in COLUMNS:
+            array = np.zeros(capacity, dtype=column.dtype)
+            array[: len(index._member_ids)] = values[column.name]
+            index._columns[column.name] = array
+        for key, (rows, codes) in info_rows.items():
+            array = np.zeros(capacity, dtype=np.int32)
+            array[rows] = codes
+            index._info_columns[key] = array
+        return index
+
+    def copy_for(self, graph_handler: "GraphHandler") -> "AttributeIndex":
+        """
+        Copies the index for a copy of the graph instead of rebuilding it.
+
+        The arrays and dicts are shared until either index changes them.
+        """
+        index = AttributeIndex()
+        index.__dict__.update(self.__dict__)
+        index._graph_handler = graph_handler
+        index._is_shared = self._is_shared = True
+        return index
+
+    def _own(self) -> None:
+        """Copies the arrays and dicts if they may be shared."""
+        if not self._is_shared:
+            return
+        self._member_ids = self._member_ids.copy()
+        self._rows = self._rows.copy()
+        self._columns = {name: array.copy() for name, array in self._columns.items()}
+        self._info_columns = {
+            key: array.copy() for key, array in self._info_columns.items()
+        }
+        self._info_codes = {
+            key: codes.copy() for key, codes in self._info_codes.items()
+        }
+        self._is_shared = False
+
+    def _capacity(self) -> int:
+        """Returns the number of rows the arrays have room for."""
+        return len(self._columns[COLUMNS[0].name])
+
+    def _info_code(self, key: str, value: str) -> int:
+        """Returns the code of an additional_info value, adding it if new."""
+        codes = self._info_codes.setdefault(key, {})
+        return codes.setdefault(value, len(codes) + 1)
+
+    def _write_row(self, member_id: str) -> None:
+        """
+        Writes a member's attributes to its row, adding a row if needed.
+
+        Args:
+            member_id: The ID of the member, which must be part of the graph.
+        """
+        assert self._graph_handler is not None
+        self._own()
+        member = self._graph_handler.get_member(member_id)
+        row = self._rows.get(member_id)
+        if row is None:
+            row = len(self._member_ids)
+            if row == self._capacity():
+                self._columns = {
+                    name: np.resize(array, 2 * row)
+                    for name, array in self._columns.items()
+                }
+                self._info_columns = {
+                    key: np.resize(array, 2 * row)
+                    for key, array in self._info_columns.items()
+                }
+            self._member_ids.append(member_id)
+            self._rows[member_id] = row
+        for column in COLUMNS:
+            self._columns[column.name][row] = column.read(member)
+        for array in self._info_columns.values():
+            array[row] = 0
+        for key, value in member.additional_info.items():
+            array = self._info_columns.get(key)
+            if array is None:
+                array = self._info_columns[key] = np.zeros(
+                    self._capacity(), dtype=np.int32
+                )
+            array[row] = self._info_code(key, value)
+
+    def filter(
+        self,
+        column_filters: Collection[ColumnFilter] = (),
+        info_filters: Collection[InfoFilter] = (),
+        limit: Optional[int] = None,
+    ) -> tuple[int, list[str]]:
+        """
+        Finds the members that meet every condition.
+
+        Args:
+            column_filters: Conditions on the attribute columns.
+            info_filters: Conditions on additional_info keys.
+            limit: The largest number of member IDs to return, if any.
+
+        Returns:
+            The number of matching members and the IDs of up to `limit` of
+            them, in no particular order.
+
+        Raises:
+            InvalidInputError: If a filter names an unknown column.
+        """
+        size = len(self._member_ids)
+        mask = np.ones(size, dtype=bool)
+        for column_filter in column_filters:
+            if column_filter.column not in _COLUMNS_BY_NAME:
+                raise InvalidInputError(
+                    operation="filter_members",
+                    field=column_filter.column,
+                    description=f"Unknown attribute '{column_filter.column}'.",
+                )
+            values = self._columns[column_filter.column][:size]
+            if column_filter.values is not None:
+                mask &= _is_any_of(values, column_filter.values)
+            if column_filter.minimum is not None:
+                mask &= values >= column_filter.minimum
+            if column_filter.maximum is not None:
+                mask &= values <= column_filter.maximum
+        for info_filter in info_filters:
+            codes = self._info_columns.get(info_filter.key)
+            if codes is None:
+                mask[:] = False
+            elif info_filter.values is None:
+                mask &= codes[:size] != 0
+            else:
+                value_codes = self._info_codes[info_filter.key]
+                allowed = [
+                    value_codes[value]
+                    for value in info_filter.values
+                    if value in value_codes
+                ]
+                mask &= _is_any_of(codes[:size], allowed)
+        rows = np.flatnonzero(mask)
+        selected = rows if limit is None else rows[:limit]
+        return len(rows), [self._member_ids[row] for row in selected.tolist()]
+
+    def member_added(self, member_id: str) -> None:
+        self._write_row(member_id)
+
+    def member_updated(self, member_id: str) -> None:
+        self._write_row(member_id)
+
+    def member_removed(self, member_id: str) -> None:
+        if member_id not in self._rows:
+            return
+        self._own()
+        row = self._rows.pop(member_id)
+        last_row = len(self._member_ids) - 1
+        last_member_id = self._member_ids.pop()
+        if row != last_row:
+            # Moves the last row into the removed one to keep the rows dense.
+            self._member_ids[row] = last_member_id
+            self._rows[last_member_id] = row
+            for array in (*self._columns.values(), *self._info_columns.values()):
+                array[row] = array[last_row]
+        for array in (*self._columns.values(), *self._info_columns.values()):
+            array[last_row] = 0
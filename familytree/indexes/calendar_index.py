@@ -0,0 +1,318 @@
+import calendar
+import datetime
+import enum
+import gc
+import heapq
+from bisect import bisect_left, insort
+from itertools import islice, takewhile
+from typing import TYPE_CHECKING, Collection, Iterator, NamedTuple, Optional
+
+from familytree.exceptions import InvalidInputError
+from familytree.indexes.graph_index import GraphIndex
+
+if TYPE_CHECKING:
+    from familytree.handlers.graph_handler import GraphHandler
+
+
+class EventKind(enum.Enum):
+    """The yearly events of a member that are kept on the calendar."""
+
+    BIRTHDAY = "birthday"
+    WEDDING_ANNIVERSARY = "wedding_anniversary"
+
+
+class CalendarEvent(NamedTuple):
+    """One occurrence of a member's yearly event."""
+
+    kind: EventKind
+    member_id: str
+    date: datetime.date
+    # The year of the birth or wedding, or 0 if it is not known.
+    year: int
+
+
+class StarDay(NamedTuple):
+    """A member's birth star day, the birth star in the Tamil birth month."""
+
+    member_id: str
+    tamil_month: int
+    star: int
+
+
+# (month, day, member ID, year), sorted.
+_GregorianEntry = tuple[int, int, str, int]
+# (Tamil month, star, member ID), sorted.
+_StarEntry = tuple[int, int, str]
+
+# A member's entry for each of its events, and its star day entry if it has one.
+_MemberEntries = tuple[dict[EventKind, _GregorianEntry], Optional[_StarEntry]]
+
+# A leap year, to check that a month and day exist.
+_LEAP_YEAR = 2000
+
+
+def _occurrence(year: int, month: int, day: int) -> datetime.date:
+    """
+    Returns the date of a yearly event in a year.
+
+    Events on 29 February fall on the 28th in common years.
+    """
+    if (month, day) == (2, 29) and not calendar.isleap(year):
+        day = 28
+    return datetime.date(year, month, day)
+
+
+class CalendarIndex(GraphIndex):
+    """
+    Birthdays, wedding anniversaries and birth star days of the members.
+
+    Each event kind has a list of (month, day) entries sorted through the
+    year, so the events from any day on start at a position found by binary
+    search. A query reads each kind's list from there, wrapping around to the
+    start of the next year, and merges the kinds by date. It reads only as
+    many entries as it returns, plus one per kind.
+
+    Star days are kept in a list sorted by Tamil month and star. Without an
+    almanac the Gregorian date of a star day is not known, so they are found
+    by Tamil month and, optionally, star.
+
+    A member is on the calendar for an event only if the month and day (or
+    the Tamil month and star) of its date are set. The lists are shared with
+    copies of the index made for graph snapshots, and copied by whichever
+    index changes them first.
+    """
+
+    def __init__(self):
+        self._events: dict[EventKind, list[_GregorianEntry]] = {
+            kind: [] for kind in EventKind
+        }
+        self._star_days: list[_StarEntry] = []
+        # Entries of each member, to remove them.
+        self._member_entries: dict[str, _MemberEntries] = {}
+        self._graph_handler: "GraphHandler | None" = None
+        self._is_shared = False
+
+    @classmethod
+    def from_graph_handler(cls, graph_handler: "GraphHandler") -> "CalendarIndex":
+        """
+        Builds the calendar from the members of a GraphHandler.
+
+        Args:
+            graph_handler: The GraphHandler to index.
+
+        Returns:
+            The new CalendarIndex.
+        """
+        index = cls()
+        index._graph_handler = graph_handler
+        # The build allocates a few objects per member; pausing the cyclic
+        # garbage collector avoids repeated full-heap scans.
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for member_id in graph_handler.iter_member_ids():
+                events, star_day = index._member_entries_of(member_id)
+                if events or star_day is not None:
+                    index._member_entries[member_id] = (events, star_day)
+                for kind, entry in events.items():
+                    index._events[kind].append(entry)
+                if star_day is not None:
+                    index._star_days.append(star_day)
+            for entries in index._events.values():
+                entries.sort()
+            index._star_days.sort()
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        return index
+
+    def copy_for(self, graph_handler: "GraphHandler") -> "CalendarIndex":
+        """
+        Copies the index for a copy of the graph instead of rebuilding it.
+
+        The lists and the member dict are shared until either index changes
+        them.
+        """
+        index = CalendarIndex()
+        index.__dict__.update(self.__dict__)
+        index._graph_handler = graph_handler
+        index._is_shared = self._is_shared = True
+        return index
+
+    def _own(self) -> None:
+        """Copies the lists and the member dict if they may be shared."""
+        if not self._is_shared:
+            return
+        self._events = {
+            kind: entries.copy() for kind, entries in self._events.items()
+        }
+        self._star_days = self._star_days.copy()
+        self._member_entries = self._member_entries.copy()
+        self._is_shared = False
+
+    def _member_entries_of(self, member_id: str) -> _MemberEntries:
+        """
+        Returns a member's entries for its current dates.
+
+        Args:
+            member_id: The ID of the member, which must be part of the graph.
+
+        Returns:
+            The member's entry for each of its events, and its star day entry
+            if it has one.
+        """
+        assert self._graph_handler is not None
+        member = self._graph_handler.get_member(member_id)
+        events = {}
+        for kind, date in (
+            (EventKind.BIRTHDAY, member.date_of_birth),
+            (EventKind.WEDDING_ANNIVERSARY, member.wedding_date),
+        ):
+            try:
+                datetime.date(_LEAP_YEAR, date.month, date.date)
+            except ValueError:
+                continue
+            events[kind] = (date.month, date.date, member_id, date.year)
+        star_day = None
+        traditional_date = member.traditional_date_of_birth
+        if traditional_date.month and traditional_date.star:
+            star_day = (traditional_date.month, traditional_date.star, member_id)
+        return events, star_day
+
+    def _unindex_member(self, member_id: str) -> None:
+        """Removes a member's entries from the sorted lists."""
+        member_entries = self._member_entries.pop(member_id, None)
+        if member_entries is None:
+            return
+        events, star_day = member_entries
+        for kind, entry in events.items():
+            entries = self._events[kind]
+            del entries[bisect_left(entries, entry)]
+        if star_day is not None:
+            del self._star_days[bisect_left(self._star_days, star_day)]
+
+    def _reindex_member(self, member_id: str) -> None:
+        """Replaces a member's entries with ones for its current dates."""
+        events, star_day = self._member_entries_of(member_id)
+        if self._member_entries.get(member_id, ({}, None)) == (events, star_day):
+            return
+        self._own()
+        self._unindex_member(member_id)
+        for kind, entry in events.items():
+            insort(self._events[kind], entry)
+        if star_day is not None:
+            insort(self._star_days, star_day)
+        if events or star_day is not None:
+            self._member_entries[member_id] = (events, star_day)
+
+    def _iter_kind(
+        self, kind: EventKind, start: datetime.date
+    ) -> Iterator[CalendarEvent]:
+        """Yields the events of one kind in the year from `start`, in order."""
+        entries = self._events[kind]
+        position = bisect_left(entries, (start.month, start.day))
+        for year, entry_range in (
+            (start.year, range(position, len(entries))),
+            (start.year + 1, range(position)),
+        ):
+            # Entries on the same day are adjacent, so they share one date.
+            month_day, date = None, start
+            for month, day, member_id, event_year in map(
+                entries.__getitem__, entry_range
+            ):
+                if (month, day) != month_day:
+                    month_day, date = (month, day), _occurrence(year, month, day)
+                yield CalendarEvent(kind, member_id, date, event_year)
+
+    def iter_events(
+        self, start: datetime.date, kinds: Optional[Collection[EventKind]] = None
+    ) -> Iterator[CalendarEvent]:
+        """
+        Yields the events of the year from a date on, in date order.
+
+        Args:
+            start: The first day to yield events on.
+            kinds: The kinds of events to yield, all if not given.
+
+        Returns:
+            An iterator over the events from `start` to the day before its
+            anniversary, each member's event once.
+        """
+        return heapq.merge(
+            *(self._iter_kind(kind, start) for kind in kinds or EventKind),
+            key=lambda event: event.date,
+        )
+
+    def find_events(
+        self,
+        start: datetime.date,
+        end: Optional[datetime.date] = None,
+        limit: Optional[int] = None,
+        kinds: Optional[Collection[EventKind]] = None,
+    ) -> list[CalendarEvent]:
+        """
+        Finds the events from a date on, e.g. the next 10 birthdays or the
+        anniversaries of a month.
+
+        Args:
+            start: The first day to look at.
+            end: The last day to look at, less than a year after `start`. If
+                not given, the year from `start` on is looked at.
+            limit: The largest number of events to return, if any.
+            kinds: The kinds of events to find, all if not given.
+
+        Returns:
+            The first `limit` events from `start` to `end`, in date order.
+
+        Raises:
+            InvalidInputError: If `end` is before `start` or a year or more
+                after it, or `limit` is negative.
+        """
+        events = self.iter_events(start, kinds)
+        if end is not None:
+            if not start <= end < _occurrence(start.year + 1, start.month, start.day):
+                raise InvalidInputError(
+                    operation="find_events",
+                    field="end",
+                    description="The end must be on or after the start and less "
+                    "than a year after it.",
+                )
+            events = takewhile(lambda event: event.date <= end, events)
+        if limit is not None:
+            if limit < 0:
+                raise InvalidInputError(
+                    operation="find_events",
+                    field="limit",
+                    description="The limit must not be negative.",
+                )
+            events = islice(events, limit)
+        return list(events)
+
+    def star_days(self, tamil_month: int, star: Optional[int] = None) -> list[StarDay]:
+        """
+        Finds the members whose birth star day falls in a Tamil month.
+
+        Args:
+            tamil_month: The TamilMonth value.
+            star: The TamilStar value, if only that star's members are wanted.
+
+        Returns:
+            The star days, ordered by star and then by member ID.
+        """
+        key = (tamil_month,) if star is None else (tamil_month, star)
+        start = bisect_left(self._star_days, key)
+        end = bisect_left(self._star_days, (*key[:-1], key[-1] + 1), lo=start)
+        return [
+            StarDay(member_id, month, star)
+            for month, star, member_id in self._star_days[start:end]
+        ]
+
+    def member_added(self, member_id: str) -> None:
+        self._reindex_member(member_id)
+
+    def member_updated(self, member_id: str) -> None:
+        self._reindex_member(member_id)
+
+    def member_removed(self, member_id: str) -> None:
+        self._own()
+        self._unindex_member(member_id)
@@ -0,0 +1,508 @@
+import calendar
+import datetime
+import enum
+import gc
+from typing import TYPE_CHECKING, Iterable, Iterator, NamedTuple, Optional
+
+from familytree.indexes.graph_index import GraphIndex
+from familytree.indexes.lineage_index import LineageIndex
+from familytree.proto import family_tree_pb2, utils_pb2
+from familytree.utils.graph_types import EdgeType
+
+if TYPE_CHECKING:
+    from familytree.handlers.graph_handler import GraphHandler
+
+
+class ViolationKind(enum.Enum):
+    """The genealogical invariants that the consistency index checks."""
+
+    # A parent-child link on a cycle, making the members their own ancestors.
+    ANCESTOR_CYCLE = "ancestor_cycle"
+    # A member who died before being born.
+    DEATH_BEFORE_BIRTH = "death_before_birth"
+    # A child born on or before the day its parent was born.
+    BORN_BEFORE_PARENT = "born_before_parent"
+    # A child born too long after its parent died.
+    BORN_AFTER_PARENT_DEATH = "born_after_parent_death"
+
+
+class Violation(NamedTuple):
+    """One broken invariant."""
+
+    kind: ViolationKind
+    member_id: str
+    # The parent of a parent-child link, or "" for a member's own dates.
+    related_member_id: str
+    description: str
+
+
+# (kind, member ID, related member ID), which identifies a violation.
+_ViolationKey = tuple[ViolationKind, str, str]
+
+# The kinds that are checked on a parent-child link between two members.
+_LINK_DATE_KINDS = (
+    ViolationKind.BORN_BEFORE_PARENT,
+    ViolationKind.BORN_AFTER_PARENT_DEATH,
+)
+
+# A child can be born this long after its father died.
+_POSTHUMOUS_BIRTH_DAYS = 300
+
+
+def _date_bounds(
+    date: utils_pb2.GregorianDate,
+) -> Optional[tuple[datetime.date, datetime.date]]:
+    """
+    Returns the first and last day a possibly partial date can stand for.
+
+    Args:
+        date: The date. Its month and day may be 0 if they are not known.
+
+    Returns:
+        The first and last possible day, or None if the year is not known or
+        the date is not valid.
+    """
+    year, month, day = date.year, date.month, date.date
+    try:
+        if not year:
+            return None
+        if not month:
+            return datetime.date(year, 1, 1), datetime.date(year, 12, 31)
+        if not day:
+            last_day = calendar.monthrange(year, month)[1]
+            return datetime.date(year, month, 1), datetime.date(year, month, last_day)
+        exact = datetime.date(year, month, day)
+    except ValueError:
+        return None
+    return exact, exact
+
+
+def _format(date: utils_pb2.GregorianDate) -> str:
+    """Formats a possibly partial date, e.g. 1980-03-01 or 1980."""
+    return "-".join(
+        f"{part:02d}" for part in (date.year, date.month, date.date) if part
+    )
+
+
+class _MemberDates(NamedTuple):
+    """A member's dates of birth and death, with the days they stand for."""
+
+    member: family_tree_pb2.FamilyMember
+    birth: Optional[tuple[datetime.date, datetime.date]]
+    death: Optional[tuple[datetime.date, datetime.date]]
+
+
+def _member_dates(member: family_tree_pb2.FamilyMember) -> _MemberDates:
+    """Reads the dates of a member for checking."""
+    return _MemberDates(
+        member, _date_bounds(member.date_of_birth), _date_bounds(member.date_of_death)
+    )
+
+
+def _member_violations(member_id: str, dates: _MemberDates) -> list[Violation]:
+    """Returns the violations of a member's own dates."""
+    birth, death = dates.birth, dates.death
+    if birth is None or death is None or death[1] >= birth[0]:
+        return []
+    member = dates.member
+    return [
+        Violation(
+            ViolationKind.DEATH_BEFORE_BIRTH,
+            member_id,
+            "",
+            f"Died on {_format(member.date_of_death)}, before being born on "
+            f"{_format(member.date_of_birth)}.",
+        )
+    ]
+
+
+def _link_violations(
+    parent_id: str, parent_dates: _MemberDates, child_id: str, child_dates: _MemberDates
+) -> list[Violation]:
+    """Returns the violations of a parent's and child's dates together."""
+    child_birth = child_dates.birth
+    if child_birth is None:
+        return []
+    parent, child = parent_dates.member, child_dates.member
+    violations = []
+    if parent_dates.birth is not None and child_birth[1] <= parent_dates.birth[0]:
+        violations.append(
+            Violation(
+                ViolationKind.BORN_BEFORE_PARENT,
+                child_id,
+                parent_id,
+                f"Born on {_format(child.date_of_birth)}, not after parent "
+                f"{parent_id} born on {_format(parent.date_of_birth)}.",
+            )
+        )
+    if (
+        parent_dates.death is not None
+        and (child_birth[0] - parent_dates.death[1]).days > _POSTHUMOUS_BIRTH_DAYS
+    ):
+        violations.append(
+            Violation(
+                ViolationKind.BORN_AFTER_PARENT_DEATH,
+                child_id,
+                parent_id,
+                f"Born on {_format(child.date_of_birth)}, more than "
+                f"{_POSTHUMOUS_BIRTH_DAYS} days after parent {parent_id} died on "
+                f"{_format(parent.date_of_death)}.",
+            )
+        )
+    return violations
+
+
+class ConsistencyIndex(GraphIndex):
+    """
+    The genealogical invariants that the tree currently breaks.
+
+    Members are checked on their own (death after birth) and on each
+    parent-child link (the child born after the parent and not too long after
+    the parent's death). A partial date stands for every day it could be, and
+    only a certain violation is reported. A parent-child link on a cycle is
+    reported for every link of the cycle.
+
+    The index is built by a full audit that checks every member and link and
+    finds the cycles as strongly connected components, in time linear in the
+    size of the tree. A topological sort first sets aside the members that
+    cannot be on a cycle, usually all of them. After that, a change re-checks
+    only its neighborhood: a changed member with its own parent and child
+    links, and a changed link. A new link closes a cycle if the child is an
+    ancestor of the parent, which the LineageIndex answers. The links of
+    reported cycles are re-checked whenever a link or member is removed.
+
+    The violations are shared with copies of the index made for graph
+    snapshots, and copied by whichever index changes them first.
+    """
+
+    def __init__(self, lineage: LineageIndex):
+        self._lineage = lineage
+        self._violations: dict[_ViolationKey, Violation] = {}
+        # Keys of the violations each member is part of, to drop them.
+        self._member_keys: dict[str, set[_ViolationKey]] = {}
+        # Keys of the ANCESTOR_CYCLE violations, re-checked on removals.
+        self._cycle_keys: set[_ViolationKey] = set()
+        self._graph_handler: "GraphHandler | None" = None
+        self._is_shared = False
+
+    @classmethod
+    def from_graph_handler(cls, graph_handler: "GraphHandler") -> "ConsistencyIndex":
+        """
+        Audits every member and parent-child link of a GraphHandler.
+
+        Args:
+            graph_handler: The GraphHandler to index.
+
+        Returns:
+            The new ConsistencyIndex.
+        """
+        index = cls(graph_handler._get_index(LineageIndex))
+        index._graph_handler = graph_handler
+        lineage = index._lineage
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            # Each member's dates are read once, for itself and its links.
+            dates = {
+                member_id: _member_dates(graph_handler.get_member(member_id))
+                for member_id in graph_handler.iter_member_ids()
+            }
+            parent_counts = {}
+            for member_id, member_dates in dates.items():
+                for violation in _member_violations(member_id, member_dates):
+                    index._report(violation)
+                parent_ids = lineage.get_parent_ids(member_id)
+                parent_counts[member_id] = len(parent_ids)
+                for parent_id in parent_ids:
+                    for violation in _link_violations(
+                        parent_id, dates[parent_id], member_id, member_dates
+                    ):
+                        index._report(violation)
+            for component in index._find_cycles(index._unsorted(parent_counts)):
+                index._report_cycle_links(component)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        return index
+
+    def copy_for(self, graph_handler: "GraphHandler") -> "ConsistencyIndex":
+        """
+        Copies the index for a copy of the graph instead of auditing it again.
+
+        The violations are shared until either index changes them. The copy
+        reads the copied graph's LineageIndex, which is copied before it.
+        """
+        index = ConsistencyIndex(graph_handler._get_index(LineageIndex))
+        index._violations = self._violations
+        index._member_keys = self._member_keys
+        index._cycle_keys = self._cycle_keys
+        index._graph_handler = graph_handler
+        index._is_shared = self._is_shared = True
+        return index
+
+    def _own(self) -> None:
+        """Copies the violations if they may be shared."""
+        if not self._is_shared:
+            return
+        self._violations = self._violations.copy()
+        self._member_keys = {
+            member_id: keys.copy() for member_id, keys in self._member_keys.items()
+        }
+        self._cycle_keys = self._cycle_keys.copy()
+        self._is_shared = False
+
+    def _report(self, violation: Violation) -> None:
+        """Records a violation, replacing an earlier one with the same key."""
+        key = (violation.kind, violation.member_id, violation.related_member_id)
+        self._own()
+        self._violations[key] = violation
+        if violation.kind == ViolationKind.ANCESTOR_CYCLE:
+            self._cycle_keys.add(key)
+        self._member_keys.setdefault(violation.member_id, set()).add(key)
+        if violation.related_member_id:
+            self._member_keys.setdefault(violation.related_member_id, set()).add(key)
+
+    def _clear(self, key: _ViolationKey) -> None:
+        """Drops a violation if it is recorded."""
+        if key not in self._violations:
+            return
+        self._own()
+        del self._violations[key]
+        self._cycle_keys.discard(key)
+        for member_id in key[1:]:
+            keys = self._member_keys.get(member_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._member_keys[member_id]
+
+    def _dates_of(self, member_id: str) -> _MemberDates:
+        """Reads the dates of a member of the indexed graph."""
+        assert self._graph_handler is not None
+        return _member_dates(self._graph_handler.get_member(member_id))
+
+    def _check_member(self, member_id: str) -> None:
+        """Checks a member's own dates."""
+        violations = _member_violations(member_id, self._dates_of(member_id))
+        for violation in violations:
+            self._report(violation)
+        if not violations:
+            self._clear((ViolationKind.DEATH_BEFORE_BIRTH, member_id, ""))
+
+    def _check_link_dates(self, parent_id: str, child_id: str) -> None:
+        """Checks the dates of a parent and child against each other."""
+        violations = {
+            violation.kind: violation
+            for violation in _link_violations(
+                parent_id, self._dates_of(parent_id), child_id, self._dates_of(child_id)
+            )
+        }
+        for kind in _LINK_DATE_KINDS:
+            violation = violations.get(kind)
+            if violation is not None:
+                self._report(violation)
+            else:
+                self._clear((kind, child_id, parent_id))
+
+    def _unsorted(self, parent_counts: dict[str, int]) -> list[str]:
+        """
+        Returns the members that a topological sort of the parent-child graph
+        leaves over: those on a cycle and their descendants.
+
+        Args:
+            parent_counts: The number of parents of every member. The dict is
+                changed.
+
+        Returns:
+            The members left over, in no particular order.
+        """
+        sorted_ids = [
+            member_id for member_id, count in parent_counts.items() if not count
+        ]
+        for member_id in sorted_ids:
+            for child_id in self._lineage.get_child_ids(member_id):
+                parent_counts[child_id] -= 1
+                if not parent_counts[child_id]:
+                    sorted_ids.append(child_id)
+        return [member_id for member_id, count in parent_counts.items() if count]
+
+    def _find_cycles(self, member_ids: list[str]) -> Iterator[list[str]]:
+        """
+        Finds the strongly connected components of the parent-child graph
+        that contain a cycle, with Tarjan's algorithm.
+
+        Args:
+            member_ids: The IDs of the members to start from. Every cycle
+                must be reachable from them.
+
+        Yields:
+            The members of each component with more than one member or a
+            link to itself.
+        """
+        lineage = self._lineage
+        numbers: dict[str, int] = {}
+        lowlinks: dict[str, int] = {}
+        stack: list[str] = []
+        on_stack: set[str] = set()
+        for root_id in member_ids:
+            if root_id in numbers:
+                continue
+            numbers[root_id] = lowlinks[root_id] = len(numbers)
+            stack.append(root_id)
+            on_stack.add(root_id)
+            # The walk is iterative; each frame is a member and its children
+            # still to visit.
+            frames = [(root_id, iter(lineage.get_child_ids(root_id)))]
+            while frames:
+                member_id, child_ids = frames[-1]
+                for child_id in child_ids:
+                    if child_id not in numbers:
+                        numbers[child_id] = lowlinks[child_id] = len(numbers)
+                        stack.append(child_id)
+                        on_stack.add(child_id)
+                        frames.append(
+                            (child_id, iter(lineage.get_child_ids(child_id)))
+                        )
+                        break
+                    if child_id in on_stack:
+                        lowlinks[member_id] = min(
+                            lowlinks[member_id], numbers[child_id]
+                        )
+                else:
+                    frames.pop()
+                    if frames:
+                        parent_id = frames[-1][0]
+                        lowlinks[parent_id] = min(
+                            lowlinks[parent_id], lowlinks[member_id]
+                        )
+                    if lowlinks[member_id] != numbers[member_id]:
+                        continue
+                    component = []
+                    while True:
+                        component_member_id = stack.pop()
+                        on_stack.discard(component_member_id)
+                        component.append(component_member_id)
+                        if component_member_id == member_id:
+                            break
+                    if len(component) > 1 or member_id in lineage.get_child_ids(
+                        member_id
+                    ):
+                        yield component
+
+    def _report_cycle_links(self, member_ids: Iterable[str]) -> None:
+        """Reports the parent-child links among members that are on one cycle."""
+        members = set(member_ids)
+        for parent_id in members:
+            for child_id in self._lineage.get_child_ids(parent_id):
+                if child_id in members:
+                    self._report(
+                        Violation(
+                            ViolationKind.ANCESTOR_CYCLE,
+                            child_id,
+                            parent_id,
+                            f"Child of {parent_id}, which descends from it.",
+                        )
+                    )
+
+    def _check_new_cycle(self, parent_id: str, child_id: str) -> None:
+        """
+        Reports the links of the cycles that a new parent-child link closes.
+
+        Those are the links among the members that descend from the child
+        and are ancestors of the parent, including the two themselves.
+        """
+        lineage = self._lineage
+        if parent_id != child_id and not lineage.is_ancestor(child_id, parent_id):
+            return
+        on_cycle = {child_id}
+        pending = [child_id]
+        while pending:
+            for descendant_id in lineage.get_child_ids(pending.pop()):
+                if descendant_id not in on_cycle and (
+                    descendant_id == parent_id
+                    or lineage.is_ancestor(descendant_id, parent_id)
+                ):
+                    on_cycle.add(descendant_id)
+                    pending.append(descendant_id)
+        self._report_cycle_links(on_cycle)
+
+    def _recheck_cycles(self) -> None:
+        """Drops reported cycle links that are no longer on a cycle."""
+        lineage = self._lineage
+        for kind, child_id, parent_id in list(self._cycle_keys):
+            if not (
+                lineage.has_member(parent_id)
+                and lineage.has_member(child_id)
+                and parent_id in lineage.get_parent_ids(child_id)
+                and (parent_id == child_id or lineage.is_ancestor(child_id, parent_id))
+            ):
+                self._clear((kind, child_id, parent_id))
+
+    def _check_link(self, parent_id: str, child_id: str) -> None:
+        """Re-checks a parent-child link that was added or removed."""
+        if parent_id in self._lineage.get_parent_ids(child_id):
+            self._check_link_dates(parent_id, child_id)
+            self._check_new_cycle(parent_id, child_id)
+        else:
+            for kind in _LINK_DATE_KINDS:
+                self._clear((kind, child_id, parent_id))
+            self._recheck_cycles()
+
+    def _check_member_and_links(self, member_id: str) -> None:
+        """Re-checks a member's own dates and those of its parent-child links."""
+        self._check_member(member_id)
+        for parent_id in self._lineage.get_parent_ids(member_id):
+            self._check_link_dates(parent_id, member_id)
+        for child_id in self._lineage.get_child_ids(member_id):
+            self._check_link_dates(member_id, child_id)
+
+    def violations(self, member_ids: Optional[Iterable[str]] = None) -> list[Violation]:
+        """
+        Returns the violations, of all members or of some of them.
+
+        Args:
+            member_ids: The members whose violations to return, as the member
+                or the related member. All violations if not given.
+
+        Returns:
+            The violations, ordered by member ID, kind and related member ID.
+        """
+        if member_ids is None:
+            violations = list(self._violations.values())
+        else:
+            keys = set()
+            for member_id in member_ids:
+                keys |= self._member_keys.get(member_id, set())
+            violations = [self._violations[key] for key in keys]
+        violations.sort(
+            key=lambda violation: (
+                violation.member_id,
+                violation.kind.value,
+                violation.related_member_id,
+            )
+        )
+        return violations
+
+    def member_added(self, member_id: str) -> None:
+        self._check_member_and_links(member_id)
+
+    def member_updated(self, member_id: str) -> None:
+        self._check_member_and_links(member_id)
+
+    def member_removed(self, member_id: str) -> None:
+        for key in list(self._member_keys.get(member_id, ())):
+            self._clear(key)
+        self._recheck_cycles()
+
+    def edge_changed(
+        self,
+        source_id: str,
+        target_id: str,
+        previous_type: Optional[EdgeType],
+        edge_type: Optional[EdgeType],
+    ) -> None:
+        for changed_type in {previous_type, edge_type}:
+            if changed_type == EdgeType.PARENT_TO_CHILD:
+                self._check_link(source_id, target_id)
+            elif changed_type == EdgeType.CHILD_TO_PARENT:
+                self._check_link(target_id, source_id)
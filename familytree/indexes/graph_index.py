@@ -0,0 +1,72 @@
+from typing import TYPE_CHECKING, Optional
+
+from familytree.utils.graph_types import EdgeType
+
+if TYPE_CHECKING:
+    from familytree.handlers.graph_handler import GraphHandler
+
+
+class GraphIndex:
+    """
+    Base class for secondary indexes kept in sync with a GraphHandler.
+
+    A GraphHandler builds an index with `from_graph_handler` the first time it
+    is needed and then reports every change through the hook methods below.
+    When a member is removed, its edges are removed with it and only
+    `member_removed` is called.
+    """
+
+    @classmethod
+    def from_graph_handler(cls, graph_handler: "GraphHandler") -> "GraphIndex":
+        """
+        Builds the index from the current state of a GraphHandler.
+
+        Args:
+            graph_handler: The GraphHandler to index.
+
+        Returns:
+            The new index.
+        """
+        raise NotImplementedError
+
+    def copy_for(self, graph_handler: "GraphHandler") -> Optional["GraphIndex"]:
+        """
+        Returns the index to use for a copy of the indexed GraphHandler.
+
+        The copy is made by `GraphHandler.copy`, and the two handlers change
+        independently afterwards. By default the index is dropped and rebuilt
+        for the copy on first use.
+
+        Args:
+            graph_handler: The new copy of the GraphHandler.
+
+        Returns:
+            An index for the copy, or None to rebuild it when needed.
+        """
+        return None
+
+    def member_added(self, member_id: str) -> None:
+        """Called after a member is added to the graph or replaced."""
+
+    def member_updated(self, member_id: str) -> None:
+        """Called after a member's attributes are changed."""
+
+    def member_removed(self, member_id: str) -> None:
+        """Called after a member and all of its edges are removed from the graph."""
+
+    def edge_changed(
+        self,
+        source_id: str,
+        target_id: str,
+        previous_type: Optional[EdgeType],
+        edge_type: Optional[EdgeType],
+    ) -> None:
+        """
+        Called after an edge is added, replaced by an edge of another type, or removed.
+
+        Args:
+            source_id: The ID of the source member of the edge.
+            target_id: The ID of the target member of the edge.
+            previous_type: The type of the edge before the change, if any.
+            edge_type: The type of the edge after the change, if any.
+        """
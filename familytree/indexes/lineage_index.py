@@ -0,0 +1,451 @@
+import logging
+from bisect import bisect_right
+from collections import deque
+from itertools import chain
+from operator import itemgetter
+from typing import TYPE_CHECKING, Iterable, Optional
+
+from familytree.exceptions import MemberNotFoundError
+from familytree.indexes.graph_index import GraphIndex
+from familytree.utils.graph_types import EdgeType
+
+if TYPE_CHECKING:
+    from familytree.handlers.graph_handler import GraphHandler
+
+logger = logging.getLogger(__name__)
+
+# Inclusive range of member numbers.
+Interval = tuple[int, int]
+
+_interval_start = itemgetter(0)
+
+
+def _merge(first: list[Interval], second: list[Interval]) -> list[Interval]:
+    """
+    Returns the union of two sorted interval lists, with touching intervals merged.
+
+    Args:
+        first: Sorted, disjoint intervals.
+        second: Sorted, disjoint intervals.
+
+    Returns:
+        A new sorted list of disjoint, non-adjacent intervals.
+    """
+    merged: list[Interval] = []
+    i = j = 0
+    while i < len(first) or j < len(second):
+        if j >= len(second) or (i < len(first) and first[i][0] <= second[j][0]):
+            start, end = first[i]
+            i += 1
+        else:
+            start, end = second[j]
+            j += 1
+        if merged and start <= merged[-1][1] + 1:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _contains(intervals: list[Interval], number: int) -> bool:
+    """Checks if a number falls in a sorted interval list."""
+    position = bisect_right(intervals, number, key=_interval_start) - 1
+    return position >= 0 and intervals[position][1] >= number
+
+
+def _covers(intervals: list[Interval], others: list[Interval]) -> bool:
+    """Checks if every interval of `others` lies inside one of `intervals`."""
+    for start, end in others:
+        position = bisect_right(intervals, start, key=_interval_start) - 1
+        if position < 0 or intervals[position][1] < end:
+            return False
+    return True
+
+
+class LineageIndex(GraphIndex):
+    """
+    Reachability labels for the parent-child graph.
+
+    Every member gets a number. A member's label is the set of numbers of the
+    member and all of its descendants, stored as sorted intervals. Numbers are
+    handed out in depth-first postorder from the root ancestors, starting
+    with the ones with the most descendants. A subtree
+    reached through one parent line therefore gets one interval. A child whose
+    parents come from two different lines adds an interval to the second line.
+
+    `is_ancestor` is a binary search in the ancestor's label, and
+    `count_descendants` sums the label's interval lengths. Adding a parent
+    link merges the child's label into the parent and its ancestors. The walk
+    stops at ancestors that already cover it. Removing a link recomputes the
+    labels of the parent and its ancestors.
+    """
+
+    def __init__(self):
+        self._numbers: dict[str, int] = {}
+        self._labels: dict[str, list[Interval]] = {}
+        # Children of every member, with the number of edges (PARENT_TO_CHILD
+        # and/or CHILD_TO_PARENT) that record the link.
+        self._children: dict[str, dict[str, int]] = {}
+        self._parents: dict[str, set[str]] = {}
+        self._next_number = 0
+        # Members whose children and parents containers this index may change
+        # in place; None means all. See `copy_for`.
+        self._owned_member_ids: Optional[set[str]] = None
+
+    @classmethod
+    def from_graph_handler(cls, graph_handler: "GraphHandler") -> "LineageIndex":
+        """
+        Builds the lineage index from the parent-child edges of a GraphHandler.
+
+        Args:
+            graph_handler: The GraphHandler to index.
+
+        Returns:
+            The new LineageIndex.
+        """
+        index = cls()
+        member_ids = list(graph_handler.iter_member_ids())
+        for member_id in member_ids:
+            index._children[member_id] = {}
+            index._parents[member_id] = set()
+        for member_id in member_ids:
+            for child_id in graph_handler.get_children(member_id):
+                index._count_link(member_id, child_id, 1)
+            for parent_id in graph_handler.get_parents(member_id):
+                index._count_link(parent_id, member_id, 1)
+        index._number_members(member_ids)
+        index._recompute_labels(member_ids)
+        logger.debug(f"Built lineage index for {len(member_ids)} members.")
+        return index
+
+    def copy_for(self, graph_handler: "GraphHandler") -> "LineageIndex":
+        """
+        Copies the index for a copy of the graph instead of rebuilding it.
+
+        Only the top-level dicts are copied. Labels are replaced rather than
+        changed in place, and both indexes copy a member's children and parents
+        the first time they change them.
+        """
+        index = LineageIndex()
+        index._numbers = self._numbers.copy()
+        index._labels = self._labels.copy()
+        index._children = self._children.copy()
+        index._parents = self._parents.copy()
+        index._next_number = self._next_number
+        index._owned_member_ids = set()
+        self._owned_member_ids = set()
+        return index
+
+    def _own(self, member_id: str) -> None:
+        """
+        Copies a member's children and parents if they may be shared with a
+        copy of this index.
+
+        Args:
+            member_id: The ID of an indexed member.
+        """
+        owned_member_ids = self._owned_member_ids
+        if owned_member_ids is None or member_id in owned_member_ids:
+            return
+        owned_member_ids.add(member_id)
+        self._children[member_id] = self._children[member_id].copy()
+        self._parents[member_id] = self._parents[member_id].copy()
+
+    def _count_link(self, parent_id: str, child_id: str, delta: int) -> tuple[bool, bool]:
+        """
+        Adds to or subtracts from the number of edges recording a parent link.
+
+        Args:
+            parent_id: The ID of the parent.
+            child_id: The ID of the child.
+            delta: +1 when an edge recording the link is added, -1 when removed.
+
+        Returns:
+            Whether the link existed before and after the change.
+        """
+        self._own(parent_id)
+        self._own(child_id)
+        children = self._children[parent_id]
+        previous_count = children.get(child_id, 0)
+        count = previous_count + delta
+        if count > 0:
+            children[child_id] = count
+            self._parents[child_id].add(parent_id)
+        else:
+            children.pop(child_id, None)
+            self._parents[child_id].discard(parent_id)
+        return previous_count > 0, count > 0
+
+    def _roots_by_weight(self, member_ids: list[str]) -> list[str]:
+        """
+        Returns the members without parents, heaviest lines first.
+
+        A member's weight is one plus an equal share of each child's weight,
+        so a founder outweighs someone who married into the family. Numbering
+        the founder's line first keeps its descendants in a single interval.
+
+        Args:
+            member_ids: The IDs of all members.
+
+        Returns:
+            The root member IDs sorted by decreasing weight.
+        """
+        weights = dict.fromkeys(member_ids, 1.0)
+        pending_children = {
+            member_id: len(self._children[member_id]) for member_id in member_ids
+        }
+        queue = deque(
+            member_id for member_id, count in pending_children.items() if count == 0
+        )
+        while queue:
+            member_id = queue.popleft()
+            parent_ids = self._parents[member_id]
+            for parent_id in parent_ids:
+                weights[parent_id] += weights[member_id] / len(parent_ids)
+                pending_children[parent_id] -= 1
+                if pending_children[parent_id] == 0:
+                    queue.append(parent_id)
+        roots = [member_id for member_id in member_ids if not self._parents[member_id]]
+        roots.sort(key=weights.__getitem__, reverse=True)
+        return roots
+
+    def _number_members(self, member_ids: list[str]) -> None:
+        """
+        Numbers members in depth-first postorder, starting from the heaviest roots.
+
+        Args:
+            member_ids: The IDs of all members.
+        """
+        visited: set[str] = set()
+        # Members only reachable through a cycle have no root; the second pass
+        # over every member picks them up.
+        for start_id in chain(self._roots_by_weight(member_ids), member_ids):
+            if start_id in visited:
+                continue
+            visited.add(start_id)
+            stack = [(start_id, iter(self._children[start_id]))]
+            while stack:
+                member_id, children = stack[-1]
+                for child_id in children:
+                    if child_id not in visited:
+                        visited.add(child_id)
+                        stack.append((child_id, iter(self._children[child_id])))
+                        break
+                else:
+                    stack.pop()
+                    self._numbers[member_id] = self._next_number
+                    self._next_number += 1
+
+    def _recompute_labels(self, member_ids: Iterable[str]) -> None:
+        """
+        Rebuilds the labels of a set of members, children before parents.
+
+        Labels of members outside the set are taken as they are. Links that
+        close a cycle are applied afterwards by propagation.
+
+        Args:
+            member_ids: The IDs of the members whose labels are rebuilt. Every
+                ancestor of a member in the set must be in the set too.
+        """
+        members = dict.fromkeys(member_ids)
+        for member_id in members:
+            number = self._numbers[member_id]
+            label = [(number, number)]
+            for child_id in self._children[member_id]:
+                if child_id not in members:
+                    label = _merge(label, self._labels[child_id])
+            self._labels[member_id] = label
+
+        finished: set[str] = set()
+        on_stack: set[str] = set()
+        cycle_links: list[tuple[str, str]] = []
+        for start_id in members:
+            if start_id in finished:
+                continue
+            on_stack.add(start_id)
+            stack = [(start_id, iter(self._children[start_id]))]
+            while stack:
+                member_id, children = stack[-1]
+                for child_id in children:
+                    if child_id not in members:
+                        continue
+                    if child_id in on_stack:
+                        cycle_links.append((member_id, child_id))
+                    elif child_id in finished:
+                        self._labels[member_id] = _merge(
+                            self._labels[member_id], self._labels[child_id]
+                        )
+                    else:
+                        on_stack.add(child_id)
+                        stack.append((child_id, iter(self._children[child_id])))
+                        break
+                else:
+                    stack.pop()
+                    on_stack.discard(member_id)
+                    finished.add(member_id)
+                    if stack:
+                        parent_id = stack[-1][0]
+                        self._labels[parent_id] = _merge(
+                            self._labels[parent_id], self._labels[member_id]
+                        )
+        for parent_id, child_id in cycle_links:
+            self._propagate(parent_id, self._labels[child_id])
+
+    def _propagate(self, member_id: str, label: list[Interval]) -> None:
+        """
+        Merges a label into a member and its ancestors.
+
+        The walk stops at members whose label already covers it, since their
+        ancestors cover it as well.
+
+        Args:
+            member_id: The ID of the member that gained descendants.
+            label: The numbers of the new descendants.
+        """
+        pending = [member_id]
+        while pending:
+            current_id = pending.pop()
+            current_label = self._labels[current_id]
+            if _covers(current_label, label):
+                continue
+            self._labels[current_id] = _merge(current_label, label)
+            pending.extend(self._parents[current_id])
+
+    def _ancestors_and_self(self, member_ids: Iterable[str]) -> list[str]:
+        """Returns the given members and all of their ancestors."""
+        seen = dict.fromkeys(member_ids)
+        queue = deque(seen)
+        while queue:
+            for parent_id in self._parents[queue.popleft()]:
+                if parent_id not in seen:
+                    seen[parent_id] = None
+                    queue.append(parent_id)
+        return list(seen)
+
+    def has_member(self, member_id: str) -> bool:
+        """Checks if a member is indexed."""
+        return member_id in self._numbers
+
+    def _check_member(self, member_id: str, operation: str) -> None:
+        if member_id not in self._numbers:
+            raise MemberNotFoundError(member_id=member_id, operation=operation)
+
+    def is_ancestor(self, ancestor_id: str, descendant_id: str) -> bool:
+        """
+        Checks if a member is an ancestor of another member.
+
+        Args:
+            ancestor_id: The ID of the possible ancestor.
+            descendant_id: The ID of the possible descendant.
+
+        Returns:
+            True if `ancestor_id` is a parent, grandparent, etc. of `descendant_id`.
+
+        Raises:
+            MemberNotFoundError: If either member is not indexed.
+        """
+        self._check_member(ancestor_id, "is_ancestor")
+        self._check_member(descendant_id, "is_ancestor")
+        if ancestor_id == descendant_id:
+            return False
+        return _contains(self._labels[ancestor_id], self._numbers[descendant_id])
+
+    def get_parent_ids(self, member_id: str) -> set[str]:
+        """
+        Returns the parents of a member, whichever edge direction records the link.
+
+        The returned set belongs to the index and must not be modified.
+
+        Args:
+            member_id: The ID of the member.
+
+        Returns:
+            The IDs of the member's parents.
+
+        Raises:
+            MemberNotFoundError: If the member is not indexed.
+        """
+        self._check_member(member_id, "get_parent_ids")
+        return self._parents[member_id]
+
+    def get_child_ids(self, member_id: str) -> Iterable[str]:
+        """
+        Returns the children of a member, whichever edge direction records the link.
+
+        The returned view belongs to the index and must not be modified.
+
+        Args:
+            member_id: The ID of the member.
+
+        Returns:
+            The IDs of the member's children.
+
+        Raises:
+            MemberNotFoundError: If the member is not indexed.
+        """
+        self._check_member(member_id, "get_child_ids")
+        return self._children[member_id].keys()
+
+    def count_descendants(self, member_id: str) -> int:
+        """
+        Counts the distinct descendants of a member.
+
+        Args:
+            member_id: The ID of the member.
+
+        Returns:
+            The number of children, grandchildren, etc. of the member.
+
+        Raises:
+            MemberNotFoundError: If the member is not indexed.
+        """
+        self._check_member(member_id, "count_descendants")
+        return sum(end - start + 1 for start, end in self._labels[member_id]) - 1
+
+    def member_added(self, member_id: str) -> None:
+        if member_id in self._numbers:
+            return
+        number = self._next_number
+        self._next_number += 1
+        self._numbers[member_id] = number
+        self._labels[member_id] = [(number, number)]
+        self._children[member_id] = {}
+        self._parents[member_id] = set()
+        if self._owned_member_ids is not None:
+            self._owned_member_ids.add(member_id)
+
+    def member_removed(self, member_id: str) -> None:
+        if member_id not in self._numbers:
+            return
+        parent_ids = self._parents.pop(member_id)
+        for parent_id in parent_ids:
+            self._own(parent_id)
+            self._children[parent_id].pop(member_id, None)
+        for child_id in self._children.pop(member_id):
+            self._own(child_id)
+            self._parents[child_id].discard(member_id)
+        del self._numbers[member_id]
+        del self._labels[member_id]
+        if parent_ids:
+            self._recompute_labels(self._ancestors_and_self(parent_ids))
+
+    def edge_changed(
+        self,
+        source_id: str,
+        target_id: str,
+        previous_type: Optional[EdgeType],
+        edge_type: Optional[EdgeType],
+    ) -> None:
+        for changed_type, delta in ((previous_type, -1), (edge_type, 1)):
+            if changed_type == EdgeType.PARENT_TO_CHILD:
+                parent_id, child_id = source_id, target_id
+            elif changed_type == EdgeType.CHILD_TO_PARENT:
+                parent_id, child_id = target_id, source_id
+            else:
+                continue
+            existed, exists = self._count_link(parent_id, child_id, delta)
+            if exists and not existed:
+                self._propagate(parent_id, self._labels[child_id])
+            elif existed and not exists:
+                self._recompute_labels(self._ancestors_and_self([parent_id]))
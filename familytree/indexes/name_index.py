@@ -0,0 +1,265 @@
+import gc
+import re
+import unicodedata
+from bisect import bisect_left, insort
+from typing import TYPE_CHECKING, NamedTuple
+
+from familytree.indexes.graph_index import GraphIndex
+
+if TYPE_CHECKING:
+    from familytree.handlers.graph_handler import GraphHandler
+
+# Names are split into tokens at whitespace and common punctuation. Combining
+# marks are kept, since Tamil vowel signs are combining marks.
+_TOKEN_SEPARATORS = re.compile(r"[\s\-.,;:'’\"()/]+")
+
+# Sorts after every other character, to end a prefix range.
+_MAX_CHAR = chr(0x10FFFF)
+
+
+def normalize_name(name: str) -> str:
+    """
+    Returns the form of a name that matching and ranking are done on.
+
+    Args:
+        name: A name or search prefix.
+
+    Returns:
+        The name in Unicode compatibility form, case-folded.
+    """
+    return unicodedata.normalize("NFKC", name).casefold()
+
+
+def tokenize_name(name: str) -> list[str]:
+    """
+    Splits a name into its normalized tokens.
+
+    Args:
+        name: A name or search prefix.
+
+    Returns:
+        The tokens, in order, without empty ones.
+    """
+    return [token for token in _TOKEN_SEPARATORS.split(normalize_name(name)) if token]
+
+
+class NameMatch(NamedTuple):
+    """A member found by a name search."""
+
+    member_id: str
+    name: str
+    # The nickname that matched, if the member's name did not.
+    nickname: str | None
+
+
+# (token, member's tokens, member ID), sorted. The member's tokens are its
+# name tokens in order and then its nickname tokens, each preceded by a space.
+_Entry = tuple[str, str, str]
+
+# Entries filtered at once by a search for several words.
+_SCAN_CHUNK = 256
+
+
+class NameIndex(GraphIndex):
+    """
+    Prefix search over the names and nicknames of the members.
+
+    Every token of a member's name and nicknames is kept in a sorted list
+    together with all of the member's tokens and its ID, one list for names
+    and one for nicknames. The entries whose token starts with a prefix are one
+    contiguous range found by binary search, already ordered by token and then
+    by name. A search therefore reads only the start of the range until it
+    has enough results.
+
+    A search for several words matches members that have, for every word, a
+    token starting with it. Matches on the name rank before matches on a
+    nickname. Within each, members are ordered by the matching token, so
+    "ron" finds "Ron" before "Ronald", and then by name.
+
+    The lists are shared with copies of the index made for graph snapshots,
+    and copied by whichever index changes them first.
+    """
+
+    def __init__(self):
+        self._name_entries: list[_Entry] = []
+        self._nickname_entries: list[_Entry] = []
+        # Entries of each member, to remove them.
+        self._member_entries: dict[str, tuple[list[_Entry], list[_Entry]]] = {}
+        # The name and nicknames each member was indexed with.
+        self._names: dict[str, tuple[str, tuple[str, ...]]] = {}
+        # For members with nicknames, the nickname each nickname token is from.
+        self._nickname_tokens: dict[str, dict[str, str]] = {}
+        self._graph_handler: "GraphHandler | None" = None
+        self._is_shared = False
+
+    @classmethod
+    def from_graph_handler(cls, graph_handler: "GraphHandler") -> "NameIndex":
+        """
+        Builds the name index from the members of a GraphHandler.
+
+        Args:
+            graph_handler: The GraphHandler to index.
+
+        Returns:
+            The new NameIndex.
+        """
+        index = cls()
+        index._graph_handler = graph_handler
+        # The build allocates a few objects per member; pausing the cyclic
+        # garbage collector avoids repeated full-heap scans.
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for member_id in graph_handler.iter_member_ids():
+                name_entries, nickname_entries = index._index_member(member_id)
+                index._name_entries.extend(name_entries)
+                index._nickname_entries.extend(nickname_entries)
+            index._name_entries.sort()
+            index._nickname_entries.sort()
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        return index
+
+    def copy_for(self, graph_handler: "GraphHandler") -> "NameIndex":
+        """
+        Copies the index for a copy of the graph instead of rebuilding it.
+
+        The entry lists and member dicts are shared until either index
+        changes them.
+        """
+        index = NameIndex()
+        index.__dict__.update(self.__dict__)
+        index._graph_handler = graph_handler
+        index._is_shared = self._is_shared = True
+        return index
+
+    def _own(self) -> None:
+        """Copies the entry lists and member dicts if they may be shared."""
+        if not self._is_shared:
+            return
+        self._name_entries = self._name_entries.copy()
+        self._nickname_entries = self._nickname_entries.copy()
+        self._member_entries = self._member_entries.copy()
+        self._names = self._names.copy()
+        self._nickname_tokens = self._nickname_tokens.copy()
+        self._is_shared = False
+
+    def _index_member(self, member_id: str) -> tuple[list[_Entry], list[_Entry]]:
+        """
+        Records a member's names and returns its entries, without adding them
+        to the sorted lists.
+
+        Args:
+            member_id: The ID of the member, which must be part of the graph.
+
+        Returns:
+            The member's name entries and nickname entries.
+        """
+        assert self._graph_handler is not None
+        member = self._graph_handler.get_member(member_id)
+        name_tokens = tokenize_name(member.name)
+        nicknames: dict[str, str] = {}
+        for nickname in member.nicknames:
+            for token in tokenize_name(nickname):
+                if token not in name_tokens:
+                    nicknames.setdefault(token, nickname)
+        tokens = "".join(f" {token}" for token in (*name_tokens, *nicknames))
+        entries = (
+            [(token, tokens, member_id) for token in dict.fromkeys(name_tokens)],
+            [(token, tokens, member_id) for token in nicknames],
+        )
+        self._member_entries[member_id] = entries
+        self._names[member_id] = (member.name, tuple(member.nicknames))
+        if nicknames:
+            self._nickname_tokens[member_id] = nicknames
+        return entries
+
+    def _unindex_member(self, member_id: str) -> None:
+        """Removes a member's entries from the sorted lists and its names."""
+        entries = self._member_entries.pop(member_id, None)
+        if entries is None:
+            return
+        for entry_list, member_entries in zip(
+            (self._name_entries, self._nickname_entries), entries
+        ):
+            for entry in member_entries:
+                del entry_list[bisect_left(entry_list, entry)]
+        del self._names[member_id]
+        self._nickname_tokens.pop(member_id, None)
+
+    def _reindex_member(self, member_id: str) -> None:
+        """Replaces a member's entries with ones for its current names."""
+        self._own()
+        self._unindex_member(member_id)
+        name_entries, nickname_entries = self._index_member(member_id)
+        for entry in name_entries:
+            insort(self._name_entries, entry)
+        for entry in nickname_entries:
+            insort(self._nickname_entries, entry)
+
+    def search(self, prefix: str, limit: int) -> list[NameMatch]:
+        """
+        Finds the best-ranked members whose names match a prefix.
+
+        Args:
+            prefix: One or more words, each the start of a name or nickname
+                token of the member. Case and compatibility forms are ignored.
+            limit: The largest number of matches to return.
+
+        Returns:
+            The matches, best first. Empty if the prefix has no words.
+        """
+        words = tokenize_name(prefix)
+        matches: list[NameMatch] = []
+        if not words or limit <= 0:
+            return matches
+        # Every match has a token for every word, so the entries of the word
+        # with the fewest entries are read in order, a chunk at a time. The
+        # other words are looked up in the tokens stored with each entry.
+        entry_lists = (self._name_entries, self._nickname_entries)
+        word_ranges = {
+            word: [self._prefix_range(entry_list, word) for entry_list in entry_lists]
+            for word in words
+        }
+        word = min(words, key=lambda word: sum(map(len, word_ranges[word])))
+        other_words = [f" {other}" for other in words if other != word]
+        seen: set[str] = set()
+        for entry_list, entry_range in zip(entry_lists, word_ranges[word]):
+            for chunk_start in entry_range[::_SCAN_CHUNK]:
+                entries = entry_list[
+                    chunk_start : min(chunk_start + _SCAN_CHUNK, entry_range.stop)
+                ]
+                for other_word in other_words:
+                    entries = [entry for entry in entries if other_word in entry[1]]
+                for token, _, member_id in entries:
+                    if member_id in seen:
+                        continue
+                    seen.add(member_id)
+                    name, _ = self._names[member_id]
+                    nickname = None
+                    if entry_list is self._nickname_entries:
+                        nickname = self._nickname_tokens[member_id][token]
+                    matches.append(NameMatch(member_id, name, nickname))
+                    if len(matches) == limit:
+                        return matches
+        return matches
+
+    @staticmethod
+    def _prefix_range(entry_list: list[_Entry], word: str) -> range:
+        """Returns the positions of the entries whose token starts with `word`."""
+        start = bisect_left(entry_list, (word,))
+        return range(start, bisect_left(entry_list, (word + _MAX_CHAR,), lo=start))
+
+    def member_added(self, member_id: str) -> None:
+        self._reindex_member(member_id)
+
+    def member_updated(self, member_id: str) -> None:
+        assert self._graph_handler is not None
+        member = self._graph_handler.get_member(member_id)
+        if self._names.get(member_id) != (member.name, tuple(member.nicknames)):
+            self._reindex_member(member_id)
+
+    def member_removed(self, member_id: str) -> None:
+        self._own()
+        self._unindex_member(member_id)
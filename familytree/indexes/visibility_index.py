@@ -0,0 +1,530 @@
+import copy
+import enum
+import logging
+import threading
+from array import array
+from typing import TYPE_CHECKING, Callable, Iterable, NamedTuple, Optional
+
+from familytree.exceptions import MemberNotFoundError, OperationError
+from familytree.indexes.graph_index import GraphIndex
+from familytree.utils.graph_types import EdgeType
+
+if TYPE_CHECKING:
+    from familytree.handlers.graph_handler import GraphHandler
+
+logger = logging.getLogger(__name__)
+
+# An edge as (source member ID, target member ID, edge type).
+Edge = tuple[str, str, EdgeType]
+
+# The view session used when a caller does not name one.
+DEFAULT_VIEW_SESSION_ID = "default"
+
+# Most view sessions kept besides the default one. Clients often leave
+# without closing theirs, so creating one more evicts the least recently used.
+_MAX_VIEW_SESSIONS = 10_000
+
+
+class RelativeGroup(enum.Enum):
+    """
+    The relatives of a member that can be shown or hidden together.
+
+    Each value matches a `has_visible_<value>` flag of GraphNode, which tells
+    whether the member has such relatives at all.
+    """
+
+    PARENTS = "parents"
+    SIBLINGS = "siblings"
+    CHILDREN = "children"
+    SPOUSE = "spouse"
+    INLAWS = "inlaws"
+
+
+class VisibilityDelta(NamedTuple):
+    """The members and edges that were shown or hidden by one view change."""
+
+    shown_member_ids: list[str]
+    hidden_member_ids: list[str]
+    shown_edges: list[Edge]
+    hidden_edges: list[Edge]
+
+
+# Bits of the per-member session flags: one per expanded group, and one for
+# pinned members.
+_GROUP_BITS = {group: 1 << bit for bit, group in enumerate(RelativeGroup)}
+_PINNED_BIT = 1 << len(RelativeGroup)
+
+# Sessions store their arrays in pages of 2**_PAGE_SHIFT member slots.
+_PAGE_SHIFT = 8
+_PAGE_MASK = (1 << _PAGE_SHIFT) - 1
+
+
+class ViewSession:
+    """
+    The view state of one viewer, kept apart from the shared graph.
+
+    Reference counts and flags are stored in arrays indexed by the member
+    slots of the VisibilityIndex. The arrays are split into fixed-size pages
+    that are only allocated once the session touches one of their slots, so a
+    new session holds nothing but empty dicts.
+    """
+
+    __slots__ = ("count_pages", "flag_pages", "expansions", "poi_slot")
+
+    def __init__(self):
+        # Number of references that keep each member visible; 0 when hidden.
+        self.count_pages: dict[int, array] = {}
+        # _GROUP_BITS of the expanded groups and _PINNED_BIT, per member.
+        self.flag_pages: dict[int, bytearray] = {}
+        # Slots counted by each expansion, keyed by (slot, group).
+        self.expansions: dict[tuple[int, RelativeGroup], array] = {}
+        self.poi_slot = -1
+
+    def count(self, slot: int) -> int:
+        page = self.count_pages.get(slot >> _PAGE_SHIFT)
+        return 0 if page is None else page[slot & _PAGE_MASK]
+
+    def add_count(self, slot: int, delta: int) -> int:
+        """Changes the reference count of a member and returns the new count."""
+        page = self.count_pages.get(slot >> _PAGE_SHIFT)
+        if page is None:
+            page = array("I", bytes(4 << _PAGE_SHIFT))
+            self.count_pages[slot >> _PAGE_SHIFT] = page
+        page[slot & _PAGE_MASK] += delta
+        return page[slot & _PAGE_MASK]
+
+    def get_flags(self, slot: int) -> int:
+        page = self.flag_pages.get(slot >> _PAGE_SHIFT)
+        return 0 if page is None else page[slot & _PAGE_MASK]
+
+    def set_flags(self, slot: int, flags: int) -> None:
+        page = self.flag_pages.get(slot >> _PAGE_SHIFT)
+        if page is None:
+            if not flags:
+                return
+            page = self.flag_pages[slot >> _PAGE_SHIFT] = bytearray(1 << _PAGE_SHIFT)
+        page[slot & _PAGE_MASK] = flags
+
+    def has_flag(self, slot: int, bit: int) -> bool:
+        return bool(self.get_flags(slot) & bit)
+
+
+class VisibilityIndex(GraphIndex):
+    """
+    Reference-counted visibility of members for the interactive graph views.
+
+    Every viewer works in its own ViewSession, so views of the same graph do
+    not interfere and never copy it. Members are given dense slots the first
+    time a view refers to them, and sessions store their state in arrays
+    indexed by those slots. Slots are not reused after a member is removed.
+
+    Within a session a member is visible while something refers to it: either
+    it was shown directly, or it belongs to an expanded group of a visible
+    member. Every expansion keeps the slots it counted, so collapsing it
+    releases exactly those. A member whose count drops to zero is hidden, and
+    its own expansions are collapsed with it.
+
+    Rendered edges are visible when both of their members are. Changes report
+    only the members and edges that appeared or disappeared, so a client can
+    patch its view.
+
+    At most _MAX_VIEW_SESSIONS sessions are kept besides the default one.
+    Creating another evicts the session that was used least recently, and
+    later requests to an evicted session fail as for a closed one.
+
+    The sessions and slots are shared by the indexes of every copy of the
+    graph, and are guarded by a lock of their own, so that views can be
+    changed on a published snapshot while a write removes members from a copy.
+    """
+
+    def __init__(self, graph_handler: "GraphHandler"):
+        self._graph_handler = graph_handler
+        self._slots: dict[str, int] = {}
+        self._member_ids: list[Optional[str]] = []
+        # Ordered from the least to the most recently used.
+        self._sessions: dict[str, ViewSession] = {
+            DEFAULT_VIEW_SESSION_ID: ViewSession()
+        }
+        # Guards the sessions and slots above.
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_graph_handler(cls, graph_handler: "GraphHandler") -> "VisibilityIndex":
+        """
+        Creates the index for a GraphHandler, with only the default session.
+
+        Args:
+            graph_handler: The GraphHandler whose members are shown.
+
+        Returns:
+            The new VisibilityIndex.
+        """
+        return cls(graph_handler)
+
+    def copy_for(self, graph_handler: "GraphHandler") -> "VisibilityIndex":
+        """
+        Shares the view sessions with a copy of the graph.
+
+        Views are not part of the graph's state: viewers keep theirs while the
+        graph is copied and changed. Each index reads the relatives of its own
+        graph, so views of a snapshot do not see a write that is in progress.
+        """
+        index = copy.copy(self)
+        index._graph_handler = graph_handler
+        return index
+
+    def create_session(self, session_id: str) -> None:
+        """
+        Starts a view session with every member hidden.
+
+        If there are already _MAX_VIEW_SESSIONS sessions besides the default
+        one, the least recently used of them is dropped.
+
+        Args:
+            session_id: The ID of the new session.
+
+        Raises:
+            OperationError: If a session with this ID already exists.
+        """
+        with self._lock:
+            if session_id in self._sessions:
+                raise OperationError(
+                    operation="create_view_session",
+                    reason=f"View session '{session_id}' already exists.",
+                    status_code=409,
+                )
+            self._sessions[session_id] = ViewSession()
+            if len(self._sessions) > _MAX_VIEW_SESSIONS + 1:
+                idle_id = next(
+                    idle_id
+                    for idle_id in self._sessions
+                    if idle_id != DEFAULT_VIEW_SESSION_ID
+                )
+                del self._sessions[idle_id]
+                logger.info(f"Evicted the idle view session '{idle_id}'.")
+
+    def close_session(self, session_id: str) -> None:
+        """
+        Ends a view session and drops its state.
+
+        The default session is only cleared, since it always exists.
+
+        Args:
+            session_id: The ID of the session.
+
+        Raises:
+            OperationError: If there is no session with this ID.
+        """
+        with self._lock:
+            self._get_session(session_id, "close_view_session")
+            if session_id == DEFAULT_VIEW_SESSION_ID:
+                self._sessions[session_id] = ViewSession()
+            else:
+                del self._sessions[session_id]
+
+    def _get_session(self, session_id: str, operation: str) -> ViewSession:
+        """Returns a session and marks it as the most recently used."""
+        session = self._sessions.pop(session_id, None)
+        if session is None:
+            raise OperationError(
+                operation=operation,
+                reason=f"View session '{session_id}' does not exist.",
+                status_code=404,
+            )
+        self._sessions[session_id] = session
+        return session
+
+    def _slot(self, member_id: str) -> int:
+        """Returns the slot of a member, assigning the next free one if needed."""
+        slot = self._slots.get(member_id)
+        if slot is None:
+            slot = self._slots[member_id] = len(self._member_ids)
+            self._member_ids.append(member_id)
+        return slot
+
+    def is_visible(
+        self, member_id: str, session_id: str = DEFAULT_VIEW_SESSION_ID
+    ) -> bool:
+        """Checks if a member is currently visible in a session."""
+        with self._lock:
+            slot = self._slots.get(member_id)
+            session = self._get_session(session_id, "is_visible")
+            return slot is not None and session.count(slot) > 0
+
+    def is_expanded(
+        self,
+        member_id: str,
+        group: RelativeGroup,
+        session_id: str = DEFAULT_VIEW_SESSION_ID,
+    ) -> bool:
+        """Checks if a group of relatives of a member is expanded in a session."""
+        with self._lock:
+            slot = self._slots.get(member_id)
+            session = self._get_session(session_id, "is_expanded")
+            return slot is not None and session.has_flag(slot, _GROUP_BITS[group])
+
+    def is_poi(self, member_id: str, session_id: str = DEFAULT_VIEW_SESSION_ID) -> bool:
+        """Checks if a member is the point of interest of a session."""
+        with self._lock:
+            slot = self._slots.get(member_id)
+            session = self._get_session(session_id, "is_poi")
+            return slot is not None and session.poi_slot == slot
+
+    def get_relatives(self, member_id: str, group: RelativeGroup) -> list[str]:
+        """
+        Returns the members a group of relatives consists of.
+
+        In-laws are the parents and siblings of the member's spouses and the
+        spouses of the member's siblings and children. The spouses, siblings
+        and children that link the member to them are included, so that the
+        in-laws are connected to the member in the view.
+
+        Args:
+            member_id: The ID of the member.
+            group: The group of relatives.
+
+        Returns:
+            The IDs of the relatives, without duplicates.
+        """
+        graph_handler = self._graph_handler
+        if group is RelativeGroup.PARENTS:
+            relatives = graph_handler.get_parents(member_id)
+        elif group is RelativeGroup.CHILDREN:
+            relatives = graph_handler.get_children(member_id)
+        elif group is RelativeGroup.SPOUSE:
+            relatives = graph_handler.get_spouses(member_id)
+        elif group is RelativeGroup.SIBLINGS:
+            relatives = self._get_siblings(member_id)
+        else:
+            relatives = []
+            for spouse_id in graph_handler.get_spouses(member_id):
+                spouse_family = graph_handler.get_parents(spouse_id)
+                spouse_family += self._get_siblings(spouse_id)
+                if spouse_family:
+                    relatives += [spouse_id, *spouse_family]
+            blood_relatives = self._get_siblings(member_id)
+            blood_relatives += graph_handler.get_children(member_id)
+            for relative_id in blood_relatives:
+                relative_spouses = graph_handler.get_spouses(relative_id)
+                if relative_spouses:
+                    relatives += [relative_id, *relative_spouses]
+        return [
+            relative_id
+            for relative_id in dict.fromkeys(relatives)
+            if relative_id != member_id
+        ]
+
+    def _get_siblings(self, member_id: str) -> list[str]:
+        """Returns the other children of a member's parents."""
+        siblings = {}
+        for parent_id in self._graph_handler.get_parents(member_id):
+            siblings.update(dict.fromkeys(self._graph_handler.get_children(parent_id)))
+        siblings.pop(member_id, None)
+        return list(siblings)
+
+    def _check_member(self, member_id: str, operation: str) -> None:
+        if not self._graph_handler.has_member(member_id):
+            raise MemberNotFoundError(member_id=member_id, operation=operation)
+
+    def _acquire(self, session: ViewSession, slot: int, shown: list[int]) -> None:
+        """Adds a reference to a member, showing it if it was hidden."""
+        if session.add_count(slot, 1) == 1:
+            shown.append(slot)
+
+    def _release(
+        self, session: ViewSession, slots: Iterable[int], hidden: list[int]
+    ) -> None:
+        """
+        Drops one reference to each member, hiding those that are left without any.
+
+        Hidden members' expansions are collapsed too, which may hide more
+        members in turn.
+        """
+        pending = list(slots)
+        while pending:
+            slot = pending.pop()
+            if session.count(slot) == 0 or session.add_count(slot, -1) > 0:
+                continue
+            hidden.append(slot)
+            flags = session.get_flags(slot)
+            for group, bit in _GROUP_BITS.items():
+                if flags & bit:
+                    pending.extend(session.expansions.pop((slot, group)))
+            session.set_flags(slot, 0)
+            if session.poi_slot == slot:
+                session.poi_slot = -1
+
+    def _incident_edges(
+        self, member_ids: list[str], is_visible: Callable[[str], bool]
+    ) -> list[Edge]:
+        """
+        Returns the rendered edges between the given members and the visible ones.
+
+        Args:
+            member_ids: The members whose edges are listed.
+            is_visible: Tells whether the member at the other end counts as
+                visible; should hold for `member_ids` for edges among them.
+
+        Returns:
+            Each edge once, as (source, target, edge type).
+        """
+        graph_handler = self._graph_handler
+        edges: dict[tuple[str, str], EdgeType] = {}
+        for member_id in member_ids:
+            if not graph_handler.has_member(member_id):
+                continue
+            for edge_type in EdgeType:
+                for neighbor_id in graph_handler._get_typed_neighbors(
+                    member_id, edge_type
+                ):
+                    if is_visible(neighbor_id):
+                        edges[member_id, neighbor_id] = edge_type
+            for source_id in graph_handler._get_predecessor_ids(member_id):
+                if (source_id, member_id) not in edges and is_visible(source_id):
+                    edge_type = graph_handler._get_edge_type(source_id, member_id)
+                    if edge_type is not None:
+                        edges[source_id, member_id] = edge_type
+        return [
+            (source_id, target_id, edge_type)
+            for (source_id, target_id), edge_type in edges.items()
+            if graph_handler._get_edge(source_id, target_id).is_rendered
+        ]
+
+    def _visibility_check(self, session: ViewSession) -> Callable[[str], bool]:
+        """Returns a function telling if a member is visible in a session."""
+
+        def is_visible(member_id: str) -> bool:
+            slot = self._slots.get(member_id)
+            return slot is not None and session.count(slot) > 0
+
+        return is_visible
+
+    def _shown_delta(self, session: ViewSession, shown: list[int]) -> VisibilityDelta:
+        shown_ids = [self._member_ids[slot] for slot in shown]
+        shown_edges = self._incident_edges(shown_ids, self._visibility_check(session))
+        return VisibilityDelta(shown_ids, [], shown_edges, [])
+
+    def show(
+        self, member_id: str, session_id: str = DEFAULT_VIEW_SESSION_ID
+    ) -> VisibilityDelta:
+        """
+        Shows a member on its own and makes it the session's point of interest.
+
+        Args:
+            member_id: The ID of the member.
+            session_id: The ID of the view session.
+
+        Returns:
+            The members and edges that became visible.
+
+        Raises:
+            MemberNotFoundError: If the member is not part of the graph.
+            OperationError: If there is no session with this ID.
+        """
+        with self._lock:
+            session = self._get_session(session_id, "show")
+            self._check_member(member_id, "show")
+            slot = self._slot(member_id)
+            shown: list[int] = []
+            if not session.has_flag(slot, _PINNED_BIT):
+                self._acquire(session, slot, shown)
+                session.set_flags(slot, session.get_flags(slot) | _PINNED_BIT)
+            session.poi_slot = slot
+            return self._shown_delta(session, shown)
+
+    def expand(
+        self,
+        member_id: str,
+        group: RelativeGroup,
+        session_id: str = DEFAULT_VIEW_SESSION_ID,
+    ) -> VisibilityDelta:
+        """
+        Shows a group of relatives of a member, and the member if it is hidden.
+
+        Expanding a group that is already expanded changes nothing.
+
+        Args:
+            member_id: The ID of the member.
+            group: The group of relatives to show.
+            session_id: The ID of the view session.
+
+        Returns:
+            The members and edges that became visible.
+
+        Raises:
+            MemberNotFoundError: If the member is not part of the graph.
+            OperationError: If there is no session with this ID.
+        """
+        with self._lock:
+            session = self._get_session(session_id, f"expand_{group.value}")
+            self._check_member(member_id, f"expand_{group.value}")
+            slot = self._slot(member_id)
+            shown: list[int] = []
+            if session.count(slot) == 0:
+                self._acquire(session, slot, shown)
+                session.set_flags(slot, session.get_flags(slot) | _PINNED_BIT)
+            if not session.has_flag(slot, _GROUP_BITS[group]):
+                relatives = self.get_relatives(member_id, group)
+                counted = array("I", map(self._slot, relatives))
+                for relative_slot in counted:
+                    self._acquire(session, relative_slot, shown)
+                session.expansions[slot, group] = counted
+                session.set_flags(slot, session.get_flags(slot) | _GROUP_BITS[group])
+            return self._shown_delta(session, shown)
+
+    def collapse(
+        self,
+        member_id: str,
+        group: RelativeGroup,
+        session_id: str = DEFAULT_VIEW_SESSION_ID,
+    ) -> VisibilityDelta:
+        """
+        Hides a group of relatives of a member.
+
+        Relatives that are still shown for another reason stay visible.
+        Collapsing a group that is not expanded changes nothing.
+
+        Args:
+            member_id: The ID of the member.
+            group: The group of relatives to hide.
+            session_id: The ID of the view session.
+
+        Returns:
+            The members and edges that were hidden.
+
+        Raises:
+            MemberNotFoundError: If the member is not part of the graph.
+            OperationError: If there is no session with this ID.
+        """
+        with self._lock:
+            session = self._get_session(session_id, f"collapse_{group.value}")
+            self._check_member(member_id, f"collapse_{group.value}")
+            slot = self._slot(member_id)
+            if not session.has_flag(slot, _GROUP_BITS[group]):
+                return VisibilityDelta([], [], [], [])
+            session.set_flags(slot, session.get_flags(slot) & ~_GROUP_BITS[group])
+            hidden: list[int] = []
+            self._release(session, session.expansions.pop((slot, group)), hidden)
+            hidden_ids = [self._member_ids[hidden_slot] for hidden_slot in hidden]
+            # Hidden members still count as visible, so that edges between two
+            # of them are reported too.
+            hidden_set = set(hidden_ids)
+            is_visible = self._visibility_check(session)
+            hidden_edges = self._incident_edges(
+                hidden_ids,
+                lambda other_id: other_id in hidden_set or is_visible(other_id),
+            )
+            return VisibilityDelta([], hidden_ids, [], hidden_edges)
+
+    def member_removed(self, member_id: str) -> None:
+        with self._lock:
+            slot = self._slots.pop(member_id, None)
+            if slot is None:
+                return
+            self._member_ids[slot] = None
+            for session in self._sessions.values():
+                count = session.count(slot)
+                if count:
+                    # The member is gone, so all of its references go with it.
+                    session.add_count(slot, 1 - count)
+                    self._release(session, [slot], [])
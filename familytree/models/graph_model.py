@@ -1,5 +1,8 @@
+import datetime
 from typing import Any, Optional
 
+from pydantic import BaseModel
+
 from familytree.models.base_model import FamilyTreeBaseResponse
 
 
@@ -13,3 +16,136 @@ class CustomGraphRenderResponse(FamilyTreeBaseResponse):
 
 class MemberInfoResponse(FamilyTreeBaseResponse):
     member_info: Optional[dict[str, Any]] = None
+
+
+class RelationshipPathStep(BaseModel):
+    member_id: str
+    name: str
+    relation: str  # How the member is related to the previous one on the path
+
+
+class RelationshipResponse(FamilyTreeBaseResponse):
+    source_member_id: str
+    target_member_id: str
+    relationship: Optional[str] = None
+    path: list[RelationshipPathStep] = []
+
+
+class MemberPair(BaseModel):
+    source_member_id: str
+    target_member_id: str
+
+
+class CommonAncestorsRequest(BaseModel):
+    pairs: list[MemberPair]
+
+
+class CommonAncestorInfo(BaseModel):
+    member_id: str
+    source_generations: int
+    target_generations: int
+
+
+class CommonAncestorsResult(MemberPair):
+    common_ancestors: list[CommonAncestorInfo] = []
+
+
+class CommonAncestorsResponse(FamilyTreeBaseResponse):
+    results: list[CommonAncestorsResult] = []
+
+
+class MemberSearchResult(BaseModel):
+    member_id: str
+    name: str
+    nickname: Optional[str] = None  # The nickname that matched, if the name did not
+
+
+class MemberSearchResponse(FamilyTreeBaseResponse):
+    results: list[MemberSearchResult] = []
+
+
+class IntRange(BaseModel):
+    # Inclusive bounds; either may be left out.
+    min: Optional[int] = None
+    max: Optional[int] = None
+
+
+class MemberFilterRequest(BaseModel):
+    # Enum fields take the names of the proto enum values, e.g. "FEMALE" or
+    # "ROHINI", and match any of the listed values.
+    gender: list[str] = []
+    alive: Optional[bool] = None
+    birth_year: Optional[IntRange] = None
+    birth_month: Optional[IntRange] = None
+    birth_day: Optional[IntRange] = None
+    death_year: Optional[IntRange] = None
+    birth_tamil_month: list[str] = []
+    birth_star: list[str] = []
+    birth_paksham: list[str] = []
+    birth_thithi: list[str] = []
+    death_tamil_month: list[str] = []
+    death_star: list[str] = []
+    death_paksham: list[str] = []
+    death_thithi: list[str] = []
+    # additional_info keys to the value they must have, or None for any value.
+    additional_info: dict[str, Optional[str]] = {}
+    limit: int = 100
+
+
+class MemberFilterResponse(FamilyTreeBaseResponse):
+    count: int = 0  # The number of matching members, which may exceed the limit
+    member_ids: list[str] = []
+
+
+class CalendarEventInfo(BaseModel):
+    kind: str  # "birthday" or "wedding_anniversary"
+    member_id: str
+    name: str
+    date: datetime.date
+    year: Optional[int] = None  # The year of the birth or wedding, if known
+
+
+class EventsResponse(FamilyTreeBaseResponse):
+    events: list[CalendarEventInfo] = []
+
+
+class StarDayInfo(BaseModel):
+    member_id: str
+    name: str
+    tamil_month: str
+    star: str
+
+
+class StarDaysResponse(FamilyTreeBaseResponse):
+    star_days: list[StarDayInfo] = []
+
+
+class ViolationInfo(BaseModel):
+    # "ancestor_cycle", "death_before_birth", "born_before_parent" or
+    # "born_after_parent_death"
+    kind: str
+    member_id: str
+    # The parent of the parent-child link, for the kinds checked on a link
+    related_member_id: Optional[str] = None
+    description: str
+
+
+class ViolationsResponse(FamilyTreeBaseResponse):
+    violations: list[ViolationInfo] = []
+
+
+class VisibilityDeltaResponse(FamilyTreeBaseResponse):
+    # vis-network node and edge items to add to the view.
+    shown_nodes: list[dict[str, Any]] = []
+    shown_edges: list[dict[str, Any]] = []
+    # Items to remove from the view; edges are given by their "from" and "to".
+    hidden_node_ids: list[str] = []
+    hidden_edges: list[dict[str, str]] = []
+
+
+class ViewSessionResponse(VisibilityDeltaResponse):
+    session_id: str
+
+
+class CloseViewSessionResponse(FamilyTreeBaseResponse):
+    session_id: str
@@ -1,7 +1,7 @@
 from builtins import isinstance
-from typing import Any, Optional
+from typing import Annotated, Any, Literal, Optional, Union
 
-from pydantic import BaseModel, field_serializer, field_validator
+from pydantic import BaseModel, Field, field_serializer, field_validator
 
 from familytree.handlers.graph_handler import EdgeType
 from familytree.models.base_model import FamilyTreeBaseResponse
@@ -41,7 +41,9 @@ class CreateFamilyResponse(FamilyTreeBaseResponse):
 
 
 class LoadFamilyRequest(BaseModel):
+    # The extension, .txtpb, .binpb or .pbstream, tells the format of `content`.
     filename: str
+    # Text format, or the base64-encoded bytes of binary or stream format.
     content: str
 
 
@@ -99,8 +101,68 @@ class DeleteRelationshipResponse(FamilyTreeBaseResponse):
     pass
 
 
+class BatchAddFamilyMemberOperation(AddFamilyMemberRequest):
+    op: Literal["add_family_member"]
+    # Name that later operations in the batch can use in place of the new ID
+    ref: Optional[str] = None
+
+
+class BatchAddRelationshipOperation(AddRelationshipRequest):
+    op: Literal["add_relationship"]
+
+
+class BatchUpdateFamilyMemberOperation(UpdateFamilyMemberRequest):
+    op: Literal["update_family_member"]
+
+
+class BatchDeleteFamilyMemberOperation(DeleteFamilyMemberRequest):
+    op: Literal["delete_family_member"]
+
+
+class BatchDeleteRelationshipOperation(DeleteRelationshipRequest):
+    op: Literal["delete_relationship"]
+
+
+BatchOperation = Annotated[
+    Union[
+        BatchAddFamilyMemberOperation,
+        BatchAddRelationshipOperation,
+        BatchUpdateFamilyMemberOperation,
+        BatchDeleteFamilyMemberOperation,
+        BatchDeleteRelationshipOperation,
+    ],
+    Field(discriminator="op"),
+]
+
+
+class BatchRequest(BaseModel):
+    operations: list[BatchOperation]  # Applied in order, all or none
+
+
+class BatchResponse(FamilyTreeBaseResponse):
+    new_member_ids: list[str] = []  # IDs of the added members, in order
+    member_refs: dict[str, str] = {}  # Batch refs mapped to the new member IDs
+
+
+class UndoResponse(FamilyTreeBaseResponse):
+    operation: str  # Description of the operation that was undone
+
+
+class RedoResponse(FamilyTreeBaseResponse):
+    operation: str  # Description of the operation that was redone
+
+
+class FillTraditionalDatesResponse(FamilyTreeBaseResponse):
+    filled_count: int = 0  # The number of traditional dates set
+
+
 class SaveFamilyResponse(FamilyTreeBaseResponse):
-    family_tree_txtpb: str
+    # Set when saving in text format.
+    family_tree_txtpb: Optional[str] = None
+    # The base64-encoded bytes, set when saving in binary format.
+    family_tree_binpb: Optional[str] = None
+    # The base64-encoded bytes, set when saving in stream format.
+    family_tree_pbstream: Optional[str] = None
 
 
 class ExportInteractiveGraphResponse(FamilyTreeBaseResponse):
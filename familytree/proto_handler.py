@@ -5,6 +5,13 @@ import string
 
 from google.protobuf import text_format
 from google.protobuf.json_format import MessageToDict
+from utils.tree_file_format import (
+    TreeFileFormat,
+    decode_stream_header,
+    detect_format,
+    encode_stream_header,
+    format_from_filename,
+)
 from utils_legacy import DateUtility, ResourceUtility
 
 import proto.family_tree_pb2 as family_tree_pb2
@@ -42,9 +49,21 @@ class ProtoHandler:
                     f"Input file not specified or not found: {self.input_text_file}"
                 )
 
-            with open(self.input_text_file, "r", encoding="utf-8") as f:
-                text_format.Merge(f.read(), self.family_tree)
-                logger.info(f"Successfully loaded {self.input_text_file}")
+            with open(self.input_text_file, "rb") as f:
+                content = f.read()
+            # .binpb files, or files whose content is binary, are read in the
+            # binary wire format. The records of a stream file are the same
+            # wire format after the stream header.
+            file_format = detect_format(self.input_text_file, content)
+            if file_format == TreeFileFormat.BINARY:
+                self.family_tree.MergeFromString(content)
+            elif file_format == TreeFileFormat.STREAM:
+                self.family_tree.MergeFromString(
+                    content[decode_stream_header(content) :]
+                )
+            else:
+                text_format.Merge(content.decode("utf-8"), self.family_tree)
+            logger.info(f"Successfully loaded {self.input_text_file}")
         except FileNotFoundError as e:
             logger.error(f"File not found: {e}")
             raise  # Re-raise for GUI to handle
@@ -66,11 +85,19 @@ class ProtoHandler:
             logger.error(f"Error creating output directory {output_dir}: {e}")
             raise IOError(f"Cannot create output directory for saving: {e}") from e
         try:
-            protobuf_string = text_format.MessageToString(
-                self.family_tree, as_utf8=True
-            )
-            with open(self.output_proto_data_file, "w", encoding="utf-8") as f:
-                f.write(protobuf_string)
+            file_format = format_from_filename(self.output_proto_data_file)
+            if file_format == TreeFileFormat.BINARY:
+                protobuf_bytes = self.family_tree.SerializeToString(deterministic=True)
+            elif file_format == TreeFileFormat.STREAM:
+                protobuf_bytes = encode_stream_header() + (
+                    self.family_tree.SerializeToString(deterministic=True)
+                )
+            else:
+                protobuf_bytes = text_format.MessageToString(
+                    self.family_tree, as_utf8=True
+                ).encode("utf-8")
+            with open(self.output_proto_data_file, "wb") as f:
+                f.write(protobuf_bytes)
                 logger.info(f"Successfully saved data to {self.output_proto_data_file}")
         except IOError as e:
             logger.error(
@@ -93,69 +93,96 @@ class PyvisRenderer:
             gender_key, default_images_map.get("GENDER_UNKNOWN")
         )
 
+    def build_node_options(
+        self, node_id: str, graph_node_obj: GraphNode
+    ) -> dict[str, Any]:
+        """
+        Builds the vis-network options a member is drawn with.
+
+        Args:
+            node_id: The ID of the member.
+            graph_node_obj: The member's GraphNode.
+
+        Returns:
+            The node options, without the node ID.
+        """
+        default_images_map, global_broken_image_path = (
+            ResourceUtility.get_default_images()
+        )
+        member_proto = graph_node_obj.attributes
+        title_str = self._build_node_title_from_proto(member_proto)
+        actual_image_to_use = self._determine_node_image(
+            member_proto, default_images_map
+        )
+
+        node_options: dict[str, Any] = {
+            "label": member_proto.name if member_proto else str(node_id),
+            "title": title_str,
+            "shape": "circularImage" if actual_image_to_use else "dot",
+            "image": actual_image_to_use,
+            "brokenImage": global_broken_image_path,
+            "size": 50,
+            "font": {
+                "size": 14,
+                "color": COLOR_PALETTE.get("white", "#FFFFFF"),
+            },
+            "color": {"background": COLOR_PALETTE.get("light cream", "#E9EBDD")},
+        }
+
+        if graph_node_obj.is_poi:
+            node_options["borderWidth"] = 3
+            node_options["color"]["border"] = COLOR_PALETTE.get("red", "#FF0000")
+        return node_options
+
+    def build_edge_options(self, graph_edge_obj: GraphEdge) -> dict[str, Any]:
+        """
+        Builds the vis-network options an edge is drawn with.
+
+        Args:
+            graph_edge_obj: The edge's GraphEdge.
+
+        Returns:
+            The edge options, without the member IDs of its ends.
+        """
+        edge_options: dict[str, Any] = {
+            "arrows": {"to": {"enabled": True, "scaleFactor": 0.5}}
+        }
+        edge_options.update(graph_edge_obj.attributes)
+
+        if graph_edge_obj.edge_type == EdgeType.SPOUSE:
+            edge_options["color"] = COLOR_PALETTE.get("pink", "#F57DB3")
+            edge_options["arrows"] = {
+                "to": {"enabled": True, "scaleFactor": 0.5},
+                "from": {"enabled": True, "scaleFactor": 0.5},
+            }
+        elif graph_edge_obj.edge_type == EdgeType.PARENT_TO_CHILD:
+            edge_options["color"] = COLOR_PALETTE.get("light blue", "#97DDE7")
+        return edge_options
+
     def _prepare_pyvis_display_graph(self, source_nx_graph: DiGraph) -> DiGraph:
         """
         Creates a new DiGraph suitable for PyVis, transforming nodes and edges
         from the GraphHandler's format. Only visible nodes and edges are included.
         """
         pyvis_display_graph = DiGraph()
-        default_images_map, global_broken_image_path = (
-            ResourceUtility.get_default_images()
-        )
 
         # Add all nodes
         for node_id, node_attributes_wrapper in source_nx_graph.nodes(data=True):
             graph_node_obj: Optional[GraphNode] = node_attributes_wrapper.get("data")
             if not graph_node_obj:
                 continue
-
-            member_proto = graph_node_obj.attributes
-            title_str = self._build_node_title_from_proto(member_proto)
-            actual_image_to_use = self._determine_node_image(
-                member_proto, default_images_map
+            pyvis_display_graph.add_node(
+                node_id, **self.build_node_options(node_id, graph_node_obj)
             )
 
-            node_options: dict[str, Any] = {
-                "label": member_proto.name if member_proto else str(node_id),
-                "title": title_str,
-                "shape": "circularImage" if actual_image_to_use else "dot",
-                "image": actual_image_to_use,
-                "brokenImage": global_broken_image_path,
-                "size": 50,
-                "font": {
-                    "size": 14,
-                    "color": COLOR_PALETTE.get("white", "#FFFFFF"),
-                },
-                "color": {"background": COLOR_PALETTE.get("light cream", "#E9EBDD")},
-            }
-
-            if graph_node_obj.is_poi:
-                node_options["borderWidth"] = 3
-                node_options["color"]["border"] = COLOR_PALETTE.get("red", "#FF0000")
-
-            pyvis_display_graph.add_node(node_id, **node_options)
-
         # Add visible edges
         for u, v, edge_attributes_wrapper in source_nx_graph.edges(data=True):
             graph_edge_obj: Optional[GraphEdge] = edge_attributes_wrapper.get("data")
             if not graph_edge_obj or not graph_edge_obj.is_rendered:
                 continue
-
-            edge_options: dict[str, Any] = {
-                "arrows": {"to": {"enabled": True, "scaleFactor": 0.5}}
-            }
-            edge_options.update(graph_edge_obj.attributes)
-
-            if graph_edge_obj.edge_type == EdgeType.SPOUSE:
-                edge_options["color"] = COLOR_PALETTE.get("pink", "#F57DB3")
-                edge_options["arrows"] = {
-                    "to": {"enabled": True, "scaleFactor": 0.5},
-                    "from": {"enabled": True, "scaleFactor": 0.5},
-                }
-            elif graph_edge_obj.edge_type == EdgeType.PARENT_TO_CHILD:
-                edge_options["color"] = COLOR_PALETTE.get("light blue", "#97DDE7")
-
-            pyvis_display_graph.add_edge(u, v, **edge_options)
+            pyvis_display_graph.add_edge(
+                u, v, **self.build_edge_options(graph_edge_obj)
+            )
 
         return pyvis_display_graph
 
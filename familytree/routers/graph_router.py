@@ -1,14 +1,28 @@
+import datetime
 import logging
+from typing import Annotated, Optional
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
 from fastapi.param_functions import Depends
 
-from familytree.exceptions import UnsupportedOperationError
 from familytree.handlers.family_tree_handler import FamilyTreeHandler
+from familytree.indexes.visibility_index import DEFAULT_VIEW_SESSION_ID, RelativeGroup
 from familytree.models.graph_model import (
+    CloseViewSessionResponse,
+    CommonAncestorsRequest,
+    CommonAncestorsResponse,
     CustomGraphRenderResponse,
+    EventsResponse,
+    MemberFilterRequest,
+    MemberFilterResponse,
     MemberInfoResponse,
+    MemberSearchResponse,
     PyvisGraphRenderResponse,
+    RelationshipResponse,
+    StarDaysResponse,
+    ViewSessionResponse,
+    ViolationsResponse,
+    VisibilityDeltaResponse,
 )
 from familytree.routers import get_current_family_tree_handler_dependency
 
@@ -42,16 +56,14 @@ async def get_data_with_poi(
         degree: The number of degrees of separation to display from the POI or root.
     """
     if poi:
-        raise UnsupportedOperationError(
-            operation="render_with_poi", feature=f"poi={poi}, degree={degree}"
-        )
+        html_content = family_tree_handler.render_ego_graph(theme, poi, degree)
     else:
         html_content = family_tree_handler.render_family_tree(theme)
-        return PyvisGraphRenderResponse(
-            status="OK",  # pyrefly: ignore
-            message="Family tree rendered successfully",
-            graph_html=html_content,  # pyrefly: ignore
-        )
+    return PyvisGraphRenderResponse(
+        status="OK",  # pyrefly: ignore
+        message="Family tree rendered successfully",
+        graph_html=html_content,  # pyrefly: ignore
+    )
 
 
 @router.get("/member_info/{user_id}", response_model=MemberInfoResponse)
@@ -70,131 +82,382 @@ async def get_member_info(
     return family_tree_handler.get_member_info(user_id)
 
 
-@router.get("/expand_parents/{user}")
-async def expand_parents(user: str):
+@router.get("/search", response_model=MemberSearchResponse)
+async def search_members(
+    prefix: str,
+    family_tree_handler: FamilyTreeHandler = Depends(
+        get_current_family_tree_handler_dependency
+    ),
+    limit: int = 10,
+):
+    """
+    Finds members whose name or nicknames start with the given words.
+
+    Args:
+        prefix: The start of one or more words of the name, e.g. "ron w".
+        limit: The largest number of matches to return.
+    """
+    return family_tree_handler.search_members(prefix, limit)
+
+
+@router.post("/filter_members", response_model=MemberFilterResponse)
+async def filter_members(
+    request: MemberFilterRequest,
+    family_tree_handler: FamilyTreeHandler = Depends(
+        get_current_family_tree_handler_dependency
+    ),
+):
+    """
+    Finds the members whose attributes meet every condition of the request.
+
+    Args:
+        request: The conditions, e.g. {"gender": ["FEMALE"], "alive": true,
+            "birth_year": {"min": 1940, "max": 1960}}, and the largest number
+            of IDs to return.
+    """
+    return family_tree_handler.filter_members(request)
+
+
+@router.get("/events", response_model=EventsResponse)
+async def find_events(
+    family_tree_handler: FamilyTreeHandler = Depends(
+        get_current_family_tree_handler_dependency
+    ),
+    start: Optional[datetime.date] = None,
+    end: Optional[datetime.date] = None,
+    limit: Optional[int] = None,
+    kinds: Annotated[Optional[list[str]], Query()] = None,
+):
+    """
+    Finds upcoming birthdays and wedding anniversaries, in date order.
+
+    Args:
+        start: The first day to look at, today if not given.
+        end: The last day to look at, less than a year after `start`.
+        limit: The largest number of events to return.
+        kinds: "birthday" and/or "wedding_anniversary", both if not given.
+    """
+    return family_tree_handler.find_events(start, end, limit, kinds)
+
+
+@router.get("/star_days", response_model=StarDaysResponse)
+async def find_star_days(
+    tamil_month: str,
+    family_tree_handler: FamilyTreeHandler = Depends(
+        get_current_family_tree_handler_dependency
+    ),
+    star: Optional[str] = None,
+):
+    """
+    Finds the members whose birth star day falls in a Tamil month.
+
+    Args:
+        tamil_month: The Tamil month, e.g. "CHITHIRAI".
+        star: The birth star, e.g. "ROHINI", if only its members are wanted.
+    """
+    return family_tree_handler.find_star_days(tamil_month, star)
+
+
+@router.get("/violations", response_model=ViolationsResponse)
+async def find_violations(
+    family_tree_handler: FamilyTreeHandler = Depends(
+        get_current_family_tree_handler_dependency
+    ),
+    member_ids: Annotated[Optional[list[str]], Query()] = None,
+    full_audit: bool = False,
+):
+    """
+    Finds the genealogical invariants the tree breaks, e.g. a member who is
+    their own ancestor or a child born before a parent.
+
+    Args:
+        member_ids: The members whose violations to return, all if not given.
+        full_audit: Whether to check the whole tree again from scratch.
+    """
+    return family_tree_handler.find_violations(member_ids, full_audit)
+
+
+@router.get("/relationship", response_model=RelationshipResponse)
+async def get_relationship(
+    source_member_id: str,
+    target_member_id: str,
+    family_tree_handler: FamilyTreeHandler = Depends(
+        get_current_family_tree_handler_dependency
+    ),
+):
+    """
+    Describes how one member of the family tree is related to another.
+
+    Args:
+        source_member_id: The ID of the member the relationship is relative to.
+        target_member_id: The ID of the member whose relationship is described.
+    """
+    return family_tree_handler.get_relationship(source_member_id, target_member_id)
+
+
+@router.post("/common_ancestors", response_model=CommonAncestorsResponse)
+async def get_common_ancestors(
+    request: CommonAncestorsRequest,
+    family_tree_handler: FamilyTreeHandler = Depends(
+        get_current_family_tree_handler_dependency
+    ),
+):
+    """
+    Finds the lowest common ancestors of many pairs of members in one call.
+
+    Args:
+        request: The member pairs to look up.
+    """
+    return family_tree_handler.get_common_ancestors(request)
+
+
+# View routes are plain functions, which FastAPI runs in its threadpool, so
+# that waiting for the lock of the view sessions or expanding a large group of
+# relatives does not block the event loop.
+
+
+@router.post("/create_view_session", response_model=ViewSessionResponse)
+def create_view_session(
+    family_tree_handler: FamilyTreeHandler = Depends(
+        get_current_family_tree_handler_dependency
+    ),
+    poi: str | None = None,
+):
+    """
+    Starts an interactive view of the family tree of its own.
+
+    Expanding or collapsing relatives in one view session leaves the others
+    unchanged, so concurrent viewers should each create one.
+
+    Args:
+        poi: Optional ID of the person to start the view from.
+    """
+    return family_tree_handler.create_view_session(poi)
+
+
+@router.post(
+    "/close_view_session/{session_id}", response_model=CloseViewSessionResponse
+)
+def close_view_session(
+    session_id: str,
+    family_tree_handler: FamilyTreeHandler = Depends(
+        get_current_family_tree_handler_dependency
+    ),
+):
+    """
+    Ends an interactive view of the family tree and frees its state.
+
+    Args:
+        session_id: The ID of the view session to close.
+    """
+    return family_tree_handler.close_view_session(session_id)
+
+
+@router.get("/expand_parents/{user}", response_model=VisibilityDeltaResponse)
+def expand_parents(
+    user: str,
+    family_tree_handler: FamilyTreeHandler = Depends(
+        get_current_family_tree_handler_dependency
+    ),
+    session_id: str = DEFAULT_VIEW_SESSION_ID,
+):
     """
     Expands the graph view to display the parents of the specified user.
 
     Args:
         user: The ID of the user whose parents are to be displayed.
+        session_id: The view session to change; the shared default view if
+            not given.
     """
-    raise UnsupportedOperationError(
-        operation="expand_parents", feature=f"expand_parents for user {user}"
+    return family_tree_handler.expand_relatives(
+        user, RelativeGroup.PARENTS, session_id
     )
 
 
-@router.get("/expand_siblings/{user}")
-async def expand_siblings(user: str):
+@router.get("/expand_siblings/{user}", response_model=VisibilityDeltaResponse)
+def expand_siblings(
+    user: str,
+    family_tree_handler: FamilyTreeHandler = Depends(
+        get_current_family_tree_handler_dependency
+    ),
+    session_id: str = DEFAULT_VIEW_SESSION_ID,
+):
     """
     Expands the graph view to display the siblings of the specified user.
 
     Args:
         user: The ID of the user whose siblings are to be displayed.
+        session_id: The view session to change; the shared default view if
+            not given.
     """
-    raise UnsupportedOperationError(
-        operation="expand_siblings", feature=f"expand_siblings for user {user}"
+    return family_tree_handler.expand_relatives(
+        user, RelativeGroup.SIBLINGS, session_id
     )
 
 
-@router.get("/expand_children/{user}")
-async def expand_children(user: str):
+@router.get("/expand_children/{user}", response_model=VisibilityDeltaResponse)
+def expand_children(
+    user: str,
+    family_tree_handler: FamilyTreeHandler = Depends(
+        get_current_family_tree_handler_dependency
+    ),
+    session_id: str = DEFAULT_VIEW_SESSION_ID,
+):
     """
     Expands the graph view to display the children of the specified user.
 
     Args:
         user: The ID of the user whose children are to be displayed.
+        session_id: The view session to change; the shared default view if
+            not given.
     """
-    raise UnsupportedOperationError(
-        operation="expand_children", feature=f"expand_children for user {user}"
+    return family_tree_handler.expand_relatives(
+        user, RelativeGroup.CHILDREN, session_id
     )
 
 
-@router.get("/expand_spouse/{user}")
-async def expand_spouse(user: str):
+@router.get("/expand_spouse/{user}", response_model=VisibilityDeltaResponse)
+def expand_spouse(
+    user: str,
+    family_tree_handler: FamilyTreeHandler = Depends(
+        get_current_family_tree_handler_dependency
+    ),
+    session_id: str = DEFAULT_VIEW_SESSION_ID,
+):
     """
     Expands the graph view to display the spouse(s) of the specified user.
 
     Args:
         user: The ID of the user whose spouse(s) are to be displayed.
+        session_id: The view session to change; the shared default view if
+            not given.
+        session_id: The view session to change; the shared default view if
+            not given.
     """
-    raise UnsupportedOperationError(
-        operation="expand_spouse", feature=f"expand_spouse for user {user}"
+    return family_tree_handler.expand_relatives(
+        user, RelativeGroup.SPOUSE, session_id
     )
 
 
-@router.get("/expand_inlaws/{user}")
-async def expand_inlaws(user: str):
+@router.get("/expand_inlaws/{user}", response_model=VisibilityDeltaResponse)
+def expand_inlaws(
+    user: str,
+    family_tree_handler: FamilyTreeHandler = Depends(
+        get_current_family_tree_handler_dependency
+    ),
+    session_id: str = DEFAULT_VIEW_SESSION_ID,
+):
     """
     Expands the graph view to display the in-laws of the specified user.
 
     Args:
         user: The ID of the user whose in-laws are to be displayed.
     """
-    raise UnsupportedOperationError(
-        operation="expand_inlaws", feature=f"expand_inlaws for user {user}"
+    return family_tree_handler.expand_relatives(
+        user, RelativeGroup.INLAWS, session_id
     )
 
 
-@router.get("/collapse_parents/{user}")
-async def collapse_parents(user: str):
+@router.get("/collapse_parents/{user}", response_model=VisibilityDeltaResponse)
+def collapse_parents(
+    user: str,
+    family_tree_handler: FamilyTreeHandler = Depends(
+        get_current_family_tree_handler_dependency
+    ),
+    session_id: str = DEFAULT_VIEW_SESSION_ID,
+):
     """
     Collapses the graph view to hide the parents of the specified user.
 
     Args:
         user: The ID of the user whose parents are to be hidden.
+        session_id: The view session to change; the shared default view if
+            not given.
     """
-    raise UnsupportedOperationError(
-        operation="collapse_parents", feature=f"collapse_parents for user {user}"
+    return family_tree_handler.collapse_relatives(
+        user, RelativeGroup.PARENTS, session_id
     )
 
 
-@router.get("/collapse_siblings/{user}")
-async def collapse_siblings(user: str):
+@router.get("/collapse_siblings/{user}", response_model=VisibilityDeltaResponse)
+def collapse_siblings(
+    user: str,
+    family_tree_handler: FamilyTreeHandler = Depends(
+        get_current_family_tree_handler_dependency
+    ),
+    session_id: str = DEFAULT_VIEW_SESSION_ID,
+):
     """
     Collapses the graph view to hide the siblings of the specified user.
 
     Args:
         user: The ID of the user whose siblings are to be hidden.
+        session_id: The view session to change; the shared default view if
+            not given.
     """
-    raise UnsupportedOperationError(
-        operation="collapse_siblings", feature=f"collapse_siblings for user {user}"
+    return family_tree_handler.collapse_relatives(
+        user, RelativeGroup.SIBLINGS, session_id
     )
 
 
-@router.get("/collapse_children/{user}")
-async def collapse_children(user: str):
+@router.get("/collapse_children/{user}", response_model=VisibilityDeltaResponse)
+def collapse_children(
+    user: str,
+    family_tree_handler: FamilyTreeHandler = Depends(
+        get_current_family_tree_handler_dependency
+    ),
+    session_id: str = DEFAULT_VIEW_SESSION_ID,
+):
     """
     Collapses the graph view to hide the children of the specified user.
 
     Args:
         user: The ID of the user whose children are to be hidden.
+        session_id: The view session to change; the shared default view if
+            not given.
     """
-    raise UnsupportedOperationError(
-        operation="collapse_children", feature=f"collapse_children for user {user}"
+    return family_tree_handler.collapse_relatives(
+        user, RelativeGroup.CHILDREN, session_id
     )
 
 
-@router.get("/collapse_spouse/{user}")
-async def collapse_spouse(user: str):
+@router.get("/collapse_spouse/{user}", response_model=VisibilityDeltaResponse)
+def collapse_spouse(
+    user: str,
+    family_tree_handler: FamilyTreeHandler = Depends(
+        get_current_family_tree_handler_dependency
+    ),
+    session_id: str = DEFAULT_VIEW_SESSION_ID,
+):
     """
     Collapses the graph view to hide the spouse(s) of the specified user.
 
     Args:
         user: The ID of the user whose spouse(s) are to be hidden.
+        session_id: The view session to change; the shared default view if
+            not given.
+        session_id: The view session to change; the shared default view if
+            not given.
     """
-    raise UnsupportedOperationError(
-        operation="collapse_spouse", feature=f"collapse_spouse for user {user}"
+    return family_tree_handler.collapse_relatives(
+        user, RelativeGroup.SPOUSE, session_id
     )
 
 
-@router.get("/collapse_inlaws/{user}")
-async def collapse_inlaws(user: str):
+@router.get("/collapse_inlaws/{user}", response_model=VisibilityDeltaResponse)
+def collapse_inlaws(
+    user: str,
+    family_tree_handler: FamilyTreeHandler = Depends(
+        get_current_family_tree_handler_dependency
+    ),
+    session_id: str = DEFAULT_VIEW_SESSION_ID,
+):
     """
     Collapses the graph view to hide the in-laws of the specified user.
 
     Args:
         user: The ID of the user whose in-laws are to be hidden.
     """
-    raise UnsupportedOperationError(
-        operation="collapse_inlaws", feature=f"collapse_inlaws for user {user}"
+    return family_tree_handler.collapse_relatives(
+        user, RelativeGroup.INLAWS, session_id
     )
@@ -11,15 +11,20 @@ from familytree.models.manage_model import (
     AddFamilyMemberResponse,
     AddRelationshipRequest,
     AddRelationshipResponse,
+    BatchRequest,
+    BatchResponse,
     CreateFamilyResponse,
     DeleteFamilyMemberRequest,
     DeleteFamilyMemberResponse,
     DeleteRelationshipRequest,
     DeleteRelationshipResponse,
     ExportInteractiveGraphResponse,
+    FillTraditionalDatesResponse,
     LoadFamilyRequest,
     LoadFamilyResponse,
+    RedoResponse,
     SaveFamilyResponse,
+    UndoResponse,
     UpdateFamilyMemberRequest,
     UpdateFamilyMemberResponse,
 )
@@ -27,6 +32,7 @@ from familytree.routers import (
     get_current_family_tree_handler_dependency,
     get_new_family_tree_handler_dependency,
 )
+from familytree.utils.tree_file_format import TreeFileFormat
 
 logger = logging.getLogger(__name__)
 
@@ -36,9 +42,13 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
+# Routes that change or save the tree are plain functions, which FastAPI runs
+# in its threadpool, so that appending to and compacting the tree log do not
+# block the event loop.
+
 
 @router.post("/create_family", response_model=CreateFamilyResponse)
-async def create_new_family(
+def create_new_family(
     family_tree_handler: FamilyTreeHandler = Depends(
         get_new_family_tree_handler_dependency
     ),
@@ -52,7 +62,7 @@ async def create_new_family(
 
 
 @router.post("/load_family", response_model=LoadFamilyResponse)
-async def load_family_data(
+def load_family_data(
     request: LoadFamilyRequest,
     family_handler: FamilyTreeHandler = Depends(get_new_family_tree_handler_dependency),
 ):
@@ -63,7 +73,7 @@ async def load_family_data(
 
 
 @router.post("/add_family_member", response_model=AddFamilyMemberResponse)
-async def add_family_member(
+def add_family_member(
     request: AddFamilyMemberRequest,
     family_handler: FamilyTreeHandler = Depends(
         get_current_family_tree_handler_dependency
@@ -76,7 +86,7 @@ async def add_family_member(
 
 
 @router.post("/add_relationship", response_model=AddRelationshipResponse)
-async def add_relationship(
+def add_relationship(
     request: AddRelationshipRequest,
     family_handler: FamilyTreeHandler = Depends(
         get_current_family_tree_handler_dependency
@@ -89,7 +99,7 @@ async def add_relationship(
 
 
 @router.post("/update_family_member", response_model=UpdateFamilyMemberResponse)
-async def update_family_member(
+def update_family_member(
     request: UpdateFamilyMemberRequest,
     family_handler: FamilyTreeHandler = Depends(
         get_current_family_tree_handler_dependency
@@ -102,7 +112,7 @@ async def update_family_member(
 
 
 @router.post("/delete_family_member", response_model=DeleteFamilyMemberResponse)
-async def delete_family_member(
+def delete_family_member(
     request: DeleteFamilyMemberRequest,
     family_handler: FamilyTreeHandler = Depends(
         get_current_family_tree_handler_dependency
@@ -115,7 +125,7 @@ async def delete_family_member(
 
 
 @router.post("/delete_relationship", response_model=DeleteRelationshipResponse)
-async def delete_relationship(
+def delete_relationship(
     request: DeleteRelationshipRequest,
     family_handler: FamilyTreeHandler = Depends(
         get_current_family_tree_handler_dependency
@@ -127,8 +137,62 @@ async def delete_relationship(
     return family_handler.delete_relationship(request)
 
 
+@router.post("/batch", response_model=BatchResponse)
+def apply_batch(
+    request: BatchRequest,
+    family_handler: FamilyTreeHandler = Depends(
+        get_current_family_tree_handler_dependency
+    ),
+):
+    """
+    Applies an ordered list of manage operations, either all of them or none.
+    """
+    return family_handler.apply_batch(request)
+
+
+@router.post("/fill_traditional_dates", response_model=FillTraditionalDatesResponse)
+def fill_traditional_dates(
+    family_handler: FamilyTreeHandler = Depends(
+        get_current_family_tree_handler_dependency
+    ),
+    overwrite: bool = False,
+):
+    """
+    Sets the Tamil dates of birth and death of all members from their
+    Gregorian dates.
+
+    Args:
+        overwrite: Whether to replace traditional dates that are already set.
+    """
+    return family_handler.fill_traditional_dates(overwrite)
+
+
+@router.post("/undo", response_model=UndoResponse)
+def undo(
+    family_handler: FamilyTreeHandler = Depends(
+        get_current_family_tree_handler_dependency
+    ),
+):
+    """
+    Undoes the most recent change to the family tree.
+    """
+    return family_handler.undo()
+
+
+@router.post("/redo", response_model=RedoResponse)
+def redo(
+    family_handler: FamilyTreeHandler = Depends(
+        get_current_family_tree_handler_dependency
+    ),
+):
+    """
+    Redoes the most recently undone change to the family tree.
+    """
+    return family_handler.redo()
+
+
 @router.get("/save_family", response_model=SaveFamilyResponse)
-async def save_family_data(
+def save_family_data(
     visible_only: Annotated[
         bool,
         Query(
@@ -137,6 +201,14 @@ async def save_family_data(
             description="Toggles what data to be saved. If true, then currently visible nodes will only be saved, otherwise all nodes will be saved.",
         ),
     ] = False,
+    file_format: Annotated[
+        TreeFileFormat,
+        Query(
+            alias="format",
+            title="Format of the saved data",
+            description="txtpb for protobuf text format, binpb for base64-encoded binary protobuf, pbstream for base64-encoded length-delimited records.",
+        ),
+    ] = TreeFileFormat.TEXT,
     family_handler: FamilyTreeHandler = Depends(
         get_current_family_tree_handler_dependency
     ),
@@ -144,7 +216,7 @@ async def save_family_data(
     """
     Saves the current state of the family tree data to a persistent storage.
     """
-    return family_handler.save_family_tree(visible_only)
+    return family_handler.save_family_tree(visible_only, file_format)
 
 
 @router.get("/export_interactive_graph", response_model=ExportInteractiveGraphResponse)
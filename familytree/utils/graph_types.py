@@ -1,5 +1,6 @@
 from enum import Enum, auto
-from typing import Optional
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
 
 from familytree.proto import family_tree_pb2
 
@@ -14,11 +15,26 @@ class EdgeType(Enum):
     CHILD_TO_PARENT = auto()
 
 
+# The view flags of a GraphNode: the boolean ones first, then the tri-state
+# `has_visible_*` ones.
+NODE_FLAGS = (
+    "is_poi",
+    "is_visible",
+    "has_visible_spouse",
+    "has_visible_parents",
+    "has_visible_children",
+    "has_visible_siblings",
+    "has_visible_inlaws",
+)
+
+
 class GraphNode:
     """
     Represents a node in the graph with its properties.
     """
 
+    __slots__ = ("attributes", *NODE_FLAGS)
+
     def __init__(self, attributes: family_tree_pb2.FamilyMember):
         self.attributes: family_tree_pb2.FamilyMember = attributes
         self.is_poi: bool = False
@@ -29,12 +45,30 @@ class GraphNode:
         self.has_visible_siblings: Optional[bool] = None
         self.has_visible_inlaws: Optional[bool] = None
 
+    def copy(self) -> "GraphNode":
+        """Returns a copy of the node that shares its attributes message."""
+        node = GraphNode(self.attributes)
+        node.is_poi = self.is_poi
+        node.is_visible = self.is_visible
+        node.has_visible_spouse = self.has_visible_spouse
+        node.has_visible_parents = self.has_visible_parents
+        node.has_visible_children = self.has_visible_children
+        node.has_visible_siblings = self.has_visible_siblings
+        node.has_visible_inlaws = self.has_visible_inlaws
+        return node
+
 
 class GraphEdge:
     """
     Represents an edge in the graph with properties.
+
+    Most edges only differ by type and render flag, so the graph stores the
+    shared instances returned by `GraphEdge.shared`. Those are immutable; use
+    `with_attributes` to get a private copy with per-edge attributes.
     """
 
+    __slots__ = ("edge_type", "is_rendered", "attributes")
+
     def __init__(
         self,
         edge_type: EdgeType,
@@ -43,4 +77,71 @@ class GraphEdge:
     ):
         self.edge_type: EdgeType = edge_type
         self.is_rendered: bool = is_rendered
-        self.attributes: dict = attributes if attributes is not None else {}
+        self.attributes: Mapping[str, Any] = (
+            attributes if attributes is not None else {}
+        )
+
+    @staticmethod
+    def shared(edge_type: EdgeType, is_rendered: bool = True) -> "GraphEdge":
+        """
+        Returns the shared immutable edge for a type and render flag.
+
+        Args:
+            edge_type: The type of the edge.
+            is_rendered: Whether the edge is drawn when the graph is rendered.
+
+        Returns:
+            A GraphEdge without attributes that must not be modified.
+        """
+        return _SHARED_EDGES[edge_type, is_rendered]
+
+    def with_attributes(self, attributes: Mapping[str, Any]) -> "GraphEdge":
+        """
+        Returns a new edge with this edge's type and render flag.
+
+        Args:
+            attributes: Attributes to set on top of this edge's attributes.
+
+        Returns:
+            A new mutable GraphEdge with the merged attributes.
+        """
+        return GraphEdge(
+            edge_type=self.edge_type,
+            is_rendered=self.is_rendered,
+            attributes={**self.attributes, **attributes},
+        )
+
+
+class _SharedGraphEdge(GraphEdge):
+    """
+    An immutable GraphEdge without attributes, shared by every edge of its kind.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, edge_type: EdgeType, is_rendered: bool):
+        object.__setattr__(self, "edge_type", edge_type)
+        object.__setattr__(self, "is_rendered", is_rendered)
+        object.__setattr__(self, "attributes", MappingProxyType({}))
+
+    def __copy__(self) -> "GraphEdge":
+        return self
+
+    def __deepcopy__(self, memo: dict) -> "GraphEdge":
+        return self
+
+    def __reduce__(self):
+        return GraphEdge.shared, (self.edge_type, self.is_rendered)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(
+            f"Cannot set '{name}' on a shared GraphEdge; use with_attributes() "
+            "to get a copy."
+        )
+
+
+_SHARED_EDGES: dict[tuple[EdgeType, bool], GraphEdge] = {
+    (edge_type, is_rendered): _SharedGraphEdge(edge_type, is_rendered)
+    for edge_type in EdgeType
+    for is_rendered in (True, False)
+}
@@ -22,3 +22,8 @@ def generate_family_unit_id() -> str:
 def generate_family_conversation_id() -> str:
     family_conversation_base = "FCON"
     return "-".join([_generate_random_block(c) for c in family_conversation_base])
+
+
+def generate_view_session_id() -> str:
+    view_session_base = "FVEW"
+    return "-".join([_generate_random_block(c) for c in view_session_base])
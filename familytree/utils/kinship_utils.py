@@ -0,0 +1,196 @@
+import enum
+import logging
+from typing import Sequence
+
+import familytree.proto.utils_pb2 as utils_pb2
+
+logger = logging.getLogger(__name__)
+
+
+class KinshipStep(enum.Enum):
+    """
+    One step of a kinship path, read as "the next member is my ...".
+    """
+
+    PARENT = "parent"
+    CHILD = "child"
+    SPOUSE = "spouse"
+
+    def inverse(self) -> "KinshipStep":
+        """Returns the step that walks the same link in the other direction."""
+        if self is KinshipStep.PARENT:
+            return KinshipStep.CHILD
+        if self is KinshipStep.CHILD:
+            return KinshipStep.PARENT
+        return KinshipStep.SPOUSE
+
+
+_STEP_WORDS = {
+    KinshipStep.PARENT: ("father", "mother", "parent"),
+    KinshipStep.CHILD: ("son", "daughter", "child"),
+    KinshipStep.SPOUSE: ("husband", "wife", "spouse"),
+}
+
+_ORDINALS = [
+    "first",
+    "second",
+    "third",
+    "fourth",
+    "fifth",
+    "sixth",
+    "seventh",
+    "eighth",
+    "ninth",
+    "tenth",
+]
+
+_REMOVALS = ["once", "twice", "thrice"]
+
+
+def _gendered(gender: int, male: str, female: str, neutral: str) -> str:
+    """Picks the word matching a utils_pb2.Gender value."""
+    if gender == utils_pb2.MALE:
+        return male
+    if gender == utils_pb2.FEMALE:
+        return female
+    return neutral
+
+
+def _ordinal(number: int) -> str:
+    if number <= len(_ORDINALS):
+        return _ORDINALS[number - 1]
+    if 10 <= number % 100 <= 20:
+        suffix = "th"
+    else:
+        suffix = {1: "st", 2: "nd", 3: "rd"}.get(number % 10, "th")
+    return f"{number}{suffix}"
+
+
+def _removal(number: int) -> str:
+    if number <= len(_REMOVALS):
+        return _REMOVALS[number - 1]
+    return f"{number} times"
+
+
+def _side(gender: int) -> str:
+    """Returns the "maternal "/"paternal " prefix for the first parent of a line."""
+    return _gendered(gender, "paternal ", "maternal ", "")
+
+
+def _ancestor(generations: int, gender: int) -> str:
+    """Returns the word for a direct ancestor, e.g. "great-grandmother"."""
+    if generations == 1:
+        return _gendered(gender, "father", "mother", "parent")
+    greats = "great-" * (generations - 2)
+    return greats + _gendered(gender, "grandfather", "grandmother", "grandparent")
+
+
+def _descendant(generations: int, gender: int) -> str:
+    """Returns the word for a direct descendant, e.g. "great-grandson"."""
+    if generations == 1:
+        return _gendered(gender, "son", "daughter", "child")
+    greats = "great-" * (generations - 2)
+    return greats + _gendered(gender, "grandson", "granddaughter", "grandchild")
+
+
+def _blood_relationship(steps: Sequence[tuple[KinshipStep, int]]) -> str | None:
+    """
+    Names a relative reached by going up some generations and then down.
+
+    Args:
+        steps: The path, as (step, gender of the member reached) pairs.
+
+    Returns:
+        The relationship label, or None if the path does not go up and then down.
+    """
+    ups = 0
+    while ups < len(steps) and steps[ups][0] is KinshipStep.PARENT:
+        ups += 1
+    downs = len(steps) - ups
+    if any(step is not KinshipStep.CHILD for step, _ in steps[ups:]):
+        return None
+
+    gender = steps[-1][1]
+    side = _side(steps[0][1]) if ups >= 2 else ""
+    if downs == 0:
+        return side + _ancestor(ups, gender)
+    if ups == 0:
+        return _descendant(downs, gender)
+    if ups == 1:
+        if downs == 1:
+            return _gendered(gender, "brother", "sister", "sibling")
+        greats = "great-" * (downs - 3)
+        grand = "grand" if downs >= 3 else ""
+        return greats + grand + _gendered(gender, "nephew", "niece", "nibling")
+    if downs == 1:
+        if ups == 2:
+            return side + _gendered(gender, "uncle", "aunt", "parent's sibling")
+        ancestor = side + _ancestor(ups - 1, steps[ups - 2][1])
+        return ancestor + "'s " + _gendered(gender, "brother", "sister", "sibling")
+    label = _ordinal(min(ups, downs) - 1) + " cousin"
+    if ups != downs:
+        label += " " + _removal(abs(ups - downs)) + " removed"
+    return label
+
+
+def _possessive_chain(steps: Sequence[tuple[KinshipStep, int]]) -> str:
+    """Spells out a path step by step, e.g. "son's mother"."""
+    return "'s ".join(_gendered(gender, *_STEP_WORDS[step]) for step, gender in steps)
+
+
+def describe_relationship(steps: Sequence[tuple[KinshipStep, int]]) -> str:
+    """
+    Translates a kinship path into a relationship label.
+
+    The label names the last member of the path as a relative of the first,
+    e.g. "maternal grandfather's brother" or "second cousin once removed".
+    A spouse step at either end of a blood relationship gives in-law and step
+    relationships. Paths that fit no common term are spelled out step by step.
+
+    Args:
+        steps: The path from the first member, as (step, gender) pairs where
+            gender is the utils_pb2.Gender of the member reached by the step.
+
+    Returns:
+        The relationship label, or "self" for an empty path.
+    """
+    if not steps:
+        return "self"
+    if len(steps) == 1 and steps[0][0] is KinshipStep.SPOUSE:
+        return _possessive_chain(steps)
+
+    lead = steps[0][0] is KinshipStep.SPOUSE
+    trail = steps[-1][0] is KinshipStep.SPOUSE
+    blood_steps = steps[int(lead) : len(steps) - int(trail)]
+    blood = _blood_relationship(blood_steps) if blood_steps else None
+    if blood is None:
+        return _possessive_chain(steps)
+    if lead == trail:
+        if lead:
+            spouse, relative_spouse = steps[:1], steps[-1:]
+            return (
+                f"{_possessive_chain(spouse)}'s {blood}'s "
+                f"{_possessive_chain(relative_spouse)}"
+            )
+        return blood
+
+    ups = sum(step is KinshipStep.PARENT for step, _ in blood_steps)
+    downs = len(blood_steps) - ups
+    gender = steps[-1][1]
+    if lead:
+        if (ups, downs) == (1, 0):
+            return _gendered(gender, "father", "mother", "parent") + "-in-law"
+        if (ups, downs) == (1, 1):
+            return _gendered(gender, "brother", "sister", "sibling") + "-in-law"
+        if (ups, downs) == (0, 1):
+            return "step" + _gendered(gender, "son", "daughter", "child")
+        return f"{_possessive_chain(steps[:1])}'s {blood}"
+    if (ups, downs) == (0, 1):
+        return _gendered(gender, "son", "daughter", "child") + "-in-law"
+    if (ups, downs) == (1, 1):
+        return _gendered(gender, "brother", "sister", "sibling") + "-in-law"
+    if (ups, downs) == (1, 0):
+        return "step" + _gendered(gender, "father", "mother", "parent")
+    if (ups, downs) == (2, 1):
+        return _gendered(gender, "uncle", "aunt", "parent's sibling") + " by marriage"
+    return f"{blood}'s {_possessive_chain(steps[-1:])}"
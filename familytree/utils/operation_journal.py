@@ -0,0 +1,164 @@
+from collections import deque
+from typing import Optional
+
+from familytree.proto import family_tree_pb2
+from familytree.utils.graph_types import EdgeType, GraphEdge
+
+# The attributes of a member and the values of its GraphNode flags.
+MemberState = tuple[family_tree_pb2.FamilyMember, tuple[Optional[bool], ...]]
+# A family unit and whether its name was stale.
+FamilyUnitState = tuple[family_tree_pb2.FamilyUnit, bool]
+
+
+class GraphOperation:
+    """
+    The state of everything one operation changed in a GraphHandler, as it was
+    before the operation.
+
+    Each member, edge and family unit is recorded the first time the
+    operation changes it, with None if it did not exist. Restoring the
+    recorded state undoes the operation, so an operation costs memory and
+    time in proportion to what it changed, not to the size of the tree.
+
+    When an existing edge is recorded, so is the order of its source's
+    targets of that type, so that restoring puts a removed edge back in its
+    place.
+    """
+
+    __slots__ = ("description", "members", "edges", "family_units", "target_orders")
+
+    def __init__(self, description: str):
+        self.description = description
+        self.members: dict[str, Optional[MemberState]] = {}
+        self.edges: dict[tuple[str, str], Optional[GraphEdge]] = {}
+        self.family_units: dict[str, Optional[FamilyUnitState]] = {}
+        self.target_orders: dict[tuple[str, EdgeType], tuple[str, ...]] = {}
+
+    def is_empty(self) -> bool:
+        """Checks if the operation did not change anything."""
+        return not (self.members or self.edges or self.family_units)
+
+
+class GraphChanges:
+    """
+    The IDs of the members, relationships and family units a GraphHandler
+    changed over a span of its history, so that a save only has to write
+    those.
+
+    A relationships ID is the ID of the member whose outgoing edges changed.
+
+    Change sets form a chain back through the history. A handler adds to its
+    latest set, and copying a handler or taking a checkpoint ends that set.
+    An ended set is never added to again, so it marks a point in the history
+    that later changes can be collected from.
+    """
+
+    __slots__ = ("member_ids", "relationship_ids", "family_unit_ids", "previous")
+
+    def __init__(self, previous: Optional["GraphChanges"] = None):
+        """
+        Initializes an empty change set.
+
+        Args:
+            previous: The ended change set this one follows, or None if it
+                starts a history, e.g. when a tree is loaded.
+        """
+        self.member_ids: set[str] = set()
+        self.relationship_ids: set[str] = set()
+        self.family_unit_ids: set[str] = set()
+        self.previous = previous
+
+    def is_empty(self) -> bool:
+        """Checks if nothing was changed in this set."""
+        return not (self.member_ids or self.relationship_ids or self.family_unit_ids)
+
+    def collect_since(
+        self, checkpoint: Optional["GraphChanges"]
+    ) -> Optional["GraphChanges"]:
+        """
+        Returns everything changed in this set and the sets before it, back to
+        a checkpoint.
+
+        Args:
+            checkpoint: An ended set earlier in this history. Its changes and
+                those before it are left out.
+
+        Returns:
+            A new change set with all the IDs, or None if the checkpoint is
+            None or not part of this history, so that what changed since it is
+            not known.
+        """
+        if checkpoint is None:
+            return None
+        collected = GraphChanges()
+        changes: Optional[GraphChanges] = self
+        while changes is not checkpoint:
+            if changes is None:
+                return None
+            collected.member_ids |= changes.member_ids
+            collected.relationship_ids |= changes.relationship_ids
+            collected.family_unit_ids |= changes.family_unit_ids
+            changes = changes.previous
+        return collected
+
+
+class OperationJournal:
+    """
+    The undo and redo stacks of the operations applied to a family tree.
+
+    Undoing an operation moves its inverse to the redo stack, and redoing moves
+    it back. Recording a new operation clears the redo stack. Only the most
+    recent `max_operations` operations can be undone.
+    """
+
+    def __init__(self, max_operations: int = 100):
+        """
+        Initializes an empty journal.
+
+        Args:
+            max_operations: The number of operations kept for undo.
+        """
+        self._undo_stack: deque[GraphOperation] = deque(maxlen=max_operations)
+        self._redo_stack: list[GraphOperation] = []
+
+    def record(self, operation: GraphOperation) -> None:
+        """
+        Records an operation that was just applied.
+
+        Args:
+            operation: The operation, with the state from before it.
+        """
+        if operation.is_empty():
+            return
+        self._undo_stack.append(operation)
+        self._redo_stack.clear()
+
+    def peek_undo(self) -> Optional[GraphOperation]:
+        """Returns the operation that would be undone next, if any."""
+        return self._undo_stack[-1] if self._undo_stack else None
+
+    def peek_redo(self) -> Optional[GraphOperation]:
+        """Returns the operation that would be redone next, if any."""
+        return self._redo_stack[-1] if self._redo_stack else None
+
+    def undone(self, inverse: GraphOperation) -> None:
+        """
+        Moves the last operation to the redo stack once it has been undone.
+
+        Args:
+            inverse: The operation that redoes it, as returned by
+                `GraphHandler.restore_operation`.
+        """
+        self._undo_stack.pop()
+        self._redo_stack.append(inverse)
+
+    def redone(self, inverse: GraphOperation) -> None:
+        """
+        Moves the last undone operation back to the undo stack once redone.
+
+        Args:
+            inverse: The operation that undoes it again, as returned by
+                `GraphHandler.restore_operation`.
+        """
+        self._redo_stack.pop()
+        self._undo_stack.append(inverse)
@@ -0,0 +1,357 @@
+import datetime
+import functools
+import logging
+from typing import NamedTuple, Optional, Sequence
+
+import numpy as np
+
+import familytree.proto.utils_pb2 as utils_pb2
+from familytree.exceptions import InvalidInputError
+
+logger = logging.getLogger(__name__)
+
+# The last Gregorian year the tables can cover, since they run to the first
+# day of the year after the range.
+LAST_SUPPORTED_YEAR = 9998
+
+# The Julian day of 2000-01-01 12:00 TT, and of 1970-01-01 00:00 UTC, the
+# epoch of numpy's datetime64.
+_J2000 = 2451545.0
+_UNIX_EPOCH_JD = 2440587.5
+
+# Sunrise and sunset in Chennai, taken as 06:00 and 18:00 IST all year. The
+# true times move by less than half an hour, which only matters on the few
+# days a star, thithi or month changes close to them.
+_SUNRISE_UTC = 0.5 / 24
+_SUNSET_UTC = 12.5 / 24
+
+# The Lahiri ayanamsa at J2000 and its yearly increase, in degrees.
+_AYANAMSA_J2000 = 23.85306
+_AYANAMSA_PER_YEAR = 50.2788 / 3600
+
+# Main periodic terms of the Moon's longitude (Meeus, Astronomical
+# Algorithms, ch. 47): multiples of D, M, M' and F, and the amplitude in
+# millionths of a degree. Terms with M are scaled by E per multiple of M.
+_MOON_TERMS = np.array(
+    [
+        (0, 0, 1, 0, 6288774),
+        (2, 0, -1, 0, 1274027),
+        (2, 0, 0, 0, 658314),
+        (0, 0, 2, 0, 213618),
+        (0, 1, 0, 0, -185116),
+        (0, 0, 0, 2, -114332),
+        (2, 0, -2, 0, 58793),
+        (2, -1, -1, 0, 57066),
+        (2, 0, 1, 0, 53322),
+        (2, -1, 0, 0, 45758),
+        (0, 1, -1, 0, -40923),
+        (1, 0, 0, 0, -34720),
+        (0, 1, 1, 0, -30383),
+        (2, 0, 0, -2, 15327),
+        (0, 0, 1, 2, -12528),
+        (0, 0, 1, -2, 10980),
+        (4, 0, -1, 0, 10675),
+        (0, 0, 3, 0, 10034),
+        (4, 0, -2, 0, 8548),
+        (2, 1, -1, 0, -7888),
+        (2, 1, 0, 0, -6766),
+        (1, 0, -1, 0, -5163),
+        (1, 1, 0, 0, 4987),
+        (2, -1, 1, 0, 4036),
+        (2, 0, 2, 0, 3994),
+        (4, 0, 0, 0, 3861),
+        (2, 0, -3, 0, 3665),
+        (0, 1, -2, 0, -2689),
+        (2, 0, -1, 2, -2602),
+        (2, -1, -2, 0, 2390),
+        (1, 0, 1, 0, -2348),
+        (2, -2, 0, 0, 2236),
+        (0, 1, 2, 0, -2120),
+        (0, 2, 0, 0, -2069),
+        (2, -2, -1, 0, 2048),
+        (2, 0, 1, -2, -1773),
+        (2, 0, 0, 2, -1595),
+        (4, -1, -1, 0, 1215),
+        (0, 0, 2, 2, -1110),
+    ],
+    dtype=np.float64,
+)
+
+# The 30 thithis of a lunar month, from the new moon: Shukla (waxing)
+# Prathamai to Chathurdasi, Pournami, then Krishna (waning) Prathamai to
+# Chathurdasi and Amavasya.
+_FORTNIGHT = range(utils_pb2.PRATHAMAI, utils_pb2.CHATHURDASI + 1)
+_THITHIS = np.array(
+    [*_FORTNIGHT, utils_pb2.POURNAMI, *_FORTNIGHT, utils_pb2.AMAVASYA],
+    dtype=np.int8,
+)
+_PAKSHAMS = np.array(
+    [utils_pb2.SHUKLA] * 15 + [utils_pb2.KRISHNA] * 15, dtype=np.int8
+)
+
+
+def _julian_centuries(julian_days: np.ndarray) -> np.ndarray:
+    """Returns Julian centuries since J2000, taking UT as TT (about a minute
+    apart)."""
+    return (julian_days - _J2000) / 36525
+
+
+def sun_longitude(julian_days: np.ndarray) -> np.ndarray:
+    """
+    Computes the apparent tropical longitude of the Sun, to about 0.01°.
+
+    Args:
+        julian_days: Julian days (UT).
+
+    Returns:
+        The longitudes in degrees, in [0, 360).
+    """
+    t = _julian_centuries(julian_days)
+    mean_longitude = 280.46646 + 36000.76983 * t
+    mean_anomaly = np.radians(357.52911 + 35999.05029 * t)
+    center = (
+        (1.914602 - 0.004817 * t) * np.sin(mean_anomaly)
+        + (0.019993 - 0.000101 * t) * np.sin(2 * mean_anomaly)
+        + 0.000289 * np.sin(3 * mean_anomaly)
+    )
+    omega = np.radians(125.04 - 1934.136 * t)
+    return (mean_longitude + center - 0.00569 - 0.00478 * np.sin(omega)) % 360
+
+
+def moon_longitude(julian_days: np.ndarray) -> np.ndarray:
+    """
+    Computes the tropical longitude of the Moon from its main periodic terms,
+    to a few hundredths of a degree.
+
+    Args:
+        julian_days: Julian days (UT).
+
+    Returns:
+        The longitudes in degrees, in [0, 360).
+    """
+    t = _julian_centuries(julian_days)
+    mean_longitude = 218.3164477 + 481267.88123421 * t
+    arguments = np.radians(
+        np.stack(
+            [
+                297.8501921 + 445267.1114034 * t,  # D, the mean elongation
+                357.5291092 + 35999.0502909 * t,  # M, the Sun's mean anomaly
+                134.9633964 + 477198.8675055 * t,  # M', the Moon's mean anomaly
+                93.2720950 + 483202.0175233 * t,  # F, the argument of latitude
+            ]
+        )
+    )
+    eccentricity = 1 - 0.002516 * t
+    multiples, amplitudes = _MOON_TERMS[:, :4], _MOON_TERMS[:, 4]
+    scales = eccentricity ** np.abs(multiples[:, 1:2])
+    terms = (amplitudes[:, None] * scales * np.sin(multiples @ arguments)).sum(0)
+    a1 = np.radians(119.75 + 131.849 * t)
+    a2 = np.radians(53.09 + 479264.290 * t)
+    f = arguments[3]
+    terms += (
+        3958 * np.sin(a1)
+        + 1962 * np.sin(np.radians(mean_longitude) - f)
+        + 318 * np.sin(a2)
+    )
+    return (mean_longitude + terms / 1e6) % 360
+
+
+def lahiri_ayanamsa(julian_days: np.ndarray) -> np.ndarray:
+    """Returns the Lahiri ayanamsa in degrees, the offset of the sidereal
+    zodiac from the tropical one."""
+    return _AYANAMSA_J2000 + (julian_days - _J2000) / 365.25 * _AYANAMSA_PER_YEAR
+
+
+class TamilDates(NamedTuple):
+    """Traditional dates, one per Gregorian date, as arrays of enum values."""
+
+    months: np.ndarray  # TamilMonth
+    stars: np.ndarray  # TamilStar
+    pakshams: np.ndarray  # Paksham
+    thithis: np.ndarray  # Thithi
+
+
+class TamilCalendar:
+    """
+    Gregorian to Tamil calendar conversion from precomputed day tables.
+
+    For every day of a range of years, the tables hold:
+
+    - the solar month, from the sidereal sign of the Sun at sunset, so a month
+      starts on the day of the Sun's transit if it happens before sunset;
+    - the star (nakshatra) of the Moon at sunrise;
+    - the thithi and paksham at sunrise, from the angle between the Moon and
+      the Sun.
+
+    Positions come from standard low-precision formulas with the Lahiri
+    ayanamsa, for Chennai. They match almanacs except on days when a change
+    falls within minutes of sunrise or sunset. A conversion is a lookup by day
+    number, done for whole arrays of dates at once.
+    """
+
+    def __init__(self, first_year: int, last_year: int):
+        """
+        Computes the tables for the years from `first_year` to `last_year`.
+
+        Args:
+            first_year: The first Gregorian year of the tables.
+            last_year: The last Gregorian year of the tables.
+
+        Raises:
+            InvalidInputError: If the range is empty or outside years 1-9998.
+        """
+        if not 1 <= first_year <= last_year <= LAST_SUPPORTED_YEAR:
+            raise InvalidInputError(
+                operation="tamil_calendar",
+                field="year",
+                description=f"Invalid year range {first_year}-{last_year}.",
+            )
+        self.first_year = first_year
+        self.last_year = last_year
+        self._first_ordinal = datetime.date(first_year, 1, 1).toordinal()
+        self._first_day = np.datetime64(datetime.date(first_year, 1, 1), "D")
+        days = np.arange(
+            self._first_day,
+            np.datetime64(datetime.date(last_year + 1, 1, 1), "D"),
+        )
+        midnights = days.astype(np.int64) + _UNIX_EPOCH_JD
+        sunrises = midnights + _SUNRISE_UTC
+        sunsets = midnights + _SUNSET_UTC
+
+        sun_at_sunset = sun_longitude(sunsets) - lahiri_ayanamsa(sunsets)
+        self._months = ((sun_at_sunset % 360) // 30 + 1).astype(np.int8)
+        sun_at_sunrise = sun_longitude(sunrises)
+        moon_at_sunrise = moon_longitude(sunrises)
+        sidereal_moon = (moon_at_sunrise - lahiri_ayanamsa(sunrises)) % 360
+        self._stars = (sidereal_moon // (360 / 27) + 1).astype(np.int8)
+        elongation = (moon_at_sunrise - sun_at_sunrise) % 360
+        lunar_days = (elongation // 12).astype(np.intp)
+        self._pakshams = _PAKSHAMS[lunar_days]
+        self._thithis = _THITHIS[lunar_days]
+
+    def _day_numbers(
+        self, dates: Sequence[datetime.date] | np.ndarray
+    ) -> np.ndarray:
+        """Returns the table rows of dates, checking that they are covered."""
+        if isinstance(dates, np.ndarray):
+            day_numbers = (dates.astype("datetime64[D]") - self._first_day).astype(
+                np.int64
+            )
+        else:
+            # Ordinals are much faster to collect than datetime64 values.
+            day_numbers = np.fromiter(
+                (date.toordinal() for date in dates), np.int64, len(dates)
+            )
+            day_numbers -= self._first_ordinal
+        if len(day_numbers) and (
+            day_numbers.min() < 0 or day_numbers.max() >= len(self._months)
+        ):
+            raise InvalidInputError(
+                operation="tamil_calendar",
+                field="date",
+                description=f"Dates must be in the years {self.first_year}-"
+                f"{self.last_year}.",
+            )
+        return day_numbers
+
+    def convert(self, dates: Sequence[datetime.date] | np.ndarray) -> TamilDates:
+        """
+        Converts Gregorian dates to traditional dates.
+
+        Args:
+            dates: The dates, or an array of numpy datetime64 days.
+
+        Returns:
+            The month, star, paksham and thithi of every date.
+
+        Raises:
+            InvalidInputError: If a date is outside the years of the tables.
+        """
+        day_numbers = self._day_numbers(dates)
+        return TamilDates(
+            self._months[day_numbers],
+            self._stars[day_numbers],
+            self._pakshams[day_numbers],
+            self._thithis[day_numbers],
+        )
+
+    def traditional_date(self, date: datetime.date) -> utils_pb2.TraditionalDate:
+        """
+        Converts one Gregorian date to a TraditionalDate.
+
+        Args:
+            date: The date.
+
+        Returns:
+            The TraditionalDate of the day.
+
+        Raises:
+            InvalidInputError: If the date is outside the years of the tables.
+        """
+        month, star, paksham, thithi = (
+            int(values[0]) for values in self.convert([date])
+        )
+        return utils_pb2.TraditionalDate(
+            month=month, star=star, paksham=paksham, thithi=thithi
+        )
+
+    def find_dates(
+        self,
+        year: int,
+        tamil_month: Optional[int] = None,
+        star: Optional[int] = None,
+        paksham: Optional[int] = None,
+        thithi: Optional[int] = None,
+    ) -> list[datetime.date]:
+        """
+        Finds the days of a Gregorian year with the given traditional date,
+        e.g. the day of a birth star in a Tamil month.
+
+        Args:
+            year: The Gregorian year.
+            tamil_month: The TamilMonth value, if any.
+            star: The TamilStar value, if any.
+            paksham: The Paksham value, if any.
+            thithi: The Thithi value, if any.
+
+        Returns:
+            The matching days of the year, in order.
+
+        Raises:
+            InvalidInputError: If the year is outside the years of the tables.
+        """
+        start, end = self._day_numbers(
+            [datetime.date(year, 1, 1), datetime.date(year, 12, 31)]
+        ).tolist()
+        matches = np.ones(end - start + 1, dtype=bool)
+        for table, value in (
+            (self._months, tamil_month),
+            (self._stars, star),
+            (self._pakshams, paksham),
+            (self._thithis, thithi),
+        ):
+            if value is not None:
+                matches &= table[start : end + 1] == value
+        first_day = datetime.date(year, 1, 1)
+        return [
+            first_day + datetime.timedelta(days=day)
+            for day in np.flatnonzero(matches).tolist()
+        ]
+
+
+@functools.lru_cache(maxsize=4)
+def get_tamil_calendar(
+    first_year: int = 1800, last_year: int = 2100
+) -> TamilCalendar:
+    """
+    Returns the TamilCalendar for a range of years, computing it on first use.
+
+    Args:
+        first_year: The first Gregorian year of the tables.
+        last_year: The last Gregorian year of the tables.
+
+    Returns:
+        The shared TamilCalendar for the range.
+    """
+    logger.info(f"Computing Tamil calendar tables for {first_year}-{last_year}")
+    return TamilCalendar(first_year, last_year)
@@ -0,0 +1,196 @@
+import base64
+import binascii
+import enum
+import os
+import re
+from typing import Optional
+
+# Only the standard library is used here, so that the desktop app, which
+# imports this module as `utils.tree_file_format`, can share it.
+
+
+class TreeFileFormat(enum.Enum):
+    """The file formats a FamilyTree is saved in, named by their extension."""
+
+    # Protobuf text format: readable and diffable, but large and slow to parse.
+    TEXT = "txtpb"
+    # Protobuf binary wire format.
+    BINARY = "binpb"
+    # A header, then one length-delimited record per member, relationships and
+    # family unit, so a tree can be read record by record.
+    STREAM = "pbstream"
+
+
+_FORMATS_BY_EXTENSION = {
+    ".txtpb": TreeFileFormat.TEXT,
+    ".textproto": TreeFileFormat.TEXT,
+    ".pbtxt": TreeFileFormat.TEXT,
+    ".binpb": TreeFileFormat.BINARY,
+    ".pb": TreeFileFormat.BINARY,
+    ".pbstream": TreeFileFormat.STREAM,
+}
+
+# A stream starts with these bytes, then the format version as a varint.
+STREAM_MAGIC = b"FTSTREAM"
+STREAM_VERSION = 1
+
+# ASCII control characters other than whitespace. Text format never contains
+# them, and the wire format of a FamilyTree has them in its first bytes: the
+# tag of every member's fields and most length prefixes.
+_CONTROL_BYTES = re.compile(rb"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]")
+# Enough of the start of a file to tell the formats apart.
+_SNIFF_LENGTH = 4096
+
+_BASE64 = re.compile(r"[A-Za-z0-9+/]*={0,2}")
+
+
+def format_from_filename(filename: str) -> Optional[TreeFileFormat]:
+    """
+    Returns the format that a file name's extension stands for.
+
+    Args:
+        filename: The name or path of the file.
+
+    Returns:
+        The TreeFileFormat, or None if the extension is not a known one.
+    """
+    return _FORMATS_BY_EXTENSION.get(os.path.splitext(filename)[1].lower())
+
+
+def sniff_format(content: bytes) -> TreeFileFormat:
+    """
+    Tells the format of a file from its content.
+
+    Args:
+        content: The content of the file, or at least its start.
+
+    Returns:
+        STREAM if the content starts with the stream header, BINARY if the
+        start of the content has control characters, else TEXT.
+    """
+    if content.startswith(STREAM_MAGIC):
+        return TreeFileFormat.STREAM
+    if _CONTROL_BYTES.search(content, 0, _SNIFF_LENGTH):
+        return TreeFileFormat.BINARY
+    return TreeFileFormat.TEXT
+
+
+def detect_format(filename: str, content: bytes) -> TreeFileFormat:
+    """
+    Returns the format of a file, from its extension or else its content.
+
+    Args:
+        filename: The name or path of the file.
+        content: The content of the file, or at least its start.
+
+    Returns:
+        The TreeFileFormat of the file.
+    """
+    return format_from_filename(filename) or sniff_format(content)
+
+
+def decode_request_content(filename: str, content: str) -> str | bytes:
+    """
+    Decodes the content of a file sent in a JSON request.
+
+    JSON carries a binary or stream file base64-encoded. The format comes from the file
+    name's extension. Without a known extension, content that is entirely
+    base64 is taken as binary, which text format with any field in it never
+    is.
+
+    Args:
+        filename: The name of the file.
+        content: The text of a text format file, or the base64-encoded bytes
+            of a binary or stream one.
+
+    Returns:
+        The text of a text format file, or the bytes of a binary or stream
+        one.
+
+    Raises:
+        ValueError: If a binary file's content is not valid base64.
+    """
+    file_format = format_from_filename(filename)
+    if file_format is None:
+        is_base64 = content and len(content) % 4 == 0 and _BASE64.fullmatch(content)
+        file_format = TreeFileFormat.BINARY if is_base64 else TreeFileFormat.TEXT
+    if file_format == TreeFileFormat.TEXT:
+        return content
+    try:
+        return base64.b64decode(content, validate=True)
+    except binascii.Error as e:
+        raise ValueError(f"A binary file must be base64-encoded: {e}") from e
+
+
+def encode_response_content(content: bytes) -> str:
+    """Encodes the bytes of a binary file for a JSON response."""
+    return base64.b64encode(content).decode("ascii")
+
+
+def encode_varint(value: int) -> bytes:
+    """Encodes a non-negative integer as a protobuf base 128 varint."""
+    encoded = bytearray()
+    while value > 0x7F:
+        encoded.append(value & 0x7F | 0x80)
+        value >>= 7
+    encoded.append(value)
+    return bytes(encoded)
+
+
+def decode_varint(content: bytes | bytearray, position: int) -> tuple[int, int]:
+    """
+    Decodes a protobuf base 128 varint.
+
+    Args:
+        content: The bytes the varint is in.
+        position: The index of the varint's first byte.
+
+    Returns:
+        The value, and the index of the first byte after the varint.
+
+    Raises:
+        IndexError: If the content ends inside the varint.
+        ValueError: If the varint is longer than 64 bits.
+    """
+    value = 0
+    for shift in range(0, 64, 7):
+        byte = content[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, position
+    raise ValueError("A varint is longer than 64 bits.")
+
+
+def encode_stream_header() -> bytes:
+    """Returns the header a stream file starts with."""
+    return STREAM_MAGIC + encode_varint(STREAM_VERSION)
+
+
+def decode_stream_header(content: bytes | bytearray) -> int:
+    """
+    Checks the header of a stream file.
+
+    The records after the header are the fields of a FamilyTree message in
+    the wire format, so the rest of the file can also be parsed as one
+    FamilyTree.
+
+    Args:
+        content: The content of the file, or at least its first bytes.
+
+    Returns:
+        The index of the first byte after the header.
+
+    Raises:
+        ValueError: If the content does not start with a header of a version
+            this module reads.
+    """
+    if not content.startswith(STREAM_MAGIC):
+        raise ValueError("A stream file must start with the stream header.")
+    try:
+        version, position = decode_varint(content, len(STREAM_MAGIC))
+    except IndexError:
+        raise ValueError("The stream header is truncated.") from None
+    if version != STREAM_VERSION:
+        raise ValueError(f"Stream version {version} is not supported.")
+    return position
@@ -0,0 +1,295 @@
+import os
+from typing import BinaryIO, NamedTuple, Optional
+
+from google.protobuf.message import DecodeError
+
+from familytree.proto import family_tree_pb2
+from familytree.utils.tree_file_format import decode_varint, encode_varint
+
+# A tree log directory holds a snapshot of a family tree, as a binary
+# FamilyTree message, and a log of the edits made to the tree since the
+# snapshot was written. The log is a header followed by one record per write:
+# a varint length and an edit message. Field 1 of an edit is a FamilyTree of
+# the members, relationships and family units the write changed, as they are
+# after it. Field 2 is a FamilyTree whose map keys are the IDs the write
+# deleted. An edit sets state instead of repeating an operation, so applying
+# the same edit twice changes nothing.
+#
+# The header names the generation of the snapshot the log follows, and each
+# compaction writes the next generation's snapshot before it starts a new
+# log. A crash at any point therefore leaves a log and the snapshot it
+# follows.
+
+LOG_MAGIC = b"FTTREELOG"
+LOG_VERSION = 1
+LOG_FILENAME = "tree.log"
+
+_CHANGED_TAG = b"\x0a"
+_DELETED_TAG = b"\x12"
+# Compacting a log smaller than this costs more than replaying it.
+_MIN_COMPACTION_BYTES = 1 << 20
+
+
+class TreeEdit(NamedTuple):
+    """
+    What one write changed in a family tree.
+
+    Attributes:
+        changed: The changed members, relationships and family units, as they
+            are after the write.
+        deleted: A FamilyTree whose map keys are the IDs of the members,
+            relationships and family units the write deleted. Its values are
+            empty.
+    """
+
+    changed: family_tree_pb2.FamilyTree
+    deleted: family_tree_pb2.FamilyTree
+
+
+def encode_log_header(generation: int) -> bytes:
+    """
+    Returns the header a log starts with.
+
+    Args:
+        generation: The generation of the snapshot the log follows.
+    """
+    return LOG_MAGIC + encode_varint(LOG_VERSION) + encode_varint(generation)
+
+
+def encode_tree_edit(edit: TreeEdit) -> bytes:
+    """
+    Encodes an edit as a log record.
+
+    Args:
+        edit: The edit to encode.
+
+    Returns:
+        The record, with its length first.
+    """
+    changed = edit.changed.SerializeToString(deterministic=True)
+    deleted = edit.deleted.SerializeToString(deterministic=True)
+    body = b"".join(
+        (
+            _CHANGED_TAG,
+            encode_varint(len(changed)),
+            changed,
+            _DELETED_TAG,
+            encode_varint(len(deleted)),
+            deleted,
+        )
+    )
+    return encode_varint(len(body)) + body
+
+
+def decode_tree_log(content: bytes) -> tuple[int, list[TreeEdit], int]:
+    """
+    Reads the header and the edits of a log.
+
+    A record cut short, e.g. by a crash while it was appended, ends the log:
+    it and anything after it are left out.
+
+    Args:
+        content: The content of the log.
+
+    Returns:
+        The generation of the snapshot the log follows, the edits in the
+        order they were made, and the number of bytes the header and the
+        complete records take.
+
+    Raises:
+        ValueError: If the content does not start with a log header of a
+            version this module reads.
+    """
+    if not content.startswith(LOG_MAGIC):
+        raise ValueError("A tree log must start with the tree log header.")
+    try:
+        version, position = decode_varint(content, len(LOG_MAGIC))
+        generation, position = decode_varint(content, position)
+    except IndexError:
+        raise ValueError("The tree log header is truncated.") from None
+    if version != LOG_VERSION:
+        raise ValueError(f"Tree log version {version} is not supported.")
+
+    edits: list[TreeEdit] = []
+    while position < len(content):
+        try:
+            length, body_start = decode_varint(content, position)
+            edit = _decode_edit(content[body_start : body_start + length])
+        except (IndexError, ValueError, DecodeError):
+            break
+        if body_start + length > len(content):
+            break
+        edits.append(edit)
+        position = body_start + length
+    return generation, edits, position
+
+
+def _decode_edit(body: bytes) -> TreeEdit:
+    """
+    Decodes the body of a log record.
+
+    Args:
+        body: The bytes of the record after its length.
+
+    Returns:
+        The edit.
+
+    Raises:
+        ValueError, IndexError or DecodeError: If the body is not an edit.
+    """
+    messages = []
+    position = 0
+    for tag in (_CHANGED_TAG, _DELETED_TAG):
+        if body[position : position + 1] != tag:
+            raise ValueError("A tree log record is not an edit.")
+        length, start = decode_varint(body, position + 1)
+        position = start + length
+        if position > len(body):
+            raise ValueError("A tree log record is truncated.")
+        messages.append(family_tree_pb2.FamilyTree.FromString(body[start:position]))
+    if position != len(body):
+        raise ValueError("A tree log record has trailing bytes.")
+    return TreeEdit(*messages)
+
+
+class TreeLog:
+    """
+    A snapshot of a family tree and a log of the edits made to it since, kept
+    in a directory.
+
+    Appending an edit writes one small record at the end of the log. Once the
+    log has grown larger than the snapshot, compacting writes the current
+    tree as the new snapshot and starts an empty log, so replaying the
+    directory costs about as much as loading the tree.
+    """
+
+    def __init__(self, directory: str, sync: bool = True):
+        """
+        Initializes a tree log kept in a directory, creating it if needed.
+
+        Nothing is read or written until `read` or `compact` is called.
+
+        Args:
+            directory: The directory of the snapshot and log files.
+            sync: Whether each append and compaction waits until the data is
+                on disk. Without it, an edit survives a crash of the process
+                but not of the machine.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self._directory = directory
+        self._sync = sync
+        self._generation = 0
+        self._log: Optional[BinaryIO] = None
+        self._log_size = 0
+        self._snapshot_size = 0
+
+    def read(self) -> tuple[bytes, list[TreeEdit]]:
+        """
+        Reads the snapshot and the edits logged since it was written.
+
+        Returns:
+            The binary FamilyTree message of the snapshot, empty if there is
+            none, and the edits in the order they were made.
+
+        Raises:
+            ValueError: If the log is not a tree log.
+        """
+        try:
+            with open(self._path(LOG_FILENAME), "rb") as f:
+                content = f.read()
+        except FileNotFoundError:
+            return b"", []
+        generation, edits, _ = decode_tree_log(content)
+        try:
+            with open(self._snapshot_path(generation), "rb") as f:
+                snapshot = f.read()
+        except FileNotFoundError:
+            snapshot = b""
+        self._generation = generation
+        return snapshot, edits
+
+    def append(self, edit: TreeEdit) -> int:
+        """
+        Appends an edit to the log.
+
+        Args:
+            edit: What a write changed.
+
+        Returns:
+            The number of bytes appended.
+
+        Raises:
+            RuntimeError: If the log has not been started by `compact`.
+        """
+        if self._log is None:
+            raise RuntimeError("The tree log must be compacted before appending.")
+        record = encode_tree_edit(edit)
+        self._log.write(record)
+        self._log.flush()
+        if self._sync:
+            os.fsync(self._log.fileno())
+        self._log_size += len(record)
+        return len(record)
+
+    def needs_compaction(self) -> bool:
+        """Checks if the log has grown larger than the snapshot."""
+        return self._log_size > max(_MIN_COMPACTION_BYTES, self._snapshot_size)
+
+    def compact(self, snapshot: bytes) -> None:
+        """
+        Replaces the snapshot with the current tree and starts an empty log.
+
+        Args:
+            snapshot: The binary FamilyTree message of the current tree,
+                including every edit logged so far.
+        """
+        self.close()
+        generation = self._generation + 1
+        self._write_file(self._snapshot_path(generation), snapshot)
+        self._write_file(self._path(LOG_FILENAME), encode_log_header(generation))
+        # The new log follows the new snapshot from here on.
+        for filename in os.listdir(self._directory):
+            if filename.startswith("snapshot-") and filename != os.path.basename(
+                self._snapshot_path(generation)
+            ):
+                os.remove(self._path(filename))
+        self._generation = generation
+        self._snapshot_size = len(snapshot)
+        self._log = open(self._path(LOG_FILENAME), "ab")
+        self._log_size = 0
+
+    def close(self) -> None:
+        """Closes the log file. Appending needs a compaction after this."""
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+    def _write_file(self, path: str, content: bytes) -> None:
+        """
+        Replaces a file with new content in one step.
+
+        Args:
+            path: The path of the file.
+            content: The new content.
+        """
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as f:
+            f.write(content)
+            f.flush()
+            if self._sync:
+                os.fsync(f.fileno())
+        os.replace(temp_path, path)
+        if self._sync and hasattr(os, "O_DIRECTORY"):
+            directory_fd = os.open(self._directory, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(directory_fd)
+            finally:
+                os.close(directory_fd)
+
+    def _snapshot_path(self, generation: int) -> str:
+        """Returns the path of the snapshot of a generation."""
+        return self._path(f"snapshot-{generation}.binpb")
+
+    def _path(self, filename: str) -> str:
+        """Returns the path of a file in the directory."""
+        return os.path.join(self._directory, filename)
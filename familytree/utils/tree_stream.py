@@ -0,0 +1,199 @@
+import enum
+from typing import BinaryIO, Iterable, Iterator, NamedTuple
+
+from google.protobuf.message import Message
+
+from familytree.proto import family_tree_pb2
+from familytree.utils.tree_file_format import (
+    decode_stream_header,
+    decode_varint,
+    encode_stream_header,
+    encode_varint,
+)
+
+# A stream file is a header followed by records. Each record is a field of a
+# FamilyTree message in the wire format: a tag, a length, and a map entry of
+# the member, relationships or family unit ID and its message. Members come
+# first, then relationships, then family units, each in ID order, so the
+# records after the header are exactly the deterministic serialization of the
+# FamilyTree.
+
+_LENGTH_DELIMITED = 2
+# The fields of a map entry message.
+_ENTRY_KEY_TAG = b"\x0a"
+_ENTRY_VALUE_TAG = b"\x12"
+# Enough bytes for the header of any version.
+_HEADER_READ_SIZE = 32
+
+
+class RecordKind(enum.IntEnum):
+    """The kinds of record in a stream, numbered by their FamilyTree field."""
+
+    MEMBER = family_tree_pb2.FamilyTree.MEMBERS_FIELD_NUMBER
+    RELATIONSHIPS = family_tree_pb2.FamilyTree.RELATIONSHIPS_FIELD_NUMBER
+    FAMILY_UNIT = family_tree_pb2.FamilyTree.FAMILY_UNITS_FIELD_NUMBER
+
+
+_RECORD_KINDS = frozenset(RecordKind)
+
+
+class TreeRecord(NamedTuple):
+    """
+    A member, a member's relationships or a family unit of a stream.
+
+    Attributes:
+        kind: What the message is.
+        key: The member ID, or the family unit ID.
+        message: A FamilyMember, Relationships or FamilyUnit message.
+    """
+
+    kind: RecordKind
+    key: str
+    message: Message
+
+
+def tree_records(family_tree: family_tree_pb2.FamilyTree) -> Iterator[TreeRecord]:
+    """
+    Yields the records of a FamilyTree in stream order.
+
+    Args:
+        family_tree: A family_tree_pb2.FamilyTree message instance.
+
+    Yields:
+        The members, then the relationships, then the family units, each in
+        ID order.
+    """
+    for kind, messages in (
+        (RecordKind.MEMBER, family_tree.members),
+        (RecordKind.RELATIONSHIPS, family_tree.relationships),
+        (RecordKind.FAMILY_UNIT, family_tree.family_units),
+    ):
+        for key in sorted(messages):
+            yield TreeRecord(kind, key, messages[key])
+
+
+def write_tree_stream(records: Iterable[TreeRecord], stream: BinaryIO) -> int:
+    """
+    Writes a header and records to a binary stream.
+
+    Args:
+        records: The records to write, usually from `tree_records`.
+        stream: A file or buffer opened for writing bytes.
+
+    Returns:
+        The number of bytes written.
+    """
+    header = encode_stream_header()
+    stream.write(header)
+    size = len(header)
+    for kind, key, message in records:
+        key_bytes = key.encode("utf-8")
+        value_bytes = message.SerializeToString(deterministic=True)
+        entry = b"".join(
+            (
+                _ENTRY_KEY_TAG,
+                encode_varint(len(key_bytes)),
+                key_bytes,
+                _ENTRY_VALUE_TAG,
+                encode_varint(len(value_bytes)),
+                value_bytes,
+            )
+        )
+        record = b"".join(
+            (
+                encode_varint(kind << 3 | _LENGTH_DELIMITED),
+                encode_varint(len(entry)),
+                entry,
+            )
+        )
+        stream.write(record)
+        size += len(record)
+    return size
+
+
+def read_tree_stream(
+    stream: BinaryIO, chunk_size: int = 1 << 20
+) -> Iterator[TreeRecord]:
+    """
+    Reads the records of a stream as they arrive.
+
+    The stream is read a chunk at a time. The complete records of each chunk
+    are parsed together, into one FamilyTree message that shares one protobuf
+    arena, and yielded in the order they were written. At most about a chunk
+    of the file is held besides the records the caller keeps. Fields that are
+    not members, relationships or family units are skipped.
+
+    Args:
+        stream: A file or buffer opened for reading bytes, positioned at the
+            header.
+        chunk_size: The number of bytes to read at a time.
+
+    Yields:
+        The records in the order they were written.
+
+    Raises:
+        ValueError: If the header is missing or the stream is malformed or
+            truncated.
+        google.protobuf.message.DecodeError: If a record is not a valid
+            message.
+    """
+    buffer = bytearray(stream.read(max(chunk_size, _HEADER_READ_SIZE)))
+    position = decode_stream_header(buffer)
+    while True:
+        batch_start = position
+        entries: list[tuple[RecordKind, int]] = []
+        while True:
+            record_end = None
+            try:
+                tag, data_start = decode_varint(buffer, position)
+                if tag & 0x7 != _LENGTH_DELIMITED:
+                    raise ValueError(f"Stream field {tag >> 3} is not a record.")
+                length, data_start = decode_varint(buffer, data_start)
+                record_end = data_start + length
+            except IndexError:
+                pass
+            if record_end is None or record_end > len(buffer):
+                break
+            if tag >> 3 in _RECORD_KINDS:
+                entries.append((RecordKind(tag >> 3), data_start))
+            position = record_end
+
+        if entries:
+            batch = family_tree_pb2.FamilyTree.FromString(buffer[batch_start:position])
+            messages = {
+                RecordKind.MEMBER: batch.members,
+                RecordKind.RELATIONSHIPS: batch.relationships,
+                RecordKind.FAMILY_UNIT: batch.family_units,
+            }
+            for kind, entry_start in entries:
+                key = _entry_key(buffer, entry_start)
+                yield TreeRecord(kind, key, messages[kind][key])
+
+        # The next record is not complete: drop what has been parsed and read
+        # at least the rest of the record.
+        missing = 0 if record_end is None else record_end - len(buffer)
+        chunk = stream.read(max(chunk_size, missing))
+        if not chunk:
+            if position == len(buffer):
+                return
+            raise ValueError("The stream ends in the middle of a record.")
+        del buffer[:position]
+        position = 0
+        buffer += chunk
+
+
+def _entry_key(buffer: bytearray, entry_start: int) -> str:
+    """
+    Returns the key of a map entry that has been parsed as valid.
+
+    Args:
+        buffer: The bytes the entry is in.
+        entry_start: The index of the entry's first byte.
+
+    Returns:
+        The key, or "" if the entry leaves the key out.
+    """
+    if buffer[entry_start : entry_start + 1] != _ENTRY_KEY_TAG:
+        return ""
+    length, key_start = decode_varint(buffer, entry_start + 1)
+    return buffer[key_start : key_start + length].decode("utf-8")
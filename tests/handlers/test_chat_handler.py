@@ -1,43 +1,84 @@
+import asyncio
+from unittest.mock import MagicMock
+
 import pytest
 
+from familytree.exceptions import OperationError
 from familytree.handlers.chat_handler import ChatHandler
 
 
+def make_event(text, is_final=True):
+    """Creates a stand-in for an ADK event with a single text part."""
+    event = MagicMock()
+    event.is_final_response.return_value = is_final
+    event.content.parts = [MagicMock(text=text)]
+    return event
+
+
+def fake_run_async(*events):
+    """Returns a replacement for Runner.run_async that yields the given events."""
+
+    async def run_async(**kwargs):
+        for event in events:
+            yield event
+
+    return run_async
+
+
 class TestChatHandler:
     def test_init(self):
         """
-        Tests that the ChatHandler initializes with default empty attributes.
+        Tests that the ChatHandler sets up the runner for the family tree assistant.
+        """
+        handler = ChatHandler()
+        assert handler.app_name == "Family Genie"
+        assert handler.user_id == "user"
+        assert handler.runner.agent is handler.family_tree_assistant
+        assert handler.run_config.max_llm_calls == 10
+
+    def test_get_or_create_session(self):
+        """
+        Tests that a session is created without a conversation ID and reused with one.
         """
         handler = ChatHandler()
-        assert handler.system_prompt_path == "", "system_prompt_path should be empty"
-        assert handler.api_key == "", "api_key should be empty"
+        conversation_id, session = asyncio.run(handler._get_or_create_session(None))
+        assert session.id == conversation_id
+
+        same_id, same_session = asyncio.run(
+            handler._get_or_create_session(conversation_id)
+        )
+        assert same_id == conversation_id
+        assert same_session.id == session.id
 
-    def test_initialize_gemini_2_5_flash_not_implemented(self):
+    def test_get_or_create_session_unknown_conversation(self):
         """
-        Tests that initialize_gemini_2_5_flash (pass) does not raise an error.
+        Tests that an unknown conversation ID raises an OperationError.
         """
         handler = ChatHandler()
-        try:
-            handler.initialize_gemini_2_5_flash()
-        except Exception as e:
-            pytest.fail(f"initialize_gemini_2_5_flash raised an exception: {e}")
+        with pytest.raises(OperationError, match="ADK Session not found"):
+            asyncio.run(handler._get_or_create_session("unknown"))
 
-    def test_get_gemini_response_not_implemented(self):
+    def test_call_agent_returns_final_response(self, monkeypatch):
         """
-        Tests that get_gemini_response (pass) does not raise an error.
+        Tests that the text of the final event is returned with the conversation ID.
         """
         handler = ChatHandler()
-        try:
-            handler.get_gemini_response("test message")
-        except Exception as e:
-            pytest.fail(f"get_gemini_response raised an exception: {e}")
+        monkeypatch.setattr(
+            handler.runner,
+            "run_async",
+            fake_run_async(make_event("Thinking", is_final=False), make_event("Ron")),
+        )
+        conversation_id, response = asyncio.run(
+            handler.call_agent_aync("Who is Arthur's son?", None)
+        )
+        assert conversation_id
+        assert response == "Ron"
 
-    def test_load_system_prompt_not_implemented(self):
+    def test_call_agent_empty_final_response(self, monkeypatch):
         """
-        Tests that _load_system_prompt (pass) does not raise an error.
+        Tests that a final event without text raises an OperationError.
         """
         handler = ChatHandler()
-        try:
-            handler._load_system_prompt()
-        except Exception as e:
-            pytest.fail(f"_load_system_prompt raised an exception: {e}")
+        monkeypatch.setattr(handler.runner, "run_async", fake_run_async(make_event("")))
+        with pytest.raises(OperationError, match="Final response not found"):
+            asyncio.run(handler.call_agent_aync("Who is Arthur's son?", None))
@@ -0,0 +1,200 @@
+import networkx as nx
+import pytest
+from familytree.proto import family_tree_pb2
+
+from familytree.exceptions import InvalidInputError, MemberNotFoundError
+from familytree.handlers.compact_graph_handler import CompactGraphHandler, CompactNode
+from familytree.handlers.graph_handler import GraphHandler
+
+
+@pytest.fixture
+def compact_graph_handler():
+    """Provides an empty CompactGraphHandler instance for each test."""
+    return CompactGraphHandler()
+
+
+def _snapshot(graph_handler):
+    """Returns the nodes, node flags and edges of a handler's graph view."""
+    graph = graph_handler.get_family_graph()
+    nodes = {
+        node_id: (
+            data["data"].attributes.name,
+            data["data"].is_poi,
+            data["data"].has_visible_spouse,
+            data["data"].has_visible_parents,
+            data["data"].has_visible_children,
+        )
+        for node_id, data in graph.nodes(data=True)
+    }
+    edges = {
+        (u, v): (data["data"].edge_type, data["data"].is_rendered)
+        for u, v, data in graph.edges(data=True)
+    }
+    return nodes, edges
+
+
+def _family_unit_members(graph_handler):
+    """Returns the parents and children of every family unit, ignoring unit IDs."""
+    return sorted(
+        (list(unit.parent_ids), list(unit.child_ids))
+        for unit in graph_handler.get_family_unit_graph().values()
+    )
+
+
+def _add_members(graph_handler, *member_ids):
+    for member_id in member_ids:
+        graph_handler.add_member(
+            member_id, family_tree_pb2.FamilyMember(id=member_id, name=member_id)
+        )
+
+
+def test_create_from_proto_matches_graph_handler(
+    compact_graph_handler, weasley_family_tree_pb
+):
+    """Tests that a compact build exposes the same graph as a DiGraph build."""
+    graph_handler = GraphHandler()
+    graph_handler.create_from_proto(weasley_family_tree_pb)
+    compact_graph_handler.create_from_proto(weasley_family_tree_pb)
+
+    assert _snapshot(compact_graph_handler) == _snapshot(graph_handler)
+    for member_id in weasley_family_tree_pb.members:
+        assert compact_graph_handler.get_children(
+            member_id
+        ) == graph_handler.get_children(member_id)
+        assert compact_graph_handler.get_parents(member_id) == graph_handler.get_parents(
+            member_id
+        )
+        assert compact_graph_handler.get_spouse(member_id) == graph_handler.get_spouse(
+            member_id
+        )
+    assert compact_graph_handler.get_member_family_unit_ids("RONAW") == ["FUNT"]
+    assert (
+        compact_graph_handler.get_family_unit_graph()["FUNT"].parent_ids
+        == graph_handler.get_family_unit_graph()["FUNT"].parent_ids
+    )
+
+
+def test_edits_match_graph_handler(compact_graph_handler):
+    """Tests that edits after a build behave like the DiGraph backend."""
+    graph_handler = GraphHandler()
+    for handler in (graph_handler, compact_graph_handler):
+        _add_members(handler, "p1", "p2", "c1", "c2", "x")
+        handler.add_spouse_relation("p1", "p2")
+        handler.add_spouse_relation("p2", "p1")
+        handler.add_child_relation("p1", "c1")
+        handler.add_parent_relation("c1", "p1")
+        handler.add_child_relation("p1", "c2")
+        handler.add_spouse_relation("c2", "x", add_to_family_unit=False)
+        handler.add_child_relation("c2", "x", add_to_family_unit=False)
+        handler.remove_relationship("p1", "c1", True)
+        handler.remove_member("c2", remove_orphaned_neighbors=True)
+
+    assert _snapshot(compact_graph_handler) == _snapshot(graph_handler)
+    assert not compact_graph_handler.has_member("x")
+    assert compact_graph_handler.get_children("p1") == []
+    assert compact_graph_handler.get_spouses("p2") == ["p1"]
+    assert _family_unit_members(compact_graph_handler) == _family_unit_members(
+        graph_handler
+    )
+
+
+def test_graph_view_nodes_write_through(compact_graph_handler):
+    """Tests that flags set through the NetworkX view are kept by the store."""
+    _add_members(compact_graph_handler, "p1")
+    node_obj = compact_graph_handler.get_family_graph().nodes["p1"]["data"]
+    assert isinstance(node_obj, CompactNode)
+
+    node_obj.is_poi = True
+    node_obj.has_visible_children = True
+
+    assert compact_graph_handler._get_node("p1").is_poi is True
+    assert compact_graph_handler._get_node("p1").has_visible_children is True
+    assert compact_graph_handler._get_node("p1").has_visible_parents is None
+
+
+def test_compact_keeps_edges_and_order(compact_graph_handler, weasley_family_tree_pb):
+    """Tests that folding edits into the CSR arrays keeps every edge in order."""
+    compact_graph_handler.create_from_proto(weasley_family_tree_pb)
+    _add_members(compact_graph_handler, "NEW1")
+    compact_graph_handler.add_child_relation("ARTHW", "NEW1")
+    compact_graph_handler.remove_relationship("ARTHW", "BILLW", False)
+    children_before = compact_graph_handler.get_children("ARTHW")
+    snapshot_before = _snapshot(compact_graph_handler)
+
+    compact_graph_handler.compact()
+
+    assert compact_graph_handler._added_edge_count == 0
+    assert not compact_graph_handler._removed_edges
+    assert compact_graph_handler.get_children("ARTHW") == children_before
+    assert children_before[-1] == "NEW1"
+    assert _snapshot(compact_graph_handler) == snapshot_before
+
+
+def test_readded_member_does_not_keep_old_edges(compact_graph_handler):
+    """Tests that re-adding a removed member ID starts without relationships."""
+    _add_members(compact_graph_handler, "p1", "p2")
+    compact_graph_handler.add_spouse_relation("p1", "p2", add_to_family_unit=False)
+    compact_graph_handler.remove_member("p2", remove_orphaned_neighbors=False)
+    _add_members(compact_graph_handler, "p2")
+
+    assert compact_graph_handler.get_spouses("p1") == []
+    assert compact_graph_handler.get_family_graph().number_of_edges() == 0
+
+
+def test_errors_match_graph_handler(compact_graph_handler):
+    """Tests that missing members and edges raise the GraphHandler errors."""
+    _add_members(compact_graph_handler, "p1", "p2")
+
+    with pytest.raises(MemberNotFoundError):
+        compact_graph_handler.remove_member("UNKNOWN", False)
+    with pytest.raises(InvalidInputError):
+        compact_graph_handler.remove_relationship("p1", "p2", False)
+    with pytest.raises(InvalidInputError):
+        compact_graph_handler.add_child_relation("p1", "UNKNOWN")
+    with pytest.raises(nx.NetworkXError):
+        compact_graph_handler.get_children("UNKNOWN")
+    with pytest.raises(KeyError):
+        compact_graph_handler.get_member_info("UNKNOWN")
+
+
+def test_set_edge_attributes(compact_graph_handler, weasley_family_tree_pb):
+    """Tests that edge attributes are kept for the edge they are set on."""
+    compact_graph_handler.create_from_proto(weasley_family_tree_pb)
+
+    compact_graph_handler.set_edge_attributes("ARTHW", "BILLW", {"width": 3})
+
+    graph = compact_graph_handler.get_family_graph()
+    assert graph.edges["ARTHW", "BILLW"]["data"].attributes == {"width": 3}
+    assert graph.edges["MOLLW", "RONAW"]["data"].attributes == {}
+    with pytest.raises(InvalidInputError):
+        compact_graph_handler.set_edge_attributes("ARTHW", "UNKNOWN", {"width": 3})
+
+
+def test_lineage_queries(compact_graph_handler, weasley_family_tree_pb):
+    """Tests that the lineage index is kept in sync by the compact backend."""
+    compact_graph_handler.create_from_proto(weasley_family_tree_pb)
+    assert compact_graph_handler.is_ancestor("ARTHW", "RONAW")
+
+    compact_graph_handler.remove_relationship("ARTHW", "RONAW", True)
+    assert not compact_graph_handler.is_ancestor("ARTHW", "RONAW")
+
+    compact_graph_handler.add_parent_relation("RONAW", "ARTHW")
+    assert compact_graph_handler.is_ancestor("ARTHW", "RONAW")
+    assert compact_graph_handler.count_descendants(
+        "ARTHW"
+    ) == compact_graph_handler.count_descendants("MOLLW")
+
+
+def test_ego_graph_matches_graph_handler(compact_graph_handler, weasley_family_tree_pb):
+    """Tests that both backends build the same ego graph."""
+    graph_handler = GraphHandler()
+    graph_handler.create_from_proto(weasley_family_tree_pb)
+    compact_graph_handler.create_from_proto(weasley_family_tree_pb)
+
+    compact_ego_graph = compact_graph_handler.get_ego_graph("BILLW", 1)
+    ego_graph = graph_handler.get_ego_graph("BILLW", 1)
+
+    assert set(compact_ego_graph.nodes) == set(ego_graph.nodes)
+    assert {
+        (u, v, data["data"].edge_type) for u, v, data in compact_ego_graph.edges(data=True)
+    } == {(u, v, data["data"].edge_type) for u, v, data in ego_graph.edges(data=True)}
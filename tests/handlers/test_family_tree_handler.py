@@ -1,27 +1,38 @@
+import datetime
+import os
 import re
+import threading
 from unittest.mock import MagicMock
 
 import pytest
 from pydantic import ValidationError
 
-from familytree.exceptions import InvalidInputError, MemberNotFoundError
+from familytree.exceptions import (
+    InvalidInputError,
+    MemberNotFoundError,
+    OperationError,
+)
 from familytree.handlers.chat_handler import ChatHandler
 from familytree.handlers.family_tree_handler import FamilyTreeHandler
 from familytree.handlers.graph_handler import GraphHandler
 from familytree.handlers.proto_handler import ProtoHandler
+from familytree.indexes.visibility_index import RelativeGroup
 from familytree.models.base_model import OK_STATUS
 from familytree.models.manage_model import (
     AddFamilyMemberRequest,
     AddFamilyMemberResponse,
     AddRelationshipRequest,
+    BatchRequest,
     DeleteFamilyMemberRequest,
     DeleteRelationshipRequest,
     LoadFamilyRequest,
     LoadFamilyResponse,
     UpdateFamilyMemberRequest,
 )
-from familytree.proto import family_tree_pb2
+from familytree.proto import family_tree_pb2, utils_pb2
+from familytree.utils import tree_log
 from familytree.utils.graph_types import EdgeType, GraphNode
+from familytree.utils.tamil_calendar import get_tamil_calendar
 
 MEMBER_ID_PATTERN = r"^F[A-Z0-9]{3}-M[A-Z0-9]{3}-B[A-Z0-9]{3}-R[A-Z0-9]{3}$"
 
@@ -521,6 +532,92 @@ def test_save_family_tree(weasley_family_tree_textproto):
     assert response.family_tree_txtpb == weasley_family_tree_textproto
 
 
+def test_save_after_edits_writes_only_changes(loaded_handler, monkeypatch):
+    """Tests that saves after a load copy the edits without a full sync."""
+    handler = loaded_handler
+    full_syncs = MagicMock(wraps=handler.proto_handler.update_from_nx_graph)
+    monkeypatch.setattr(handler.proto_handler, "update_from_nx_graph", full_syncs)
+
+    handler.update_family_member(
+        UpdateFamilyMemberRequest(member_id="RONAW", updated_member_data={"name": "Ron"})
+    )
+    handler.save_family_tree(visible_only=False)
+    handler.add_family_member(
+        AddFamilyMemberRequest(
+            new_member_data={"name": "Rose Weasley", "gender": utils_pb2.FEMALE},
+            source_family_member_id="RONAW",
+            relationship_type=EdgeType.PARENT_TO_CHILD,
+            infer_relationships=False,
+        )
+    )
+    response = handler.save_family_tree(visible_only=False)
+
+    full_syncs.assert_not_called()
+    saved = FamilyTreeHandler()
+    saved.load_family_tree(
+        LoadFamilyRequest(filename="saved.txtpb", content=response.family_tree_txtpb)
+    )
+    family_tree = saved.proto_handler.get_family_tree()
+    assert family_tree.members["RONAW"].name == "Ron"
+    (rose_id,) = [
+        member_id
+        for member_id, member in family_tree.members.items()
+        if member.name == "Rose Weasley"
+    ]
+    assert rose_id in family_tree.relationships["RONAW"].children_ids
+
+
+def test_add_and_delete_cycles_keep_saves_flat(
+    loaded_handler, weasley_family_tree_textproto, monkeypatch
+):
+    """Tests that deleted members leave the saved tree and each save stays small."""
+    handler = loaded_handler
+    synced_changes = []
+    update_from_graph_changes = handler.proto_handler.update_from_graph_changes
+
+    def record_changes(graph_handler, changes):
+        synced_changes.append(changes)
+        update_from_graph_changes(graph_handler, changes)
+
+    monkeypatch.setattr(
+        handler.proto_handler, "update_from_graph_changes", record_changes
+    )
+
+    saved = []
+    for cycle in range(10):
+        response = handler.add_family_member(
+            AddFamilyMemberRequest(
+                new_member_data={"name": f"Child {cycle}"},
+                source_family_member_id="RONAW",
+                relationship_type=EdgeType.PARENT_TO_CHILD,
+                infer_relationships=False,
+            )
+        )
+        added = handler.save_family_tree(visible_only=False).family_tree_txtpb
+        assert f"Child {cycle}" in added
+        handler.delete_family_member(
+            DeleteFamilyMemberRequest(member_id=response.new_member_id)
+        )
+        saved.append(handler.save_family_tree(visible_only=False).family_tree_txtpb)
+        assert f"Child {cycle}" not in saved[-1]
+
+    # The first child gave Ron a family unit of his own, which stays. After
+    # that, every cycle saves the same tree.
+    assert saved[0] != weasley_family_tree_textproto
+    assert saved == [saved[0]] * 10
+    # Each save synced only the members the cycle touched.
+    assert len(synced_changes) == 20
+    assert max(len(changes.member_ids) for changes in synced_changes) <= 2
+    assert max(len(changes.relationship_ids) for changes in synced_changes) <= 2
+
+    # Undoing a saved deletion puts the member back where it was.
+    handler.delete_family_member(DeleteFamilyMemberRequest(member_id="PERCW"))
+    assert "PERCW" not in handler.save_family_tree(visible_only=False).family_tree_txtpb
+    handler.undo()
+    response = handler.save_family_tree(visible_only=False)
+    assert response.family_tree_txtpb == saved[0]
+
+
 def test_add_relationship(loaded_handler):
     handler = loaded_handler
     # Add Fleur Delacour and connect her to Bill
@@ -607,6 +704,483 @@ def test_update_family_member(loaded_handler):
     assert "Ron" in updated_member_info["nicknames"]
 
 
+def test_snapshot_is_not_changed_by_later_writes(loaded_handler):
+    """Tests that a reader's snapshot keeps its state while the graph is changed."""
+    handler = loaded_handler
+    snapshot = handler.snapshot_graph()
+    assert handler.snapshot_graph() is snapshot
+
+    handler.update_family_member(
+        UpdateFamilyMemberRequest(member_id="RONAW", updated_member_data={"name": "Ron"})
+    )
+    handler.delete_family_member(DeleteFamilyMemberRequest(member_id="PERCW"))
+
+    assert snapshot.get_member("RONAW").name == "Ron Weasley"
+    assert snapshot.has_member("PERCW")
+    assert "PERCW" in snapshot.get_children("ARTHW")
+    # The next read publishes the changed graph.
+    assert handler.get_member_info("RONAW").member_info["name"] == "Ron"
+    assert not handler.snapshot_graph().has_member("PERCW")
+    assert handler.snapshot_graph() is not snapshot
+
+
+@pytest.mark.parametrize("load", [False, True])
+def test_read_during_first_write_sees_published_graph(
+    load, weasley_family_tree_textproto
+):
+    """Tests that a read during the first write after creation or a load works."""
+    handler = FamilyTreeHandler()
+    if load:
+        handler.load_family_tree(
+            LoadFamilyRequest(
+                filename="test.textpb", content=weasley_family_tree_textproto
+            )
+        )
+    results = []
+
+    def read():
+        results.append(handler.snapshot_graph())
+
+    with handler._writing_graph() as graph_handler:
+        graph_handler.add_member(
+            "NEWMB", family_tree_pb2.FamilyMember(id="NEWMB", name="New Member")
+        )
+        reader = threading.Thread(target=read)
+        reader.start()
+        reader.join(timeout=5)
+
+    assert len(results) == 1
+    snapshot = results[0]
+    assert snapshot is not None
+    assert snapshot is not handler.graph_handler
+    assert not snapshot.has_member("NEWMB")
+    assert snapshot.has_member("RONAW") == load
+    assert handler.snapshot_graph().has_member("NEWMB")
+
+
+def test_view_changes_do_not_wait_for_writes(loaded_handler):
+    """Tests that a view works on the snapshot while a write is in progress."""
+    handler = loaded_handler
+    session_id = handler.create_view_session("RONAW").session_id
+    responses = []
+
+    def expand():
+        responses.append(
+            handler.expand_relatives("RONAW", RelativeGroup.PARENTS, session_id)
+        )
+
+    with handler._writing_graph() as graph_handler:
+        graph_handler.remove_member("ARTHW", remove_orphaned_neighbors=False)
+        viewer = threading.Thread(target=expand)
+        viewer.start()
+        viewer.join(timeout=5)
+        assert not viewer.is_alive()
+
+    # The view saw the tree as it was before the write.
+    assert [node["id"] for node in responses[0].shown_nodes] == ["ARTHW", "MOLLW"]
+    # The session carries over to the written graph, and collapsing hides
+    # what the view was shown.
+    response = handler.collapse_relatives("RONAW", RelativeGroup.PARENTS, session_id)
+    assert sorted(response.hidden_node_ids) == ["ARTHW", "MOLLW"]
+    response = handler.expand_relatives("RONAW", RelativeGroup.PARENTS)
+    assert [node["id"] for node in response.shown_nodes] == ["RONAW", "MOLLW"]
+
+
+def test_reload_does_not_change_held_snapshot(
+    loaded_handler, weasley_family_tree_textproto
+):
+    """Tests that loading again leaves a snapshot from the first load as it was."""
+    handler = loaded_handler
+    snapshot = handler.snapshot_graph()
+
+    handler.load_family_tree(
+        LoadFamilyRequest(
+            filename="test.textpb",
+            content=weasley_family_tree_textproto.replace(
+                'name: "Ron Weasley"', 'name: "Ronald Weasley"'
+            ),
+        )
+    )
+
+    assert snapshot.get_member("RONAW").name == "Ron Weasley"
+    assert handler.get_member_info("RONAW").member_info["name"] == "Ronald Weasley"
+
+
+def test_write_after_load_does_not_change_protobuf(loaded_handler):
+    """Tests that a graph built from the loaded protobuf copies what it changes."""
+    handler = loaded_handler
+    handler.update_family_member(
+        UpdateFamilyMemberRequest(member_id="RONAW", updated_member_data={"name": "Ron"})
+    )
+
+    assert handler.proto_handler.get_family_tree().members["RONAW"].name == (
+        "Ron Weasley"
+    )
+    handler.save_family_tree(visible_only=False)
+    assert handler.proto_handler.get_family_tree().members["RONAW"].name == "Ron"
+
+
+def _edit_weasleys(handler):
+    """Makes a few kinds of edit, the last one undone."""
+    handler.update_family_member(
+        UpdateFamilyMemberRequest(member_id="RONAW", updated_member_data={"name": "Ron"})
+    )
+    handler.add_family_member(
+        AddFamilyMemberRequest(
+            new_member_data={"name": "Rose Weasley"},
+            source_family_member_id="RONAW",
+            relationship_type=EdgeType.PARENT_TO_CHILD,
+            infer_relationships=True,
+        )
+    )
+    handler.delete_family_member(DeleteFamilyMemberRequest(member_id="PERCW"))
+    handler.delete_family_member(DeleteFamilyMemberRequest(member_id="GINNW"))
+    handler.undo()
+
+
+def test_tree_log_replays_unsaved_edits(loaded_handler, tmp_path, monkeypatch):
+    """Tests that edits survive without a save and each one is a small append."""
+    handler = loaded_handler
+    handler.open_tree_log(str(tmp_path), replay=False, sync=False)
+    full_syncs = MagicMock(wraps=handler.proto_handler.update_from_nx_graph)
+    monkeypatch.setattr(handler.proto_handler, "update_from_nx_graph", full_syncs)
+    log_size = (tmp_path / "tree.log").stat().st_size
+
+    _edit_weasleys(handler)
+
+    assert 0 < (tmp_path / "tree.log").stat().st_size - log_size < 2000
+    full_syncs.assert_not_called()
+    expected = handler.save_family_tree(visible_only=False).family_tree_txtpb
+    assert "PERCW" not in expected
+    assert "GINNW" in expected
+
+    # The handler is dropped without closing the log, as in a crash.
+    replayed = FamilyTreeHandler()
+    replayed.open_tree_log(str(tmp_path), sync=False)
+    response = replayed.save_family_tree(visible_only=False)
+    assert response.family_tree_txtpb == expected
+    assert replayed.snapshot_graph().get_children("RONAW") == (
+        handler.snapshot_graph().get_children("RONAW")
+    )
+
+
+def test_tree_log_compacts_loads_and_large_logs(
+    loaded_handler, weasley_family_tree_textproto, tmp_path, monkeypatch
+):
+    """Tests that loads and logs larger than the snapshot start a new snapshot."""
+    handler = loaded_handler
+    handler.open_tree_log(str(tmp_path), sync=False)
+    # The empty directory was replayed as an empty tree.
+    assert not handler.snapshot_graph().has_member("RONAW")
+    handler.load_family_tree(
+        LoadFamilyRequest(filename="test.textpb", content=weasley_family_tree_textproto)
+    )
+    assert sorted(os.listdir(tmp_path)) == ["snapshot-2.binpb", "tree.log"]
+
+    monkeypatch.setattr(tree_log, "_MIN_COMPACTION_BYTES", 0)
+    handler.add_family_member(
+        AddFamilyMemberRequest(
+            new_member_data={"name": "Teddy Lupin"}, infer_relationships=False
+        )
+    )
+    handler.add_family_member(
+        AddFamilyMemberRequest(
+            new_member_data={"name": "Victoire Weasley"}, infer_relationships=False
+        )
+    )
+    assert sorted(os.listdir(tmp_path)) == ["snapshot-2.binpb", "tree.log"]
+    handler.update_family_member(
+        UpdateFamilyMemberRequest(
+            member_id="RONAW", updated_member_data={"name": "R" * 10_000}
+        )
+    )
+    assert sorted(os.listdir(tmp_path)) == ["snapshot-3.binpb", "tree.log"]
+    handler.close_tree_log()
+
+    replayed = FamilyTreeHandler()
+    replayed.open_tree_log(str(tmp_path), sync=False)
+    assert replayed.save_family_tree(visible_only=False) == handler.save_family_tree(
+        visible_only=False
+    )
+
+
+def test_undo_and_redo_add_family_member(loaded_handler):
+    """Tests that undo removes a new member with its relationships and family units."""
+    handler = loaded_handler
+    family_units = handler.snapshot_graph().get_family_unit_graph()
+    response = handler.add_family_member(
+        AddFamilyMemberRequest(
+            new_member_data={"name": "Rose Weasley"},
+            source_family_member_id="RONAW",
+            relationship_type=EdgeType.PARENT_TO_CHILD,
+            infer_relationships=True,
+        )
+    )
+    new_member_id = response.new_member_id
+    family_units_after = handler.snapshot_graph().get_family_unit_graph()
+    assert len(family_units_after) == len(family_units) + 1
+
+    response = handler.undo()
+    assert response.operation == "Add member Rose Weasley"
+    graph_handler = handler.snapshot_graph()
+    assert not graph_handler.has_member(new_member_id)
+    assert graph_handler.get_children("RONAW") == []
+    assert graph_handler.get_member("RONAW").acquired_family_unit_id == ""
+    assert graph_handler.get_family_unit_graph() == family_units
+
+    handler.redo()
+    graph_handler = handler.snapshot_graph()
+    assert graph_handler.get_member(new_member_id).name == "Rose Weasley"
+    assert graph_handler.get_children("RONAW") == [new_member_id]
+    with pytest.raises(OperationError):
+        handler.redo()
+
+
+def test_undo_with_nothing_to_undo(loaded_handler):
+    with pytest.raises(OperationError) as exc_info:
+        loaded_handler.undo()
+    assert exc_info.value.status_code == 409
+
+
+def test_failed_write_is_rolled_back(loaded_handler):
+    """Tests that a write that fails half way leaves the graph unchanged."""
+    handler = loaded_handler
+    with pytest.raises(InvalidInputError):
+        handler.add_family_member(
+            AddFamilyMemberRequest(
+                new_member_data={"name": "Nobody's child"},
+                source_family_member_id="UNKNOWN_ID",
+                relationship_type=EdgeType.CHILD_TO_PARENT,
+                infer_relationships=False,
+            )
+        )
+    graph_handler = handler.snapshot_graph()
+    assert len(list(graph_handler.iter_member_ids())) == 9
+    with pytest.raises(OperationError):
+        handler.undo()
+
+
+def test_apply_batch_with_refs_and_inference(loaded_handler):
+    """Tests a batch that adds a couple and a child using refs."""
+    handler = loaded_handler
+    request = BatchRequest.model_validate(
+        {
+            "operations": [
+                {
+                    "op": "add_family_member",
+                    "ref": "hermione",
+                    "new_member_data": {"name": "Hermione Granger"},
+                    "source_family_member_id": "RONAW",
+                    "relationship_type": "SPOUSE",
+                    "infer_relationships": False,
+                },
+                {
+                    "op": "add_family_member",
+                    "ref": "rose",
+                    "new_member_data": {"name": "Rose"},
+                    "source_family_member_id": "RONAW",
+                    "relationship_type": "PARENT_TO_CHILD",
+                    "infer_relationships": True,
+                },
+                {
+                    "op": "update_family_member",
+                    "member_id": "rose",
+                    "updated_member_data": {"name": "Rose Weasley"},
+                },
+            ]
+        }
+    )
+
+    response = handler.apply_batch(request)
+
+    assert response.status == OK_STATUS
+    assert response.message == "3 operations applied successfully."
+    hermione_id = response.member_refs["hermione"]
+    rose_id = response.member_refs["rose"]
+    assert response.new_member_ids == [hermione_id, rose_id]
+    graph_handler = handler.snapshot_graph()
+    assert graph_handler.get_member(rose_id).name == "Rose Weasley"
+    assert graph_handler.get_spouse("RONAW") == hermione_id
+    assert set(graph_handler.get_parents(rose_id)) == {"RONAW", hermione_id}
+
+    response = handler.undo()
+    assert response.operation == "Batch of 3 operations"
+    assert len(list(handler.snapshot_graph().iter_member_ids())) == 9
+
+
+def test_apply_batch_is_all_or_nothing(loaded_handler):
+    """Tests that a batch failing at its last operation changes nothing."""
+    handler = loaded_handler
+    request = BatchRequest.model_validate(
+        {
+            "operations": [
+                {
+                    "op": "add_family_member",
+                    "ref": "rose",
+                    "new_member_data": {"name": "Rose Weasley"},
+                    "source_family_member_id": "RONAW",
+                    "relationship_type": "PARENT_TO_CHILD",
+                    "infer_relationships": False,
+                },
+                {"op": "delete_family_member", "member_id": "PERCW"},
+                {
+                    "op": "delete_relationship",
+                    "source_member_id": "rose",
+                    "target_member_id": "PERCW",
+                },
+            ]
+        }
+    )
+    with pytest.raises(MemberNotFoundError) as exc_info:
+        handler.apply_batch(request)
+    assert "batch operation 2" in exc_info.value.detail
+
+    request.operations[2].target_member_id = "GINNW"
+    with pytest.raises(InvalidInputError):
+        handler.apply_batch(request)
+
+    graph_handler = handler.snapshot_graph()
+    assert len(list(graph_handler.iter_member_ids())) == 9
+    assert graph_handler.get_children("RONAW") == []
+    with pytest.raises(OperationError):
+        handler.undo()
+
+
+def test_apply_batch_rejects_reused_ref(loaded_handler):
+    request = BatchRequest.model_validate(
+        {
+            "operations": [
+                {
+                    "op": "add_family_member",
+                    "ref": "RONAW",
+                    "new_member_data": {"name": "Ron's namesake"},
+                    "infer_relationships": False,
+                }
+            ]
+        }
+    )
+    with pytest.raises(InvalidInputError):
+        loaded_handler.apply_batch(request)
+
+
+def test_apply_batch_validates_orphaned_neighbors(loaded_handler, monkeypatch):
+    """Tests that members a batch deletes as orphaned neighbors are found up front."""
+    handler = loaded_handler
+    applied = MagicMock(wraps=handler._apply_batch_operation)
+    monkeypatch.setattr(handler, "_apply_batch_operation", applied)
+    operations = [
+        {
+            "op": "add_family_member",
+            "ref": "rose",
+            "new_member_data": {"name": "Rose Weasley"},
+            "source_family_member_id": "RONAW",
+            "relationship_type": "PARENT_TO_CHILD",
+            "infer_relationships": False,
+        },
+        {"op": "delete_family_member", "member_id": "RONAW"},
+        {
+            "op": "update_family_member",
+            "member_id": "rose",
+            "updated_member_data": {"name": "Rose Granger-Weasley"},
+        },
+    ]
+
+    operations[1]["remove_orphaned_neighbors"] = True
+    with pytest.raises(MemberNotFoundError) as exc_info:
+        handler.apply_batch(BatchRequest.model_validate({"operations": operations}))
+    assert "batch operation 2" in exc_info.value.detail
+    applied.assert_not_called()
+
+    operations[1]["remove_orphaned_neighbors"] = False
+    response = handler.apply_batch(
+        BatchRequest.model_validate({"operations": operations})
+    )
+    rose_id = response.member_refs["rose"]
+    assert handler.snapshot_graph().get_member(rose_id).name == "Rose Granger-Weasley"
+
+
+def test_apply_batch_wraps_apply_errors(loaded_handler, monkeypatch):
+    """Tests that an error while applying a valid batch names the operation."""
+    handler = loaded_handler
+
+    def fail(graph_handler, member_id, member):
+        raise InvalidInputError(
+            operation="update_family_member", field=None, description="Rejected."
+        )
+
+    monkeypatch.setattr(GraphHandler, "update_family_member", fail)
+    request = BatchRequest.model_validate(
+        {
+            "operations": [
+                {
+                    "op": "update_family_member",
+                    "member_id": "RONAW",
+                    "updated_member_data": {"name": "Ron"},
+                }
+            ]
+        }
+    )
+    with pytest.raises(OperationError) as exc_info:
+        handler.apply_batch(request)
+    assert exc_info.value.operation == "batch operation 0 (update_family_member)"
+    assert exc_info.value.status_code == 400
+    assert "Rejected." in exc_info.value.reason
+
+
+def test_fill_traditional_dates(loaded_handler):
+    """Tests that empty traditional dates are filled in one undoable operation."""
+    handler = loaded_handler
+    tamil_calendar = get_tamil_calendar()
+
+    response = handler.fill_traditional_dates()
+
+    # Every member has a date of birth and Fred a date of death; Ginny's
+    # traditional date of birth was already set.
+    assert response.filled_count == 9
+    graph_handler = handler.snapshot_graph()
+    assert graph_handler.get_member(
+        "RONAW"
+    ).traditional_date_of_birth == tamil_calendar.traditional_date(
+        datetime.date(1980, 3, 1)
+    )
+    assert graph_handler.get_member(
+        "FREDW"
+    ).traditional_date_of_death == tamil_calendar.traditional_date(
+        datetime.date(1998, 5, 2)
+    )
+    ginny = graph_handler.get_member("GINNW")
+    assert ginny.traditional_date_of_birth.star == utils_pb2.ASHWINI
+    assert ginny.traditional_date_of_birth.thithi == utils_pb2.THITHI_UNKNOWN
+    assert handler.fill_traditional_dates().filled_count == 0
+    assert handler.fill_traditional_dates(overwrite=True).filled_count == 10
+
+    handler.undo()
+    handler.undo()
+    assert not handler.snapshot_graph().get_member(
+        "RONAW"
+    ).HasField("traditional_date_of_birth")
+
+
+def test_fill_traditional_dates_skips_unsupported_years(loaded_handler):
+    """Tests that dates past the years of the Tamil calendar are left unfilled."""
+    handler = loaded_handler
+    handler.update_family_member(
+        UpdateFamilyMemberRequest(
+            member_id="RONAW",
+            updated_member_data={
+                "date_of_birth": {"year": 9999, "month": 12, "date": 31}
+            },
+        )
+    )
+
+    response = handler.fill_traditional_dates()
+
+    assert response.filled_count == 8
+    assert not handler.snapshot_graph().get_member(
+        "RONAW"
+    ).HasField("traditional_date_of_birth")
+
+
 def test_get_member_info(loaded_handler):
     handler = loaded_handler
     member_id = "GINNW"
@@ -638,6 +1212,9 @@ def test_delete_family_member(loaded_handler):
     assert response.status == OK_STATUS
     assert response.message == "Member deleted successfully."
 
+    # The write went to a copy of the published graph.
+    assert graph.has_node(member_id_to_delete)
+    graph = handler.graph_handler.get_family_graph()
     assert not graph.has_node(member_id_to_delete)
     # Check that edges are also removed
     assert not graph.has_edge("ARTHW", member_id_to_delete)
@@ -663,6 +1240,7 @@ def test_delete_family_member_with_orphaned_neighbors(loaded_handler):
     )
     handler.delete_family_member(request)
 
+    graph = handler.graph_handler.get_family_graph()
     assert not graph.has_node(percy_id)
     assert not graph.has_node(audrey_id)  # Audrey is an orphan and should be removed.
 
@@ -685,6 +1263,7 @@ def test_delete_relationship(loaded_handler):
     assert response.status == OK_STATUS
     assert response.message == "Relationship deleted successfully."
 
+    graph = handler.graph_handler.get_family_graph()
     assert not graph.has_edge(source_id, target_id)
     assert graph.has_edge(target_id, source_id)  # Inverse should still exist
 
@@ -707,5 +1286,6 @@ def test_delete_relationship_with_inverse(loaded_handler):
 
     assert response.status == OK_STATUS
 
+    graph = handler.graph_handler.get_family_graph()
     assert not graph.has_edge(source_id, target_id)
     assert not graph.has_edge(target_id, source_id)
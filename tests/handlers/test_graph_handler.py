@@ -1,3 +1,6 @@
+import io
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import MagicMock, patch
 
 import networkx as nx
@@ -5,8 +8,18 @@ import pytest
 from familytree.proto import family_tree_pb2, utils_pb2
 
 from familytree.exceptions import InvalidInputError, MemberNotFoundError
+from familytree.handlers import graph_handler as graph_handler_module
+from familytree.handlers.compact_graph_handler import CompactGraphHandler
 from familytree.handlers.graph_handler import GraphHandler
 from familytree.utils.graph_types import EdgeType, GraphEdge, GraphNode
+from familytree.utils.kinship_utils import KinshipStep
+from familytree.utils.tree_stream import (
+    RecordKind,
+    TreeRecord,
+    read_tree_stream,
+    tree_records,
+    write_tree_stream,
+)
 
 
 @pytest.fixture
@@ -254,6 +267,112 @@ def test_create_from_proto_missing_node_in_relationships(graph_handler_instance)
     assert "Source ID 'M_GHOST' not found in graph nodes." in str(excinfo.value)
 
 
+def test_create_from_proto_reports_all_dangling_references(graph_handler_instance):
+    """Tests that every dangling member reference is reported in one error."""
+    ft_proto = family_tree_pb2.FamilyTree()
+    ft_proto.members["M001"].id = "M001"
+    ft_proto.relationships["M001"].children_ids.append("C_GHOST")
+    ft_proto.relationships["M001"].spouse_ids.append("S_GHOST")
+    ft_proto.relationships["M_GHOST"].parent_ids.append("M001")
+
+    with pytest.raises(InvalidInputError) as excinfo:
+        graph_handler_instance.create_from_proto(ft_proto)
+    assert "Found 3 dangling member reference(s)" in str(excinfo.value)
+    assert "Child ID 'C_GHOST' not found in graph nodes." in str(excinfo.value)
+    assert "Spouse ID 'S_GHOST' not found in graph nodes." in str(excinfo.value)
+    assert "Source ID 'M_GHOST' not found in graph nodes." in str(excinfo.value)
+    assert len(graph_handler_instance._graph.nodes) == 0
+
+
+def test_create_from_proto_matches_incremental_build(
+    graph_handler_instance, weasley_family_tree_pb
+):
+    """Tests that the bulk build produces the same graph as per-item additions."""
+    graph_handler_instance.create_from_proto(weasley_family_tree_pb)
+
+    incremental_handler = GraphHandler()
+    for member_id, member_data in weasley_family_tree_pb.members.items():
+        incremental_handler.add_member(member_id, member_data)
+    for source_id, relationships in weasley_family_tree_pb.relationships.items():
+        for child_id in relationships.children_ids:
+            incremental_handler.add_child_relation(source_id, child_id, False)
+        for spouse_id in relationships.spouse_ids:
+            incremental_handler.add_spouse_relation(source_id, spouse_id, False)
+        for parent_id in relationships.parent_ids:
+            incremental_handler.add_parent_relation(source_id, parent_id, False)
+
+    bulk_graph = graph_handler_instance._graph
+    incremental_graph = incremental_handler._graph
+    assert set(bulk_graph.edges) == set(incremental_graph.edges)
+    for source_id, target_id in bulk_graph.edges:
+        bulk_edge = bulk_graph.edges[source_id, target_id]["data"]
+        incremental_edge = incremental_graph.edges[source_id, target_id]["data"]
+        assert bulk_edge.edge_type == incremental_edge.edge_type
+        assert bulk_edge.is_rendered == incremental_edge.is_rendered
+    for member_id in bulk_graph.nodes:
+        bulk_node = bulk_graph.nodes[member_id]["data"]
+        incremental_node = incremental_graph.nodes[member_id]["data"]
+        assert bulk_node.has_visible_children == incremental_node.has_visible_children
+        assert bulk_node.has_visible_spouse == incremental_node.has_visible_spouse
+        assert bulk_node.has_visible_parents == incremental_node.has_visible_parents
+        assert graph_handler_instance.get_children(
+            member_id
+        ) == incremental_handler.get_children(member_id)
+
+
+@pytest.mark.parametrize("handler_type", [GraphHandler, CompactGraphHandler])
+def test_create_from_records_matches_create_from_proto(
+    handler_type, weasley_family_tree_pb
+):
+    """Tests that building from stream records gives the same graph as a proto."""
+    proto_handler = handler_type()
+    proto_handler.create_from_proto(weasley_family_tree_pb)
+    stream = io.BytesIO()
+    write_tree_stream(tree_records(weasley_family_tree_pb), stream)
+    stream.seek(0)
+
+    records_handler = handler_type()
+    records_handler.create_from_records(read_tree_stream(stream, chunk_size=64))
+
+    proto_graph = proto_handler.get_family_graph()
+    records_graph = records_handler.get_family_graph()
+    assert set(records_graph.nodes) == set(proto_graph.nodes)
+    assert set(records_graph.edges) == set(proto_graph.edges)
+    for source_id, target_id in proto_graph.edges:
+        proto_edge = proto_graph.edges[source_id, target_id]["data"]
+        records_edge = records_graph.edges[source_id, target_id]["data"]
+        assert records_edge.edge_type == proto_edge.edge_type
+        assert records_edge.is_rendered == proto_edge.is_rendered
+    for member_id in proto_graph.nodes:
+        proto_node = proto_graph.nodes[member_id]["data"]
+        records_node = records_graph.nodes[member_id]["data"]
+        assert records_node.attributes == proto_node.attributes
+        assert records_node.has_visible_children == proto_node.has_visible_children
+        assert records_node.has_visible_spouse == proto_node.has_visible_spouse
+        assert records_node.has_visible_parents == proto_node.has_visible_parents
+        assert records_handler.get_member_family_unit_ids(
+            member_id
+        ) == proto_handler.get_member_family_unit_ids(member_id)
+    assert records_handler.get_family_unit_graph() == dict(
+        weasley_family_tree_pb.family_units
+    )
+
+
+def test_create_from_records_reports_dangling_references(graph_handler_instance):
+    """Tests that relationships to members not read before them are reported."""
+    member = family_tree_pb2.FamilyMember(id="M001")
+    relationships = family_tree_pb2.Relationships(children_ids=["M002"])
+    records = [
+        TreeRecord(RecordKind.MEMBER, "M001", member),
+        TreeRecord(RecordKind.RELATIONSHIPS, "M001", relationships),
+        TreeRecord(RecordKind.MEMBER, "M002", family_tree_pb2.FamilyMember()),
+    ]
+
+    with pytest.raises(InvalidInputError) as excinfo:
+        graph_handler_instance.create_from_records(records)
+    assert "Child ID 'M002' not found in graph nodes." in str(excinfo.value)
+
+
 def _setup_node_with_visibility_flags(
     handler,
     node_id,
@@ -439,3 +558,440 @@ def test_update_family_member_not_found(graph_handler_instance):
         graph_handler_instance.update_family_member(
             "non_existent_node", family_tree_pb2.FamilyMember()
         )
+
+
+def test_get_parents_and_spouses(graph_handler_instance, weasley_family_tree_pb):
+    """Tests typed lookups that return every matching neighbor."""
+    graph_handler_instance.create_from_proto(weasley_family_tree_pb)
+
+    assert graph_handler_instance.get_parents("RONAW") == ["ARTHW", "MOLLW"]
+    assert graph_handler_instance.get_spouses("ARTHW") == ["MOLLW"]
+    assert graph_handler_instance.get_parents("ARTHW") == []
+    with pytest.raises(nx.NetworkXError):
+        graph_handler_instance.get_parents("non_existent_node")
+
+
+def test_typed_adjacency_after_remove_relationship(
+    graph_handler_instance, weasley_family_tree_pb
+):
+    """Tests that removing an edge also removes it from typed lookups."""
+    graph_handler_instance.create_from_proto(weasley_family_tree_pb)
+
+    graph_handler_instance.remove_relationship("ARTHW", "RONAW", True)
+
+    assert "RONAW" not in graph_handler_instance.get_children("ARTHW")
+    assert graph_handler_instance.get_parents("RONAW") == ["MOLLW"]
+    assert "RONAW" in graph_handler_instance.get_children("MOLLW")
+
+
+def test_typed_adjacency_after_remove_member(
+    graph_handler_instance, weasley_family_tree_pb
+):
+    """Tests that removing a member drops it from its neighbors' typed lookups."""
+    graph_handler_instance.create_from_proto(weasley_family_tree_pb)
+
+    graph_handler_instance.remove_member("MOLLW", False)
+
+    assert graph_handler_instance.get_spouse("ARTHW") is None
+    assert graph_handler_instance.get_parents("GINNW") == ["ARTHW"]
+    with pytest.raises(nx.NetworkXError):
+        graph_handler_instance.get_children("MOLLW")
+
+
+def test_typed_adjacency_when_edge_type_changes(graph_handler_instance):
+    """Tests that re-adding an edge with a new type replaces the old typed entry."""
+    graph_handler_instance.add_member("p1", family_tree_pb2.FamilyMember(id="p1", name="p1"))
+    graph_handler_instance.add_member("p2", family_tree_pb2.FamilyMember(id="p2", name="p2"))
+    graph_handler_instance.add_spouse_relation("p1", "p2", add_to_family_unit=False)
+    graph_handler_instance.add_child_relation("p1", "p2", add_to_family_unit=False)
+
+    assert graph_handler_instance.get_spouse("p1") is None
+    assert graph_handler_instance.get_children("p1") == ["p2"]
+
+
+def test_get_member_family_unit_ids(graph_handler_instance, weasley_family_tree_pb):
+    """Tests the member to family unit reverse index built on load."""
+    graph_handler_instance.create_from_proto(weasley_family_tree_pb)
+
+    assert graph_handler_instance.get_member_family_unit_ids("ARTHW") == ["FUNT"]
+    assert graph_handler_instance.get_member_family_unit_ids("RONAW") == ["FUNT"]
+    assert graph_handler_instance.get_member_family_unit_ids("UNKNOWN") == []
+
+
+def test_remove_member_updates_family_units(
+    graph_handler_instance, weasley_family_tree_pb
+):
+    """Tests that removing members only edits their units and drops empty ones."""
+    graph_handler_instance.create_from_proto(weasley_family_tree_pb)
+    graph_handler_instance.add_member(
+        "HARRY", family_tree_pb2.FamilyMember(id="HARRY", name="Harry Potter")
+    )
+    graph_handler_instance.add_spouse_relation("HARRY", "GINNW")
+    harry_unit_id = graph_handler_instance._get_acquired_family_id("HARRY")
+    assert graph_handler_instance.get_member_family_unit_ids("GINNW") == sorted(
+        ["FUNT", harry_unit_id]
+    )
+
+    graph_handler_instance.remove_member("GINNW", False)
+    family_units = graph_handler_instance.get_family_unit_graph()
+    assert "GINNW" not in family_units["FUNT"].child_ids
+    assert list(family_units[harry_unit_id].parent_ids) == ["HARRY"]
+    assert graph_handler_instance.get_member_family_unit_ids("GINNW") == []
+
+    graph_handler_instance.remove_member("HARRY", False)
+    assert harry_unit_id not in graph_handler_instance.get_family_unit_graph()
+    assert "FUNT" in graph_handler_instance.get_family_unit_graph()
+
+
+def test_family_unit_name_is_not_rebuilt_when_adding_children(graph_handler_instance):
+    """Tests that adding children does not recompute the family unit name."""
+    graph_handler_instance.add_member("P1", family_tree_pb2.FamilyMember(id="P1", name="Parent"))
+    graph_handler_instance.add_member("C1", family_tree_pb2.FamilyMember(id="C1", name="Child1"))
+    graph_handler_instance.add_member("C2", family_tree_pb2.FamilyMember(id="C2", name="Child2"))
+    graph_handler_instance.add_child_relation("P1", "C1")
+    family_unit = list(graph_handler_instance.get_family_unit_graph().values())[0]
+    assert family_unit.name == "Parent's family"
+
+    with patch.object(graph_handler_instance, "get_member_info") as mock_member_info:
+        graph_handler_instance.add_child_relation("P1", "C2")
+    mock_member_info.assert_not_called()
+    assert graph_handler_instance._stale_family_unit_names == set()
+
+
+def test_family_unit_name_follows_parent_changes(graph_handler_instance):
+    """Tests that unit names are refreshed after parent additions, renames and removals."""
+    graph_handler_instance.add_member("S1", family_tree_pb2.FamilyMember(id="S1", name="Spouse1"))
+    graph_handler_instance.add_member("S2", family_tree_pb2.FamilyMember(id="S2", name="Spouse2"))
+    graph_handler_instance.add_member("C1", family_tree_pb2.FamilyMember(id="C1", name="Child"))
+    graph_handler_instance.add_spouse_relation("S1", "S2")
+    graph_handler_instance.add_child_relation("S1", "C1")
+    unit_id = graph_handler_instance._get_acquired_family_id("S1")
+    family_units = graph_handler_instance.get_family_unit_graph()
+    assert family_units[unit_id].name == "Spouse1's and Spouse2's family"
+
+    # Renaming a child does not touch the unit, renaming a parent does
+    graph_handler_instance.update_family_member(
+        "C1", family_tree_pb2.FamilyMember(name="Renamed Child")
+    )
+    assert graph_handler_instance._stale_family_unit_names == set()
+    graph_handler_instance.update_family_member(
+        "S2", family_tree_pb2.FamilyMember(name="Renamed")
+    )
+    assert unit_id in graph_handler_instance._stale_family_unit_names
+    family_units = graph_handler_instance.get_family_unit_graph()
+    assert family_units[unit_id].name == "Spouse1's and Renamed's family"
+
+    graph_handler_instance.remove_member("S1", False)
+    family_units = graph_handler_instance.get_family_unit_graph()
+    assert family_units[unit_id].name == "Renamed's family"
+
+
+def test_default_edges_are_shared(graph_handler_instance, weasley_family_tree_pb):
+    """Tests that edges without attributes share one immutable instance per kind."""
+    graph_handler_instance.create_from_proto(weasley_family_tree_pb)
+    graph = graph_handler_instance._graph
+
+    assert (
+        graph.edges["ARTHW", "BILLW"]["data"] is graph.edges["MOLLW", "RONAW"]["data"]
+    )
+    with pytest.raises(AttributeError):
+        graph.edges["ARTHW", "BILLW"]["data"].is_rendered = False
+
+
+def test_set_edge_attributes_copies_shared_edge(
+    graph_handler_instance, weasley_family_tree_pb
+):
+    """Tests that setting edge attributes only changes the edge it is set on."""
+    graph_handler_instance.create_from_proto(weasley_family_tree_pb)
+    graph = graph_handler_instance._graph
+
+    graph_handler_instance.set_edge_attributes("ARTHW", "BILLW", {"width": 3})
+    graph_handler_instance.set_edge_attributes("ARTHW", "BILLW", {"dashes": True})
+
+    edge_obj = graph.edges["ARTHW", "BILLW"]["data"]
+    assert edge_obj.edge_type == EdgeType.PARENT_TO_CHILD
+    assert edge_obj.is_rendered is True
+    assert edge_obj.attributes == {"width": 3, "dashes": True}
+    assert graph.edges["MOLLW", "RONAW"]["data"].attributes == {}
+    with pytest.raises(InvalidInputError):
+        graph_handler_instance.set_edge_attributes("ARTHW", "UNKNOWN", {"width": 3})
+
+
+def test_find_relationship_path(graph_handler_instance, weasley_family_tree_pb):
+    """Tests that the shortest kinship path prefers blood links to marriages."""
+    graph_handler_instance.create_from_proto(weasley_family_tree_pb)
+    graph_handler_instance.add_member(
+        "TEDDL", family_tree_pb2.FamilyMember(id="TEDDL", name="Teddy Lupin")
+    )
+
+    assert graph_handler_instance.find_relationship_path("RONAW", "RONAW") == []
+    assert graph_handler_instance.find_relationship_path("ARTHW", "MOLLW") == [
+        (KinshipStep.SPOUSE, "MOLLW")
+    ]
+    path = graph_handler_instance.find_relationship_path("RONAW", "GINNW")
+    assert [step for step, _ in path] == [KinshipStep.PARENT, KinshipStep.CHILD]
+    assert path[0][1] in ("ARTHW", "MOLLW")
+    assert graph_handler_instance.find_relationship_path("RONAW", "TEDDL") is None
+    with pytest.raises(MemberNotFoundError):
+        graph_handler_instance.find_relationship_path("RONAW", "UNKNOWN")
+
+
+def test_get_ego_graph(graph_handler_instance, weasley_family_tree_pb):
+    """Tests that the ego graph holds the members within `degree` hops."""
+    graph_handler_instance.create_from_proto(weasley_family_tree_pb)
+
+    ego_graph = graph_handler_instance.get_ego_graph("RONAW", 1)
+
+    assert set(ego_graph.nodes) == {"RONAW", "ARTHW", "MOLLW"}
+    assert ego_graph.nodes["RONAW"]["data"].is_poi is True
+    assert ego_graph.nodes["ARTHW"]["data"].is_poi is False
+    assert set(ego_graph.edges) == {
+        ("RONAW", "ARTHW"),
+        ("RONAW", "MOLLW"),
+        ("ARTHW", "RONAW"),
+        ("MOLLW", "RONAW"),
+        ("ARTHW", "MOLLW"),
+        ("MOLLW", "ARTHW"),
+    }
+    assert graph_handler_instance._get_node("RONAW").is_poi is False
+    assert len(graph_handler_instance.get_ego_graph("RONAW", 2)) == 9
+    assert list(graph_handler_instance.get_ego_graph("RONAW", 0).nodes) == ["RONAW"]
+    with pytest.raises(MemberNotFoundError):
+        graph_handler_instance.get_ego_graph("UNKNOWN", 1)
+    with pytest.raises(InvalidInputError):
+        graph_handler_instance.get_ego_graph("RONAW", -1)
+
+
+@pytest.mark.parametrize("handler_cls", [GraphHandler, CompactGraphHandler])
+def test_get_ego_graph_follows_one_way_links(handler_cls):
+    """Tests that a link recorded by an edge one way only is followed both ways."""
+    graph_handler = handler_cls()
+    for member_id in ("P", "C", "S"):
+        graph_handler.add_member(member_id, family_tree_pb2.FamilyMember(id=member_id))
+    graph_handler.add_child_relation("P", "C")
+    graph_handler.add_spouse_relation("S", "P")
+
+    assert set(graph_handler.get_ego_graph("C", 1).nodes) == {"C", "P"}
+    ego_graph = graph_handler.get_ego_graph("C", 2)
+    assert set(ego_graph.nodes) == {"C", "P", "S"}
+    assert set(ego_graph.edges) == {("P", "C"), ("S", "P")}
+
+
+def test_render_ego_graph_is_cached_until_graph_changes(
+    graph_handler_instance, weasley_family_tree_pb
+):
+    """Tests that ego graph renders are reused until the graph version changes."""
+    graph_handler_instance.create_from_proto(weasley_family_tree_pb)
+
+    with patch(
+        "familytree.handlers.graph_handler.PyvisRenderer.render_graph_to_html",
+        side_effect=["<html>1</html>", "<html>2</html>"],
+    ) as mock_render:
+        first = graph_handler_instance.render_ego_graph_to_html("RONAW", 1, "light")
+        second = graph_handler_instance.render_ego_graph_to_html("RONAW", 1, "light")
+        graph_handler_instance.remove_relationship("ARTHW", "RONAW", True)
+        third = graph_handler_instance.render_ego_graph_to_html("RONAW", 1, "light")
+
+    assert first == second == "<html>1</html>"
+    assert third == "<html>2</html>"
+    assert mock_render.call_count == 2
+
+
+def test_concurrent_renders_evict_safely(
+    graph_handler_instance, weasley_family_tree_pb, monkeypatch
+):
+    """Tests that two readers evicting from a full render cache at once both succeed."""
+    graph_handler_instance.create_from_proto(weasley_family_tree_pb)
+    monkeypatch.setattr(graph_handler_module, "_MAX_CACHED_EGO_GRAPHS", 1)
+    barrier = threading.Barrier(2)
+
+    class MeetingDict(dict):
+        """Holds the first reader that evicts an entry for the second."""
+
+        def __delitem__(self, key):
+            try:
+                barrier.wait(timeout=0.2)
+            except threading.BrokenBarrierError:
+                pass
+            super().__delitem__(key)
+
+    with patch(
+        "familytree.handlers.graph_handler.PyvisRenderer.render_graph_to_html",
+        return_value="<html></html>",
+    ):
+        graph_handler_instance.render_ego_graph_to_html("RONAW", 0, "light")
+        graph_handler_instance._ego_graph_html_cache = MeetingDict(
+            graph_handler_instance._ego_graph_html_cache
+        )
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            renders = [
+                executor.submit(
+                    graph_handler_instance.render_ego_graph_to_html, poi_id, 0, "light"
+                )
+                for poi_id in ("ARTHW", "GINNW")
+            ]
+            assert [render.result() for render in renders] == ["<html></html>"] * 2
+
+    assert len(graph_handler_instance._ego_graph_html_cache) == 1
+
+
+def _graph_state(graph_handler):
+    """Returns the members, parent links, edge attributes and family units."""
+    return (
+        {
+            member_id: graph_handler.get_member(member_id).name
+            for member_id in graph_handler.iter_member_ids()
+        },
+        {
+            member_id: sorted(graph_handler.get_children(member_id))
+            for member_id in graph_handler.iter_member_ids()
+        },
+        dict(graph_handler._get_edge("ARTHW", "RONAW").attributes),
+        sorted(
+            (unit.name, sorted(unit.child_ids))
+            for unit in graph_handler.get_family_unit_graph().values()
+        ),
+        graph_handler.count_descendants("ARTHW"),
+    )
+
+
+@pytest.mark.parametrize("handler_cls", [GraphHandler, CompactGraphHandler])
+def test_copy_is_independent(handler_cls, weasley_family_tree_pb):
+    """Tests that a copy and its original can be changed without affecting each other."""
+    original = handler_cls()
+    original.create_from_proto(weasley_family_tree_pb)
+    original_state = _graph_state(original)
+
+    graph_copy = original.copy()
+    assert _graph_state(graph_copy) == original_state
+    graph_copy.update_family_member(
+        "ARTHW", family_tree_pb2.FamilyMember(name="Arthur W.")
+    )
+    graph_copy.add_member(
+        "ROSEW", family_tree_pb2.FamilyMember(id="ROSEW", name="Rose Weasley")
+    )
+    graph_copy.add_child_relation("RONAW", "ROSEW")
+    graph_copy.add_parent_relation("ROSEW", "RONAW")
+    graph_copy.remove_member("GINNW", remove_orphaned_neighbors=False)
+    graph_copy.set_edge_attributes("ARTHW", "RONAW", {"color": "red"})
+    copy_state = _graph_state(graph_copy)
+
+    assert _graph_state(original) == original_state
+    assert copy_state[0]["ARTHW"] == "Arthur W."
+    assert "GINNW" not in copy_state[0]
+    assert copy_state[1]["RONAW"] == ["ROSEW"]
+    assert copy_state[2] == {"color": "red"}
+    assert copy_state[4] == original_state[4]
+
+    original.remove_relationship("ARTHW", "RONAW", True)
+    assert "RONAW" in graph_copy.get_children("ARTHW")
+    assert _graph_state(graph_copy) == copy_state
+
+
+@pytest.mark.parametrize("handler_cls", [GraphHandler, CompactGraphHandler])
+def test_changes_since_checkpoint(handler_cls, weasley_family_tree_pb):
+    """Tests that changes are collected back to a checkpoint, across copies."""
+    original = handler_cls()
+    original.create_from_proto(weasley_family_tree_pb)
+    loaded = original.checkpoint_changes()
+    assert original.changes_since(loaded).is_empty()
+    assert original.changes_since(None) is None
+
+    # A published graph is copied before it is changed, and the copy's
+    # changes are collected back to a checkpoint of the published graph.
+    writer = original.copy()
+    published = original.checkpoint_changes()
+    writer.update_family_member("RONAW", family_tree_pb2.FamilyMember(name="Ron"))
+    writer.add_member(
+        "ROSEW", family_tree_pb2.FamilyMember(id="ROSEW", name="Rose Weasley")
+    )
+    writer.add_child_relation("RONAW", "ROSEW")
+    changes = writer.changes_since(published)
+    assert changes.member_ids == {"RONAW", "ROSEW"}
+    assert changes.relationship_ids == {"RONAW"}
+    assert writer.changes_since(loaded).member_ids == {"RONAW", "ROSEW"}
+
+    # Changes made to a copy are not part of the original's history.
+    original.update_family_member("GINNW", family_tree_pb2.FamilyMember(name="Gin"))
+    assert writer.changes_since(original.checkpoint_changes()) is None
+
+    writer.remove_member("PERCW", remove_orphaned_neighbors=False)
+    changes = writer.changes_since(writer.checkpoint_changes())
+    assert changes.is_empty()
+    changes = writer.changes_since(published)
+    assert "PERCW" in changes.member_ids
+    assert {"PERCW", "ARTHW", "MOLLW"} <= changes.relationship_ids
+
+
+@pytest.mark.parametrize("handler_cls", [GraphHandler, CompactGraphHandler])
+def test_restore_operation_undoes_and_redoes(handler_cls, weasley_family_tree_pb):
+    """Tests that restoring a recorded operation undoes it, and its inverse redoes it."""
+    graph_handler = handler_cls()
+    graph_handler.create_from_proto(weasley_family_tree_pb)
+    original_state = _graph_state(graph_handler)
+
+    with graph_handler.record_operation("Delete member RONAW") as operation:
+        graph_handler.set_edge_attributes("ARTHW", "RONAW", {"color": "red"})
+        graph_handler.remove_member("RONAW", remove_orphaned_neighbors=False)
+    assert operation.family_units
+    changed_state = (
+        {
+            member_id: graph_handler.get_member(member_id).name
+            for member_id in graph_handler.iter_member_ids()
+        },
+        graph_handler.get_children("ARTHW"),
+    )
+
+    inverse = graph_handler.restore_operation(operation)
+    assert _graph_state(graph_handler) == original_state
+    assert graph_handler.get_parents("RONAW") == ["ARTHW", "MOLLW"]
+
+    graph_handler.restore_operation(inverse)
+    assert not graph_handler.has_member("RONAW")
+    assert "RONAW" not in graph_handler.get_family_unit_graph()[
+        graph_handler.get_member("ARTHW").acquired_family_unit_id
+    ].child_ids
+    assert (
+        {
+            member_id: graph_handler.get_member(member_id).name
+            for member_id in graph_handler.iter_member_ids()
+        },
+        graph_handler.get_children("ARTHW"),
+    ) == changed_state
+
+
+@pytest.mark.parametrize("handler_cls", [GraphHandler, CompactGraphHandler])
+def test_restore_operation_keeps_target_order(handler_cls, weasley_family_tree_pb):
+    """Tests that undoing a removal puts the member back in its parents' order."""
+    graph_handler = handler_cls()
+    graph_handler.create_from_proto(weasley_family_tree_pb)
+    children = graph_handler.get_children("ARTHW")
+    assert children.index("PERCW") < len(children) - 1
+
+    with graph_handler.record_operation("Delete member PERCW") as operation:
+        graph_handler.remove_member("PERCW", remove_orphaned_neighbors=False)
+    inverse = graph_handler.restore_operation(operation)
+    assert graph_handler.get_children("ARTHW") == children
+    assert graph_handler.get_children("MOLLW") == children
+
+    graph_handler.restore_operation(inverse)
+    assert graph_handler.get_children("ARTHW") == [
+        child_id for child_id in children if child_id != "PERCW"
+    ]
+
+
+def test_record_operation_rolls_back_on_error(
+    graph_handler_instance, weasley_family_tree_pb
+):
+    """Tests that changes made before an error in a recorded block are rolled back."""
+    graph_handler_instance.create_from_proto(weasley_family_tree_pb)
+    original_state = _graph_state(graph_handler_instance)
+
+    with pytest.raises(InvalidInputError):
+        with graph_handler_instance.record_operation("Add a child"):
+            graph_handler_instance.update_family_member(
+                "ARTHW", family_tree_pb2.FamilyMember(name="Arthur W.")
+            )
+            graph_handler_instance.add_child_relation("ARTHW", "UNKNOWN")
+
+    assert _graph_state(graph_handler_instance) == original_state
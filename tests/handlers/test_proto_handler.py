@@ -3,7 +3,9 @@ from unittest.mock import patch
 import networkx as nx
 import pytest
 from google.protobuf import text_format
+from google.protobuf.message import DecodeError
 
+from familytree.handlers.graph_handler import GraphHandler
 from familytree.handlers.proto_handler import ProtoHandler
 from familytree.proto import family_tree_pb2, utils_pb2
 from familytree.utils.graph_types import EdgeType, GraphEdge, GraphNode
@@ -112,6 +114,19 @@ def test_save_to_textproto(proto_handler_instance, family_tree_1):
     assert new_tree.members["1"].name == "John Smith"
 
 
+def test_binary_round_trip(proto_handler_instance, family_tree_1):
+    """Tests saving to and loading from the binary wire format."""
+    proto_handler_instance._family_tree = family_tree_1
+    saved_bytes = proto_handler_instance.save_to_binary()
+    assert saved_bytes == proto_handler_instance.save_to_binary()
+
+    loaded = ProtoHandler()
+    loaded.load_from_binary(saved_bytes)
+    assert loaded.get_family_tree() == family_tree_1
+    with pytest.raises(DecodeError):
+        loaded.load_from_binary(b"\x0a\xff")
+
+
 def test_update_from_nx_graph(proto_handler_instance, sample_nx_graph):
     """Tests updating the family tree from a NetworkX graph."""
     proto_handler_instance.update_from_nx_graph(sample_nx_graph, {})
@@ -129,6 +144,77 @@ def test_update_from_nx_graph_with_existing_members(
     assert proto_handler_instance._family_tree.members["1"].name == "John Smith"
 
 
+def test_update_from_graph_changes(proto_handler_instance, family_tree_1):
+    """Tests that only the changed members and relationships are written."""
+    graph_handler = GraphHandler()
+    graph_handler.create_from_proto(family_tree_1)
+    proto_handler_instance._family_tree.CopyFrom(family_tree_1)
+    checkpoint = graph_handler.checkpoint_changes()
+
+    graph_handler.add_member(
+        "3", family_tree_pb2.FamilyMember(id="3", name="Jim Smith")
+    )
+    graph_handler.add_child_relation("1", "3")
+    graph_handler.add_parent_relation("3", "1")
+    # An unsaved change outside the change set is left alone.
+    graph_handler.get_member("2").name = "Not saved"
+    changes = graph_handler.changes_since(checkpoint)
+    proto_handler_instance.update_from_graph_changes(graph_handler, changes)
+    # Saving the same changes again does not duplicate relationships.
+    proto_handler_instance.update_from_graph_changes(graph_handler, changes)
+
+    family_tree = proto_handler_instance._family_tree
+    assert family_tree.members["3"].name == "Jim Smith"
+    assert family_tree.members["2"].name == "Jane Smith"
+    assert list(family_tree.relationships["1"].children_ids) == ["3"]
+    assert list(family_tree.relationships["1"].spouse_ids) == ["2"]
+    assert list(family_tree.relationships["3"].parent_ids) == ["1"]
+    assert "2" not in family_tree.relationships or not (
+        family_tree.relationships["2"].children_ids
+    )
+
+
+def test_update_from_graph_changes_mirrors_deletions(
+    proto_handler_instance, family_tree_1
+):
+    """Tests that members and relationships removed from the graph are deleted."""
+    graph_handler = GraphHandler()
+    graph_handler.create_from_proto(family_tree_1)
+    proto_handler_instance._family_tree.CopyFrom(family_tree_1)
+    checkpoint = graph_handler.checkpoint_changes()
+
+    graph_handler.remove_member("2", remove_orphaned_neighbors=False)
+    proto_handler_instance.update_from_graph_changes(
+        graph_handler, graph_handler.changes_since(checkpoint)
+    )
+
+    family_tree = proto_handler_instance._family_tree
+    assert list(family_tree.members) == ["1"]
+    assert "2" not in family_tree.relationships
+    assert not family_tree.relationships["1"].spouse_ids
+
+
+def test_update_from_nx_graph_reconcile(proto_handler_instance, sample_nx_graph):
+    """Tests that reconciling deletes what the graph does not have."""
+    family_tree = proto_handler_instance._family_tree
+    family_tree.members["9"].name = "Removed"
+    family_tree.relationships["1"].children_ids.append("9")
+    family_tree.relationships["9"].parent_ids.append("1")
+    family_tree.family_units["u9"].name = "Removed unit"
+
+    proto_handler_instance.update_from_nx_graph(sample_nx_graph, {})
+    assert "9" in family_tree.members
+    proto_handler_instance.update_from_nx_graph(
+        sample_nx_graph, {}, reconcile=True
+    )
+
+    assert "9" not in family_tree.members
+    assert "9" not in family_tree.relationships
+    assert not family_tree.relationships["1"].children_ids
+    assert "2" in family_tree.relationships["1"].spouse_ids
+    assert not family_tree.family_units
+
+
 def test_update_missing_relationships(proto_handler_instance):
     """Tests adding parent-child relationships."""
     graph = nx.DiGraph()
@@ -0,0 +1,80 @@
+import pytest
+from familytree.proto import family_tree_pb2
+
+from familytree.exceptions import MemberNotFoundError
+from familytree.handlers.graph_handler import GraphHandler
+from familytree.indexes.ancestry_index import AncestryIndex, CommonAncestor
+
+
+@pytest.fixture
+def graph_handler_instance():
+    """
+    Provides a GraphHandler with three generations below one couple:
+
+             g1 + g2
+             |     |
+        s + p1     p2 + t
+            |        |
+            c1       c2
+            |
+            d1
+    """
+    graph_handler = GraphHandler()
+    for member_id in ("g1", "g2", "s", "p1", "p2", "t", "c1", "c2", "d1"):
+        graph_handler.add_member(
+            member_id, family_tree_pb2.FamilyMember(id=member_id, name=member_id)
+        )
+    for parent_id, child_id in (
+        ("g1", "p1"),
+        ("g2", "p1"),
+        ("g1", "p2"),
+        ("g2", "p2"),
+        ("s", "c1"),
+        ("p1", "c1"),
+        ("p2", "c2"),
+        ("t", "c2"),
+        ("c1", "d1"),
+    ):
+        graph_handler.add_child_relation(parent_id, child_id, add_to_family_unit=False)
+    return graph_handler
+
+
+def test_lowest_common_ancestors(graph_handler_instance):
+    """Tests the shared ancestors and generation distances of member pairs."""
+    ancestry_index = AncestryIndex.from_graph_handler(graph_handler_instance)
+
+    # First cousins share both grandparents, two generations up from each.
+    assert ancestry_index.lowest_common_ancestors("c1", "c2") == [
+        CommonAncestor("g1", 2, 2),
+        CommonAncestor("g2", 2, 2),
+    ]
+    # First cousins once removed.
+    assert ancestry_index.lowest_common_ancestors("d1", "c2") == [
+        CommonAncestor("g1", 3, 2),
+        CommonAncestor("g2", 3, 2),
+    ]
+    # A direct ancestor is its own lowest common ancestor with a descendant.
+    assert ancestry_index.lowest_common_ancestors("p1", "d1") == [
+        CommonAncestor("p1", 0, 2)
+    ]
+    assert ancestry_index.lowest_common_ancestors("s", "t") == []
+    with pytest.raises(MemberNotFoundError):
+        ancestry_index.lowest_common_ancestors("c1", "UNKNOWN")
+
+
+def test_cached_ancestors_follow_edits(graph_handler_instance):
+    """Tests that changed parent links are seen by later queries."""
+    assert graph_handler_instance.find_common_ancestors([("d1", "c2")])[0][0] == (
+        CommonAncestor("g1", 3, 2)
+    )
+
+    graph_handler_instance.remove_relationship("p1", "c1", False)
+    graph_handler_instance.add_child_relation("p2", "c1", add_to_family_unit=False)
+
+    assert graph_handler_instance.find_common_ancestors(
+        [("d1", "c2"), ("c1", "c2")]
+    ) == [[CommonAncestor("p2", 2, 1)], [CommonAncestor("p2", 1, 1)]]
+
+    graph_handler_instance.remove_member("p2", remove_orphaned_neighbors=False)
+
+    assert graph_handler_instance.find_common_ancestors([("c1", "c2")]) == [[]]
@@ -0,0 +1,102 @@
+import pytest
+from familytree.proto import family_tree_pb2, utils_pb2
+
+from familytree.exceptions import InvalidInputError
+from familytree.handlers.graph_handler import GraphHandler
+from familytree.indexes.attribute_index import (
+    AttributeIndex,
+    ColumnFilter,
+    InfoFilter,
+)
+
+
+def _member(member_id, gender, birth_year, alive=None, star=0, **info):
+    member = family_tree_pb2.FamilyMember(
+        id=member_id, name=member_id, gender=gender, additional_info=info
+    )
+    member.date_of_birth.year = birth_year
+    member.traditional_date_of_birth.star = star
+    if alive is not None:
+        member.alive = alive
+    return member
+
+
+@pytest.fixture
+def graph_handler_instance():
+    """Provides a GraphHandler with members of varied attributes."""
+    graph_handler = GraphHandler()
+    for member in (
+        _member("amma", utils_pb2.FEMALE, 1945, True, utils_pb2.ROHINI, town="Madurai"),
+        _member("appa", utils_pb2.MALE, 1940, False, utils_pb2.ROHINI, town="Salem"),
+        _member("athai", utils_pb2.FEMALE, 1955, True, town="Salem"),
+        _member("paati", utils_pb2.FEMALE, 1920, False),
+        _member("kutty", utils_pb2.FEMALE, 1990),
+    ):
+        graph_handler.add_member(member.id, member)
+    return graph_handler
+
+
+def test_filter_combines_conditions(graph_handler_instance):
+    """Tests that every condition must hold and that unknown values match none."""
+    index = AttributeIndex.from_graph_handler(graph_handler_instance)
+    living_women = [
+        ColumnFilter("gender", values=[utils_pb2.FEMALE]),
+        ColumnFilter("alive", values=[1]),
+        ColumnFilter("birth_year", minimum=1940, maximum=1960),
+    ]
+
+    assert index.filter(living_women) == (2, ["amma", "athai"])
+    assert index.filter(living_women, limit=1) == (2, ["amma"])
+    assert index.filter([ColumnFilter("birth_star", values=[utils_pb2.ROHINI])]) == (
+        2,
+        ["amma", "appa"],
+    )
+    # Members whose alive field is not set match neither True nor False.
+    assert index.filter([ColumnFilter("alive", values=[0])]) == (
+        2,
+        ["appa", "paati"],
+    )
+    assert index.filter(info_filters=[InfoFilter("town")]) == (
+        3,
+        ["amma", "appa", "athai"],
+    )
+    assert index.filter(living_women, [InfoFilter("town", ["Salem"])]) == (
+        1,
+        ["athai"],
+    )
+    assert index.filter(info_filters=[InfoFilter("town", ["Chennai"])]) == (0, [])
+    assert index.filter(info_filters=[InfoFilter("village")]) == (0, [])
+    with pytest.raises(InvalidInputError):
+        index.filter([ColumnFilter("height", minimum=150)])
+
+
+def test_index_follows_member_changes(graph_handler_instance):
+    """Tests that the columns are kept current and that copies are independent."""
+    graph_handler = graph_handler_instance
+    born_1955 = [ColumnFilter("birth_year", values=[1955])]
+    assert graph_handler.filter_members(born_1955) == (1, ["athai"])
+    snapshot = graph_handler.copy()
+
+    graph_handler.update_family_member(
+        "athai", family_tree_pb2.FamilyMember(additional_info={"town": "Trichy"})
+    )
+    graph_handler.remove_member("amma", remove_orphaned_neighbors=False)
+    for number in range(2000):
+        member = _member(f"m{number}", utils_pb2.MALE, 1900 + number % 100)
+        graph_handler.add_member(member.id, member)
+
+    assert graph_handler.filter_members(born_1955, limit=3) == (
+        21,
+        ["athai", "m55", "m155"],
+    )
+    assert graph_handler.filter_members(
+        info_filters=[InfoFilter("town", ["Trichy"])]
+    ) == (1, ["athai"])
+    assert graph_handler.filter_members(
+        [ColumnFilter("gender", values=[utils_pb2.FEMALE])]
+    )[0] == 3
+    assert snapshot.filter_members(info_filters=[InfoFilter("town")]) == (
+        3,
+        ["amma", "appa", "athai"],
+    )
+    assert snapshot.filter_members(born_1955) == (1, ["athai"])
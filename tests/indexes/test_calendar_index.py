@@ -0,0 +1,109 @@
+import datetime
+
+import pytest
+from familytree.proto import family_tree_pb2, utils_pb2
+
+from familytree.exceptions import InvalidInputError
+from familytree.handlers.graph_handler import GraphHandler
+from familytree.indexes.calendar_index import (
+    CalendarEvent,
+    CalendarIndex,
+    EventKind,
+    StarDay,
+)
+
+BIRTHDAY = EventKind.BIRTHDAY
+ANNIVERSARY = EventKind.WEDDING_ANNIVERSARY
+CHITHIRAI = utils_pb2.CHITHIRAI
+
+
+def _member(member_id, birthday, wedding=None, tamil_month=0, star=0):
+    member = family_tree_pb2.FamilyMember(id=member_id, name=member_id)
+    dates = ((member.date_of_birth, birthday), (member.wedding_date, wedding))
+    for date, value in dates:
+        if value is not None:
+            date.year, date.month, date.date = value
+    member.traditional_date_of_birth.month = tamil_month
+    member.traditional_date_of_birth.star = star
+    return member
+
+
+@pytest.fixture
+def graph_handler_instance():
+    """Provides a GraphHandler with members born across the year."""
+    graph_handler = GraphHandler()
+    for member in (
+        _member("appa", (1950, 3, 10), (1975, 6, 1), CHITHIRAI, utils_pb2.ROHINI),
+        _member("amma", (1955, 12, 30), (1975, 6, 1), utils_pb2.THAI, utils_pb2.ROHINI),
+        _member("akka", (1980, 2, 29), None, CHITHIRAI, utils_pb2.ASHWINI),
+        _member("thambi", (0, 6, 1)),
+        _member("unknown", (1990, 0, 0), tamil_month=utils_pb2.THAI),
+    ):
+        graph_handler.add_member(member.id, member)
+    return graph_handler
+
+
+def test_find_events_wraps_around_the_year(graph_handler_instance):
+    """Tests next-N and range queries, including the year end and 29 February."""
+    calendar = CalendarIndex.from_graph_handler(graph_handler_instance)
+
+    assert calendar.find_events(datetime.date(2025, 12, 1), limit=3) == [
+        CalendarEvent(BIRTHDAY, "amma", datetime.date(2025, 12, 30), 1955),
+        CalendarEvent(BIRTHDAY, "akka", datetime.date(2026, 2, 28), 1980),
+        CalendarEvent(BIRTHDAY, "appa", datetime.date(2026, 3, 10), 1950),
+    ]
+    assert calendar.find_events(
+        datetime.date(2028, 2, 1), datetime.date(2028, 2, 29)
+    ) == [CalendarEvent(BIRTHDAY, "akka", datetime.date(2028, 2, 29), 1980)]
+    assert calendar.find_events(
+        datetime.date(2025, 6, 1), datetime.date(2025, 6, 30)
+    ) == [
+        CalendarEvent(BIRTHDAY, "thambi", datetime.date(2025, 6, 1), 0),
+        CalendarEvent(ANNIVERSARY, "amma", datetime.date(2025, 6, 1), 1975),
+        CalendarEvent(ANNIVERSARY, "appa", datetime.date(2025, 6, 1), 1975),
+    ]
+    assert [
+        event.member_id
+        for event in calendar.find_events(
+            datetime.date(2025, 6, 2), kinds=[ANNIVERSARY]
+        )
+    ] == ["amma", "appa"]
+    assert len(calendar.find_events(datetime.date(2025, 1, 1))) == 6
+    with pytest.raises(InvalidInputError):
+        calendar.find_events(datetime.date(2025, 1, 1), datetime.date(2026, 1, 1))
+    with pytest.raises(InvalidInputError):
+        calendar.find_events(datetime.date(2025, 1, 2), datetime.date(2025, 1, 1))
+
+    assert calendar.star_days(CHITHIRAI) == [
+        StarDay("akka", CHITHIRAI, utils_pb2.ASHWINI),
+        StarDay("appa", CHITHIRAI, utils_pb2.ROHINI),
+    ]
+    assert calendar.star_days(utils_pb2.THAI, utils_pb2.ROHINI) == [
+        StarDay("amma", utils_pb2.THAI, utils_pb2.ROHINI)
+    ]
+    assert calendar.star_days(utils_pb2.AADI) == []
+
+
+def test_index_follows_member_changes(graph_handler_instance):
+    """Tests that the calendar is kept current and that copies are independent."""
+    graph_handler = graph_handler_instance
+    new_year = datetime.date(2026, 1, 1)
+    assert graph_handler.find_events(new_year, limit=1)[0].member_id == "akka"
+    snapshot = graph_handler.copy()
+
+    changed = family_tree_pb2.FamilyMember()
+    changed.date_of_birth.month = 1
+    changed.date_of_birth.date = 5
+    graph_handler.update_family_member("thambi", changed)
+    graph_handler.remove_member("akka", remove_orphaned_neighbors=False)
+
+    assert [
+        event.member_id for event in graph_handler.find_events(new_year, limit=2)
+    ] == ["thambi", "appa"]
+    assert graph_handler.find_star_days(CHITHIRAI) == [
+        StarDay("appa", CHITHIRAI, utils_pb2.ROHINI)
+    ]
+    assert [
+        event.member_id for event in snapshot.find_events(new_year, limit=2)
+    ] == ["akka", "appa"]
+    assert len(snapshot.find_star_days(CHITHIRAI)) == 2
@@ -0,0 +1,138 @@
+import pytest
+from familytree.proto import family_tree_pb2
+
+from familytree.handlers.graph_handler import GraphHandler
+from familytree.indexes.consistency_index import (
+    ConsistencyIndex,
+    ViolationKind,
+    _date_bounds,
+)
+
+
+def _member(member_id, birth=(), death=()):
+    """Returns a member with a (year, month, day) date of birth and death."""
+    member = family_tree_pb2.FamilyMember(id=member_id, name=member_id)
+    for date, parts in ((member.date_of_birth, birth), (member.date_of_death, death)):
+        for field, part in zip(("year", "month", "date"), parts):
+            setattr(date, field, part)
+    return member
+
+
+def _link(graph_handler, parent_id, child_id):
+    graph_handler.add_child_relation(parent_id, child_id, add_to_family_unit=False)
+    graph_handler.add_parent_relation(child_id, parent_id, add_to_family_unit=False)
+
+
+def _keys(violations):
+    return [
+        (violation.kind, violation.member_id, violation.related_member_id)
+        for violation in violations
+    ]
+
+
+@pytest.fixture
+def graph_handler_instance():
+    """
+    Provides a GraphHandler with three consistent generations:
+
+        gp (1920) -> p (1950) -> c (1980)
+    """
+    graph_handler = GraphHandler()
+    graph_handler.add_member("gp", _member("gp", (1920, 5, 1), (1990, 1, 1)))
+    graph_handler.add_member("p", _member("p", (1950, 6, 15)))
+    graph_handler.add_member("c", _member("c", (1980,)))
+    _link(graph_handler, "gp", "p")
+    _link(graph_handler, "p", "c")
+    return graph_handler
+
+
+def test_date_bounds_of_partial_dates():
+    """Tests that a partial date stands for every day it could be."""
+    assert _date_bounds(_member("m", (2024, 2)).date_of_birth)[1].day == 29
+    assert _date_bounds(_member("m", (1980,)).date_of_birth)[0].month == 1
+    assert _date_bounds(_member("m").date_of_birth) is None
+    assert _date_bounds(_member("m", (2023, 2, 30)).date_of_birth) is None
+
+
+def test_audit_finds_date_violations(graph_handler_instance):
+    """Tests the member and link date checks of a full audit."""
+    graph_handler_instance.add_member(
+        "late", _member("late", (1992, 1, 1), (1991, 12, 31))
+    )
+    graph_handler_instance.add_member("early", _member("early", (1910,)))
+    _link(graph_handler_instance, "gp", "late")
+    _link(graph_handler_instance, "p", "early")
+
+    violations = ConsistencyIndex.from_graph_handler(
+        graph_handler_instance
+    ).violations()
+
+    # "late" was born within 300 days of gp's death and c's year of birth
+    # may be after p's birth.
+    assert _keys(violations) == [
+        (ViolationKind.BORN_BEFORE_PARENT, "early", "p"),
+        (ViolationKind.BORN_AFTER_PARENT_DEATH, "late", "gp"),
+        (ViolationKind.DEATH_BEFORE_BIRTH, "late", ""),
+    ]
+    assert "1910" in violations[0].description
+
+
+def test_updates_recheck_member_and_links(graph_handler_instance):
+    """Tests that a member update re-checks its own links."""
+    assert graph_handler_instance.find_violations() == []
+
+    graph_handler_instance.update_family_member(
+        "p", _member("p", (1981, 1, 1), (1970,))
+    )
+    assert _keys(graph_handler_instance.find_violations(["p"])) == [
+        (ViolationKind.BORN_AFTER_PARENT_DEATH, "c", "p"),
+        (ViolationKind.BORN_BEFORE_PARENT, "c", "p"),
+        (ViolationKind.DEATH_BEFORE_BIRTH, "p", ""),
+    ]
+    assert _keys(graph_handler_instance.find_violations(["gp"])) == []
+
+    graph_handler_instance.update_family_member("p", _member("p", (1949,), (2020,)))
+    assert graph_handler_instance.find_violations() == []
+    assert graph_handler_instance.audit_consistency() == []
+
+
+def test_cycles_are_found_and_cleared(graph_handler_instance):
+    """Tests that every link of a cycle is reported until the cycle is broken."""
+    graph_handler_instance.find_violations()
+    graph_handler_instance.add_member("x", _member("x"))
+    _link(graph_handler_instance, "c", "x")
+
+    graph_handler_instance.add_child_relation("x", "gp", add_to_family_unit=False)
+
+    # gp is now a child of x, which descends from gp.
+    incremental = graph_handler_instance.find_violations()
+    assert _keys(incremental) == [
+        (ViolationKind.ANCESTOR_CYCLE, "c", "p"),
+        (ViolationKind.ANCESTOR_CYCLE, "gp", "x"),
+        (ViolationKind.ANCESTOR_CYCLE, "p", "gp"),
+        (ViolationKind.ANCESTOR_CYCLE, "x", "c"),
+    ]
+    assert _keys(graph_handler_instance.audit_consistency()) == _keys(incremental)
+
+    snapshot = graph_handler_instance.copy()
+    snapshot.remove_relationship("x", "gp", False)
+    assert _keys(snapshot.find_violations()) == []
+    assert len(graph_handler_instance.find_violations()) == 4
+
+    graph_handler_instance.remove_member("x", remove_orphaned_neighbors=False)
+    assert graph_handler_instance.find_violations() == []
+
+
+def test_self_link_is_a_cycle(graph_handler_instance):
+    """Tests that a member who is their own parent is reported."""
+    graph_handler_instance.find_violations()
+
+    graph_handler_instance.add_child_relation("c", "c", add_to_family_unit=False)
+
+    # Only the year of birth is known, so c may not be born before itself.
+    assert _keys(graph_handler_instance.find_violations()) == [
+        (ViolationKind.ANCESTOR_CYCLE, "c", "c")
+    ]
+    assert _keys(graph_handler_instance.audit_consistency()) == [
+        (ViolationKind.ANCESTOR_CYCLE, "c", "c")
+    ]
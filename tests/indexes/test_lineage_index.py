@@ -0,0 +1,117 @@
+import pytest
+from familytree.proto import family_tree_pb2
+
+from familytree.exceptions import MemberNotFoundError
+from familytree.handlers.graph_handler import GraphHandler
+from familytree.indexes.lineage_index import LineageIndex, _merge
+
+
+@pytest.fixture
+def graph_handler_instance():
+    """
+    Provides a GraphHandler with two grandparent couples whose children marry:
+
+        g1 + g2      g3 + g4
+           |            |
+           p1    +     p2
+                 |
+             c1     c2
+    """
+    graph_handler = GraphHandler()
+    for member_id in ("g1", "g2", "g3", "g4", "p1", "p2", "c1", "c2"):
+        graph_handler.add_member(
+            member_id, family_tree_pb2.FamilyMember(id=member_id, name=member_id)
+        )
+    for parent_id, child_id in (
+        ("g1", "p1"),
+        ("g2", "p1"),
+        ("g3", "p2"),
+        ("g4", "p2"),
+        ("p1", "c1"),
+        ("p2", "c1"),
+        ("p1", "c2"),
+        ("p2", "c2"),
+    ):
+        graph_handler.add_child_relation(parent_id, child_id, add_to_family_unit=False)
+        graph_handler.add_parent_relation(child_id, parent_id, add_to_family_unit=False)
+    return graph_handler
+
+
+def test_merge_joins_touching_intervals():
+    """Tests that merged labels stay sorted and collapse adjacent intervals."""
+    assert _merge([(0, 2), (7, 7)], [(3, 4), (9, 10)]) == [(0, 4), (7, 7), (9, 10)]
+    assert _merge([(0, 5)], [(1, 2)]) == [(0, 5)]
+
+
+def test_build_from_graph_handler(graph_handler_instance):
+    """Tests ancestor checks and descendant counts through both parent lines."""
+    lineage_index = LineageIndex.from_graph_handler(graph_handler_instance)
+
+    assert lineage_index.is_ancestor("g1", "c1")
+    assert lineage_index.is_ancestor("g4", "c2")
+    assert not lineage_index.is_ancestor("c1", "g1")
+    assert not lineage_index.is_ancestor("p1", "p2")
+    assert not lineage_index.is_ancestor("c1", "c1")
+    assert lineage_index.count_descendants("g1") == 3
+    assert lineage_index.count_descendants("g3") == 3
+    assert lineage_index.count_descendants("c1") == 0
+
+
+def test_links_from_either_edge_direction(graph_handler_instance):
+    """Tests that a link stays while either of its two edges is left."""
+    graph_handler_instance.count_descendants("g1")
+
+    graph_handler_instance.remove_relationship("p1", "c1", False)
+    assert graph_handler_instance.is_ancestor("g1", "c1")
+
+    graph_handler_instance.remove_relationship("c1", "p1", False)
+    assert not graph_handler_instance.is_ancestor("g1", "c1")
+    assert graph_handler_instance.is_ancestor("g3", "c1")
+    assert graph_handler_instance.count_descendants("g1") == 2
+
+
+def test_updates_on_added_members_and_links(graph_handler_instance):
+    """Tests that new members and links are merged into the ancestors' labels."""
+    graph_handler_instance.count_descendants("g1")
+
+    graph_handler_instance.add_member("gc", family_tree_pb2.FamilyMember(id="gc"))
+    assert graph_handler_instance.count_descendants("gc") == 0
+    assert not graph_handler_instance.is_ancestor("g1", "gc")
+
+    graph_handler_instance.add_child_relation("c1", "gc", add_to_family_unit=False)
+    assert graph_handler_instance.is_ancestor("g1", "gc")
+    assert graph_handler_instance.is_ancestor("g4", "gc")
+    assert graph_handler_instance.count_descendants("g2") == 4
+
+
+def test_updates_on_removed_member(graph_handler_instance):
+    """Tests that removing a member drops its line from its ancestors."""
+    graph_handler_instance.count_descendants("g1")
+
+    graph_handler_instance.remove_member("p1", remove_orphaned_neighbors=False)
+
+    assert graph_handler_instance.count_descendants("g1") == 0
+    assert graph_handler_instance.count_descendants("g3") == 3
+    assert not graph_handler_instance.is_ancestor("g1", "c1")
+    with pytest.raises(MemberNotFoundError):
+        graph_handler_instance.is_ancestor("p1", "c1")
+
+
+def test_edge_type_change_updates_links(graph_handler_instance):
+    """Tests that turning a child edge into a spouse edge ends the link."""
+    graph_handler_instance.count_descendants("g1")
+    graph_handler_instance.remove_relationship("c2", "p2", False)
+
+    graph_handler_instance.add_spouse_relation("p2", "c2", add_to_family_unit=False)
+
+    assert not graph_handler_instance.is_ancestor("g3", "c2")
+    assert graph_handler_instance.is_ancestor("g1", "c2")
+
+
+def test_cycle_is_tolerated(graph_handler_instance):
+    """Tests that an invalid parent cycle does not break reachability."""
+    graph_handler_instance.add_child_relation("c1", "g1", add_to_family_unit=False)
+
+    assert graph_handler_instance.is_ancestor("c1", "p1")
+    assert graph_handler_instance.is_ancestor("g1", "g1") is False
+    assert graph_handler_instance.count_descendants("c1") == 3
@@ -0,0 +1,80 @@
+import pytest
+from familytree.proto import family_tree_pb2
+
+from familytree.handlers.graph_handler import GraphHandler
+from familytree.indexes.name_index import NameIndex, NameMatch
+
+
+@pytest.fixture
+def graph_handler_instance():
+    """Provides a GraphHandler with members whose names share prefixes."""
+    graph_handler = GraphHandler()
+    for member_id, name, nicknames in (
+        ("ronw", "Ron Weasley", ["Won-Won"]),
+        ("ronaldb", "Ronald Bilius", []),
+        ("rosew", "Rose Weasley", []),
+        ("ginny", "Ginevra Weasley", ["Ginny"]),
+        ("karthik", "கார்த்திக் ராஜன்", []),
+    ):
+        graph_handler.add_member(
+            member_id,
+            family_tree_pb2.FamilyMember(id=member_id, name=name, nicknames=nicknames),
+        )
+    return graph_handler
+
+
+def test_search_ranks_matches(graph_handler_instance):
+    """Tests that name matches rank by matching token, then name, then nicknames."""
+    name_index = NameIndex.from_graph_handler(graph_handler_instance)
+
+    assert name_index.search("ro", 10) == [
+        NameMatch("ronw", "Ron Weasley", None),
+        NameMatch("ronaldb", "Ronald Bilius", None),
+        NameMatch("rosew", "Rose Weasley", None),
+    ]
+    assert name_index.search("RO", 2) == name_index.search("ro", 2)[:2]
+    # Every word must match, on the name or a nickname.
+    assert [match.member_id for match in name_index.search("weasley r", 10)] == [
+        "ronw",
+        "rosew",
+    ]
+    assert name_index.search("ron won", 10) == [
+        NameMatch("ronw", "Ron Weasley", "Won-Won")
+    ]
+    assert name_index.search("gin", 10) == [
+        NameMatch("ginny", "Ginevra Weasley", None)
+    ]
+    assert name_index.search("won", 10) == [
+        NameMatch("ronw", "Ron Weasley", "Won-Won")
+    ]
+    assert name_index.search("கார்", 10) == [
+        NameMatch("karthik", "கார்த்திக் ராஜன்", None)
+    ]
+    assert name_index.search(" ", 10) == []
+
+
+def test_index_follows_member_changes(graph_handler_instance):
+    """Tests that the index is kept current and that copies are independent."""
+    graph_handler = graph_handler_instance
+    assert graph_handler.search_members("hugo", 10) == []
+    graph_handler.add_member(
+        "hugow", family_tree_pb2.FamilyMember(id="hugow", name="Hugo Weasley")
+    )
+    snapshot = graph_handler.copy()
+
+    graph_handler.update_family_member(
+        "ronw", family_tree_pb2.FamilyMember(name="Ronald Weasley")
+    )
+    graph_handler.remove_member("hugow", remove_orphaned_neighbors=False)
+
+    assert [match.member_id for match in graph_handler.search_members("ron", 10)] == [
+        "ronaldb",
+        "ronw",
+    ]
+    assert graph_handler.search_members("hugo", 10) == []
+    assert snapshot.search_members("hugo", 10) == [
+        NameMatch("hugow", "Hugo Weasley", None)
+    ]
+    assert snapshot.search_members("ronald", 10) == [
+        NameMatch("ronaldb", "Ronald Bilius", None)
+    ]
@@ -0,0 +1,165 @@
+import pytest
+from familytree.proto import family_tree_pb2
+
+from familytree.exceptions import MemberNotFoundError, OperationError
+from familytree.handlers.compact_graph_handler import CompactGraphHandler
+from familytree.handlers.graph_handler import GraphHandler
+from familytree.indexes import visibility_index
+from familytree.indexes.visibility_index import RelativeGroup, VisibilityIndex
+from familytree.utils.graph_types import EdgeType
+
+
+@pytest.fixture(params=[GraphHandler, CompactGraphHandler])
+def graph_handler_instance(request):
+    """
+    Provides a graph handler with a couple, their children and a grandchild:
+
+        p1 + p2
+           |
+        c1   c2 + s
+             |
+             g1
+    """
+    graph_handler = request.param()
+    for member_id in ("p1", "p2", "c1", "c2", "s", "g1"):
+        graph_handler.add_member(
+            member_id, family_tree_pb2.FamilyMember(id=member_id, name=member_id)
+        )
+    for member_id, spouse_id in (("p1", "p2"), ("c2", "s")):
+        graph_handler.add_spouse_relation(member_id, spouse_id, False)
+        graph_handler.add_spouse_relation(spouse_id, member_id, False)
+    for parent_id, child_id in (
+        ("p1", "c1"),
+        ("p2", "c1"),
+        ("p1", "c2"),
+        ("p2", "c2"),
+        ("c2", "g1"),
+        ("s", "g1"),
+    ):
+        graph_handler.add_child_relation(parent_id, child_id, False)
+        graph_handler.add_parent_relation(child_id, parent_id, False)
+    return graph_handler
+
+
+def test_expand_shows_only_new_members_and_edges(graph_handler_instance):
+    """Tests that expansions report what became visible."""
+    delta = graph_handler_instance.expand_relatives("c1", RelativeGroup.PARENTS)
+
+    assert delta.shown_member_ids == ["c1", "p1", "p2"]
+    assert sorted(delta.shown_edges) == [
+        ("p1", "c1", EdgeType.PARENT_TO_CHILD),
+        ("p1", "p2", EdgeType.SPOUSE),
+        ("p2", "c1", EdgeType.PARENT_TO_CHILD),
+    ]
+    visibility = graph_handler_instance._get_index(VisibilityIndex)
+    assert visibility.is_visible("p1")
+    assert visibility.is_expanded("c1", RelativeGroup.PARENTS)
+
+    delta = graph_handler_instance.expand_relatives("c1", RelativeGroup.SIBLINGS)
+    assert delta.shown_member_ids == ["c2"]
+    assert sorted(delta.shown_edges) == [
+        ("p1", "c2", EdgeType.PARENT_TO_CHILD),
+        ("p2", "c2", EdgeType.PARENT_TO_CHILD),
+    ]
+    assert graph_handler_instance.expand_relatives(
+        "c1", RelativeGroup.SIBLINGS
+    ).shown_member_ids == []
+
+
+def test_collapse_keeps_members_shown_by_other_expansions(graph_handler_instance):
+    """Tests reference counting and the cascade through hidden members."""
+    graph_handler_instance.expand_relatives("c1", RelativeGroup.PARENTS)
+    graph_handler_instance.expand_relatives("p1", RelativeGroup.CHILDREN)
+    graph_handler_instance.expand_relatives("c2", RelativeGroup.CHILDREN)
+
+    delta = graph_handler_instance.collapse_relatives("c1", RelativeGroup.PARENTS)
+    # p1 and p2 are hidden; c2 was only shown by p1 and takes g1 with it.
+    assert sorted(delta.hidden_member_ids) == ["c2", "g1", "p1", "p2"]
+    assert ("c2", "g1", EdgeType.PARENT_TO_CHILD) in delta.hidden_edges
+    assert ("p1", "c1", EdgeType.PARENT_TO_CHILD) in delta.hidden_edges
+    visibility = graph_handler_instance._get_index(VisibilityIndex)
+    assert visibility.is_visible("c1")
+    assert not visibility.is_expanded("c1", RelativeGroup.PARENTS)
+    assert not visibility.is_expanded("p1", RelativeGroup.CHILDREN)
+
+    graph_handler_instance.expand_relatives("c1", RelativeGroup.PARENTS)
+    graph_handler_instance.expand_relatives("c1", RelativeGroup.SIBLINGS)
+    graph_handler_instance.expand_relatives("p2", RelativeGroup.CHILDREN)
+    delta = graph_handler_instance.collapse_relatives("c1", RelativeGroup.SIBLINGS)
+    assert delta.hidden_member_ids == []
+
+
+def test_inlaws_and_removed_members(graph_handler_instance):
+    """Tests the in-law group and that removed members leave the view."""
+    delta = graph_handler_instance.expand_relatives("s", RelativeGroup.INLAWS)
+    assert sorted(delta.shown_member_ids) == ["c1", "c2", "p1", "p2", "s"]
+
+    graph_handler_instance.remove_member("c2", remove_orphaned_neighbors=False)
+    delta = graph_handler_instance.collapse_relatives("s", RelativeGroup.INLAWS)
+
+    assert sorted(delta.hidden_member_ids) == ["c1", "p1", "p2"]
+    with pytest.raises(MemberNotFoundError):
+        graph_handler_instance.expand_relatives("UNKNOWN", RelativeGroup.SPOUSE)
+
+
+def test_sessions_are_independent(graph_handler_instance):
+    """Tests that view sessions share the graph but not their view state."""
+    graph_handler_instance.create_view_session("tab1")
+    graph_handler_instance.create_view_session("tab2")
+    graph_handler_instance.show_member("c2", "tab1")
+    graph_handler_instance.expand_relatives("c2", RelativeGroup.PARENTS, "tab1")
+
+    delta = graph_handler_instance.expand_relatives(
+        "c1", RelativeGroup.PARENTS, "tab2"
+    )
+    assert delta.shown_member_ids == ["c1", "p1", "p2"]
+    delta = graph_handler_instance.collapse_relatives(
+        "c2", RelativeGroup.PARENTS, "tab1"
+    )
+    assert sorted(delta.hidden_member_ids) == ["p1", "p2"]
+
+    visibility = graph_handler_instance._get_index(VisibilityIndex)
+    assert visibility.is_visible("p1", "tab2")
+    assert not visibility.is_visible("p1")
+    assert visibility.is_poi("c2", "tab1")
+    assert not visibility.is_poi("c2", "tab2")
+    # The shared nodes keep only whether the relatives exist.
+    assert graph_handler_instance._get_node("p1").is_visible is False
+    assert graph_handler_instance._get_node("c1").has_visible_parents is False
+    assert graph_handler_instance._get_node("c2").is_poi is False
+
+
+def test_session_lifecycle(graph_handler_instance):
+    """Tests creating, closing and using unknown view sessions."""
+    graph_handler_instance.create_view_session("tab")
+    with pytest.raises(OperationError):
+        graph_handler_instance.create_view_session("tab")
+
+    graph_handler_instance.expand_relatives("c1", RelativeGroup.PARENTS, "tab")
+    graph_handler_instance.close_view_session("tab")
+
+    with pytest.raises(OperationError):
+        graph_handler_instance.expand_relatives("c1", RelativeGroup.PARENTS, "tab")
+    with pytest.raises(OperationError):
+        graph_handler_instance.close_view_session("tab")
+
+
+def test_least_recently_used_session_is_evicted(graph_handler_instance, monkeypatch):
+    """Tests that creating a session past the cap drops the idlest one."""
+    monkeypatch.setattr(visibility_index, "_MAX_VIEW_SESSIONS", 2)
+    graph_handler_instance.create_view_session("tab1")
+    graph_handler_instance.create_view_session("tab2")
+    graph_handler_instance.expand_relatives("c1", RelativeGroup.PARENTS, "tab1")
+
+    graph_handler_instance.create_view_session("tab3")
+
+    with pytest.raises(OperationError):
+        graph_handler_instance.expand_relatives("c1", RelativeGroup.PARENTS, "tab2")
+    visibility = graph_handler_instance._get_index(VisibilityIndex)
+    assert visibility.is_visible("p1", "tab1")
+    # The default session is never evicted, even when it is the idlest.
+    graph_handler_instance.create_view_session("tab4")
+    with pytest.raises(OperationError):
+        graph_handler_instance.close_view_session("tab3")
+    assert not visibility.is_visible("p1")
+    assert visibility.is_visible("p1", "tab1")
@@ -2,6 +2,7 @@ import pytest
 from fastapi.testclient import TestClient
 
 from familytree.family_tree_webapp import app
+from familytree.handlers.family_tree_handler import FamilyTreeHandler
 
 
 @pytest.fixture
@@ -9,13 +10,23 @@ def client():
     return TestClient(app)
 
 
-def test_send_message_not_implemented(client):
-    """Tests that the /chat/send_message endpoint returns 501 Not Implemented."""
-    response = client.post("/api/v1/chat/send_message")
+def test_send_message_success(client, monkeypatch):
+    """Tests that the /chat/ask endpoint returns the assistant's answer."""
+
+    async def ask_about_family(family_tree_handler, query, conversation_id):
+        return conversation_id or "CONV1", f"Answer to: {query}"
+
+    monkeypatch.setattr(FamilyTreeHandler, "ask_about_family", ask_about_family)
+    response = client.post("/api/v1/chat/ask", json={"query": "Who is Ron?"})
     json_response = response.json()
-    assert response.status_code == 501
-    assert json_response["status"] == "ERROR"
-    assert (
-        json_response["message"]
-        == "Unsupported operation 'send_message'. Feature 'chatbot' is not implemented."
-    )
+    assert response.status_code == 200
+    assert json_response["status"] == "OK"
+    assert json_response["response"] == "Answer to: Who is Ron?"
+    assert json_response["conversation_id"] == "CONV1"
+
+
+def test_send_message_empty_query(client):
+    """Tests that the /chat/ask endpoint rejects an empty query."""
+    response = client.post("/api/v1/chat/ask", json={"query": ""})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Query cannot be empty."
@@ -1,17 +1,42 @@
+import inspect
+
 import pytest
 
 from familytree.models.manage_model import LoadFamilyRequest
+from familytree.routers import graph_router
+
+
+def test_get_data_with_poi_success(
+    client, weasley_family_tree_textproto, reset_app_state_between_tests
+):
+    """Tests the /graph/render endpoint with a POI renders only its neighborhood."""
+    load_request = LoadFamilyRequest(
+        filename="weasley.txtpb", content=weasley_family_tree_textproto
+    )
+    load_response = client.post(
+        "/api/v1/manage/load_family", json=load_request.model_dump()
+    )
+    assert load_response.status_code == 200
+
+    response = client.get("/api/v1/graph/render?theme=light&poi=RONAW&degree=1")
+
+    assert response.status_code == 200
+    assert response.json()["message"] == "Family tree rendered successfully"
+    graph_html = response.json()["graph_html"]
+    assert "Ron Weasley" in graph_html
+    assert "Arthur Weasley" in graph_html
+    assert "Ginny Weasley" not in graph_html
 
 
-def test_get_data_with_poi_not_implemented(client):
-    """Tests the /graph/render endpoint with a POI (should return 501)."""
+def test_get_data_with_poi_member_not_found(client):
+    """Tests the /graph/render endpoint with an unknown POI (should return 404)."""
     response = client.get("/api/v1/graph/render?theme=light&poi=some_id&degree=3")
     json_response = response.json()
-    assert response.status_code == 501
+    assert response.status_code == 404
     assert json_response["status"] == "ERROR"
     assert (
         json_response["message"]
-        == "Unsupported operation 'render_with_poi'. Feature 'poi=some_id, degree=3' is not implemented."
+        == "Member with ID 'some_id' not found during operation 'get_ego_graph'."
     )
 
 
@@ -113,7 +138,7 @@ def test_get_member_info_member_not_found(
     )
 
 
-# Test suite for the unimplemented expansion/collapse endpoints
+# Test suite for the expansion/collapse endpoints
 @pytest.mark.parametrize(
     "endpoint, operation, user",
     [
@@ -169,11 +194,322 @@ def test_get_member_info_member_not_found(
         ),
     ],
 )
-def test_unimplemented_endpoints(endpoint, operation, user, client):
-    """Tests that all expand/collapse endpoints return 501 Not Implemented."""
-    response_template = f"Unsupported operation '{operation}'. Feature '{operation} for user {user}' is not implemented."
+def test_expand_collapse_member_not_found(endpoint, operation, user, client):
+    """Tests that all expand/collapse endpoints return 404 for unknown members."""
+    response_template = (
+        f"Member with ID '{user}' not found during operation '{operation}'."
+    )
     response = client.get(endpoint)
     json_response = response.json()
-    assert response.status_code == 501
+    assert response.status_code == 404
     assert json_response["status"] == "ERROR"
     assert json_response["message"] == response_template
+
+
+def test_expand_and_collapse_return_deltas(
+    client, weasley_family_tree_textproto, reset_app_state_between_tests
+):
+    """Tests that expand/collapse only return the nodes and edges that changed."""
+    load_request = LoadFamilyRequest(
+        filename="weasley.txtpb", content=weasley_family_tree_textproto
+    )
+    load_response = client.post(
+        "/api/v1/manage/load_family", json=load_request.model_dump()
+    )
+    assert load_response.status_code == 200
+
+    response = client.get("/api/v1/graph/expand_parents/RONAW")
+    json_response = response.json()
+    assert response.status_code == 200
+    assert [node["id"] for node in json_response["shown_nodes"]] == [
+        "RONAW",
+        "ARTHW",
+        "MOLLW",
+    ]
+    assert json_response["shown_nodes"][1]["label"] == "Arthur Weasley"
+    # Only the rendered edges: one per parent and one per couple.
+    assert len(json_response["shown_edges"]) == 3
+    assert json_response["hidden_node_ids"] == []
+
+    response = client.get("/api/v1/graph/expand_siblings/RONAW")
+    assert len(response.json()["shown_nodes"]) == 6
+
+    response = client.get("/api/v1/graph/collapse_parents/RONAW")
+    json_response = response.json()
+    assert response.status_code == 200
+    assert sorted(json_response["hidden_node_ids"]) == ["ARTHW", "MOLLW"]
+    assert json_response["shown_nodes"] == []
+    # The couple's edge and the edges to the seven children.
+    assert len(json_response["hidden_edges"]) == 1 + 2 * 7
+
+
+def test_view_sessions_are_independent(
+    client, weasley_family_tree_textproto, reset_app_state_between_tests
+):
+    """Tests that expansions in one view session do not affect another."""
+    load_request = LoadFamilyRequest(
+        filename="weasley.txtpb", content=weasley_family_tree_textproto
+    )
+    load_response = client.post(
+        "/api/v1/manage/load_family", json=load_request.model_dump()
+    )
+    assert load_response.status_code == 200
+
+    response = client.post("/api/v1/graph/create_view_session?poi=RONAW")
+    json_response = response.json()
+    assert response.status_code == 200
+    session_id = json_response["session_id"]
+    assert [node["id"] for node in json_response["shown_nodes"]] == ["RONAW"]
+    assert json_response["shown_nodes"][0]["borderWidth"] == 3
+
+    response = client.get(f"/api/v1/graph/expand_parents/RONAW?session_id={session_id}")
+    assert len(response.json()["shown_nodes"]) == 2
+
+    # The default view has not seen Ron yet.
+    response = client.get("/api/v1/graph/expand_parents/RONAW")
+    assert len(response.json()["shown_nodes"]) == 3
+
+    response = client.post(f"/api/v1/graph/close_view_session/{session_id}")
+    assert response.status_code == 200
+    response = client.get(f"/api/v1/graph/expand_parents/RONAW?session_id={session_id}")
+    assert response.status_code == 404
+    assert response.json()["status"] == "ERROR"
+
+
+def test_view_routes_run_in_threadpool():
+    """Tests that the view session routes do not block the event loop."""
+    endpoints = {
+        route.name: route.endpoint
+        for route in graph_router.router.routes
+        if "view_session" in route.name
+        or route.name.startswith(("expand_", "collapse_"))
+    }
+    assert len(endpoints) == 12
+    for name, endpoint in endpoints.items():
+        assert not inspect.iscoroutinefunction(endpoint), name
+
+
+def test_get_relationship_success(
+    client, weasley_family_tree_textproto, reset_app_state_between_tests
+):
+    """Tests the /graph/relationship endpoint."""
+    load_request = LoadFamilyRequest(
+        filename="weasley.txtpb", content=weasley_family_tree_textproto
+    )
+    load_response = client.post(
+        "/api/v1/manage/load_family", json=load_request.model_dump()
+    )
+    assert load_response.status_code == 200
+
+    response = client.get(
+        "/api/v1/graph/relationship?source_member_id=RONAW&target_member_id=GINNW"
+    )
+    json_response = response.json()
+    assert response.status_code == 200
+    assert json_response["status"] == "OK"
+    assert json_response["relationship"] == "sister"
+    assert [step["relation"] for step in json_response["path"]] == ["parent", "child"]
+    assert json_response["path"][-1]["name"] == "Ginny Weasley"
+
+
+def test_get_relationship_member_not_found(client, reset_app_state_between_tests):
+    """Tests the /graph/relationship endpoint with an unknown member."""
+    response = client.get(
+        "/api/v1/graph/relationship?source_member_id=RONAW&target_member_id=NOBODY"
+    )
+    assert response.status_code == 404
+    assert response.json()["status"] == "ERROR"
+
+
+def test_get_common_ancestors_success(
+    client, weasley_family_tree_textproto, reset_app_state_between_tests
+):
+    """Tests the /graph/common_ancestors endpoint with several pairs."""
+    load_request = LoadFamilyRequest(
+        filename="weasley.txtpb", content=weasley_family_tree_textproto
+    )
+    load_response = client.post(
+        "/api/v1/manage/load_family", json=load_request.model_dump()
+    )
+    assert load_response.status_code == 200
+
+    response = client.post(
+        "/api/v1/graph/common_ancestors",
+        json={
+            "pairs": [
+                {"source_member_id": "RONAW", "target_member_id": "GINNW"},
+                {"source_member_id": "ARTHW", "target_member_id": "MOLLW"},
+            ]
+        },
+    )
+    json_response = response.json()
+    assert response.status_code == 200
+    assert json_response["status"] == "OK"
+    siblings, spouses = json_response["results"]
+    assert sorted(
+        ancestor["member_id"] for ancestor in siblings["common_ancestors"]
+    ) == ["ARTHW", "MOLLW"]
+    assert siblings["common_ancestors"][0]["source_generations"] == 1
+    assert spouses["common_ancestors"] == []
+
+
+def test_search_members(
+    client, weasley_family_tree_textproto, reset_app_state_between_tests
+):
+    """Tests the /graph/search endpoint for member pickers."""
+    load_request = LoadFamilyRequest(
+        filename="weasley.txtpb", content=weasley_family_tree_textproto
+    )
+    client.post("/api/v1/manage/load_family", json=load_request.model_dump())
+
+    response = client.get("/api/v1/graph/search?prefix=weasley%20g&limit=5")
+    assert response.status_code == 200
+    assert response.json()["results"] == [
+        {"member_id": "GEORW", "name": "George Weasley", "nickname": None},
+        {"member_id": "GINNW", "name": "Ginny Weasley", "nickname": None},
+    ]
+
+    response = client.get("/api/v1/graph/search?prefix=w&limit=3")
+    assert len(response.json()["results"]) == 3
+
+    response = client.get("/api/v1/graph/search?prefix=w&limit=0")
+    assert response.status_code == 400
+    assert response.json()["status"] == "ERROR"
+
+
+def test_filter_members(
+    client, weasley_family_tree_textproto, reset_app_state_between_tests
+):
+    """Tests the /graph/filter_members endpoint."""
+    load_request = LoadFamilyRequest(
+        filename="weasley.txtpb", content=weasley_family_tree_textproto
+    )
+    client.post("/api/v1/manage/load_family", json=load_request.model_dump())
+
+    response = client.post(
+        "/api/v1/graph/filter_members",
+        json={
+            "gender": ["FEMALE"],
+            "alive": True,
+            "birth_year": {"min": 1940, "max": 1960},
+        },
+    )
+    assert response.status_code == 200
+    assert response.json()["count"] == 1
+    assert response.json()["member_ids"] == ["MOLLW"]
+
+    response = client.post(
+        "/api/v1/graph/filter_members", json={"birth_star": ["ASHWINI"]}
+    )
+    assert response.json()["member_ids"] == ["GINNW"]
+
+    response = client.post(
+        "/api/v1/graph/filter_members", json={"alive": False, "limit": 0}
+    )
+    assert response.json()["count"] == 1
+    assert response.json()["member_ids"] == []
+
+    response = client.post(
+        "/api/v1/graph/filter_members", json={"birth_star": ["NOT_A_STAR"]}
+    )
+    assert response.status_code == 400
+    assert response.json()["status"] == "ERROR"
+
+
+def test_find_events_and_star_days(
+    client, weasley_family_tree_textproto, reset_app_state_between_tests
+):
+    """Tests the /graph/events and /graph/star_days endpoints."""
+    load_request = LoadFamilyRequest(
+        filename="weasley.txtpb", content=weasley_family_tree_textproto
+    )
+    client.post("/api/v1/manage/load_family", json=load_request.model_dump())
+
+    response = client.get("/api/v1/graph/events?start=2025-12-01&limit=3")
+    assert response.status_code == 200
+    assert response.json()["events"] == [
+        {
+            "kind": "birthday",
+            "member_id": "CHARW",
+            "name": "Charlie Weasley",
+            "date": "2025-12-12",
+            "year": 1972,
+        },
+        {
+            "kind": "birthday",
+            "member_id": "ARTHW",
+            "name": "Arthur Weasley",
+            "date": "2026-02-06",
+            "year": 1950,
+        },
+        {
+            "kind": "birthday",
+            "member_id": "RONAW",
+            "name": "Ron Weasley",
+            "date": "2026-03-01",
+            "year": 1980,
+        },
+    ]
+
+    response = client.get(
+        "/api/v1/graph/events?start=2025-04-01&end=2025-04-30&kinds=birthday"
+    )
+    assert [event["member_id"] for event in response.json()["events"]] == [
+        "FREDW",
+        "GEORW",
+    ]
+
+    response = client.get("/api/v1/graph/events?kinds=funeral")
+    assert response.status_code == 400
+
+    response = client.get("/api/v1/graph/star_days?tamil_month=CHITHIRAI")
+    assert response.json()["star_days"] == [
+        {
+            "member_id": "GINNW",
+            "name": "Ginny Weasley",
+            "tamil_month": "CHITHIRAI",
+            "star": "ASHWINI",
+        }
+    ]
+
+    response = client.get("/api/v1/graph/star_days?tamil_month=CHITHIRAI&star=NOPE")
+    assert response.status_code == 400
+
+
+def test_find_violations(
+    client, weasley_family_tree_textproto, reset_app_state_between_tests
+):
+    """Tests that /graph/violations reports a child born before its parents."""
+    load_request = LoadFamilyRequest(
+        filename="weasley.txtpb", content=weasley_family_tree_textproto
+    )
+    client.post("/api/v1/manage/load_family", json=load_request.model_dump())
+
+    response = client.get("/api/v1/graph/violations?full_audit=true")
+    assert response.status_code == 200
+    assert response.json()["violations"] == []
+
+    client.post(
+        "/api/v1/manage/update_family_member",
+        json={
+            "member_id": "BILLW",
+            "updated_member_data": {
+                "date_of_birth": {"year": 1940, "month": 1, "date": 1}
+            },
+        },
+    )
+    response = client.get("/api/v1/graph/violations?member_ids=BILLW")
+    violations = response.json()["violations"]
+    assert [
+        (violation["kind"], violation["member_id"], violation["related_member_id"])
+        for violation in violations
+    ] == [
+        ("born_before_parent", "BILLW", "ARTHW"),
+        ("born_before_parent", "BILLW", "MOLLW"),
+    ]
+    assert response.json()["message"] == "2 violations found."
+    full_audit = client.get("/api/v1/graph/violations?full_audit=true")
+    assert full_audit.json()["violations"] == violations
+
+    response = client.get("/api/v1/graph/violations?member_ids=NOBODY")
+    assert response.status_code == 404
@@ -1,3 +1,5 @@
+import base64
+import inspect
 import logging
 import re
 
@@ -11,12 +13,23 @@ from familytree.models.manage_model import (
     LoadFamilyRequest,
     UpdateFamilyMemberRequest,
 )
+from familytree.proto import family_tree_pb2
+from familytree.routers import manage_router
 from familytree.utils.graph_types import EdgeType
 
 MEMBER_ID_PATTERN = r"^[A-Z0-9]{4}-[A-Z0-9]{4}-[A-Z0-9]{4}-[A-Z0-9]{4}$"
 logger = logging.getLogger(__name__)
 
 
+def test_tree_changing_routes_run_in_threadpool():
+    """Tests that routes that may write the tree log do not block the event loop."""
+    endpoints = {route.name: route.endpoint for route in manage_router.router.routes}
+    del endpoints["export_interactive_graph"]
+    assert endpoints
+    for name, endpoint in endpoints.items():
+        assert not inspect.iscoroutinefunction(endpoint), name
+
+
 def test_create_new_family_success(client, reset_app_state_between_tests):
     """Tests successful creation of a new family tree."""
     response = client.post("/api/v1/manage/create_family")
@@ -411,6 +424,7 @@ def test_delete_relationship_e2e(
     assert response_no_inverse.json()["message"] == "Relationship deleted successfully."
 
     # Verify graph state after deletion without inverse.
+    graph = family_handler.graph_handler.get_family_graph()
     assert not graph.has_edge("ARTHW", "MOLLW")
     assert graph.has_edge("MOLLW", "ARTHW")  # Inverse should still exist.
 
@@ -433,6 +447,7 @@ def test_delete_relationship_e2e(
     assert response_with_inverse.json()["status"] == OK_STATUS
 
     # Verify graph state after deletion with inverse.
+    graph = family_handler.graph_handler.get_family_graph()
     assert not graph.has_edge("PERCW", "ARTHW")
     assert not graph.has_edge("ARTHW", "PERCW")
 
@@ -488,6 +503,72 @@ def test_save_family_data_e2e(
     assert saved_textproto == weasley_family_tree_textproto
 
 
+def test_save_and_load_binary_family_data(
+    client, weasley_family_tree_pb, weasley_family_tree_textproto
+):
+    """Tests that a tree saved as .binpb loads back to the same tree."""
+    load_request = LoadFamilyRequest(
+        filename="weasley.txtpb", content=weasley_family_tree_textproto
+    )
+    client.post("/api/v1/manage/load_family", json=load_request.model_dump())
+
+    response = client.get("/api/v1/manage/save_family?format=binpb")
+    assert response.status_code == 200
+    assert response.json()["message"] == "Created family tree binary proto"
+    assert response.json()["family_tree_txtpb"] is None
+    saved_binpb = response.json()["family_tree_binpb"]
+    saved_tree = family_tree_pb2.FamilyTree.FromString(base64.b64decode(saved_binpb))
+    assert saved_tree == weasley_family_tree_pb
+
+    load_request = LoadFamilyRequest(filename="weasley.binpb", content=saved_binpb)
+    response = client.post(
+        "/api/v1/manage/load_family", json=load_request.model_dump()
+    )
+    assert response.status_code == 200
+    response = client.get("/api/v1/manage/save_family")
+    assert response.json()["family_tree_txtpb"] == weasley_family_tree_textproto
+
+    load_request = LoadFamilyRequest(filename="weasley.binpb", content="Cv8=")
+    response = client.post(
+        "/api/v1/manage/load_family", json=load_request.model_dump()
+    )
+    assert response.status_code == 400
+    response = client.get("/api/v1/manage/save_family?format=pdf")
+    assert response.status_code == 422
+
+
+def test_save_and_load_stream_family_data(
+    client, weasley_family_tree_pb, weasley_family_tree_textproto
+):
+    """Tests that a tree saved as .pbstream loads back to the same tree."""
+    load_request = LoadFamilyRequest(
+        filename="weasley.txtpb", content=weasley_family_tree_textproto
+    )
+    client.post("/api/v1/manage/load_family", json=load_request.model_dump())
+
+    response = client.get("/api/v1/manage/save_family?format=pbstream")
+    assert response.status_code == 200
+    assert response.json()["message"] == "Created family tree proto stream"
+    saved_pbstream = response.json()["family_tree_pbstream"]
+    assert base64.b64decode(saved_pbstream).startswith(b"FTSTREAM")
+
+    # Without a known extension, the stream is told apart by its header.
+    load_request = LoadFamilyRequest(filename="upload", content=saved_pbstream)
+    response = client.post(
+        "/api/v1/manage/load_family", json=load_request.model_dump()
+    )
+    assert response.status_code == 200
+    response = client.get("/api/v1/manage/save_family")
+    assert response.json()["family_tree_txtpb"] == weasley_family_tree_textproto
+
+    truncated = base64.b64encode(base64.b64decode(saved_pbstream)[:-1]).decode()
+    load_request = LoadFamilyRequest(filename="weasley.pbstream", content=truncated)
+    response = client.post(
+        "/api/v1/manage/load_family", json=load_request.model_dump()
+    )
+    assert response.status_code == 400
+
+
 def test_export_interactive_graph_not_implemented(client):
     """Tests that the /manage/export_interactive_graph endpoint returns 501 Not Implemented."""
     response = client.get("/api/v1/manage/export_interactive_graph")
@@ -498,3 +579,89 @@ def test_export_interactive_graph_not_implemented(client):
         json_response["message"]
         == "Unsupported operation 'export_interactive_graph'. Feature 'export_interactive_graph' is not implemented."
     )
+
+
+def test_undo_and_redo_e2e(
+    client, weasley_family_tree_textproto, reset_app_state_between_tests
+):
+    """E2E test for undoing and redoing a member deletion."""
+    load_request = LoadFamilyRequest(
+        filename="weasley.txtpb", content=weasley_family_tree_textproto
+    )
+    client.post("/api/v1/manage/load_family", json=load_request.model_dump())
+    delete_payload = DeleteFamilyMemberRequest(
+        member_id="PERCW", remove_orphaned_neighbors=True
+    )
+    client.post("/api/v1/manage/delete_family_member", json=delete_payload.model_dump())
+    response = client.get("/api/v1/manage/save_family")
+    assert response.json()["family_tree_txtpb"] != weasley_family_tree_textproto
+
+    response = client.post("/api/v1/manage/undo")
+    assert response.status_code == 200
+    assert response.json()["status"] == OK_STATUS
+    assert response.json()["operation"] == "Delete member PERCW"
+    response = client.get("/api/v1/manage/save_family")
+    assert response.json()["family_tree_txtpb"] == weasley_family_tree_textproto
+
+    response = client.post("/api/v1/manage/redo")
+    assert response.status_code == 200
+    assert response.json()["message"] == "Redid: Delete member PERCW."
+    graph_handler = app_state.get_current_family_tree_handler().snapshot_graph()
+    assert not graph_handler.has_member("PERCW")
+
+    response = client.post("/api/v1/manage/redo")
+    assert response.status_code == 409
+    assert response.json()["status"] == "ERROR"
+    assert "There is nothing to redo." in response.json()["message"]
+
+
+def test_batch_e2e(client, weasley_family_tree_textproto, reset_app_state_between_tests):
+    """E2E test for adding a branch in one batch and rejecting an invalid one."""
+    load_request = LoadFamilyRequest(
+        filename="weasley.txtpb", content=weasley_family_tree_textproto
+    )
+    client.post("/api/v1/manage/load_family", json=load_request.model_dump())
+    payload = {
+        "operations": [
+            {
+                "op": "add_family_member",
+                "ref": "hugo",
+                "new_member_data": {"name": "Hugo Weasley"},
+                "source_family_member_id": "RONAW",
+                "relationship_type": "PARENT_TO_CHILD",
+                "infer_relationships": True,
+            },
+            {
+                "op": "add_family_member",
+                "ref": "hugo_jr",
+                "new_member_data": {"name": "Hugo Weasley Jr"},
+                "infer_relationships": False,
+            },
+            {
+                "op": "add_relationship",
+                "source_member_id": "hugo",
+                "target_member_id": "hugo_jr",
+                "relationship_type": "PARENT_TO_CHILD",
+            },
+        ]
+    }
+
+    response = client.post("/api/v1/manage/batch", json=payload)
+
+    assert response.status_code == 200
+    json_response = response.json()
+    assert json_response["status"] == OK_STATUS
+    member_refs = json_response["member_refs"]
+    assert re.match(MEMBER_ID_PATTERN, member_refs["hugo"])
+    graph_handler = app_state.get_current_family_tree_handler().snapshot_graph()
+    assert graph_handler.get_children(member_refs["hugo"]) == [member_refs["hugo_jr"]]
+
+    payload["operations"][2]["target_member_id"] = "UNKNOWN_ID"
+    response = client.post("/api/v1/manage/batch", json=payload)
+    assert response.status_code == 404
+    assert response.json()["status"] == "ERROR"
+    graph_handler = app_state.get_current_family_tree_handler().snapshot_graph()
+    assert len(list(graph_handler.iter_member_ids())) == 11
+
+    response = client.post("/api/v1/manage/batch", json={"operations": [{"op": "x"}]})
+    assert response.status_code == 422
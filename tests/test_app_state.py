@@ -75,3 +75,16 @@ def test_reset_current_family_tree_handler(MockFamilyTreeHandler):
     MockFamilyTreeHandler.assert_called_once()
     assert global_app_state.family_tree_handler is new_mock_instance
     assert global_app_state.family_tree_handler is not initial_mock_handler
+
+
+@patch("familytree.app_state.FamilyTreeHandler")
+def test_tree_log_directory_is_replayed_and_reset(MockFamilyTreeHandler):
+    """Tests that a tree log directory is opened on creation and reset."""
+    state = GlobalAppState()
+    state.tree_log_directory = "/tmp/tree-log"
+    handler = state.get_handler()
+    handler.open_tree_log.assert_called_once_with("/tmp/tree-log")
+
+    state.reset_handler()
+    handler.close_tree_log.assert_called_once()
+    handler.open_tree_log.assert_called_with("/tmp/tree-log", replay=False)
@@ -0,0 +1,53 @@
+import pytest
+
+import familytree.proto.utils_pb2 as utils_pb2
+from familytree.utils.kinship_utils import KinshipStep, describe_relationship
+
+P, C, S = KinshipStep.PARENT, KinshipStep.CHILD, KinshipStep.SPOUSE
+M, F, U = utils_pb2.MALE, utils_pb2.FEMALE, utils_pb2.GENDER_UNKNOWN
+
+
+@pytest.mark.parametrize(
+    "steps, expected",
+    [
+        ([], "self"),
+        ([(P, M)], "father"),
+        ([(P, F), (P, M)], "maternal grandfather"),
+        ([(P, M), (P, M), (P, F)], "paternal great-grandmother"),
+        ([(C, F), (C, U)], "grandchild"),
+        ([(P, M), (C, F)], "sister"),
+        ([(P, M), (C, M), (C, M)], "nephew"),
+        ([(P, M), (C, M), (C, M), (C, F)], "grandniece"),
+        ([(P, F), (P, M), (C, F)], "maternal aunt"),
+        ([(P, F), (P, M), (P, M), (C, M)], "maternal grandfather's brother"),
+        ([(P, M), (P, M), (C, M), (C, F)], "first cousin"),
+        (
+            [(P, M), (P, M), (P, M), (C, M), (C, M), (C, M), (C, F)],
+            "second cousin once removed",
+        ),
+    ],
+)
+def test_describe_blood_relationship(steps, expected):
+    """Tests the labels of relatives reached by going up and then down."""
+    assert describe_relationship(steps) == expected
+
+
+@pytest.mark.parametrize(
+    "steps, expected",
+    [
+        ([(S, F)], "wife"),
+        ([(S, F), (P, M)], "father-in-law"),
+        ([(S, M), (P, M), (C, F)], "sister-in-law"),
+        ([(S, F), (C, M)], "stepson"),
+        ([(C, M), (S, F)], "daughter-in-law"),
+        ([(P, M), (C, M), (S, F)], "sister-in-law"),
+        ([(P, F), (S, M)], "stepfather"),
+        ([(P, M), (P, M), (C, M), (S, F)], "aunt by marriage"),
+        ([(S, F), (P, M), (P, M), (C, F)], "wife's paternal aunt"),
+        ([(P, M), (P, M), (C, M), (C, M), (S, U)], "first cousin's spouse"),
+        ([(C, M), (P, F)], "son's mother"),
+    ],
+)
+def test_describe_marriage_relationship(steps, expected):
+    """Tests the labels of relationships that go through a marriage."""
+    assert describe_relationship(steps) == expected
@@ -0,0 +1,93 @@
+import datetime
+
+import numpy as np
+import pytest
+
+from familytree.proto import utils_pb2
+from familytree.exceptions import InvalidInputError
+from familytree.utils.tamil_calendar import TamilCalendar, get_tamil_calendar
+
+
+@pytest.mark.parametrize(
+    "date, month, star, paksham, thithi",
+    [
+        # Tamil new year: Chithirai starts the day the Sun enters Mesha
+        # before sunset, and the next day otherwise.
+        ((2024, 4, 13), utils_pb2.PANGUNI, None, None, None),
+        ((2024, 4, 14), utils_pb2.CHITHIRAI, None, None, None),
+        ((2025, 4, 14), utils_pb2.CHITHIRAI, None, None, None),
+        # Pongal, the first day of Thai.
+        ((2024, 1, 15), utils_pb2.THAI, None, None, None),
+        ((2025, 1, 13), utils_pb2.MARGAZHI, None, None, None),
+        ((2025, 1, 14), utils_pb2.THAI, None, None, None),
+        # Chithra Pournami.
+        (
+            (2024, 4, 23),
+            utils_pb2.CHITHIRAI,
+            utils_pb2.CHITTHIRAI,
+            utils_pb2.SHUKLA,
+            utils_pb2.POURNAMI,
+        ),
+        # Deepavali, on Naraka Chathurdasi.
+        (
+            (2023, 11, 12),
+            utils_pb2.IYPASI,
+            utils_pb2.SWATHI,
+            utils_pb2.KRISHNA,
+            utils_pb2.CHATHURDASI,
+        ),
+        # Aavani Avittam, the full moon of Thiruvonam.
+        (
+            (2025, 8, 9),
+            utils_pb2.AADI,
+            utils_pb2.THIRUVONAM,
+            utils_pb2.SHUKLA,
+            utils_pb2.POURNAMI,
+        ),
+        # Amavasya.
+        (
+            (2024, 1, 11),
+            utils_pb2.MARGAZHI,
+            None,
+            utils_pb2.KRISHNA,
+            utils_pb2.AMAVASYA,
+        ),
+    ],
+)
+def test_traditional_date_matches_almanac(date, month, star, paksham, thithi):
+    """Tests conversions against festival days in published almanacs."""
+    traditional_date = get_tamil_calendar().traditional_date(datetime.date(*date))
+
+    assert traditional_date.month == month
+    for field, expected in (
+        ("star", star),
+        ("paksham", paksham),
+        ("thithi", thithi),
+    ):
+        if expected is not None:
+            assert getattr(traditional_date, field) == expected
+
+
+def test_convert_and_find_dates():
+    """Tests batch conversion, reverse lookups and the range of the tables."""
+    tamil_calendar = TamilCalendar(2020, 2030)
+    dates = [datetime.date(2024, 4, 23), datetime.date(2025, 1, 14)]
+
+    months, stars, pakshams, thithis = tamil_calendar.convert(dates)
+    assert months.tolist() == [utils_pb2.CHITHIRAI, utils_pb2.THAI]
+    assert thithis[0] == utils_pb2.POURNAMI
+    # Arrays of datetime64 days give the same answer.
+    days = np.array(dates, dtype="datetime64[D]")
+    assert tamil_calendar.convert(days).stars.tolist() == stars.tolist()
+    assert tamil_calendar.find_dates(
+        2024, tamil_month=utils_pb2.CHITHIRAI, thithi=utils_pb2.POURNAMI
+    ) == [datetime.date(2024, 4, 23)]
+    assert tamil_calendar.find_dates(
+        2025, tamil_month=utils_pb2.THAI, thithi=utils_pb2.AMAVASYA
+    ) == [datetime.date(2025, 1, 29)]
+    # Every star comes about once a month.
+    assert 12 <= len(tamil_calendar.find_dates(2025, star=utils_pb2.ROHINI)) <= 14
+    with pytest.raises(InvalidInputError):
+        tamil_calendar.convert([datetime.date(2031, 1, 1)])
+    with pytest.raises(InvalidInputError):
+        TamilCalendar(2030, 2020)
@@ -0,0 +1,64 @@
+import base64
+
+import pytest
+
+from familytree.proto import family_tree_pb2
+from familytree.utils.tree_file_format import (
+    TreeFileFormat,
+    decode_request_content,
+    decode_stream_header,
+    detect_format,
+    encode_response_content,
+    encode_stream_header,
+    encode_varint,
+)
+
+
+@pytest.fixture
+def family_tree():
+    tree = family_tree_pb2.FamilyTree()
+    tree.members["RONAW"].id = "RONAW"
+    tree.members["RONAW"].name = "Ron Weasley"
+    tree.relationships["RONAW"].parent_ids.append("ARTHW")
+    return tree
+
+
+def test_detect_format_by_extension_and_content(family_tree):
+    """Tests that the extension wins and unknown extensions are sniffed."""
+    binary = family_tree.SerializeToString()
+    text = b'members {\n  key: "RONAW"\n}\n'
+
+    assert detect_format("tree.BINPB", text) == TreeFileFormat.BINARY
+    assert detect_format("tree.txtpb", binary) == TreeFileFormat.TEXT
+    assert detect_format("tree", binary) == TreeFileFormat.BINARY
+    assert detect_format("tree.dat", text) == TreeFileFormat.TEXT
+    assert detect_format("tree", b"") == TreeFileFormat.TEXT
+    assert detect_format("tree.pbstream", b"") == TreeFileFormat.STREAM
+    assert detect_format("tree", encode_stream_header()) == TreeFileFormat.STREAM
+
+
+def test_request_content_round_trip(family_tree):
+    """Tests that binary files travel base64-encoded in JSON."""
+    binary = family_tree.SerializeToString()
+    encoded = encode_response_content(binary)
+
+    assert decode_request_content("tree.binpb", encoded) == binary
+    assert decode_request_content("upload", encoded) == binary
+    assert decode_request_content("upload", "members { }") == "members { }"
+    assert decode_request_content("tree.txtpb", "AAAA") == "AAAA"
+    with pytest.raises(ValueError):
+        decode_request_content("tree.binpb", "members { }")
+    assert base64.b64decode(encoded) == binary
+
+
+def test_stream_header():
+    """Tests that only complete headers of the supported version are read."""
+    header = encode_stream_header()
+
+    assert decode_stream_header(header + b"\x0a") == len(header)
+    with pytest.raises(ValueError, match="truncated"):
+        decode_stream_header(header[:-1])
+    with pytest.raises(ValueError, match="version 300"):
+        decode_stream_header(b"FTSTREAM" + encode_varint(300))
+    with pytest.raises(ValueError, match="start with"):
+        decode_stream_header(b"members {}")
@@ -0,0 +1,101 @@
+import os
+
+import pytest
+
+from familytree.proto import family_tree_pb2
+from familytree.utils import tree_log
+from familytree.utils.tree_log import (
+    LOG_FILENAME,
+    TreeEdit,
+    TreeLog,
+    decode_tree_log,
+    encode_log_header,
+    encode_tree_edit,
+)
+
+
+@pytest.fixture
+def snapshot():
+    tree = family_tree_pb2.FamilyTree()
+    tree.members["ARTHW"].id = "ARTHW"
+    tree.members["ARTHW"].name = "Arthur Weasley"
+    return tree.SerializeToString()
+
+
+def _edit(member_id, name, deleted_id=None):
+    edit = TreeEdit(family_tree_pb2.FamilyTree(), family_tree_pb2.FamilyTree())
+    edit.changed.members[member_id].id = member_id
+    edit.changed.members[member_id].name = name
+    edit.changed.relationships["ARTHW"].children_ids.append(member_id)
+    if deleted_id is not None:
+        edit.deleted.members[deleted_id].SetInParent()
+    return edit
+
+
+def test_round_trip(tmp_path, snapshot):
+    """Tests that the snapshot and the appended edits read back in order."""
+    log = TreeLog(str(tmp_path))
+    log.compact(snapshot)
+    edits = [_edit("RONAW", "Ron"), _edit("GINNW", "Ginny", deleted_id="RONAW")]
+    for edit in edits:
+        assert log.append(edit) == len(encode_tree_edit(edit))
+    log.close()
+
+    assert TreeLog(str(tmp_path)).read() == (snapshot, edits)
+
+
+def test_read_empty_directory(tmp_path):
+    assert TreeLog(str(tmp_path / "new")).read() == (b"", [])
+
+
+def test_torn_record_ends_the_log(tmp_path, snapshot):
+    """Tests that a record cut short by a crash and anything after it are dropped."""
+    log = TreeLog(str(tmp_path))
+    log.compact(snapshot)
+    log.append(_edit("RONAW", "Ron"))
+    log.append(_edit("GINNW", "Ginny"))
+    log.close()
+    path = os.path.join(tmp_path, LOG_FILENAME)
+    with open(path, "r+b") as f:
+        f.truncate(os.path.getsize(path) - 3)
+
+    _, edits = TreeLog(str(tmp_path)).read()
+    assert edits == [_edit("RONAW", "Ron")]
+
+    content = encode_log_header(4) + encode_tree_edit(_edit("RONAW", "Ron"))
+    generation, edits, valid_length = decode_tree_log(content + b"\x05\x0a\xff")
+    assert (generation, len(edits), valid_length) == (4, 1, len(content))
+
+
+@pytest.mark.parametrize(
+    "content",
+    [b"", b"FTSTREAM", b"FTTREELOG", encode_log_header(1).replace(b"\x01", b"\x09", 1)],
+)
+def test_bad_header(content):
+    with pytest.raises(ValueError):
+        decode_tree_log(content)
+
+
+def test_append_before_compact(tmp_path):
+    with pytest.raises(RuntimeError):
+        TreeLog(str(tmp_path)).append(_edit("RONAW", "Ron"))
+
+
+def test_compact_starts_a_new_generation(tmp_path, snapshot, monkeypatch):
+    """Tests that compaction replaces the snapshot and empties the log."""
+    monkeypatch.setattr(tree_log, "_MIN_COMPACTION_BYTES", 0)
+    log = TreeLog(str(tmp_path))
+    log.compact(b"")
+    log.append(_edit("RONAW", "Ron"))
+    assert log.needs_compaction()
+
+    log.compact(snapshot)
+    assert not log.needs_compaction()
+    log.append(_edit("GINNW", "Ginny"))
+    log.close()
+
+    assert sorted(os.listdir(tmp_path)) == ["snapshot-2.binpb", LOG_FILENAME]
+    reopened = TreeLog(str(tmp_path))
+    assert reopened.read() == (snapshot, [_edit("GINNW", "Ginny")])
+    reopened.compact(b"")
+    assert sorted(os.listdir(tmp_path)) == ["snapshot-3.binpb", LOG_FILENAME]
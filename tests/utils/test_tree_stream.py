@@ -0,0 +1,69 @@
+import io
+
+import pytest
+from google.protobuf.message import DecodeError
+
+from familytree.proto import family_tree_pb2
+from familytree.utils.tree_file_format import encode_stream_header
+from familytree.utils.tree_stream import (
+    RecordKind,
+    TreeRecord,
+    read_tree_stream,
+    tree_records,
+    write_tree_stream,
+)
+
+
+@pytest.fixture
+def family_tree():
+    tree = family_tree_pb2.FamilyTree()
+    for member_id, name in (("RONAW", "Ron Weasley"), ("ARTHW", "Arthur Weasley")):
+        tree.members[member_id].id = member_id
+        tree.members[member_id].name = name
+    tree.members["HERMG"].id = "HERMG"
+    tree.relationships["RONAW"].parent_ids.append("ARTHW")
+    tree.relationships["ARTHW"].children_ids.append("RONAW")
+    tree.family_units["FUNT"].parent_ids.append("ARTHW")
+    tree.family_units["FUNT"].child_ids.append("RONAW")
+    return tree
+
+
+def _stream(family_tree):
+    stream = io.BytesIO()
+    write_tree_stream(tree_records(family_tree), stream)
+    return stream.getvalue()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1 << 20])
+def test_round_trip(family_tree, chunk_size):
+    """Tests that records read back in order whatever the chunk size."""
+    content = _stream(family_tree)
+
+    records = list(read_tree_stream(io.BytesIO(content), chunk_size))
+
+    assert records == list(tree_records(family_tree))
+    assert records[0] == TreeRecord(
+        RecordKind.MEMBER, "ARTHW", family_tree.members["ARTHW"]
+    )
+    # The records are the deterministic wire format of the whole tree.
+    header = encode_stream_header()
+    assert content[len(header) :] == family_tree.SerializeToString(
+        deterministic=True
+    )
+
+
+def test_malformed_streams_are_rejected(family_tree):
+    """Tests the errors for a missing header, a truncated record and bad data."""
+    content = _stream(family_tree)
+    header = encode_stream_header()
+
+    with pytest.raises(ValueError, match="stream header"):
+        list(read_tree_stream(io.BytesIO(content[len(header) :])))
+    with pytest.raises(ValueError, match="middle of a record"):
+        list(read_tree_stream(io.BytesIO(content[:-1])))
+    with pytest.raises(ValueError, match="not a record"):
+        list(read_tree_stream(io.BytesIO(header + b"\x08\x01")))
+    with pytest.raises(DecodeError):
+        list(read_tree_stream(io.BytesIO(header + b"\x0a\x02\x0a\xff")))
+    # Fields of later versions are skipped.
+    assert list(read_tree_stream(io.BytesIO(header + b"\x22\x00"))) == []